@@ -8,14 +8,19 @@
 GitHub Webhook Trigger
 Receives GitHub webhooks with HMAC signature verification
 Triggers workflows on PR events (opened, synchronize)
+
+Events are queued durably and acknowledged with 202; redeliveries are
+dropped by X-GitHub-Delivery and bursts for the same PR/ref coalesce
+into the latest event.
 """
 from fastapi import FastAPI, Request, HTTPException, Header
-import httpx
 import os
 import logging
 import hmac
 import hashlib
 
+from webhook_queue import WebhookQueue
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -30,6 +35,22 @@ TEAM_ID = os.getenv("TEAM_ID")
 # User-defined environment variables
 GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET", "")
 FILTER_ACTIONS = os.getenv("FILTER_ACTIONS", "opened,synchronize").split(",")
+# Events for the same PR/ref arriving within this window collapse into the latest
+COALESCE_WINDOW_SECONDS = float(os.getenv("COALESCE_WINDOW_SECONDS", "10"))
+
+queue = WebhookQueue(ORCHESTRATOR_URL)
+
+
+@app.on_event("startup")
+async def start_queue():
+    """Start dispatch workers (resumes events queued before a restart)"""
+    await queue.start()
+
+
+@app.on_event("shutdown")
+async def stop_queue():
+    """Stop dispatch workers; undelivered events stay queued"""
+    await queue.stop()
 
 
 def verify_github_signature(payload_body: bytes, signature_header: str) -> bool:
@@ -65,16 +86,18 @@ def verify_github_signature(payload_body: bytes, signature_header: str) -> bool:
     return hmac.compare_digest(computed_signature, expected_signature)
 
 
-@app.post("/webhook")
+@app.post("/webhook", status_code=202)
 async def handle_github_webhook(
     request: Request,
     x_hub_signature_256: str = Header(None),
-    x_github_event: str = Header(None)
+    x_github_event: str = Header(None),
+    x_github_delivery: str = Header(None)
 ):
     """
-    Receive GitHub webhook and trigger workflow/team
+    Receive GitHub webhook and queue it for the workflow/team
 
-    Verifies HMAC signature and filters by PR action
+    Verifies HMAC signature and filters by PR action, then responds 202
+    once the event is durably queued
     """
     # Get raw body for signature verification
     body = await request.body()
@@ -123,57 +146,57 @@ async def handle_github_webhook(
             detail="No target configured. WORKFLOW_ID or TEAM_ID must be set."
         )
 
-    # Execute workflow or team
-    try:
-        async with httpx.AsyncClient() as client:
-            if WORKFLOW_ID:
-                logger.info(f"Triggering workflow: {WORKFLOW_ID}")
-                response = await client.post(
-                    f"{ORCHESTRATOR_URL}/workflows/execute",
-                    json={"workflow_id": WORKFLOW_ID, "params": params}
-                )
-            elif TEAM_ID:
-                logger.info(f"Triggering team: {TEAM_ID}")
-                response = await client.post(
-                    f"{ORCHESTRATOR_URL}/teams/{TEAM_ID}/execute",
-                    json={"params": params}
-                )
-
-            response.raise_for_status()
-            result = response.json()
-
-            logger.info(
-                f"Workflow/team triggered successfully",
-                extra={
-                    "execution_id": result.get("id"),
-                    "workflow_id": WORKFLOW_ID,
-                    "team_id": TEAM_ID,
-                    "github_action": action
-                }
-            )
-
-            return {
-                "status": "triggered",
-                "execution_id": result.get("id"),
-                "workflow_id": WORKFLOW_ID,
-                "team_id": TEAM_ID,
-                "github_event": event_type,
-                "github_action": action
-            }
-
-    except httpx.HTTPError as e:
-        logger.error(
-            f"Failed to trigger workflow/team",
-            extra={
-                "error": str(e),
-                "workflow_id": WORKFLOW_ID,
-                "team_id": TEAM_ID
-            }
-        )
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to trigger workflow/team: {str(e)}"
-        )
+    if WORKFLOW_ID:
+        path, dispatch_body = "/workflows/execute", {"workflow_id": WORKFLOW_ID, "params": params}
+    else:
+        path, dispatch_body = f"/teams/{TEAM_ID}/execute", {"params": params}
+
+    status, event_id = await queue.enqueue(
+        path,
+        dispatch_body,
+        delivery_id=x_github_delivery,
+        coalesce_key=coalesce_key(params),
+        coalesce_window=COALESCE_WINDOW_SECONDS
+    )
+
+    logger.info(
+        f"GitHub webhook {status}",
+        extra={
+            "event_id": event_id,
+            "delivery_id": x_github_delivery,
+            "workflow_id": WORKFLOW_ID,
+            "team_id": TEAM_ID,
+            "github_action": action
+        }
+    )
+
+    return {
+        "status": status,
+        "event_id": event_id,
+        "delivery_id": x_github_delivery,
+        "workflow_id": WORKFLOW_ID,
+        "team_id": TEAM_ID,
+        "github_event": event_type,
+        "github_action": action
+    }
+
+
+def coalesce_key(params: dict):
+    """
+    Key shared by events that supersede each other
+
+    Args:
+        params: Parameters extracted from the payload
+
+    Returns:
+        "<repo>#<pr>" for pull requests, "<repo>@<ref>" for pushes, else None
+    """
+    repository = params.get("repository")
+    if params.get("github_event") == "pull_request" and params.get("pr_number") is not None:
+        return f"{repository}#{params['pr_number']}"
+    if params.get("github_event") == "push" and params.get("ref"):
+        return f"{repository}@{params['ref']}"
+    return None
 
 
 def extract_parameters(payload: dict, event_type: str) -> dict:
@@ -218,6 +241,21 @@ def extract_parameters(payload: dict, event_type: str) -> dict:
     return params
 
 
+@app.get("/queue")
+async def queue_stats():
+    """Webhook queue depth and dispatch status"""
+    return queue.stats()
+
+
+@app.get("/queue/{event_id}")
+async def queue_event(event_id: int):
+    """Dispatch status of one queued webhook"""
+    event = queue.get_event(event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail=f"Event {event_id} not found")
+    return event
+
+
 @app.get("/health")
 async def health():
     """Health check endpoint"""
@@ -227,7 +265,8 @@ async def health():
         "has_workflow_id": WORKFLOW_ID is not None,
         "has_team_id": TEAM_ID is not None,
         "has_webhook_secret": bool(GITHUB_WEBHOOK_SECRET),
-        "filter_actions": FILTER_ACTIONS
+        "filter_actions": FILTER_ACTIONS,
+        "queue": queue.stats()
     }
 
 
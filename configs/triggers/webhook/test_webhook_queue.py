@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for the durable webhook queue
+Dispatches through an httpx MockTransport standing in for the orchestrator
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from webhook_queue import WebhookQueue
+
+PATH = "/workflows/execute"
+
+
+class FakeOrchestrator:
+    """Answers each POST with the next scripted status code"""
+
+    def __init__(self, *statuses: int):
+        self.statuses = list(statuses)
+        self.requests = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        if status == 200:
+            return httpx.Response(200, json={"id": f"exec-{len(self.requests)}"})
+        return httpx.Response(status, json={"detail": f"status {status}"})
+
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    """Route the queue's pooled client through a FakeOrchestrator"""
+    fake = FakeOrchestrator(200)
+    client_class = httpx.AsyncClient
+
+    def client(*args, **kwargs):
+        return client_class(*args, transport=httpx.MockTransport(fake.handle), **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", client)
+    return fake
+
+
+def make_queue(tmp_path, **overrides) -> WebhookQueue:
+    options = dict(workers=2, max_attempts=5, retry_base_delay=0.01, retry_max_delay=0.05)
+    options.update(overrides)
+    return WebhookQueue("http://orchestrator.test", path=str(tmp_path / "queue.db"), **options)
+
+
+async def wait_for_status(queue: WebhookQueue, event_id: int, *statuses: str, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        event = queue.get_event(event_id)
+        if event["status"] in statuses or time.monotonic() >= deadline:
+            return event
+        await asyncio.sleep(0.01)
+
+
+def test_repeated_delivery_id_is_duplicate(tmp_path):
+    queue = make_queue(tmp_path)
+
+    async def scenario():
+        first = await queue.enqueue(PATH, {"n": 1}, delivery_id="gh-1")
+        again = await queue.enqueue(PATH, {"n": 2}, delivery_id="gh-1")
+        other = await queue.enqueue(PATH, {"n": 3}, delivery_id="gh-2")
+        return first, again, other
+
+    first, again, other = asyncio.run(scenario())
+
+    assert first[0] == "queued"
+    assert again == ("duplicate", first[1])
+    assert other[0] == "queued" and other[1] != first[1]
+    assert queue.stats()["counts"] == {"pending": 2}
+
+
+def test_newer_event_coalesces_older_pending_one(tmp_path):
+    queue = make_queue(tmp_path)
+
+    async def scenario():
+        older = await queue.enqueue(PATH, {"sha": "a"}, delivery_id="d1", coalesce_key="repo#7", coalesce_window=30)
+        other_pr = await queue.enqueue(PATH, {"sha": "x"}, delivery_id="d2", coalesce_key="repo#8", coalesce_window=30)
+        newer = await queue.enqueue(PATH, {"sha": "b"}, delivery_id="d3", coalesce_key="repo#7", coalesce_window=30)
+        return older[1], other_pr[1], newer[1]
+
+    older, other_pr, newer = asyncio.run(scenario())
+
+    assert queue.get_event(older)["status"] == "coalesced"
+    assert queue.get_event(older)["last_error"] == f"superseded by event {newer}"
+    assert queue.get_event(newer)["status"] == "pending"
+    assert queue.get_event(other_pr)["status"] == "pending"
+
+
+def test_unavailable_orchestrator_is_retried_then_delivered(tmp_path, orchestrator):
+    orchestrator.statuses = [503, 503, 200]
+    queue = make_queue(tmp_path)
+
+    async def scenario():
+        await queue.start()
+        _, event_id = await queue.enqueue(PATH, {"workflow_id": "wf"}, delivery_id="d1")
+        event = await wait_for_status(queue, event_id, "delivered", "failed")
+        await queue.stop()
+        return event
+
+    event = asyncio.run(scenario())
+
+    assert event["status"] == "delivered"
+    assert event["attempts"] == 3
+    assert event["execution_id"] == "exec-3"
+    assert event["last_error"] is None
+    assert [r.url.path for r in orchestrator.requests] == [PATH] * 3
+
+
+def test_client_error_fails_without_retry(tmp_path, orchestrator):
+    orchestrator.statuses = [422]
+    queue = make_queue(tmp_path)
+
+    async def scenario():
+        await queue.start()
+        _, event_id = await queue.enqueue(PATH, {"workflow_id": "missing"}, delivery_id="d1")
+        event = await wait_for_status(queue, event_id, "delivered", "failed")
+        await asyncio.sleep(0.1)  # a retry would have been due by now
+        await queue.stop()
+        return event
+
+    event = asyncio.run(scenario())
+
+    assert event["status"] == "failed"
+    assert event["attempts"] == 1
+    assert "422" in event["last_error"]
+    assert len(orchestrator.requests) == 1
+
+
+def test_dispatching_events_are_requeued_on_start(tmp_path, orchestrator):
+    """An event claimed when the process died is dispatched after a restart"""
+    crashed = make_queue(tmp_path)
+    _, event_id = asyncio.run(crashed.enqueue(PATH, {"workflow_id": "wf"}, delivery_id="d1"))
+    assert crashed._claim()[0] == event_id
+    assert crashed.get_event(event_id)["status"] == "dispatching"
+    crashed._db.close()  # no stop(): the process was killed mid-dispatch
+
+    restarted = make_queue(tmp_path)
+
+    async def scenario():
+        await restarted.start()
+        event = await wait_for_status(restarted, event_id, "delivered", "failed")
+        await restarted.stop()
+        return event
+
+    event = asyncio.run(scenario())
+
+    assert event["status"] == "delivered"
+    assert event["attempts"] == 1
+    assert len(orchestrator.requests) == 1
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,365 @@
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Webhook Queue
+Durable SQLite queue between webhook receipt and orchestrator dispatch
+
+- Webhooks are acknowledged once stored, not once the workflow has started
+- Redeliveries with a known delivery id are dropped
+- Events sharing a coalesce key (same PR / ref) inside the coalesce window
+  collapse into the latest one
+- A pool of workers dispatches over one pooled HTTP client, retrying with
+  exponential back-off; events that keep failing are kept as "failed"
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Settings (overridable per trigger through environment variables)
+QUEUE_PATH = os.getenv("WEBHOOK_QUEUE_PATH", "/app/queue/webhook-queue.db")
+DISPATCH_WORKERS = int(os.getenv("DISPATCH_WORKERS", "4"))
+MAX_ATTEMPTS = int(os.getenv("DISPATCH_MAX_ATTEMPTS", "8"))
+RETRY_BASE_DELAY = float(os.getenv("DISPATCH_RETRY_BASE_DELAY", "2"))
+RETRY_MAX_DELAY = float(os.getenv("DISPATCH_RETRY_MAX_DELAY", "300"))
+DISPATCH_TIMEOUT = float(os.getenv("DISPATCH_TIMEOUT", "30"))
+# Delivered/coalesced events (and their delivery ids) are kept this long
+RETENTION_SECONDS = float(os.getenv("WEBHOOK_QUEUE_RETENTION", "86400"))
+
+# Statuses that are never picked up again
+_FINAL_STATUSES = ("delivered", "coalesced", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    delivery_id TEXT NOT NULL UNIQUE,
+    coalesce_key TEXT,
+    path TEXT NOT NULL,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    received_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    last_error TEXT,
+    execution_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_due ON events (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_events_coalesce ON events (coalesce_key, status);
+"""
+
+
+class PermanentDispatchError(Exception):
+    """Dispatch failed in a way retrying cannot fix (e.g. a 4xx response)"""
+
+
+class WebhookQueue:
+    """Durable webhook queue with deduplication, coalescing and retrying dispatch"""
+
+    def __init__(
+        self,
+        orchestrator_url: str,
+        path: str = QUEUE_PATH,
+        workers: int = DISPATCH_WORKERS,
+        max_attempts: int = MAX_ATTEMPTS,
+        retry_base_delay: float = RETRY_BASE_DELAY,
+        retry_max_delay: float = RETRY_MAX_DELAY
+    ):
+        """
+        Initialize webhook queue
+
+        Args:
+            orchestrator_url: Base URL events are dispatched to
+            path: SQLite database file
+            workers: Number of concurrent dispatch workers
+            max_attempts: Attempts before an event is marked failed
+            retry_base_delay: First retry delay in seconds (doubles per attempt)
+            retry_max_delay: Upper bound for the retry delay
+        """
+        self.orchestrator_url = orchestrator_url
+        self.path = path
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._tasks = []
+
+    # Lifecycle
+
+    async def start(self):
+        """Recover interrupted dispatches and start the worker pool"""
+        with self._lock:
+            recovered = self._db.execute(
+                "UPDATE events SET status = 'pending' WHERE status = 'dispatching'"
+            ).rowcount
+        if recovered:
+            logger.warning(f"Re-queued {recovered} webhook events interrupted by a restart")
+
+        self._client = httpx.AsyncClient(base_url=self.orchestrator_url, timeout=DISPATCH_TIMEOUT)
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._purge_loop()))
+
+    async def stop(self):
+        """Stop workers; undelivered events stay queued for the next start"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        with self._lock:
+            self._db.execute("UPDATE events SET status = 'pending' WHERE status = 'dispatching'")
+
+    # Producer side
+
+    async def enqueue(
+        self,
+        path: str,
+        body: Dict[str, Any],
+        delivery_id: Optional[str] = None,
+        coalesce_key: Optional[str] = None,
+        coalesce_window: float = 0.0
+    ) -> Tuple[str, Optional[int]]:
+        """
+        Durably store an event for dispatch
+
+        Args:
+            path: Orchestrator API path to POST to
+            body: JSON body for the orchestrator
+            delivery_id: Sender's delivery id (redeliveries are dropped)
+            coalesce_key: Events with the same key inside the window collapse
+                into the latest one
+            coalesce_window: Seconds an event waits for newer events with its key
+
+        Returns:
+            ("queued" | "duplicate", event id)
+        """
+        result = await asyncio.to_thread(
+            self._insert, path, body, delivery_id, coalesce_key, coalesce_window
+        )
+        if result[0] == "queued" and self._wake is not None:
+            self._wake.set()
+        return result
+
+    def _insert(
+        self,
+        path: str,
+        body: Dict[str, Any],
+        delivery_id: Optional[str],
+        coalesce_key: Optional[str],
+        coalesce_window: float
+    ) -> Tuple[str, Optional[int]]:
+        now = time.time()
+        delivery_id = delivery_id or f"local-{uuid.uuid4().hex}"
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._db.execute(
+                    "INSERT OR IGNORE INTO events "
+                    "(delivery_id, coalesce_key, path, body, next_attempt_at, received_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (delivery_id, coalesce_key, path, json.dumps(body),
+                     now + coalesce_window, now, now)
+                )
+                if cursor.rowcount == 0:
+                    self._db.execute("COMMIT")
+                    row = self._db.execute(
+                        "SELECT id FROM events WHERE delivery_id = ?", (delivery_id,)
+                    ).fetchone()
+                    return "duplicate", row[0] if row else None
+
+                event_id = cursor.lastrowid
+                if coalesce_key:
+                    # Older events for the same PR/ref that have not started
+                    # dispatching are superseded by this one
+                    self._db.execute(
+                        "UPDATE events SET status = 'coalesced', updated_at = ?, last_error = ? "
+                        "WHERE coalesce_key = ? AND status = 'pending' AND id < ?",
+                        (now, f"superseded by event {event_id}", coalesce_key, event_id)
+                    )
+                self._db.execute("COMMIT")
+                return "queued", event_id
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    # Consumer side
+
+    async def _worker(self, index: int):
+        """Claim due events and dispatch them until cancelled"""
+        while True:
+            try:
+                event = await asyncio.to_thread(self._claim)
+            except Exception as e:
+                logger.error(f"Webhook queue worker {index} failed to claim an event: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            if event is None:
+                await self._sleep_until_due()
+                continue
+
+            event_id, path, body, attempts = event
+            try:
+                result = await self._dispatch(path, json.loads(body))
+            except Exception as e:
+                await asyncio.to_thread(self._record_failure, event_id, attempts + 1, e)
+            else:
+                await asyncio.to_thread(self._record_success, event_id, result)
+
+    def _claim(self) -> Optional[Tuple[int, str, str, int]]:
+        """Atomically mark the oldest due event as dispatching"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, path, body, attempts FROM events "
+                "WHERE status = 'pending' AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at LIMIT 1",
+                (time.time(),)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE events SET status = 'dispatching', updated_at = ? WHERE id = ?",
+                (time.time(), row[0])
+            )
+            return row
+
+    async def _sleep_until_due(self):
+        """Wait for the next due event, a new event, or one second at most"""
+        row = await asyncio.to_thread(self._next_due)
+        timeout = 1.0 if row is None else min(1.0, max(0.0, row - time.time()))
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _next_due(self) -> Optional[float]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MIN(next_attempt_at) FROM events WHERE status = 'pending'"
+            ).fetchone()
+        return row[0] if row else None
+
+    async def _dispatch(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """POST one event to the orchestrator"""
+        response = await self._client.post(path, json=body)
+        if 400 <= response.status_code < 500 and response.status_code not in (408, 429):
+            raise PermanentDispatchError(
+                f"Orchestrator rejected event ({response.status_code}): {response.text[:200]}"
+            )
+        response.raise_for_status()
+        try:
+            return response.json()
+        except ValueError:
+            return {}
+
+    def _record_success(self, event_id: int, result: Dict[str, Any]):
+        with self._lock:
+            self._db.execute(
+                "UPDATE events SET status = 'delivered', attempts = attempts + 1, "
+                "updated_at = ?, last_error = NULL, execution_id = ? WHERE id = ?",
+                (time.time(), str(result.get("id")) if result.get("id") else None, event_id)
+            )
+        logger.info(
+            f"Webhook event {event_id} dispatched",
+            extra={"event_id": event_id, "execution_id": result.get("id")}
+        )
+
+    def _record_failure(self, event_id: int, attempts: int, error: Exception):
+        now = time.time()
+        permanent = isinstance(error, PermanentDispatchError)
+        if permanent or attempts >= self.max_attempts:
+            status, next_attempt_at = "failed", now
+            logger.error(f"Webhook event {event_id} failed after {attempts} attempts: {error}")
+        else:
+            delay = min(self.retry_base_delay * (2 ** (attempts - 1)), self.retry_max_delay)
+            # Full jitter so retries from a burst do not arrive together
+            delay = random.uniform(delay / 2, delay)
+            status, next_attempt_at = "pending", now + delay
+            logger.warning(
+                f"Webhook event {event_id} dispatch failed (attempt {attempts}), "
+                f"retrying in {delay:.1f}s: {error}"
+            )
+        with self._lock:
+            self._db.execute(
+                "UPDATE events SET status = ?, attempts = ?, next_attempt_at = ?, "
+                "updated_at = ?, last_error = ? WHERE id = ?",
+                (status, attempts, next_attempt_at, now, str(error)[:1000], event_id)
+            )
+
+    async def _purge_loop(self):
+        """Periodically delete finished events past the retention period"""
+        while True:
+            await asyncio.sleep(min(RETENTION_SECONDS, 3600))
+            try:
+                await asyncio.to_thread(self._purge)
+            except Exception as e:
+                logger.error(f"Webhook queue purge failed: {e}")
+
+    def _purge(self):
+        placeholders = ", ".join("?" for _ in _FINAL_STATUSES)
+        with self._lock:
+            deleted = self._db.execute(
+                f"DELETE FROM events WHERE status IN ({placeholders}) AND updated_at < ?",
+                (*_FINAL_STATUSES, time.time() - RETENTION_SECONDS)
+            ).rowcount
+        if deleted:
+            logger.info(f"Purged {deleted} finished webhook events")
+
+    # Introspection
+
+    def stats(self) -> Dict[str, Any]:
+        """Event counts by status and age of the oldest pending event"""
+        with self._lock:
+            counts = dict(self._db.execute(
+                "SELECT status, COUNT(*) FROM events GROUP BY status"
+            ).fetchall())
+            oldest = self._db.execute(
+                "SELECT MIN(received_at) FROM events WHERE status IN ('pending', 'dispatching')"
+            ).fetchone()[0]
+        return {
+            "counts": counts,
+            "oldest_pending_age_seconds": round(time.time() - oldest, 1) if oldest else None,
+            "workers": self.workers,
+        }
+
+    def get_event(self, event_id: int) -> Optional[Dict[str, Any]]:
+        """Status of one event"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, delivery_id, coalesce_key, status, attempts, last_error, execution_id "
+                "FROM events WHERE id = ?",
+                (event_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("event_id", "delivery_id", "coalesce_key", "status", "attempts", "last_error", "execution_id")
+        return dict(zip(keys, row))
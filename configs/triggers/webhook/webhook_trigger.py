@@ -6,14 +6,15 @@
 
 """
 Basic Webhook Trigger
-Receives HTTP webhooks and triggers workflows or teams
+Receives HTTP webhooks, queues them durably and triggers workflows or teams
 """
 from fastapi import FastAPI, Request, HTTPException
-import httpx
 import os
 import json
 import logging
 
+from webhook_queue import WebhookQueue
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,12 +26,56 @@ ORCHESTRATOR_URL = os.getenv("ORCHESTRATOR_URL", "http://orchestrator:8000")
 WORKFLOW_ID = os.getenv("WORKFLOW_ID")
 TEAM_ID = os.getenv("TEAM_ID")
 TASK_TEMPLATE = os.getenv("TASK_TEMPLATE", "Process webhook event: {_raw}")
+# Payload field whose value identifies events that supersede each other
+COALESCE_FIELD = os.getenv("COALESCE_FIELD", "")
+COALESCE_WINDOW_SECONDS = float(os.getenv("COALESCE_WINDOW_SECONDS", "0"))
+
+# Headers senders commonly use for a unique delivery id
+DELIVERY_ID_HEADERS = ("x-delivery-id", "x-request-id", "idempotency-key")
+
+queue = WebhookQueue(ORCHESTRATOR_URL)
+
+
+@app.on_event("startup")
+async def start_queue():
+    """Start dispatch workers (resumes events queued before a restart)"""
+    await queue.start()
+
+
+@app.on_event("shutdown")
+async def stop_queue():
+    """Stop dispatch workers; undelivered events stay queued"""
+    await queue.stop()
+
+
+def build_dispatch_request(payload: dict) -> tuple:
+    """
+    Build the orchestrator request for a webhook payload
+
+    Returns:
+        (API path, JSON body)
+    """
+    if WORKFLOW_ID:
+        return "/workflows/execute", {"workflow_id": WORKFLOW_ID, "params": payload}
+
+    # Generate task string from template
+    try:
+        task = TASK_TEMPLATE.format(**payload, _raw=json.dumps(payload))
+    except (KeyError, AttributeError) as e:
+        # Fallback if template references missing keys
+        task = f"Process webhook event: {json.dumps(payload)}"
+        logger.warning(f"Task template error: {e}, using fallback")
+
+    return "/teams/run", {"team_id": TEAM_ID, "task": task, "context": payload}
 
 
-@app.post("/webhook")
+@app.post("/webhook", status_code=202)
 async def handle_webhook(request: Request):
     """
-    Receive webhook and trigger workflow/team
+    Receive webhook and queue it for the workflow/team
+
+    Responds 202 once the event is durably queued; dispatch to the
+    orchestrator happens in the background with retries.
 
     The platform auto-injects:
     - ORCHESTRATOR_URL: URL of orchestrator API
@@ -55,67 +100,45 @@ async def handle_webhook(request: Request):
             detail="No target configured. WORKFLOW_ID or TEAM_ID must be set."
         )
 
-    # Execute workflow or team
-    try:
-        async with httpx.AsyncClient() as client:
-            if WORKFLOW_ID:
-                logger.info(f"Triggering workflow: {WORKFLOW_ID}")
-                response = await client.post(
-                    f"{ORCHESTRATOR_URL}/workflows/execute",
-                    json={"workflow_id": WORKFLOW_ID, "params": payload}
-                )
-            elif TEAM_ID:
-                logger.info(f"Triggering team: {TEAM_ID}")
-
-                # Generate task string from template
-                try:
-                    task = TASK_TEMPLATE.format(**payload, _raw=json.dumps(payload))
-                except (KeyError, AttributeError) as e:
-                    # Fallback if template references missing keys
-                    task = f"Process webhook event: {json.dumps(payload)}"
-                    logger.warning(f"Task template error: {e}, using fallback")
-
-                response = await client.post(
-                    f"{ORCHESTRATOR_URL}/teams/run",
-                    json={
-                        "team_id": TEAM_ID,
-                        "task": task,
-                        "context": payload
-                    }
-                )
-
-            response.raise_for_status()
-            result = response.json()
-
-            logger.info(
-                f"Workflow/team triggered successfully",
-                extra={
-                    "execution_id": result.get("id"),
-                    "workflow_id": WORKFLOW_ID,
-                    "team_id": TEAM_ID
-                }
-            )
-
-            return {
-                "status": "triggered",
-                "execution_id": result.get("id"),
-                "workflow_id": WORKFLOW_ID,
-                "team_id": TEAM_ID
-            }
-
-    except httpx.HTTPError as e:
-        logger.error(
-            f"Failed to trigger workflow/team",
-            extra={
-                "error": str(e),
-                "workflow_id": WORKFLOW_ID,
-                "team_id": TEAM_ID
-            }
-        )
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to trigger workflow/team: {str(e)}"
-        )
+    delivery_id = next(
+        (request.headers[h] for h in DELIVERY_ID_HEADERS if request.headers.get(h)),
+        None
+    )
+    coalesce_key = None
+    if COALESCE_FIELD and isinstance(payload, dict) and payload.get(COALESCE_FIELD) is not None:
+        coalesce_key = f"{COALESCE_FIELD}={payload[COALESCE_FIELD]}"
+
+    path, body = build_dispatch_request(payload)
+    status, event_id = await queue.enqueue(
+        path,
+        body,
+        delivery_id=delivery_id,
+        coalesce_key=coalesce_key,
+        coalesce_window=COALESCE_WINDOW_SECONDS
+    )
+
+    return {
+        "status": status,
+        "event_id": event_id,
+        "delivery_id": delivery_id,
+        "workflow_id": WORKFLOW_ID,
+        "team_id": TEAM_ID
+    }
+
+
+@app.get("/queue")
+async def queue_stats():
+    """Webhook queue depth and dispatch status"""
+    return queue.stats()
+
+
+@app.get("/queue/{event_id}")
+async def queue_event(event_id: int):
+    """Dispatch status of one queued webhook"""
+    event = queue.get_event(event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail=f"Event {event_id} not found")
+    return event
 
 
 @app.get("/health")
@@ -125,7 +148,8 @@ async def health():
         "status": "healthy",
         "orchestrator_url": ORCHESTRATOR_URL,
         "has_workflow_id": WORKFLOW_ID is not None,
-        "has_team_id": TEAM_ID is not None
+        "has_team_id": TEAM_ID is not None,
+        "queue": queue.stats()
     }
 
 
@@ -259,8 +259,9 @@ async def filter_models(
 ) -> List[Dict[str, Any]]:
     """Filter models based on criteria"""
     try:
-        # Get all models
-        models = await service.list_models()
+        # Get all models from the current catalog snapshot
+        snapshot = await service.get_catalog_snapshot()
+        models = list(snapshot.models)
         
         # Create filter criteria
         safety_levels = None
@@ -290,7 +291,8 @@ async def filter_models(
             models=models,
             criteria=criteria,
             performance_data=performance_data,
-            ratings_data=ratings_data
+            ratings_data=ratings_data,
+            catalog_version=snapshot.version
         )
         
         return filtered_models
@@ -307,8 +309,9 @@ async def sort_models(
 ) -> List[Dict[str, Any]]:
     """Sort models based on criteria"""
     try:
-        # Get all models
-        models = await service.list_models()
+        # Get all models from the current catalog snapshot
+        snapshot = await service.get_catalog_snapshot()
+        models = list(snapshot.models)
         
         # Create sort criteria
         sort_option = SortOption(request.sort_by)
@@ -330,7 +333,8 @@ async def sort_models(
             models=models,
             criteria=criteria,
             performance_data=performance_data,
-            ratings_data=ratings_data
+            ratings_data=ratings_data,
+            catalog_version=snapshot.version
         )
         
         return sorted_models
@@ -370,11 +374,14 @@ async def get_filter_options(
 ) -> Dict[str, List[str]]:
     """Get available filter options based on current models"""
     try:
-        # Get all models
-        models = await service.list_models()
+        # Get all models from the current catalog snapshot
+        snapshot = await service.get_catalog_snapshot()
         
         # Get filter options
-        options = filter_service.get_filter_options(models)
+        options = filter_service.get_filter_options(
+            list(snapshot.models),
+            catalog_version=snapshot.version
+        )
         
         return options
         
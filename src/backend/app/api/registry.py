@@ -352,6 +352,23 @@ async def list_transactions(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/transactions/compact")
+async def compact_transactions(
+    service: RegistryService = Depends(get_registry_service)
+):
+    """Compact the transaction log to the latest state per transaction."""
+
+    try:
+        archive = service.compact_transactions()
+        return {
+            "success": True,
+            "archived_to": str(archive) if archive else None
+        }
+    except Exception as e:
+        logger.error(f"Failed to compact transactions: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # Air-Gapped Environment Endpoints
 @router.post("/discover-local")
 async def discover_local_packages(
@@ -539,11 +556,9 @@ async def get_transaction(transaction_id: str,
     """Get details of a specific transaction."""
 
     try:
-        transactions = service.list_transactions(limit=1000)
-
-        for txn in transactions:
-            if txn.get("id") == transaction_id:
-                return txn
+        txn = service.get_transaction(transaction_id)
+        if txn:
+            return txn
 
         raise HTTPException(status_code=404, detail=f"Transaction not found: {transaction_id}")
     except HTTPException:
@@ -730,6 +745,7 @@ async def get_registry_health(
             "success": True,
             "registry_health": health_summary,
             "ordered_registries": ordered_registries,
+            "hedging": service.get_hedge_metrics(),
             "total_registries": len(service.registries),
             "available_registries": len([
                 name for name, health in health_summary.items() 
@@ -777,8 +793,14 @@ async def get_failover_config(
                 "health_check_interval": config.health_check_interval,
                 "timeout": config.timeout,
                 "circuit_breaker_threshold": config.circuit_breaker_threshold,
-                "circuit_breaker_reset_time": config.circuit_breaker_reset_time
-            }
+                "circuit_breaker_reset_time": config.circuit_breaker_reset_time,
+                "hedge_enabled": config.hedge_enabled,
+                "hedge_percentile": config.hedge_percentile,
+                "hedge_min_delay": config.hedge_min_delay,
+                "hedge_default_delay": config.hedge_default_delay,
+                "max_hedged_requests": config.max_hedged_requests
+            },
+            "hedging": service.get_hedge_metrics()
         }
     except Exception as e:
         logger.error(f"Failed to get failover config: {e}")
@@ -794,6 +816,11 @@ class FailoverConfigRequest(BaseModel):
     timeout: Optional[float] = None
     circuit_breaker_threshold: Optional[int] = None
     circuit_breaker_reset_time: Optional[int] = None
+    hedge_enabled: Optional[bool] = None
+    hedge_percentile: Optional[float] = None
+    hedge_min_delay: Optional[float] = None
+    hedge_default_delay: Optional[float] = None
+    max_hedged_requests: Optional[int] = None
 
 
 @router.post("/failover/config")
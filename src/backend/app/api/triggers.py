@@ -10,6 +10,7 @@ import httpx
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, HTTPException
 from app.core.config import get_config
+from app.services.scheduler_service import get_scheduler_service, is_schedule_trigger
 
 router = APIRouter()
 config = get_config()
@@ -58,6 +59,14 @@ def get_trigger_manager():
     return main_get_trigger_manager()
 
 
+def get_scheduler_for(trigger_name: str):
+    """In-process scheduler if it manages this trigger, else None"""
+    scheduler = get_scheduler_service()
+    if scheduler is not None and trigger_name in scheduler.schedules:
+        return scheduler
+    return None
+
+
 @router.post("/registries/install/trigger/{trigger_id}")
 async def install_trigger_from_registry(trigger_id: str, user_config: Dict[str, Any]):
     """
@@ -91,8 +100,13 @@ async def install_trigger_from_registry(trigger_id: str, user_config: Dict[str,
                 response.raise_for_status()
                 trigger_package = response.json()
 
-                # Install using Trigger Manager
-                result = get_trigger_manager().install(trigger_package, user_config)
+                # Schedule triggers run in the orchestrator's scheduler when enabled,
+                # everything else through the Trigger Manager
+                scheduler = get_scheduler_service()
+                if scheduler is not None and is_schedule_trigger(trigger_package):
+                    result = scheduler.install(trigger_package, user_config)
+                else:
+                    result = await get_trigger_manager().install_async(trigger_package, user_config)
 
                 if result["status"] in ["installed", "already_installed"]:
                     result["registry"] = registry.get("name", "Unknown")
@@ -120,7 +134,11 @@ async def install_trigger_from_registry(trigger_id: str, user_config: Dict[str,
 @router.delete("/triggers/{trigger_name}")
 async def uninstall_trigger(trigger_name: str):
     """Uninstall a trigger"""
-    result = get_trigger_manager().uninstall(trigger_name)
+    scheduler = get_scheduler_for(trigger_name)
+    if scheduler is not None:
+        result = scheduler.uninstall(trigger_name)
+    else:
+        result = await get_trigger_manager().uninstall_async(trigger_name)
 
     if result["status"] == "not_installed":
         raise HTTPException(
@@ -133,37 +151,58 @@ async def uninstall_trigger(trigger_name: str):
 @router.post("/triggers/{trigger_name}/start")
 async def start_trigger(trigger_name: str):
     """Start a stopped trigger"""
-    return get_trigger_manager().start(trigger_name)
+    scheduler = get_scheduler_for(trigger_name)
+    if scheduler is not None:
+        return scheduler.start_schedule(trigger_name)
+    return await get_trigger_manager().start_async(trigger_name)
 
 
 @router.post("/triggers/{trigger_name}/stop")
 async def stop_trigger(trigger_name: str):
     """Stop a running trigger"""
-    return get_trigger_manager().stop(trigger_name)
+    scheduler = get_scheduler_for(trigger_name)
+    if scheduler is not None:
+        return scheduler.stop_schedule(trigger_name)
+    return await get_trigger_manager().stop_async(trigger_name)
 
 
 @router.post("/triggers/{trigger_name}/restart")
 async def restart_trigger(trigger_name: str):
     """Restart a trigger"""
-    return get_trigger_manager().restart(trigger_name)
+    scheduler = get_scheduler_for(trigger_name)
+    if scheduler is not None:
+        return scheduler.restart_schedule(trigger_name)
+    return await get_trigger_manager().restart_async(trigger_name)
+
+
+async def list_all_triggers():
+    """Container triggers plus schedules run by the in-process scheduler"""
+    triggers = await get_trigger_manager().list_installed_async()
+    scheduler = get_scheduler_service()
+    if scheduler is not None:
+        triggers = triggers + scheduler.list_installed()
+    return triggers
 
 
 @router.get("/triggers")
 async def list_triggers():
     """List all installed triggers (alias for /triggers/installed)"""
-    return get_trigger_manager().list_installed()
+    return await list_all_triggers()
 
 
 @router.get("/triggers/installed")
 async def list_installed_triggers():
     """List all installed triggers with their status"""
-    return get_trigger_manager().list_installed()
+    return await list_all_triggers()
 
 
 @router.get("/triggers/{trigger_name}/status")
 async def get_trigger_status(trigger_name: str):
     """Get detailed status of an installed trigger"""
-    return get_trigger_manager().get_status(trigger_name)
+    scheduler = get_scheduler_for(trigger_name)
+    if scheduler is not None:
+        return scheduler.get_status(trigger_name)
+    return await get_trigger_manager().get_status_async(trigger_name)
 
 
 @router.post("/triggers/{trigger_name}/update")
@@ -186,7 +225,11 @@ async def update_trigger(trigger_name: str, registry_id: Optional[str] = None):
         raise HTTPException(status_code=404, detail="No enabled registries found")
 
     # Get current version
-    status = get_trigger_manager().get_status(trigger_name)
+    scheduler = get_scheduler_for(trigger_name)
+    if scheduler is not None:
+        status = scheduler.get_status(trigger_name)
+    else:
+        status = await get_trigger_manager().get_status_async(trigger_name)
     if status.get("status") == "not_installed":
         raise HTTPException(
             status_code=404, detail=f"Trigger '{trigger_name}' is not installed"
@@ -220,8 +263,11 @@ async def update_trigger(trigger_name: str, registry_id: Optional[str] = None):
                 response.raise_for_status()
                 trigger_package = response.json()
 
-                # Update using Trigger manager
-                result = get_trigger_manager().update(trigger_name, trigger_package)
+                # Update using the scheduler or Trigger manager
+                if scheduler is not None:
+                    result = scheduler.update(trigger_name, trigger_package)
+                else:
+                    result = await get_trigger_manager().update_async(trigger_name, trigger_package)
 
                 if result["status"] == "updated":
                     result["registry"] = registry.get("name", "Unknown")
@@ -13,8 +13,8 @@ CRUD operations and execution for V2 workflows.
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException
 
-from app.workflow_v2.models import WorkflowRunRequest, ExecutionV2Result
-from app.services.workflow_v2_service import WorkflowV2Service
+from app.workflow_v2.models import WorkflowRunRequest
+from app.services.workflow_v2_service import WorkflowV2Service, WorkflowRunResult
 from app.core.errors import NotFoundError, ValidationError
 from app.core.dependencies import get_current_user_context
 
@@ -100,13 +100,13 @@ async def delete_workflow(
         raise HTTPException(status_code=404, detail=str(e))
 
 
-@router.post("/run", response_model=ExecutionV2Result)
+@router.post("/run", response_model=WorkflowRunResult)
 async def run_workflow(
     request: WorkflowRunRequest,
     service: WorkflowV2Service = Depends(get_workflow_v2_service),
     security_context=Depends(get_current_user_context)
-) -> ExecutionV2Result:
-    """Execute a workflow by workflow_id"""
+) -> WorkflowRunResult:
+    """Execute a workflow by workflow_id (post-processing continues in the background)"""
     try:
         return await service.run_workflow(
             request.workflow_id,
@@ -121,3 +121,15 @@ async def run_workflow(
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Workflow execution failed: {str(e)}")
+
+
+@router.get("/executions/{execution_id}/post-processing")
+async def get_post_processing(
+    execution_id: str,
+    service: WorkflowV2Service = Depends(get_workflow_v2_service)
+) -> Dict[str, Any]:
+    """Status of scan creation and attack session updates for an execution"""
+    try:
+        return await service.get_post_processing(execution_id)
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
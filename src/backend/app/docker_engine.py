@@ -0,0 +1,215 @@
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Docker Engine Client - Async access to the Docker Engine API.
+
+Talks to dockerd over its Unix socket through a single pooled
+httpx.AsyncClient, so status queries and lifecycle calls made from async
+handlers never spawn a `docker` process or block the event loop.
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+import httpx
+
+DEFAULT_SOCKET_PATH = "unix:///var/run/docker.sock"
+API_BASE_URL = "http://docker"
+
+
+class DockerEngineError(Exception):
+    """Raised when the Docker Engine API returns an error response"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def resolve_socket_path(socket_path: Optional[str] = None) -> str:
+    """
+    Resolve the filesystem path of the Docker socket.
+
+    Args:
+        socket_path: Socket path or unix:// URL (defaults to DOCKER_SOCKET_PATH env var)
+
+    Returns:
+        Filesystem path of the socket
+    """
+    socket_path = socket_path or os.getenv("DOCKER_SOCKET_PATH") or DEFAULT_SOCKET_PATH
+    if socket_path.startswith("unix://"):
+        socket_path = socket_path[len("unix://"):]
+    return socket_path
+
+
+class DockerEngineClient:
+    """Minimal async Docker Engine API client over a Unix socket"""
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        timeout: float = 30.0,
+        max_connections: int = 10
+    ):
+        """
+        Initialize Docker Engine client
+
+        Args:
+            socket_path: Socket path or unix:// URL (defaults to DOCKER_SOCKET_PATH env var)
+            timeout: Default request timeout in seconds
+            max_connections: Size of the connection pool to the daemon
+        """
+        self.socket_path = resolve_socket_path(socket_path)
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client, created on first use"""
+        if self._client is None or self._client.is_closed:
+            transport = httpx.AsyncHTTPTransport(
+                uds=self.socket_path,
+                limits=httpx.Limits(max_connections=self.max_connections)
+            )
+            self._client = httpx.AsyncClient(
+                transport=transport,
+                base_url=API_BASE_URL,
+                timeout=self.timeout
+            )
+        return self._client
+
+    def is_available(self) -> bool:
+        """Check whether the Docker socket exists"""
+        return os.path.exists(self.socket_path)
+
+    async def close(self):
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        ok_status: tuple = (200, 201, 204),
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Send a request to the Engine API
+
+        Args:
+            method: HTTP method
+            path: API path (e.g. /containers/json)
+            ok_status: Status codes treated as success
+            timeout: Optional per-request timeout override
+
+        Returns:
+            Response object
+
+        Raises:
+            DockerEngineError: If the daemon returns an unexpected status
+        """
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        response = await self.client.request(method, path, **kwargs)
+        if response.status_code not in ok_status:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            raise DockerEngineError(
+                f"Docker API {method} {path} failed ({response.status_code}): {message}",
+                status_code=response.status_code
+            )
+        return response
+
+    async def ping(self) -> bool:
+        """Check that the daemon answers on the socket"""
+        try:
+            await self._request("GET", "/_ping")
+            return True
+        except (httpx.HTTPError, DockerEngineError, OSError):
+            return False
+
+    async def list_containers(self, all: bool = True) -> List[Dict[str, Any]]:
+        """
+        List containers in a single API call
+
+        Args:
+            all: Include stopped containers
+
+        Returns:
+            Raw container summaries from GET /containers/json
+        """
+        response = await self._request(
+            "GET", "/containers/json", params={"all": "1" if all else "0"}
+        )
+        return response.json()
+
+    async def container_statuses(self) -> Dict[str, Dict[str, str]]:
+        """
+        Map container name to its state and status text
+
+        Returns:
+            {name: {"state": "running", "status": "Up 3 minutes"}}
+        """
+        statuses = {}
+        for container in await self.list_containers(all=True):
+            entry = {
+                "state": container.get("State", ""),
+                "status": container.get("Status", "")
+            }
+            for name in container.get("Names") or []:
+                statuses[name.lstrip("/")] = entry
+        return statuses
+
+    async def image_exists(self, image: str) -> bool:
+        """Check whether an image is present locally"""
+        try:
+            await self._request("GET", f"/images/{quote(image, safe='')}/json")
+            return True
+        except DockerEngineError as e:
+            if e.status_code == 404:
+                return False
+            raise
+
+    async def start_container(self, name: str):
+        """Start a container (no-op if already running)"""
+        await self._request(
+            "POST", f"/containers/{quote(name, safe='')}/start", ok_status=(204, 304)
+        )
+
+    async def stop_container(self, name: str, timeout: int = 10):
+        """Stop a container (no-op if already stopped)"""
+        await self._request(
+            "POST",
+            f"/containers/{quote(name, safe='')}/stop",
+            ok_status=(204, 304),
+            params={"t": str(timeout)},
+            timeout=self.timeout + timeout
+        )
+
+    async def restart_container(self, name: str, timeout: int = 10):
+        """Restart a container"""
+        await self._request(
+            "POST",
+            f"/containers/{quote(name, safe='')}/restart",
+            params={"t": str(timeout)},
+            timeout=self.timeout + timeout
+        )
+
+    async def remove_container(self, name: str, force: bool = True):
+        """Remove a container, ignoring containers that do not exist"""
+        await self._request(
+            "DELETE",
+            f"/containers/{quote(name, safe='')}",
+            ok_status=(204, 404),
+            params={"force": "1" if force else "0"}
+        )
@@ -7,15 +7,27 @@
 """
 Docker Manager - CLI-based Container Lifecycle Management
 Uses Docker CLI instead of Docker SDK to avoid compatibility issues
+
+Async callers use the *_async methods: status queries go to the Docker
+Engine API over the Unix socket in one batched list call, and builds and
+container creation run in a bounded worker pool off the event loop.
 """
+import asyncio
 import subprocess
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 import re
 import os
 from datetime import datetime, UTC
 from app.core.config import get_config
+from app.docker_engine import DockerEngineClient, DockerEngineError
+
+# Concurrent builds/creates per manager; image builds are CPU and disk heavy
+DEFAULT_MAX_WORKERS = 4
 
 
 class DockerManager:
@@ -33,7 +45,6 @@ class DockerManager:
 
         # Get base_dir from parameter, environment, or fail explicitly
         if base_dir is None:
-            import os
             base_dir = os.getenv('APP_BASE_DIR')
             if base_dir is None:
                 raise ValueError("base_dir must be provided or APP_BASE_DIR environment variable must be set")
@@ -41,6 +52,19 @@ class DockerManager:
         self.resource_type = resource_type
         self.installed_file = self.base_dir / "volumes" / "state" / f"installed-{resource_type}s.json"
 
+        # Serializes writes of the installed registry from worker threads
+        self._state_lock = threading.RLock()
+
+        # Bounded pool for blocking CLI work (builds, container creation)
+        max_workers = int(os.getenv("DOCKER_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+        self._workers = ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix=f"docker-{resource_type}"
+        )
+
+        # Async Engine API client (one pooled connection set per manager)
+        self.engine = DockerEngineClient()
+
         # Auto-detect network from environment or current container
         self.network_name = self._detect_network()
 
@@ -271,9 +295,13 @@ class DockerManager:
 
     def _save_installed(self):
         """Save registry of installed resources"""
-        self.installed_file.write_text(
-            json.dumps(self.installed, indent=2)
-        )
+        with self._state_lock:
+            # Copy first so installs finishing in other workers can't mutate
+            # the dict while it is being serialized
+            snapshot = dict(self.installed)
+            self.installed_file.write_text(
+                json.dumps(snapshot, indent=2)
+            )
 
     # Backwards compatibility
     def _save_installed_mcps(self):
@@ -788,8 +816,7 @@ class DockerManager:
             }
 
         try:
-            mcp_info = self.installed[name]
-            container_name = mcp_info["container_name"]
+            container_name = self.installed[name]["container_name"]
 
             # Get container status
             result = self._run_docker(
@@ -797,39 +824,7 @@ class DockerManager:
                 check=False
             )
 
-            if not result.stdout.strip():
-                status_response = {
-                    "name": name,
-                    "version": mcp_info["version"],
-                    "state": "container_missing",
-                    "running": False,
-                    "container_name": container_name,
-                    "installed_at": mcp_info.get("installed_at", "unknown")
-                }
-                # Add trigger-specific fields
-                if self.resource_type == "trigger":
-                    status_response["trigger_type"] = mcp_info.get("trigger_type", "unknown")
-                    status_response["package"] = mcp_info.get("package")
-                    status_response["user_config"] = mcp_info.get("user_config")
-                return status_response
-
-            status_text = result.stdout.strip()
-            running = status_text.startswith("Up")
-
-            status_response = {
-                "name": name,
-                "version": mcp_info["version"],
-                "container_name": container_name,
-                "state": "running" if running else "exited",
-                "running": running,
-                "installed_at": mcp_info.get("installed_at", "unknown")
-            }
-            # Add trigger-specific fields
-            if self.resource_type == "trigger":
-                status_response["trigger_type"] = mcp_info.get("trigger_type", "unknown")
-                status_response["package"] = mcp_info.get("package")
-                status_response["user_config"] = mcp_info.get("user_config")
-            return status_response
+            return self._build_status(name, result.stdout.strip() or None)
 
         except Exception as e:
             return {
@@ -840,13 +835,79 @@ class DockerManager:
 
     def list_installed(self) -> List[Dict[str, Any]]:
         """List all installed MCPs with their status"""
-        mcps = []
+        if not self.installed:
+            return []
 
-        for name in self.installed.keys():
-            mcps.append(self.get_status(name))
+        # One `docker ps` for every container instead of one per MCP
+        result = self._run_docker(
+            ["ps", "-a", "--format", "{{.Names}}\t{{.Status}}"],
+            check=False
+        )
+        if result.returncode != 0:
+            return [self.get_status(name) for name in list(self.installed.keys())]
 
+        statuses = {}
+        for line in result.stdout.splitlines():
+            container_name, _, status_text = line.partition("\t")
+            if container_name:
+                statuses[container_name.strip()] = status_text.strip()
+
+        return self._build_statuses(statuses)
+
+    def _build_statuses(self, statuses: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        Build status entries for every installed resource
+
+        Args:
+            statuses: Container name -> docker status text ("Up 3 minutes")
+        """
+        mcps = []
+        for name in list(self.installed.keys()):
+            try:
+                container_name = self.installed[name]["container_name"]
+                mcps.append(self._build_status(name, statuses.get(container_name)))
+            except Exception as e:
+                mcps.append({"status": "error", "name": name, "error": str(e)})
         return mcps
 
+    def _build_status(self, name: str, status_text: Optional[str]) -> Dict[str, Any]:
+        """
+        Build the status response for an installed resource
+
+        Args:
+            name: Resource name
+            status_text: Docker status text, or None if the container is missing
+        """
+        mcp_info = self.installed[name]
+        container_name = mcp_info["container_name"]
+
+        if status_text is None:
+            status_response = {
+                "name": name,
+                "version": mcp_info["version"],
+                "state": "container_missing",
+                "running": False,
+                "container_name": container_name,
+                "installed_at": mcp_info.get("installed_at", "unknown")
+            }
+        else:
+            running = status_text.startswith("Up")
+            status_response = {
+                "name": name,
+                "version": mcp_info["version"],
+                "container_name": container_name,
+                "state": "running" if running else "exited",
+                "running": running,
+                "installed_at": mcp_info.get("installed_at", "unknown")
+            }
+
+        # Add trigger-specific fields
+        if self.resource_type == "trigger":
+            status_response["trigger_type"] = mcp_info.get("trigger_type", "unknown")
+            status_response["package"] = mcp_info.get("package")
+            status_response["user_config"] = mcp_info.get("user_config")
+        return status_response
+
     def update(self, name: str, new_package: Dict[str, Any]) -> Dict[str, Any]:
         """
         Update an MCP to a new version
@@ -891,6 +952,94 @@ class DockerManager:
 
         return install_result
 
+    # Async API - safe to call from the event loop
+
+    async def _run_in_pool(self, func, *args, **kwargs):
+        """Run a blocking operation in the bounded worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._workers, partial(func, *args, **kwargs))
+
+    async def list_installed_async(self) -> List[Dict[str, Any]]:
+        """List all installed resources with status from a single Engine API call"""
+        if not self.installed:
+            return []
+        try:
+            containers = await self.engine.container_statuses()
+        except Exception as e:
+            print(f"⚠️  Docker Engine API unavailable, falling back to CLI: {e}")
+            return await self._run_in_pool(self.list_installed)
+
+        statuses = {name: info["status"] for name, info in containers.items()}
+        return self._build_statuses(statuses)
+
+    async def get_status_async(self, name: str) -> Dict[str, Any]:
+        """Get status of an installed resource without blocking the event loop"""
+        if name not in self.installed:
+            return {
+                "status": "not_installed",
+                "name": name
+            }
+        try:
+            containers = await self.engine.container_statuses()
+        except Exception:
+            return await self._run_in_pool(self.get_status, name)
+
+        container_name = self.installed[name]["container_name"]
+        container = containers.get(container_name)
+        return self._build_status(name, container["status"] if container else None)
+
+    async def install_async(self, mcp_package: Dict[str, Any], user_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Install a resource; the image build and container creation run in the worker pool"""
+        return await self._run_in_pool(self.install, mcp_package, user_config)
+
+    async def update_async(self, name: str, new_package: Dict[str, Any]) -> Dict[str, Any]:
+        """Update a resource to a new version in the worker pool"""
+        return await self._run_in_pool(self.update, name, new_package)
+
+    async def uninstall_async(self, name: str) -> Dict[str, Any]:
+        """Uninstall a resource in the worker pool"""
+        return await self._run_in_pool(self.uninstall, name)
+
+    async def start_async(self, name: str) -> Dict[str, Any]:
+        """Start an installed container, recreating it in the worker pool if missing"""
+        if name not in self.installed:
+            return {"status": "not_installed", "name": name}
+        try:
+            await self.engine.start_container(self.installed[name]["container_name"])
+            return {"status": "started", "name": name}
+        except Exception:
+            # Missing container or no socket - the CLI path rebuilds/recreates
+            return await self._run_in_pool(self.start, name)
+
+    async def stop_async(self, name: str) -> Dict[str, Any]:
+        """Stop an installed container through the Engine API"""
+        if name not in self.installed:
+            return {"status": "not_installed", "name": name}
+        try:
+            await self.engine.stop_container(self.installed[name]["container_name"])
+            return {"status": "stopped", "name": name}
+        except DockerEngineError as e:
+            return {"status": "error", "name": name, "error": str(e)}
+        except Exception:
+            return await self._run_in_pool(self.stop, name)
+
+    async def restart_async(self, name: str) -> Dict[str, Any]:
+        """Restart an installed container through the Engine API"""
+        if name not in self.installed:
+            return {"status": "not_installed", "name": name}
+        try:
+            await self.engine.restart_container(self.installed[name]["container_name"])
+            return {"status": "restarted", "name": name}
+        except DockerEngineError as e:
+            return {"status": "error", "name": name, "error": str(e)}
+        except Exception:
+            return await self._run_in_pool(self.restart, name)
+
+    async def aclose(self):
+        """Close Engine API connections and shut down the worker pool"""
+        await self.engine.close()
+        self._workers.shutdown(wait=False)
+
     def _get_timestamp(self) -> str:
         """Get current timestamp"""
         return datetime.now(UTC).isoformat()
@@ -8,6 +8,9 @@
 FastAPI Orchestrator - Main Platform API
 Manages MCP server registry and executes workflows
 """
+# Startup profiling (ADCL_STARTUP_PROFILE) starts timing from this import
+from app.startup_profile import get_startup_profiler, lazy, lazy_startup_enabled
+
 # Load environment variables from .env file (local development)
 # Docker Compose loads .env automatically, but this helps with local dev
 from dotenv import load_dotenv
@@ -17,9 +20,12 @@ if _env_path.exists():
     load_dotenv(_env_path)
     print(f"✅ Loaded environment variables from {_env_path}")
 
-from fastapi import FastAPI, WebSocket, HTTPException, WebSocketDisconnect
+profiler = get_startup_profiler()
+profiler.mark("load .env")
+
+from fastapi import FastAPI, WebSocket, HTTPException, WebSocketDisconnect, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, field_validator
 from typing import Dict, List, Any, Optional, Callable
 import httpx
@@ -38,6 +44,17 @@ from app.core.config import get_config
 from app.core.errors import sanitize_error_for_user
 from app.services.feature_service import init_feature_service, get_feature_service
 from app.services.config_version_service import init_config_version_service
+from app.services.catalog_cache_service import RegistryCatalogCache
+from app.services.team_chat_service import combine_team_responses, gather_team_responses
+from app.services.session_context_service import (
+    get_session_context_service,
+    init_session_context_service,
+)
+from app.services.scheduler_service import (
+    get_scheduler_service,
+    init_scheduler_service,
+    scheduler_enabled,
+)
 from anthropic import Anthropic
 from openai import OpenAI
 
@@ -65,10 +82,8 @@ from app.models import (
 from app.models.settings import ALLOWED_SETTINGS
 
 # Import API routers (PRD-99 refactoring)
-from app.api import agents, workflows, teams, models, mcps, executions, recon, system, license
-from app.api import dashboard, scanner, vulnerabilities  # Red Team Dashboard
-from app.api import vulhub  # Vulhub container management
-from app.api import attack_playground  # Attack Playground state management
+# Red Team routers are imported only when the feature is enabled (see below)
+from app.api import agents, workflows, teams, models, mcps, executions, system, license
 from app.api import registry as registry_api  # YUM-style package management
 from app.api import triggers  # Trigger management (Phase 4 refactoring)
 from app.api.v2 import workflows as workflows_v2
@@ -76,6 +91,8 @@ from app.api import migration  # Migration API endpoints
 from app.api import edition_capabilities  # Edition capability awareness for agents
 from app.api import settings  # User settings (Phase 3.4 refactoring)
 
+profiler.mark("import modules and core routers")
+
 
 def serialize_anthropic_objects(obj: Any) -> Any:
     """
@@ -203,6 +220,8 @@ def get_trigger_manager():
             trigger_manager = DummyTriggerManager()
     return trigger_manager
 
+profiler.mark("app, config and MCP registry")
+
 # Import enhanced workflow engine
 from app.workflow_engine import WorkflowEngine
 from app.workflow_loader import WorkflowLoader
@@ -210,6 +229,7 @@ from app.workflow_loader import WorkflowLoader
 # Initialize workflow loader and engine
 workflow_loader = WorkflowLoader()
 engine = WorkflowEngine(registry, workflow_loader)
+profiler.mark("workflow engine")
 
 # Initialize AI clients (allow None for optional providers)
 anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")
@@ -221,38 +241,52 @@ ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_DUMMY_API_KEY = "ollama-local-no-auth-required"
 
 # Anthropic client (required for most features)
+# In lazy startup mode provider clients are constructed on first use
 if anthropic_api_key:
-    anthropic_client = Anthropic(api_key=anthropic_api_key)
+    anthropic_client = lazy(lambda: Anthropic(api_key=anthropic_api_key), "Anthropic client")
 else:
     anthropic_client = None
     print("⚠️  Warning: ANTHROPIC_API_KEY not set. Agent features will be limited.")
 
 # OpenAI client (optional)
 if openai_api_key:
-    openai_client = OpenAI(api_key=openai_api_key)
+    openai_client = lazy(lambda: OpenAI(api_key=openai_api_key), "OpenAI client")
 else:
     openai_client = None
     print("⚠️  Warning: OPENAI_API_KEY not set. OpenAI models will not be available.")
 
-# Ollama client (optional, uses OpenAI-compatible API)
-# For local Ollama, no API key needed. For remote, use OLLAMA_API_KEY env var
-try:
-    import httpx
-    ollama_client = OpenAI(
-        base_url=f"{ollama_base_url}/v1",
-        api_key=ollama_api_key or OLLAMA_DUMMY_API_KEY,
-        timeout=httpx.Timeout(5.0, connect=2.0)  # Fast timeout for health check
-    )
 
-    # Health check: verify Ollama is actually running (with timeout)
+def check_ollama_health(client) -> bool:
+    """Verify Ollama is actually running (blocking, bounded by the client timeout)"""
     try:
-        ollama_client.models.list()
+        client.models.list()
         print(f"✓ Ollama client initialized and verified (base_url: {ollama_base_url})")
+        return True
     except Exception as health_error:
         print(f"⚠️  Warning: Ollama client created but health check failed: {health_error}")
         print(f"   Ollama may not be running at {ollama_base_url}")
         print(f"   Models will fail at runtime if Ollama is not available")
         # Keep client - will fail at runtime with clear error
+        return False
+
+
+# Ollama client (optional, uses OpenAI-compatible API)
+# For local Ollama, no API key needed. For remote, use OLLAMA_API_KEY env var
+try:
+    import httpx
+    ollama_client = lazy(
+        lambda: OpenAI(
+            base_url=f"{ollama_base_url}/v1",
+            api_key=ollama_api_key or OLLAMA_DUMMY_API_KEY,
+            timeout=httpx.Timeout(5.0, connect=2.0)  # Fast timeout for health check
+        ),
+        "Ollama client"
+    )
+
+    # Health check: in lazy startup mode this runs in the background after
+    # the server starts (see startup()) instead of blocking the import
+    if not lazy_startup_enabled():
+        check_ollama_health(ollama_client)
 
 except Exception as e:
     ollama_client = None
@@ -260,9 +294,20 @@ except Exception as e:
     traceback.print_exc()
     print(f"⚠️  Warning: Could not initialize Ollama client: {e}")
 
+profiler.mark("AI provider clients")
+
 # Initialize agent runtime for autonomous agents with all clients
 agent_runtime = AgentRuntime(registry, anthropic_client, openai_client, ollama_client, config=config)
 
+# Resolved provider clients for model-only chat, shared across requests
+from app.services.model_config_service import ModelClientPool
+model_client_pool = ModelClientPool(agent_runtime._get_client_for_model)
+
+# Shared in-memory indexes of team/agent definitions (hot-reloaded from disk)
+from app.services.definition_registry import get_definition_registry
+team_definitions = get_definition_registry(Path(config.get_agent_teams_path()), "team")
+agent_definitions = get_definition_registry(Path(config.get_agent_definitions_path()), "agent")
+
 # Initialize team runtime for multi-agent teams
 team_runtime = TeamRuntime(
     agent_runtime=agent_runtime,
@@ -273,6 +318,7 @@ team_runtime = TeamRuntime(
 # Initialize WebSocket chat router with dependencies (Phase 2.2 refactoring)
 from app.api.ws.chat import create_chat_websocket_router
 ws_chat_router = create_chat_websocket_router(manager, agent_runtime)
+profiler.mark("agent and team runtimes")
 
 # Initialize Workflow V2 Service
 from app.services.workflow_v2_service import WorkflowV2Service
@@ -284,29 +330,50 @@ from app.workflow_v2.executor import WorkflowExecutor
 from app.api.v2.workflows import set_workflow_v2_service
 
 # Initialize ReconService and AttackService
-recon_service = ReconService(base_dir=str(Path(config.volumes_path) / "recon"))
-attack_service = AttackService(base_dir=str(Path(config.volumes_path) / "recon"))
+# (constructed on first use in lazy startup mode)
+recon_service = lazy(
+    lambda: ReconService(base_dir=str(Path(config.volumes_path) / "recon")),
+    "ReconService"
+)
+attack_service = lazy(
+    lambda: AttackService(base_dir=str(Path(config.volumes_path) / "recon")),
+    "AttackService"
+)
 
 # Create WorkflowResultProcessor to integrate workflows with recon/attack services
-workflow_result_processor = WorkflowResultProcessor(
-    recon_service=recon_service,
-    attack_service=attack_service
+workflow_result_processor = lazy(
+    lambda: WorkflowResultProcessor(
+        recon_service=recon_service,
+        attack_service=attack_service
+    ),
+    "WorkflowResultProcessor"
 )
 
-agent_service = AgentService(agents_dir=Path(config.get_agent_definitions_path()))
-workflow_v2_executor = WorkflowExecutor(
-    agent_runtime=agent_runtime,
-    agent_service=agent_service,
-    history_mcp_url=config.history_mcp_url
+agent_service = AgentService(
+    agents_dir=Path(config.get_agent_definitions_path()),
+    definitions=agent_definitions
 )
-workflow_v2_service = WorkflowV2Service(
-    workflows_dir=Path("workflows/v2"),
-    executor=workflow_v2_executor,
-    result_processor=workflow_result_processor
+workflow_v2_executor = lazy(
+    lambda: WorkflowExecutor(
+        agent_runtime=agent_runtime,
+        agent_service=agent_service,
+        history_mcp_url=config.history_mcp_url
+    ),
+    "WorkflowExecutor"
+)
+workflow_v2_service = lazy(
+    lambda: WorkflowV2Service(
+        workflows_dir=Path("workflows/v2"),
+        executor=workflow_v2_executor,
+        result_processor=workflow_result_processor,
+        agent_definitions=agent_definitions
+    ),
+    "WorkflowV2Service"
 )
 
 # Initialize workflow V2 service for dependency injection
 set_workflow_v2_service(workflow_v2_service)
+profiler.mark("workflow V2 services")
 
 
 # Initialize FeatureService early (before router mounting)
@@ -323,6 +390,14 @@ print(f"✅ LicenseService initialized: {license_service}")
 config_version_service = init_config_version_service("/configs")
 print(f"✅ ConfigVersionService initialized: {config_version_service}")
 
+# Shared across chat sessions so per-session locks and the context cache apply
+init_session_context_service(
+    Path(config.volumes_path) / "conversations",
+    max_context_items=5,
+    max_context_tokens=4000,
+)
+profiler.mark("feature, license and config services")
+
 # Mount API routers (PRD-99 refactoring)
 # Note: All routers either have prefixes defined or include full paths in their routes,
 # so we don't add prefixes here to avoid double-prefixing (e.g., /agents/agents).
@@ -347,6 +422,9 @@ app.include_router(settings.router)  # User settings at /api/settings (Phase 3.4
 # Red Team feature routers (conditionally enabled based on edition)
 if feature_service.is_enabled("red_team"):
     print("✅ Red Team features enabled - mounting red team routers")
+    from app.api import recon, dashboard, scanner, vulnerabilities  # Red Team Dashboard
+    from app.api import vulhub  # Vulhub container management
+    from app.api import attack_playground  # Attack Playground state management
     app.include_router(recon.router)  # Recon/Attack playground at /api/recon/*
     app.include_router(attack_playground.router)  # Attack playground sessions at /api/playground/*
     app.include_router(dashboard.router)  # Dashboard KPIs at /api/dashboard/*
@@ -356,11 +434,26 @@ if feature_service.is_enabled("red_team"):
 else:
     print("⚠️  Red Team features disabled - routers not mounted")
 
+profiler.mark("mount routers")
+
 
 # API Routes
 @app.on_event("startup")
 async def startup():
     """Startup tasks - Extracted to app/startup.py (Phase 5 refactoring)"""
+    profiler.mark("server boot")
+
+    # Deferred provider health check (lazy startup mode)
+    if lazy_startup_enabled() and ollama_client is not None:
+        app.state.ollama_health_task = asyncio.create_task(
+            asyncio.to_thread(check_ollama_health, ollama_client)
+        )
+
+    # Schedule triggers run in-process instead of one container per cron
+    if scheduler_enabled():
+        scheduler = init_scheduler_service(Path(config.volumes_path) / "state" / "schedules.json")
+        await scheduler.start()
+
     from app.startup import run_startup
     await run_startup(
         app=app,
@@ -373,12 +466,29 @@ async def startup():
         get_trigger_manager=get_trigger_manager,
         parse_registries_conf=parse_registries_conf,
     )
+    profiler.write_report()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop background services"""
+    scheduler = get_scheduler_service()
+    if scheduler is not None:
+        await scheduler.stop()
+    await registry_catalog_cache.aclose()
+    from app.services.workflow_postprocessing_service import get_post_processing_queue
+    await get_post_processing_queue().stop(drain_timeout=10)
 
 
 @app.get("/health")
 async def health():
-    """Health check"""
-    return {"status": "healthy", "service": "orchestrator"}
+    """Health check (includes startup progress while MCPs are still installing)"""
+    from app.startup import get_startup_progress
+    return {
+        "status": "healthy",
+        "service": "orchestrator",
+        "startup": get_startup_progress().to_dict(),
+    }
 
 
 @app.get("/debug/mcps")
@@ -494,9 +604,21 @@ def save_team_to_file(team_id: str, team_data: dict):
     save_data = {k: v for k, v in team_data.items() if k not in ["id", "file"]}
 
     file_path.write_text(json.dumps(save_data, indent=2))
+    team_definitions.invalidate(team_id)
     return file_path
 
 
+def find_team(team_id: Optional[str]) -> Optional[dict]:
+    """Look up a team definition by id from the in-memory index"""
+    if not team_id:
+        return None
+    team = team_definitions.get(team_id)
+    if team is not None:
+        # Chat endpoints always address teams by filename
+        team["id"] = team_id
+    return team
+
+
 # Execution persistence helpers (ADCL compliance - disk-first, no hidden state)
 def get_executions_dir():
     """Get the executions directory path"""
@@ -532,31 +654,15 @@ async def chat(msg: ChatMessage):
     """Chat with an agent team - can execute workflows based on intent"""
     import re
 
-    # Find team from disk
-    team = None
-    try:
-        teams_dir = get_teams_dir()
-        for file in teams_dir.glob("*.json"):
-            team_data = load_team_from_file(file)
-            if team_data["id"] == msg.team_id:
-                team = team_data
-                break
-    except Exception as e:
-        print(f"Error loading teams: {e}")
+    # Find team from the definition index
+    team = find_team(msg.team_id)
 
     # Handle model-only selection (no team or agent specified)
     if msg.model_id and not team and not msg.agent_id:
         print(f"🎯 HTTP Model-only mode: Direct chat with model {msg.model_id}")
         try:
-            # Get provider and client for the model
-            from app.agent_runtime import AgentRuntime
-            temp_runtime = AgentRuntime(
-                mcp_registry=registry,
-                anthropic_client=anthropic_client,
-                openai_client=openai_client,
-                ollama_client=ollama_client
-            )
-            provider, client = temp_runtime._get_client_for_model(msg.model_id)
+            # Get provider, shared client and cached model config for the model
+            provider, client, model_config = model_client_pool.get(msg.model_id)
 
             # Build messages from history
             messages = []
@@ -564,18 +670,6 @@ async def chat(msg: ChatMessage):
                 messages.append({"role": item["role"], "content": item["content"]})
             messages.append({"role": "user", "content": msg.message})
 
-            # Load full model config to get actual model_id and max_tokens
-            import yaml
-            from pathlib import Path
-            models_file = Path("/configs/models.yaml")
-            with open(models_file) as f:
-                models_data = yaml.safe_load(f)
-
-            # Find model config by ID
-            model_config = next((m for m in models_data["models"] if m["id"] == msg.model_id), None)
-            if not model_config:
-                raise ValueError(f"Model {msg.model_id} not found in config")
-
             max_tokens = model_config.get("max_tokens", 2048)
             actual_model_id = model_config.get("model_id", msg.model_id)
 
@@ -805,94 +899,18 @@ async def chat(msg: ChatMessage):
             conversation_history += f"{role}: {content}\n"
         conversation_history += "\n"
 
-    # If team has multiple agents, get input from each
+    # If team has multiple agents, get input from each (concurrently, in team order)
     if team and len(team.get("agents", [])) > 1:
-        team_responses = []
-
-        # Get response from each agent in the team
-        for agent in team["agents"]:
-            server = registry.get(agent["mcp_server"])
-            if not server:
-                team_responses.append(
-                    {
-                        "agent": agent["name"],
-                        "role": agent["role"],
-                        "response": f"⚠️ MCP server '{agent['mcp_server']}' not available",
-                    }
-                )
-                continue
-
-            # Build agent-specific prompt
-            agent_context = f"You are {agent['name']}, the {agent['role']} on the '{team['name']}' team.\n"
-            agent_context += f"Team description: {team['description']}\n"
-            agent_context += f"Your MCP server capabilities: {agent['mcp_server']}\n\n"
-
-            # Only agent MCP has think tool, others should describe their capabilities
-            if agent["mcp_server"] == "agent":
-                tool = "think"
-                prompt = f"{conversation_history}{agent_context}User message: {msg.message}\n\nProvide your analysis and recommendations."
-            else:
-                # For non-agent MCP servers, use agent to explain what this team member would do
-                server = registry.get("agent")
-                if not server:
-                    continue
-                tool = "think"
-                prompt = f"{conversation_history}{agent_context}User message: {msg.message}\n\nAs {agent['name']}, explain what you would do with your {agent['mcp_server']} capabilities to help with this request. Be specific about the tools/actions you would use."
-
-            try:
-                response = await engine.client.post(
-                    f"{server.endpoint}/mcp/call_tool",
-                    json={"tool": tool, "arguments": {"prompt": prompt}},
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                if data.get("isError"):
-                    team_responses.append(
-                        {
-                            "agent": agent["name"],
-                            "role": agent["role"],
-                            "response": f"⚠️ Error: {data['content'][0]['text']}",
-                        }
-                    )
-                else:
-                    result = data["content"][0]["text"]
-                    try:
-                        result_json = json.loads(result)
-                        team_responses.append(
-                            {
-                                "agent": agent["name"],
-                                "role": agent["role"],
-                                "response": result_json.get("reasoning", result),
-                            }
-                        )
-                    except (json.JSONDecodeError, TypeError, KeyError):
-                        # Use raw response if JSON parsing fails
-                        team_responses.append(
-                            {
-                                "agent": agent["name"],
-                                "role": agent["role"],
-                                "response": result,
-                            }
-                        )
-            except Exception as e:
-                team_responses.append(
-                    {
-                        "agent": agent["name"],
-                        "role": agent["role"],
-                        "response": f"⚠️ Error: {str(e)}",
-                    }
-                )
-
-        # Combine all team responses
-        combined_response = f"**{team['name']} Team Response:**\n\n"
-        for resp in team_responses:
-            combined_response += (
-                f"**{resp['agent']}** ({resp['role']}):\n{resp['response']}\n\n---\n\n"
-            )
+        team_responses = await gather_team_responses(
+            engine.client,
+            registry,
+            team,
+            msg.message,
+            conversation_history=conversation_history,
+        )
 
         return {
-            "response": combined_response,
+            "response": combine_team_responses(team, team_responses),
             "agent": team["name"],
             "team_responses": team_responses,
         }
@@ -987,17 +1005,8 @@ async def websocket_chat(websocket: WebSocket, session_id: str):
         print(f"\n💬 WebSocket chat for session {session_id}")
         print(f"   team: {team_id}, agent: {agent_id}, model: {model_id}")
 
-        # Find team from disk
-        team = None
-        try:
-            teams_dir = get_teams_dir()
-            for file in teams_dir.glob("*.json"):
-                team_data = load_team_from_file(file)
-                if team_data["id"] == team_id:
-                    team = team_data
-                    break
-        except Exception as e:
-            print(f"Error loading teams: {e}")
+        # Find team from the definition index
+        team = find_team(team_id)
 
         # Create callback to send updates
         async def send_update(update: dict):
@@ -1007,13 +1016,8 @@ async def websocket_chat(websocket: WebSocket, session_id: str):
         if model_id and not team and not agent_id:
             print(f"🎯 Model-only mode: Creating simple chat agent with model {model_id}")
             try:
-                # Initialize SessionContextService for conversation memory
-                from app.services.session_context_service import SessionContextService
-                context_service = SessionContextService(
-                    conversations_dir=Path(config.volumes_path) / "conversations",
-                    max_context_items=5,
-                    max_context_tokens=4000
-                )
+                # Shared SessionContextService for conversation memory
+                context_service = get_session_context_service()
 
                 # Load previous conversation context
                 session_context = await context_service.get_context(session_id)
@@ -1025,16 +1029,7 @@ async def websocket_chat(websocket: WebSocket, session_id: str):
                     context["conversation_history"] = context_text
                     print(f"📚 Loaded {session_context.get('total_items', 0)} previous execution(s)")
 
-                # Create a minimal agent definition for direct chat
-                from app.agent_runtime import AgentRuntime
-                agent_runtime = AgentRuntime(
-                    mcp_registry=registry,
-                    anthropic_client=anthropic_client,
-                    openai_client=openai_client,
-                    ollama_client=ollama_client
-                )
-
-                # Minimal agent definition - just the model
+                # Minimal agent definition - just the model, run on the shared runtime
                 simple_agent = {
                     "id": f"simple-chat-{model_id}",
                     "name": f"Chat with {model_id}",
@@ -1092,13 +1087,8 @@ async def websocket_chat(websocket: WebSocket, session_id: str):
         if team and "available_mcps" in team:
             # New team format: use team runtime with streaming
             try:
-                # Initialize SessionContextService for conversation memory
-                from app.services.session_context_service import SessionContextService
-                context_service = SessionContextService(
-                    conversations_dir=Path(config.volumes_path) / "conversations",
-                    max_context_items=5,
-                    max_context_tokens=4000
-                )
+                # Shared SessionContextService for conversation memory
+                context_service = get_session_context_service()
 
                 # Load previous conversation context from disk
                 session_context = await context_service.get_context(session_id)
@@ -1398,12 +1388,8 @@ async def websocket_workflow_execution(websocket: WebSocket, session_id: str):
         session_state = None
         if attack_playground_session_id:
             try:
-                from pathlib import Path
-                import json
-                session_file = Path("/app/volumes/data/attack_sessions") / f"{attack_playground_session_id}.json"
-                if session_file.exists():
-                    with open(session_file) as f:
-                        session_state = json.load(f)
+                from app.services.attack_session_service import AttackSessionService
+                session_state = AttackSessionService.load_session(attack_playground_session_id)
             except Exception as e:
                 print(f"⚠️  Failed to load session state: {e}")
 
@@ -1414,9 +1400,23 @@ async def websocket_workflow_execution(websocket: WebSocket, session_id: str):
             "final_result": final_result_serialized,
             "scan_id": result.scan_id,  # Tell UI which scan was created
             "cumulative_tokens": result.cumulative_tokens,  # Include token usage and cost
-            "session_state": session_state  # Include session state in response (no race condition)
+            "session_state": session_state,  # Session state before this run's updates
+            "post_processing": result.post_processing  # Scan/session updates still running
         })
 
+        # Scan creation and session updates finish in the background; follow up with their results
+        job = workflow_v2_service.post_processing.get(result.execution_id) if result.post_processing else None
+        if job:
+            await job.wait()
+            status = await workflow_v2_service.get_post_processing(result.execution_id)
+            await manager.send_update(session_id, {
+                "type": "post_processing_complete",
+                "execution_id": result.execution_id,
+                "scan_id": status["results"].get("scan"),
+                "session_state": status.get("session_state", session_state),
+                "post_processing": status
+            })
+
     except WebSocketDisconnect:
         manager.disconnect(session_id)
     except Exception as e:
@@ -1503,151 +1503,23 @@ async def list_registries():
     return parse_registries_conf()
 
 
-@app.get("/registries/catalog")
-async def get_all_catalogs():
-    """Get combined catalog from all enabled registries"""
-    registries = parse_registries_conf()
-    enabled_registries = [r for r in registries if r.get("enabled", True)]
-
-    combined_catalog = {"registries": [], "mcps": [], "teams": [], "triggers": []}
-
-    for registry in enabled_registries:
-        try:
-            # Handle file:// registries by scanning local directory
-            if registry['url'].startswith('file://'):
-                from pathlib import Path
-                import json
-
-                local_path = registry['url'].replace('file://', '')
-                if local_path.startswith('./') or local_path.startswith('../'):
-                    # Relative paths are resolved from application base directory
-                    base_dir = os.getenv('APP_BASE_DIR', '/app')
-                    directory = (Path(base_dir) / local_path).resolve()
-                else:
-                    directory = Path(local_path)
-
-                combined_catalog["registries"].append({
-                    "id": registry["id"],
-                    "name": registry["name"],
-                    "url": registry["url"],
-                    "available": True,
-                    "type": "local"
-                })
-
-                # Scan directory for mcp.json files
-                if directory.exists() and directory.is_dir():
-                    for item in directory.iterdir():
-                        if not item.is_dir():
-                            continue
-                        mcp_json = item / "mcp.json"
-                        if mcp_json.exists():
-                            try:
-                                with open(mcp_json) as f:
-                                    mcp_data = json.load(f)
-                                mcp_data["registry"] = registry["id"]
-                                mcp_data["registry_name"] = registry["name"]
-                                mcp_data["id"] = mcp_data.get("name")  # Use name as ID for local packages
-                                combined_catalog["mcps"].append(mcp_data)
-                            except Exception as e:
-                                print(f"Failed to load {mcp_json}: {e}")
-                continue
-
-            async with httpx.AsyncClient(
-                timeout=config.get_http_timeout_health_check()
-            ) as client:
-                response = await client.get(f"{registry['url']}/catalog")
-                response.raise_for_status()
-                catalog = response.json()
-
-                # Add registry info
-                combined_catalog["registries"].append(
-                    {
-                        "id": registry["id"],
-                        "name": registry["name"],
-                        "url": registry["url"],
-                        "available": True,
-                    }
-                )
-
-                # Add packages with registry source
-                for mcp in catalog.get("mcps", []):
-                    mcp["registry"] = registry["id"]
-                    mcp["registry_name"] = registry["name"]
-                    combined_catalog["mcps"].append(mcp)
-
-                for team in catalog.get("teams", []):
-                    team["registry"] = registry["id"]
-                    team["registry_name"] = registry["name"]
-                    combined_catalog["teams"].append(team)
-
-                for trigger in catalog.get("triggers", []):
-                    trigger["registry"] = registry["id"]
-                    trigger["registry_name"] = registry["name"]
-                    combined_catalog["triggers"].append(trigger)
-
-        except Exception as e:
-            print(
-                f"Failed to fetch catalog from {registry.get('name', 'unknown')}: {e}"
-            )
-            combined_catalog["registries"].append(
-                {
-                    "id": registry["id"],
-                    "name": registry.get("name", "Unknown"),
-                    "url": registry["url"],
-                    "available": False,
-                    "error": str(e),
-                }
-            )
-
-    # Also scan local agent-teams and triggers directories
-    from pathlib import Path
-    import json
-
-    # Scan agent-teams directory
-    teams_dir = Path("/app/agent-teams")
-    if teams_dir.exists() and teams_dir.is_dir():
-        for team_file in teams_dir.glob("*.json"):
-            try:
-                with open(team_file) as f:
-                    team_data = json.load(f)
-
-                # Return simplified structure for catalog listing to avoid React rendering errors
-                # Frontend can fetch full details separately if needed
-                team_summary = {
-                    "id": team_file.stem,
-                    "name": team_data.get("name", team_file.stem),
-                    "description": team_data.get("description", ""),
-                    "version": team_data.get("version", "1.0.0"),
-                    "tags": team_data.get("tags", []),
-                    "author": team_data.get("author", ""),
-                    "agent_count": len(team_data.get("agents", [])),
-                    "coordination_mode": team_data.get("coordination", {}).get("mode", "sequential"),
-                    "registry": "local",
-                    "registry_name": "Local Teams"
-                }
-                combined_catalog["teams"].append(team_summary)
-            except Exception as e:
-                print(f"Failed to load team {team_file}: {e}")
+# Combined catalog is served from memory and revalidated in the background
+registry_catalog_cache = RegistryCatalogCache(
+    load_registries=parse_registries_conf,
+    timeout=config.get_http_timeout_health_check(),
+    ttl=float(os.getenv("REGISTRY_CATALOG_TTL", "30")),
+    max_stale=float(os.getenv("REGISTRY_CATALOG_MAX_STALE", "600")),
+)
 
-    # Scan triggers directory
-    triggers_dir = Path("/app/triggers")
-    if triggers_dir.exists() and triggers_dir.is_dir():
-        for trigger_type_dir in triggers_dir.iterdir():
-            if not trigger_type_dir.is_dir():
-                continue
-            for trigger_file in trigger_type_dir.glob("*.json"):
-                try:
-                    with open(trigger_file) as f:
-                        trigger_data = json.load(f)
-                    trigger_data["id"] = trigger_file.stem
-                    trigger_data["type"] = trigger_type_dir.name
-                    trigger_data["registry"] = "local"
-                    trigger_data["registry_name"] = "Local Triggers"
-                    combined_catalog["triggers"].append(trigger_data)
-                except Exception as e:
-                    print(f"Failed to load trigger {trigger_file}: {e}")
 
-    return combined_catalog
+@app.get("/registries/catalog")
+async def get_all_catalogs(request: Request):
+    """Get combined catalog from all enabled registries"""
+    snapshot = await registry_catalog_cache.get()
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == snapshot.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
 
 
 @app.post("/registries/install/team/{team_id}")
@@ -1690,6 +1562,8 @@ async def install_team_from_registry(team_id: str, registry_id: Optional[str] =
                     if k not in ["id", "file", "registry", "registry_name"]
                 }
                 file_path.write_text(json.dumps(save_data, indent=2))
+                team_definitions.invalidate(team_id_normalized)
+                registry_catalog_cache.invalidate_local()
 
                 return {
                     "status": "installed",
@@ -1769,7 +1643,7 @@ async def install_mcp_from_registry(mcp_id: str, registry_id: Optional[str] = No
                     continue
 
                 # Install using MCP manager (builds and deploys Docker container)
-                result = get_mcp_manager().install(mcp_package)
+                result = await get_mcp_manager().install_async(mcp_package)
 
                 if result["status"] in ["installed", "already_installed"]:
                     # Register with orchestrator if newly installed
@@ -1791,7 +1665,7 @@ async def install_mcp_from_registry(mcp_id: str, registry_id: Optional[str] = No
                     mcp_package = response.json()
 
                     # Install using MCP manager (builds and deploys Docker container)
-                    result = get_mcp_manager().install(mcp_package)
+                    result = await get_mcp_manager().install_async(mcp_package)
 
                     if result["status"] in ["installed", "already_installed"]:
                         # Register with orchestrator if newly installed
@@ -1879,7 +1753,7 @@ async def update_mcp(mcp_name: str, registry_id: Optional[str] = None):
         raise HTTPException(status_code=404, detail="No enabled registries found")
 
     # Get current version
-    status = get_mcp_manager().get_status(mcp_name)
+    status = await get_mcp_manager().get_status_async(mcp_name)
     if status.get("status") == "not_installed":
         raise HTTPException(
             status_code=404, detail=f"MCP '{mcp_name}' is not installed"
@@ -1914,7 +1788,7 @@ async def update_mcp(mcp_name: str, registry_id: Optional[str] = None):
                 mcp_package = response.json()
 
                 # Update using MCP manager
-                result = get_mcp_manager().update(mcp_name, mcp_package)
+                result = await get_mcp_manager().update_async(mcp_name, mcp_package)
 
                 if result["status"] == "updated":
                     # Re-register with orchestrator
@@ -1966,6 +1840,7 @@ def save_agent_to_file(agent_id: str, agent_data: dict):
     save_data = {k: v for k, v in agent_data.items() if k not in ["file"]}
 
     file_path.write_text(json.dumps(save_data, indent=2))
+    agent_definitions.invalidate(agent_id)
     return file_path
 
 
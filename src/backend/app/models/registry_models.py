@@ -257,6 +257,7 @@ class InstallOptions(BaseModel):
     force: bool = False
     registry: Optional[str] = None  # Specific registry to use
     no_rollback: bool = False  # Disable automatic rollback on failure
+    max_parallel: int = Field(default=4, ge=1)  # Packages installed concurrently
 
 
 class DependencyConflict(BaseModel):
@@ -17,6 +17,7 @@ from typing import List, Dict, Any, Optional
 
 from app.core.errors import NotFoundError, ValidationError, ConflictError
 from app.core.logging import get_service_logger
+from app.services.definition_registry import DefinitionRegistry, get_definition_registry
 
 logger = get_service_logger("agent")
 
@@ -33,15 +34,17 @@ class AgentService:
     - Validate agent definitions
     """
 
-    def __init__(self, agents_dir: Path):
+    def __init__(self, agents_dir: Path, definitions: Optional[DefinitionRegistry] = None):
         """
         Initialize AgentService.
 
         Args:
             agents_dir: Directory containing agent JSON files
+            definitions: Agent definition index (defaults to the shared index for agents_dir)
         """
         self.agents_dir = agents_dir
         self.agents_dir.mkdir(parents=True, exist_ok=True)
+        self.definitions = definitions or get_definition_registry(agents_dir, "agent")
         logger.info(f"AgentService initialized with directory: {agents_dir}")
 
     async def list_agents(self) -> List[Dict[str, Any]]:
@@ -57,16 +60,9 @@ class AgentService:
             >>> len(agents)
             5
         """
-        agents = []
+        agents = self.definitions.list()
 
-        for file_path in self.agents_dir.glob("*.json"):
-            try:
-                agent = self._load_agent_from_file(file_path)
-                agents.append(agent)
-            except Exception as e:
-                logger.error(f"Failed to load agent from {file_path}: {e}")
-
-        logger.info(f"Loaded {len(agents)} agents from disk")
+        logger.info(f"Listed {len(agents)} agents")
         return agents
 
     async def get_agent(self, agent_id: str) -> Dict[str, Any]:
@@ -83,12 +79,11 @@ class AgentService:
             NotFoundError: If agent not found
         """
         self._validate_agent_id(agent_id)
-        file_path = self.agents_dir / f"{agent_id}.json"
 
-        if not file_path.exists():
+        agent = self.definitions.get(agent_id)
+        if agent is None:
             raise NotFoundError("Agent", agent_id)
 
-        agent = self._load_agent_from_file(file_path)
         logger.info(f"Retrieved agent: {agent_id}")
         return agent
 
@@ -190,6 +185,7 @@ class AgentService:
             raise NotFoundError("Agent", agent_id)
 
         file_path.unlink()
+        self.definitions.invalidate(agent_id)
 
         logger.info(f"Deleted agent: {agent_id}")
         return {"status": "deleted", "id": agent_id}
@@ -241,30 +237,6 @@ class AgentService:
                 field="agent_id"
             )
 
-    def _load_agent_from_file(self, file_path: Path) -> Dict[str, Any]:
-        """
-        Load an agent from a JSON file.
-
-        Args:
-            file_path: Path to agent JSON file
-
-        Returns:
-            Agent definition
-
-        Raises:
-            JSONDecodeError: If file is not valid JSON
-        """
-        agent_data = json.loads(file_path.read_text())
-
-        # Use filename (without .json) as ID if not present
-        if "id" not in agent_data:
-            agent_data["id"] = file_path.stem
-
-        # Add file metadata
-        agent_data["file"] = file_path.name
-
-        return agent_data
-
     def _save_agent_to_file(
         self, agent_id: str, agent_data: Dict[str, Any]
     ) -> Path:
@@ -286,6 +258,7 @@ class AgentService:
         }
 
         file_path.write_text(json.dumps(save_data, indent=2))
+        self.definitions.invalidate(agent_id)
         return file_path
 
     def _slugify_agent_id(self, name: str) -> str:
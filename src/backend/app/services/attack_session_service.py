@@ -8,16 +8,243 @@
 Attack Session Service - Automatic State Management
 Listens to workflow completion events and automatically updates session state.
 Backend reads execution results and enriches host data.
+
+Session state lives in a SQLite database keyed by (session_id, ip), so host
+lookups and merges touch one row instead of rewriting the whole session.
+Legacy per-session JSON files are imported on first open.
 """
 from pathlib import Path
 import json
 import re
+import sqlite3
+import threading
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 SESSIONS_DIR = Path("/app/volumes/data/attack_sessions")
 SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS hosts (
+    session_id TEXT NOT NULL,
+    ip TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, ip)
+);
+CREATE INDEX IF NOT EXISTS idx_hosts_ip ON hosts (ip);
+"""
+
+
+class AttackSessionStore:
+    """
+    IP-keyed host store for attack playground sessions.
+
+    Hosts keep their insertion order (SQLite rowid), so sessions read back
+    exactly as the old JSON ``hosts`` list did. Every write is a single
+    transaction, so a crash never leaves a half-written session.
+    """
+
+    def __init__(self, db_path: Path, legacy_dir: Optional[Path] = None):
+        """
+        Open (or create) the store.
+
+        Args:
+            db_path: SQLite database file
+            legacy_dir: Directory of legacy ``<session_id>.json`` files to
+                import; imported files are renamed to ``.json.migrated``
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+        if legacy_dir is not None:
+            self._import_legacy(Path(legacy_dir))
+
+    def _transaction(self):
+        return _Transaction(self._db, self._lock)
+
+    def _import_legacy(self, legacy_dir: Path):
+        for session_file in sorted(legacy_dir.glob("*.json")):
+            try:
+                session = json.loads(session_file.read_text())
+                if self.session_exists(session.get("session_id", session_file.stem)):
+                    continue
+                session.setdefault("session_id", session_file.stem)
+                self.replace_session(session)
+                session_file.rename(session_file.with_name(session_file.name + ".migrated"))
+                print(f"✅ Imported attack session {session['session_id']} ({len(session.get('hosts', []))} hosts)")
+            except Exception as e:
+                print(f"⚠️  Failed to import attack session {session_file.name}: {e}")
+
+    @staticmethod
+    def _ensure_session(db: sqlite3.Connection, session_id: str):
+        db.execute(
+            "INSERT OR IGNORE INTO sessions (session_id, created_at) VALUES (?, ?)",
+            (session_id, datetime.utcnow().isoformat())
+        )
+
+    def session_exists(self, session_id: str) -> bool:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row is not None
+
+    def load_session(self, session_id: str, create: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Session dict in the legacy JSON shape (hosts in insertion order).
+
+        Args:
+            session_id: Attack playground session ID
+            create: Create an empty session if it does not exist
+
+        Returns:
+            Session dict, or None if it does not exist and create is False
+        """
+        with self._transaction() as db:
+            if create:
+                self._ensure_session(db, session_id)
+            row = db.execute(
+                "SELECT created_at, data FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            hosts = [
+                json.loads(data) for (data,) in db.execute(
+                    "SELECT data FROM hosts WHERE session_id = ? ORDER BY rowid", (session_id,)
+                )
+            ]
+        return {"session_id": session_id, "created_at": row[0], **json.loads(row[1]), "hosts": hosts}
+
+    def replace_session(self, session: Dict[str, Any]):
+        """Replace a whole session (metadata and host list) in one transaction"""
+        session_id = session["session_id"]
+        extra = {k: v for k, v in session.items() if k not in ("session_id", "created_at", "hosts")}
+        with self._transaction() as db:
+            db.execute(
+                "INSERT INTO sessions (session_id, created_at, data) VALUES (?, ?, ?) "
+                "ON CONFLICT (session_id) DO UPDATE SET created_at = excluded.created_at, data = excluded.data",
+                (session_id, session.get("created_at") or datetime.utcnow().isoformat(), json.dumps(extra))
+            )
+            db.execute("DELETE FROM hosts WHERE session_id = ?", (session_id,))
+            # The first entry for an IP is the one lookups and merges always used
+            db.executemany(
+                "INSERT OR IGNORE INTO hosts (session_id, ip, data) VALUES (?, ?, ?)",
+                [
+                    (session_id, host["ip"], json.dumps(host))
+                    for host in session.get("hosts", []) if host.get("ip")
+                ]
+            )
+
+    def get_host(self, session_id: str, ip: str) -> Optional[Dict[str, Any]]:
+        """Host dict for an IP, or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM hosts WHERE session_id = ? AND ip = ?", (session_id, ip)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def merge_host(self, session_id: str, ip: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge update_data into a host (creating session and host as needed).
+
+        Existing hosts become ``{**host, **update_data, "updated_at": now}``;
+        new hosts ``{"ip": ip, **update_data, "added_at": now}``.
+
+        Returns:
+            The merged host dict
+        """
+        now = datetime.utcnow().isoformat()
+        with self._transaction() as db:
+            self._ensure_session(db, session_id)
+            row = db.execute(
+                "SELECT data FROM hosts WHERE session_id = ? AND ip = ?", (session_id, ip)
+            ).fetchone()
+            if row:
+                host = {**json.loads(row[0]), **update_data, "updated_at": now}
+                db.execute(
+                    "UPDATE hosts SET data = ? WHERE session_id = ? AND ip = ?",
+                    (json.dumps(host), session_id, ip)
+                )
+            else:
+                host = {"ip": ip, **update_data, "added_at": now}
+                db.execute(
+                    "INSERT INTO hosts (session_id, ip, data) VALUES (?, ?, ?)",
+                    (session_id, ip, json.dumps(host))
+                )
+        return host
+
+    def remove_host_everywhere(self, ip: str) -> int:
+        """
+        Remove an IP from every session.
+
+        Returns:
+            Number of sessions the IP was removed from
+        """
+        with self._transaction() as db:
+            return db.execute("DELETE FROM hosts WHERE ip = ?", (ip,)).rowcount
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK under the store lock"""
+
+    def __init__(self, db: sqlite3.Connection, lock: threading.Lock):
+        self._db = db
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._db.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self._lock.release()
+            raise
+        return self._db
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._db.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+        return False
+
+
+_store_instance: Optional[AttackSessionStore] = None
+_store_init_lock = threading.Lock()
+
+
+def get_attack_session_store() -> AttackSessionStore:
+    """Get the shared store (opened on first use in SESSIONS_DIR)"""
+    global _store_instance
+    if _store_instance is None:
+        with _store_init_lock:
+            if _store_instance is None:
+                _store_instance = AttackSessionStore(SESSIONS_DIR / "attack_sessions.db", legacy_dir=SESSIONS_DIR)
+    return _store_instance
+
+
+def init_attack_session_store(db_path: Path, legacy_dir: Optional[Path] = None) -> AttackSessionStore:
+    """Open the shared store at a specific path (replacing any open store)"""
+    global _store_instance
+    with _store_init_lock:
+        if _store_instance is not None:
+            _store_instance.close()
+        _store_instance = AttackSessionStore(db_path, legacy_dir=legacy_dir)
+    return _store_instance
+
 
 class AttackSessionService:
     """Manages attack playground session state (backend is source of truth)"""
@@ -165,26 +392,22 @@ class AttackSessionService:
     @staticmethod
     def get_or_create_session(session_id: str) -> Dict[str, Any]:
         """Load session or create new one"""
-        session_file = SESSIONS_DIR / f"{session_id}.json"
+        return get_attack_session_store().load_session(session_id, create=True)
 
-        if session_file.exists():
-            with open(session_file) as f:
-                return json.load(f)
-
-        # Create new session
-        session = {
-            "session_id": session_id,
-            "created_at": datetime.utcnow().isoformat(),
-            "hosts": []
-        }
-        session_file.write_text(json.dumps(session, indent=2))
-        return session
+    @staticmethod
+    def load_session(session_id: str) -> Optional[Dict[str, Any]]:
+        """Load session, or None if it does not exist"""
+        return get_attack_session_store().load_session(session_id)
 
     @staticmethod
     def save_session(session: Dict[str, Any]):
-        """Save session to disk"""
-        session_file = SESSIONS_DIR / f"{session['session_id']}.json"
-        session_file.write_text(json.dumps(session, indent=2))
+        """Save session to disk (replaces the whole host list)"""
+        get_attack_session_store().replace_session(session)
+
+    @staticmethod
+    def remove_host_from_all_sessions(host_ip: str) -> int:
+        """Remove a host from every session, returning how many sessions had it"""
+        return get_attack_session_store().remove_host_everywhere(host_ip)
 
     @staticmethod
     def get_host_from_session(session_id: str, target_ip: str) -> Optional[Dict[str, Any]]:
@@ -199,21 +422,16 @@ class AttackSessionService:
             Host dict with services/vulnerabilities/ports, or None if not found
         """
         try:
-            session_file = SESSIONS_DIR / f"{session_id}.json"
-            if not session_file.exists():
-                print(f"Session file not found: {session_id}")
-                return None
-
-            with open(session_file) as f:
-                session = json.load(f)
-
-            # Find host matching target IP
-            for host in session.get("hosts", []):
-                if host.get("ip") == target_ip:
-                    print(f"Found host data for {target_ip} in session {session_id}")
-                    return host
-
-            print(f"No host found for {target_ip} in session {session_id}")
+            store = get_attack_session_store()
+            host = store.get_host(session_id, target_ip)
+            if host is not None:
+                print(f"Found host data for {target_ip} in session {session_id}")
+                return host
+
+            if not store.session_exists(session_id):
+                print(f"Session not found: {session_id}")
+            else:
+                print(f"No host found for {target_ip} in session {session_id}")
             return None
 
         except Exception as e:
@@ -221,34 +439,9 @@ class AttackSessionService:
             return None
 
     @staticmethod
-    def update_host_in_session(session_id: str, host_ip: str, update_data: Dict[str, Any]):
-        """Update host data in session (merge strategy)"""
-        session = AttackSessionService.get_or_create_session(session_id)
-
-        # Find existing host
-        host_idx = None
-        for idx, host in enumerate(session["hosts"]):
-            if host["ip"] == host_ip:
-                host_idx = idx
-                break
-
-        if host_idx is not None:
-            # Merge with existing host
-            session["hosts"][host_idx] = {
-                **session["hosts"][host_idx],
-                **update_data,
-                "updated_at": datetime.utcnow().isoformat()
-            }
-        else:
-            # Add new host
-            session["hosts"].append({
-                "ip": host_ip,
-                **update_data,
-                "added_at": datetime.utcnow().isoformat()
-            })
-
-        AttackSessionService.save_session(session)
-        return session
+    def update_host_in_session(session_id: str, host_ip: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Update host data in session (merge strategy), returning the merged host"""
+        return get_attack_session_store().merge_host(session_id, host_ip, update_data)
 
     @staticmethod
     def on_workflow_complete(session_id: str, workflow_id: str, target: str, execution_result: Dict[str, Any]):
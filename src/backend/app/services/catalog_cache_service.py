@@ -0,0 +1,404 @@
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Catalog Cache Service - Combined registry catalog served from memory.
+
+Single responsibility: Keep the combined /registries/catalog response warm.
+Follows ADCL principle: Registries are the source of truth, memory is a cache.
+
+- Fresh for `ttl` seconds; after that the cached catalog is still served
+  while one background refresh runs (stale-while-revalidate)
+- Past `max_stale` seconds, or when registries.conf changes, requests wait
+  for the refresh instead
+- Registries are fetched concurrently over one pooled HTTP client; each
+  goes through RegistryFailoverManager so a failing registry trips its own
+  circuit breaker and keeps serving its last good packages
+- Local agent-teams/triggers are re-read only when their files change
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.logging import get_service_logger
+from app.models.registry_models import RegistryConfig
+from app.services.registry.failover import FailoverConfig, RegistryFailoverManager
+
+logger = get_service_logger("catalog_cache")
+
+DEFAULT_TTL = 30.0
+DEFAULT_MAX_STALE = 600.0
+# Minimum seconds between stat scans of the local teams/triggers directories
+LOCAL_POLL_INTERVAL = 2.0
+
+
+@dataclass
+class RegistryCatalog:
+    """Last fetched catalog of one registry"""
+    entry: Dict[str, Any]
+    mcps: List[Dict[str, Any]] = field(default_factory=list)
+    teams: List[Dict[str, Any]] = field(default_factory=list)
+    triggers: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Serialized combined catalog"""
+    body: bytes
+    etag: str
+    built_at: float
+
+
+class RegistryCatalogCache:
+    """TTL + stale-while-revalidate cache of the combined registry catalog"""
+
+    def __init__(
+        self,
+        load_registries: Callable[[], List[Dict[str, Any]]],
+        timeout: float,
+        ttl: float = DEFAULT_TTL,
+        max_stale: float = DEFAULT_MAX_STALE,
+        teams_dir: Path = Path("/app/agent-teams"),
+        triggers_dir: Path = Path("/app/triggers"),
+        failover_manager: Optional[RegistryFailoverManager] = None,
+    ):
+        """
+        Initialize catalog cache.
+
+        Args:
+            load_registries: Returns registries.conf entries (id, name, url, enabled)
+            timeout: Per-request timeout for HTTP registries
+            ttl: Seconds a catalog is served without revalidation
+            max_stale: Seconds after which a stale catalog is no longer served
+            teams_dir: Local agent-teams directory
+            triggers_dir: Local triggers directory
+            failover_manager: Health tracking / circuit breakers per registry
+        """
+        self.load_registries = load_registries
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.teams_dir = teams_dir
+        self.triggers_dir = triggers_dir
+        self.failover_manager = failover_manager or RegistryFailoverManager(
+            FailoverConfig(max_retries=1, retry_delay=0.5, timeout=timeout)
+        )
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._registries_key: Optional[str] = None
+        self._registry_catalogs: Dict[str, RegistryCatalog] = {}
+        self._local: Tuple[List[Dict[str, Any]], List[Dict[str, Any]]] = ([], [])
+        self._local_signature: Optional[tuple] = None
+        self._local_checked = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client shared by all registry fetches"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
+
+    async def get(self) -> CatalogSnapshot:
+        """
+        Get the combined catalog.
+
+        Returns:
+            Snapshot served from memory whenever possible
+        """
+        registries = self._enabled_registries()
+        registries_key = json.dumps(registries, sort_keys=True)
+
+        snapshot = self._snapshot
+        if snapshot is None or registries_key != self._registries_key:
+            return await self.refresh(registries)
+
+        age = time.monotonic() - snapshot.built_at
+        if age > self.max_stale:
+            return await self.refresh(registries)
+        if age > self.ttl:
+            self._refresh_in_background(registries)
+        if self._local_changed():
+            await asyncio.to_thread(self._scan_local)
+            # Registries were not re-fetched, so the TTL keeps counting
+            self._build_snapshot(built_at=snapshot.built_at)
+
+        return self._snapshot
+
+    async def refresh(self, registries: Optional[List[Dict[str, Any]]] = None) -> CatalogSnapshot:
+        """
+        Refresh every registry now (joins a refresh already in flight).
+
+        Returns:
+            New snapshot
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(
+                self._refresh(registries or self._enabled_registries())
+            )
+        return await asyncio.shield(self._refresh_task)
+
+    def invalidate_local(self):
+        """Re-read local teams/triggers on the next request"""
+        self._local_signature = None
+        self._local_checked = 0.0
+
+    async def aclose(self):
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # Private helper methods
+
+    def _enabled_registries(self) -> List[Dict[str, Any]]:
+        return [r for r in self.load_registries() if r.get("enabled", True)]
+
+    def _refresh_in_background(self, registries: List[Dict[str, Any]]):
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._refresh(registries))
+        self._refresh_task.add_done_callback(self._log_background_failure)
+
+    @staticmethod
+    def _log_background_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background catalog refresh failed: {task.exception()}")
+
+    async def _refresh(self, registries: List[Dict[str, Any]]) -> CatalogSnapshot:
+        """Fetch all registries concurrently and rebuild the snapshot"""
+        started = time.monotonic()
+        await asyncio.gather(
+            *(self._refresh_registry(registry) for registry in registries),
+            asyncio.to_thread(self._scan_local),
+        )
+
+        ids = [registry["id"] for registry in registries]
+        self._registry_catalogs = {
+            registry_id: self._registry_catalogs[registry_id]
+            for registry_id in ids
+            if registry_id in self._registry_catalogs
+        }
+        self._registries_key = json.dumps(registries, sort_keys=True)
+        snapshot = self._build_snapshot()
+        logger.info(
+            f"Registry catalog refreshed from {len(registries)} registries "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+        return snapshot
+
+    async def _refresh_registry(self, registry: Dict[str, Any]):
+        """Refresh one registry, keeping its previous packages on failure"""
+        registry_id = registry["id"]
+        try:
+            if registry["url"].startswith("file://"):
+                catalog = await asyncio.to_thread(self._scan_file_registry, registry)
+            else:
+                catalog = await self._fetch_http_registry(registry)
+            self._registry_catalogs[registry_id] = catalog
+        except Exception as e:
+            logger.warning(f"Failed to fetch catalog from {registry.get('name', 'unknown')}: {e}")
+            previous = self._registry_catalogs.get(registry_id)
+            entry = {
+                "id": registry_id,
+                "name": registry.get("name", "Unknown"),
+                "url": registry["url"],
+                "available": False,
+                "error": str(e),
+            }
+            if previous is not None and previous.entry.get("url") == registry["url"]:
+                entry["stale"] = True
+                self._registry_catalogs[registry_id] = RegistryCatalog(
+                    entry, previous.mcps, previous.teams, previous.triggers
+                )
+            else:
+                self._registry_catalogs[registry_id] = RegistryCatalog(entry)
+
+    async def _fetch_http_registry(self, registry: Dict[str, Any]) -> RegistryCatalog:
+        """Fetch an HTTP registry catalog through the failover manager"""
+        registry_id = registry["id"]
+        if self.failover_manager.is_circuit_breaker_open(registry_id):
+            raise Exception("circuit breaker open")
+
+        async def fetch(_config: RegistryConfig):
+            response = await self.client.get(f"{registry['url']}/catalog")
+            response.raise_for_status()
+            return response.json()
+
+        config = RegistryConfig(
+            name=registry_id,
+            display_name=registry.get("name", registry_id),
+            url=registry["url"],
+        )
+        try:
+            catalog = await self.failover_manager.execute_with_retry(fetch, config, "catalog")
+        except Exception:
+            health = self.failover_manager.get_registry_health(registry_id)
+            if health.consecutive_failures >= self.failover_manager.config.circuit_breaker_threshold:
+                self.failover_manager.open_circuit_breaker(registry_id)
+            raise
+
+        source = {"registry": registry_id, "registry_name": registry["name"]}
+        return RegistryCatalog(
+            entry={
+                "id": registry_id,
+                "name": registry["name"],
+                "url": registry["url"],
+                "available": True,
+            },
+            mcps=[{**mcp, **source} for mcp in catalog.get("mcps", [])],
+            teams=[{**team, **source} for team in catalog.get("teams", [])],
+            triggers=[{**trigger, **source} for trigger in catalog.get("triggers", [])],
+        )
+
+    def _scan_file_registry(self, registry: Dict[str, Any]) -> RegistryCatalog:
+        """Scan a file:// registry directory for mcp.json files"""
+        local_path = registry['url'].replace('file://', '')
+        if local_path.startswith('./') or local_path.startswith('../'):
+            # Relative paths are resolved from application base directory
+            base_dir = os.getenv('APP_BASE_DIR', '/app')
+            directory = (Path(base_dir) / local_path).resolve()
+        else:
+            directory = Path(local_path)
+
+        mcps = []
+        if directory.exists() and directory.is_dir():
+            for item in directory.iterdir():
+                if not item.is_dir():
+                    continue
+                mcp_json = item / "mcp.json"
+                if mcp_json.exists():
+                    try:
+                        with open(mcp_json) as f:
+                            mcp_data = json.load(f)
+                        mcp_data["registry"] = registry["id"]
+                        mcp_data["registry_name"] = registry["name"]
+                        mcp_data["id"] = mcp_data.get("name")  # Use name as ID for local packages
+                        mcps.append(mcp_data)
+                    except Exception as e:
+                        logger.warning(f"Failed to load {mcp_json}: {e}")
+
+        return RegistryCatalog(
+            entry={
+                "id": registry["id"],
+                "name": registry["name"],
+                "url": registry["url"],
+                "available": True,
+                "type": "local"
+            },
+            mcps=mcps,
+        )
+
+    def _local_files(self) -> List[Tuple[str, int, int]]:
+        """(path, mtime_ns, size) of every local team/trigger definition"""
+        files = []
+        try:
+            with os.scandir(self.teams_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        st = entry.stat()
+                        files.append((entry.path, st.st_mtime_ns, st.st_size))
+        except OSError:
+            pass
+        try:
+            with os.scandir(self.triggers_dir) as type_dirs:
+                for type_dir in type_dirs:
+                    if not type_dir.is_dir():
+                        continue
+                    with os.scandir(type_dir.path) as it:
+                        for entry in it:
+                            if entry.name.endswith(".json") and entry.is_file():
+                                st = entry.stat()
+                                files.append((entry.path, st.st_mtime_ns, st.st_size))
+        except OSError:
+            pass
+        return sorted(files)
+
+    def _local_changed(self) -> bool:
+        """Throttled check whether local teams/triggers changed since the last scan"""
+        now = time.monotonic()
+        if now - self._local_checked < LOCAL_POLL_INTERVAL:
+            return False
+        self._local_checked = now
+        return tuple(self._local_files()) != self._local_signature
+
+    def _scan_local(self):
+        """Read local agent-teams and triggers directories"""
+        signature = tuple(self._local_files())
+        teams = []
+        triggers = []
+
+        for path, _, _ in signature:
+            file_path = Path(path)
+            try:
+                with open(file_path) as f:
+                    data = json.load(f)
+            except Exception as e:
+                logger.warning(f"Failed to load {file_path}: {e}")
+                continue
+
+            if file_path.parent == self.teams_dir:
+                # Return simplified structure for catalog listing to avoid React rendering errors
+                # Frontend can fetch full details separately if needed
+                teams.append({
+                    "id": file_path.stem,
+                    "name": data.get("name", file_path.stem),
+                    "description": data.get("description", ""),
+                    "version": data.get("version", "1.0.0"),
+                    "tags": data.get("tags", []),
+                    "author": data.get("author", ""),
+                    "agent_count": len(data.get("agents", [])),
+                    "coordination_mode": data.get("coordination", {}).get("mode", "sequential"),
+                    "registry": "local",
+                    "registry_name": "Local Teams"
+                })
+            else:
+                data["id"] = file_path.stem
+                data["type"] = file_path.parent.name
+                data["registry"] = "local"
+                data["registry_name"] = "Local Triggers"
+                triggers.append(data)
+
+        self._local = (teams, triggers)
+        self._local_signature = signature
+        self._local_checked = time.monotonic()
+
+    def _build_snapshot(self, built_at: Optional[float] = None) -> CatalogSnapshot:
+        """
+        Serialize the combined catalog and compute its ETag.
+
+        Args:
+            built_at: Time the registry data was fetched (defaults to now)
+        """
+        combined_catalog = {"registries": [], "mcps": [], "teams": [], "triggers": []}
+        for catalog in self._registry_catalogs.values():
+            combined_catalog["registries"].append(catalog.entry)
+            combined_catalog["mcps"].extend(catalog.mcps)
+            combined_catalog["teams"].extend(catalog.teams)
+            combined_catalog["triggers"].extend(catalog.triggers)
+
+        local_teams, local_triggers = self._local
+        combined_catalog["teams"].extend(local_teams)
+        combined_catalog["triggers"].extend(local_triggers)
+
+        body = json.dumps(combined_catalog, separators=(",", ":")).encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+        self._snapshot = CatalogSnapshot(
+            body=body,
+            etag=etag,
+            built_at=time.monotonic() if built_at is None else built_at
+        )
+        return self._snapshot
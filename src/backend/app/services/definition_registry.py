@@ -0,0 +1,277 @@
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Definition Registry - In-memory index of team/agent definitions.
+
+Single responsibility: Keep a validated, id-keyed view of a directory of
+JSON definitions current without re-reading it on every lookup.
+Follows ADCL principle: Disk is the source of truth, memory is a cache.
+
+Files are parsed once and re-parsed only when their (mtime, size) changes.
+Staleness is detected by a throttled os.scandir() of the directory, so
+lookups between polls are plain dict reads.
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.logging import get_service_logger
+
+logger = get_service_logger("definitions")
+
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+def validate_team_definition(data: Dict[str, Any]) -> None:
+    """
+    Validate a team definition loaded from disk.
+
+    Raises:
+        ValueError: If the definition is malformed
+    """
+    if not isinstance(data.get("name"), str) or not data["name"]:
+        raise ValueError("team 'name' must be a non-empty string")
+    if not isinstance(data.get("agents", []), list):
+        raise ValueError("team 'agents' must be a list")
+    if not isinstance(data.get("available_mcps", []), list):
+        raise ValueError("team 'available_mcps' must be a list")
+
+
+def validate_agent_definition(data: Dict[str, Any]) -> None:
+    """
+    Validate an agent definition loaded from disk.
+
+    Raises:
+        ValueError: If the definition is malformed
+    """
+    if not isinstance(data.get("name"), str) or not data["name"]:
+        raise ValueError("agent 'name' must be a non-empty string")
+    if not isinstance(data.get("available_mcps", []), list):
+        raise ValueError("agent 'available_mcps' must be a list")
+    if not isinstance(data.get("model_config", {}), dict):
+        raise ValueError("agent 'model_config' must be an object")
+
+
+_VALIDATORS: Dict[str, Callable[[Dict[str, Any]], None]] = {
+    "team": validate_team_definition,
+    "agent": validate_agent_definition,
+}
+
+
+class DefinitionRegistry:
+    """
+    Id-keyed in-memory index over a directory of ``<id>.json`` definitions.
+
+    Usage:
+        teams = get_definition_registry(Path("agent-teams"), "team")
+        team = teams.get("code-review-team")   # dict lookup, no disk I/O
+
+    Writers should call ``invalidate(definition_id)`` after changing a file
+    so the change is visible immediately instead of on the next poll.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        kind: str,
+        validator: Optional[Callable[[Dict[str, Any]], None]] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        """
+        Initialize DefinitionRegistry.
+
+        Args:
+            directory: Directory containing definition JSON files
+            kind: Definition kind used in log messages ("team", "agent")
+            validator: Callable raising ValueError for invalid definitions
+            poll_interval: Minimum seconds between directory stat scans
+        """
+        self.directory = directory
+        self.kind = kind
+        self.validator = validator or _VALIDATORS.get(kind)
+        self.poll_interval = poll_interval
+
+        # id -> parsed definition; replaced wholesale on refresh so readers
+        # never observe a half-built index
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # id -> (mtime_ns, size) of the file the entry was parsed from
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        # id -> (mtime_ns, size) of files that failed to load, so they are
+        # not re-parsed on every poll
+        self._rejected: Dict[str, Tuple[int, int]] = {}
+        self._last_poll = 0.0
+        self._lock = threading.Lock()
+
+        self.reload()
+
+    def get(self, definition_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a definition by id.
+
+        Returns:
+            A copy of the definition, or None if unknown or invalid
+        """
+        self._refresh_if_stale()
+        entry = self._entries.get(definition_id)
+        return copy.deepcopy(entry) if entry is not None else None
+
+    def list(self) -> List[Dict[str, Any]]:
+        """List copies of all valid definitions."""
+        self._refresh_if_stale()
+        return [copy.deepcopy(entry) for entry in self._entries.values()]
+
+    def ids(self) -> List[str]:
+        """List ids of all valid definitions."""
+        self._refresh_if_stale()
+        return list(self._entries.keys())
+
+    def __contains__(self, definition_id: str) -> bool:
+        self._refresh_if_stale()
+        return definition_id in self._entries
+
+    def __len__(self) -> int:
+        self._refresh_if_stale()
+        return len(self._entries)
+
+    def reload(self) -> None:
+        """Rescan the directory now, re-parsing only changed files."""
+        with self._lock:
+            self._scan()
+
+    def invalidate(self, definition_id: Optional[str] = None) -> None:
+        """
+        Force a definition (or the whole directory) to be re-read.
+
+        Args:
+            definition_id: Id whose file changed; None rescans everything
+        """
+        with self._lock:
+            if definition_id is None:
+                self._stats = {}
+                self._rejected = {}
+            else:
+                self._stats.pop(definition_id, None)
+                self._rejected.pop(definition_id, None)
+            self._scan()
+
+    # Private helper methods
+
+    def _refresh_if_stale(self) -> None:
+        """Rescan the directory if the poll interval has elapsed."""
+        if time.monotonic() - self._last_poll < self.poll_interval:
+            return
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            if time.monotonic() - self._last_poll >= self.poll_interval:
+                self._scan()
+
+    def _scan(self) -> None:
+        """Stat every definition file and re-parse the ones that changed."""
+        current: Dict[str, Tuple[int, int, str]] = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(".json") or not entry.is_file():
+                        continue
+                    st = entry.stat()
+                    current[entry.name[:-5]] = (st.st_mtime_ns, st.st_size, entry.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Failed to scan {self.kind} definitions in {self.directory}: {e}")
+            self._last_poll = time.monotonic()
+            return
+
+        entries = dict(self._entries)
+        stats = dict(self._stats)
+        changed = 0
+
+        for definition_id in list(entries):
+            if definition_id not in current:
+                entries.pop(definition_id)
+                stats.pop(definition_id, None)
+                changed += 1
+        for definition_id in list(self._rejected):
+            if definition_id not in current:
+                self._rejected.pop(definition_id)
+
+        for definition_id, (mtime_ns, size, path) in current.items():
+            stat_key = (mtime_ns, size)
+            if stats.get(definition_id) == stat_key or self._rejected.get(definition_id) == stat_key:
+                continue
+            try:
+                data = self._load(Path(path))
+            except Exception as e:
+                logger.error(f"Failed to load {self.kind} from {path}: {e}")
+                entries.pop(definition_id, None)
+                stats.pop(definition_id, None)
+                self._rejected[definition_id] = stat_key
+                changed += 1
+                continue
+            entries[definition_id] = data
+            stats[definition_id] = stat_key
+            self._rejected.pop(definition_id, None)
+            changed += 1
+
+        self._entries = entries
+        self._stats = stats
+        self._last_poll = time.monotonic()
+        if changed:
+            logger.info(f"Indexed {len(entries)} {self.kind} definitions ({changed} changed)")
+
+    def _load(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Parse and validate a definition file.
+
+        Raises:
+            JSONDecodeError: If file is not valid JSON
+            ValueError: If the definition fails validation
+        """
+        data = json.loads(file_path.read_text())
+        if not isinstance(data, dict):
+            raise ValueError(f"{self.kind} definition must be a JSON object")
+        if self.validator:
+            self.validator(data)
+
+        # Use filename (without .json) as ID if not present
+        if "id" not in data:
+            data["id"] = file_path.stem
+
+        # Add file metadata
+        data["file"] = file_path.name
+        return data
+
+
+# Registries are shared per (kind, directory) so every service constructed
+# for the same directory reads from the same index
+_registries: Dict[Tuple[str, str], DefinitionRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_definition_registry(directory: Path, kind: str) -> DefinitionRegistry:
+    """
+    Get the shared DefinitionRegistry for a directory.
+
+    Args:
+        directory: Directory containing definition JSON files
+        kind: Definition kind ("team" or "agent")
+
+    Returns:
+        DefinitionRegistry shared by all callers using the same directory
+    """
+    key = (kind, str(Path(directory).resolve()))
+    with _registries_lock:
+        definitions = _registries.get(key)
+        if definitions is None:
+            definitions = DefinitionRegistry(Path(directory), kind)
+            _registries[key] = definitions
+        return definitions
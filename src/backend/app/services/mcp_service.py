@@ -182,7 +182,7 @@ class MCPService:
         if not self.mcp_manager:
             raise RuntimeError("MCP Manager not available")
 
-        result = self.mcp_manager.install(mcp_package)
+        result = await self.mcp_manager.install_async(mcp_package)
         logger.info(f"Installed MCP: {mcp_package.get('name', 'unknown')}")
         return result
 
@@ -202,7 +202,7 @@ class MCPService:
         if not self.mcp_manager:
             raise RuntimeError("MCP Manager not available")
 
-        result = self.mcp_manager.uninstall(mcp_name)
+        result = await self.mcp_manager.uninstall_async(mcp_name)
 
         # Unregister from local registry if successful
         if result.get("status") == "uninstalled" and mcp_name in self.servers:
@@ -227,7 +227,7 @@ class MCPService:
         if not self.mcp_manager:
             raise RuntimeError("MCP Manager not available")
 
-        result = self.mcp_manager.start(mcp_name)
+        result = await self.mcp_manager.start_async(mcp_name)
         logger.info(f"Started MCP: {mcp_name}")
         return result
 
@@ -247,7 +247,7 @@ class MCPService:
         if not self.mcp_manager:
             raise RuntimeError("MCP Manager not available")
 
-        result = self.mcp_manager.stop(mcp_name)
+        result = await self.mcp_manager.stop_async(mcp_name)
         logger.info(f"Stopped MCP: {mcp_name}")
         return result
 
@@ -267,7 +267,7 @@ class MCPService:
         if not self.mcp_manager:
             raise RuntimeError("MCP Manager not available")
 
-        result = self.mcp_manager.restart(mcp_name)
+        result = await self.mcp_manager.restart_async(mcp_name)
         logger.info(f"Restarted MCP: {mcp_name}")
         return result
 
@@ -291,7 +291,7 @@ class MCPService:
             raise RuntimeError("MCP Manager not available")
 
         # Get running containers
-        running_mcps = self.mcp_manager.list_installed()
+        running_mcps = await self.mcp_manager.list_installed_async()
         running_by_name = {mcp["name"]: mcp for mcp in running_mcps}
 
         # Also check registry service for installed packages
@@ -350,7 +350,7 @@ class MCPService:
         if not self.mcp_manager:
             raise RuntimeError("MCP Manager not available")
 
-        status = self.mcp_manager.get_status(mcp_name)
+        status = await self.mcp_manager.get_status_async(mcp_name)
         logger.debug(f"Retrieved status for MCP: {mcp_name}")
         return status
 
@@ -7,9 +7,10 @@
 """Model configuration management service."""
 
 import asyncio
+import threading
 import yaml
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from app.models.model import ModelsConfigFile
 from app.core.config import get_config
 
@@ -20,6 +21,91 @@ models_db: List[Dict[str, Any]] = []
 models_lock = asyncio.Lock()
 MODELS_CONFIG_PATH = Path("/configs/models.yaml")
 
+# Raw models.yaml entries keyed by model id, parsed once and dropped by
+# save_models_to_config(). The generation counter lets client pools notice.
+_model_configs: Optional[Dict[str, Dict[str, Any]]] = None
+_model_configs_generation = 0
+_model_configs_lock = threading.Lock()
+
+
+def get_model_config(model_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the raw models.yaml entry for a model id.
+
+    The file is parsed on first use and cached until save_models_to_config()
+    rewrites it, so per-message lookups do not touch disk.
+    """
+    global _model_configs
+
+    configs = _model_configs
+    if configs is None:
+        with _model_configs_lock:
+            if _model_configs is None:
+                with open(MODELS_CONFIG_PATH) as f:
+                    models_data = yaml.safe_load(f) or {}
+                _model_configs = {
+                    m["id"]: m for m in models_data.get("models", []) if "id" in m
+                }
+            configs = _model_configs
+
+    return configs.get(model_id)
+
+
+def invalidate_model_configs() -> None:
+    """Drop cached model configs and any clients resolved from them."""
+    global _model_configs, _model_configs_generation
+
+    with _model_configs_lock:
+        _model_configs = None
+        _model_configs_generation += 1
+
+
+class ModelClientPool:
+    """
+    Shares resolved SDK clients across chat requests.
+
+    Entries are keyed by (provider, provider model id) and resolved once via
+    the runtime's client lookup, so requests reuse the same connection-pooled
+    Anthropic/OpenAI/Ollama clients instead of building a runtime per message.
+    The pool empties itself when model configs are invalidated.
+    """
+
+    def __init__(self, resolve_client: Callable[[str], Tuple[str, Any]]):
+        """
+        Initialize ModelClientPool.
+
+        Args:
+            resolve_client: Maps a model id to (provider, client),
+                e.g. AgentRuntime._get_client_for_model
+        """
+        self._resolve_client = resolve_client
+        self._clients: Dict[Tuple[str, str], Tuple[str, Any]] = {}
+        self._generation = _model_configs_generation
+
+    def get(self, model_id: str) -> Tuple[str, Any, Dict[str, Any]]:
+        """
+        Get provider, client and model config for a model id.
+
+        Raises:
+            ValueError: If the model is not in models.yaml
+        """
+        if self._generation != _model_configs_generation:
+            self._clients = {}
+            self._generation = _model_configs_generation
+
+        model_config = get_model_config(model_id)
+        if not model_config:
+            raise ValueError(f"Model {model_id} not found in config")
+
+        key = (model_config.get("provider", ""), model_config.get("model_id", model_id))
+        entry = self._clients.get(key)
+        if entry is None:
+            entry = self._resolve_client(model_id)
+            self._clients[key] = entry
+
+        provider, client = entry
+        return provider, client, model_config
+
 
 def load_models_from_config() -> List[Dict[str, Any]]:
     """
@@ -161,6 +247,8 @@ async def save_models_to_config(models: List[Dict[str, Any]]) -> bool:
         with open(MODELS_CONFIG_PATH, "w") as f:
             yaml.safe_dump(existing_config, f, default_flow_style=False, sort_keys=False)
 
+        invalidate_model_configs()
+
         print(f"  💾 Saved {len(models)} models to {MODELS_CONFIG_PATH}")
         return True
 
@@ -15,8 +15,9 @@ Provides comprehensive model management features including:
 """
 
 import re
-from typing import List, Dict, Any, Optional, Callable
-from dataclasses import dataclass
+import threading
+from typing import List, Dict, Any, Optional, Callable, Set, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta, timezone
 
@@ -84,6 +85,45 @@ class SortCriteria:
     secondary_sort: Optional[SortOption] = None
 
 
+# Capability facets and the predicate deciding membership, matching
+# _model_has_capabilities()
+CAPABILITY_FACETS: Dict[str, Callable[[Dict[str, Any]], bool]] = {
+    "function_calling": lambda caps: caps.get("function_calling") != "none",
+    "vision": lambda caps: bool(caps.get("vision", False)),
+    "code_generation": lambda caps: bool(caps.get("code_generation", False)),
+    "multimodal": lambda caps: bool(caps.get("multimodal", False)),
+}
+
+
+@dataclass
+class ModelFacetIndex:
+    """
+    Facet sets and sort orderings for one model-catalog version.
+
+    Models are referred to by their position in ``models``. Each facet maps
+    a value to the set of positions having it, so filtering is a series of
+    set intersections. Facets depend only on the models; sort orderings also
+    depend on performance and ratings data, so each (option, secondary,
+    direction) ordering is stored with the data objects it was computed from
+    and reused only for those same objects.
+    """
+    version: Any
+    models: List[Dict[str, Any]]
+    providers: Dict[str, Set[int]] = field(default_factory=dict)
+    statuses: Dict[str, Set[int]] = field(default_factory=dict)
+    capabilities: Dict[str, Set[int]] = field(default_factory=dict)
+    safety_levels: Dict[str, Set[int]] = field(default_factory=dict)
+    tags: Dict[str, Set[int]] = field(default_factory=dict)
+    # sort key -> (performance_data, ratings_data, ordering)
+    orderings: Dict[Tuple, Tuple[Any, Any, List[int]]] = field(default_factory=dict)
+    filter_options: Dict[str, List[str]] = field(default_factory=dict)
+
+
+# Most recently built facet index; shared across (per-request) service instances
+_facet_index: Optional[ModelFacetIndex] = None
+_facet_index_lock = threading.Lock()
+
+
 class ModelFilterService:
     """
     Service for filtering, sorting, and searching models.
@@ -104,7 +144,8 @@ class ModelFilterService:
         models: List[Dict[str, Any]], 
         criteria: FilterCriteria,
         performance_data: Optional[Dict[str, Dict[str, Any]]] = None,
-        ratings_data: Optional[Dict[str, Dict[str, Any]]] = None
+        ratings_data: Optional[Dict[str, Dict[str, Any]]] = None,
+        catalog_version: Optional[Any] = None
     ) -> List[Dict[str, Any]]:
         """
         Filter models based on provided criteria.
@@ -114,6 +155,8 @@ class ModelFilterService:
             criteria: Filter criteria to apply
             performance_data: Optional performance metrics for cost filtering
             ratings_data: Optional ratings data for rating filtering
+            catalog_version: Version identifying models/performance/ratings;
+                enables the cached facet index
             
         Returns:
             Filtered list of models
@@ -121,42 +164,11 @@ class ModelFilterService:
         if criteria.is_empty():
             return models
         
-        filtered_models = models.copy()
-        
-        # Apply provider filter
-        if criteria.providers:
-            filtered_models = [
-                model for model in filtered_models
-                if model.get("provider") in criteria.providers
-            ]
-        
-        # Apply status filter
-        if criteria.statuses:
-            filtered_models = [
-                model for model in filtered_models
-                if self._get_model_status(model) in criteria.statuses
-            ]
-        
-        # Apply capabilities filter
-        if criteria.capabilities:
-            filtered_models = [
-                model for model in filtered_models
-                if self._model_has_capabilities(model, criteria.capabilities)
-            ]
-        
-        # Apply safety level filter
-        if criteria.safety_levels:
-            filtered_models = [
-                model for model in filtered_models
-                if SafetyLevel(model.get("safety_level", "moderate")) in criteria.safety_levels
-            ]
-        
-        # Apply tags filter (if tags are implemented in model data)
-        if criteria.tags:
-            filtered_models = [
-                model for model in filtered_models
-                if self._model_has_tags(model, criteria.tags)
-            ]
+        if catalog_version is not None:
+            index = self.get_facet_index(models, catalog_version)
+            filtered_models = self._filter_with_index(index, criteria)
+        else:
+            filtered_models = self._filter_by_facets(models.copy(), criteria)
         
         # Apply search query filter
         if criteria.search_query:
@@ -206,7 +218,8 @@ class ModelFilterService:
         models: List[Dict[str, Any]],
         criteria: SortCriteria,
         performance_data: Optional[Dict[str, Dict[str, Any]]] = None,
-        ratings_data: Optional[Dict[str, Dict[str, Any]]] = None
+        ratings_data: Optional[Dict[str, Dict[str, Any]]] = None,
+        catalog_version: Optional[Any] = None
     ) -> List[Dict[str, Any]]:
         """
         Sort models based on provided criteria.
@@ -216,6 +229,8 @@ class ModelFilterService:
             criteria: Sort criteria to apply
             performance_data: Optional performance metrics for usage/cost sorting
             ratings_data: Optional ratings data for rating sorting
+            catalog_version: Version identifying models/performance/ratings;
+                enables the cached facet index
             
         Returns:
             Sorted list of models
@@ -223,6 +238,12 @@ class ModelFilterService:
         if not models:
             return models
         
+        if catalog_version is not None:
+            index = self.get_facet_index(models, catalog_version)
+            ordering = self._get_ordering(index, criteria, performance_data, ratings_data)
+            logger.info(f"Sorted {len(models)} models by {criteria.option.value} ({criteria.direction.value})")
+            return [index.models[position] for position in ordering]
+        
         # Create sort key function
         sort_key_func = self._create_sort_key_function(
             criteria, performance_data, ratings_data
@@ -280,17 +301,58 @@ class ModelFilterService:
     
     def get_filter_options(
         self,
-        models: List[Dict[str, Any]]
+        models: List[Dict[str, Any]],
+        catalog_version: Optional[Any] = None
     ) -> Dict[str, List[str]]:
         """
         Get available filter options based on current models.
         
         Args:
             models: List of model configurations
+            catalog_version: Version identifying models; enables the cached facet index
             
         Returns:
             Dictionary of available filter options
         """
+        if catalog_version is not None:
+            index = self.get_facet_index(models, catalog_version)
+            return {key: list(values) for key, values in index.filter_options.items()}
+        
+        return self._compute_filter_options(models)
+    
+    def get_facet_index(
+        self,
+        models: List[Dict[str, Any]],
+        catalog_version: Any
+    ) -> ModelFacetIndex:
+        """
+        Get the facet index for a catalog version, building it on first use.
+        
+        Args:
+            models: Models of that catalog version
+            catalog_version: Version identifying the models (unique per catalog snapshot)
+            
+        Returns:
+            ModelFacetIndex shared by all requests for the version
+        """
+        global _facet_index
+
+        index = _facet_index
+        if index is not None and index.version == catalog_version:
+            return index
+
+        with _facet_index_lock:
+            index = _facet_index
+            if index is None or index.version != catalog_version:
+                index = self._build_facet_index(models, catalog_version)
+                _facet_index = index
+            return index
+    
+    def _compute_filter_options(
+        self,
+        models: List[Dict[str, Any]]
+    ) -> Dict[str, List[str]]:
+        """Scan models for the available filter options"""
         providers = set()
         statuses = set()
         capabilities = set()
@@ -327,6 +389,147 @@ class ModelFilterService:
     
     # Private helper methods
     
+    def _filter_by_facets(
+        self,
+        filtered_models: List[Dict[str, Any]],
+        criteria: FilterCriteria
+    ) -> List[Dict[str, Any]]:
+        """Apply provider/status/capability/safety/tag filters by scanning models"""
+        # Apply provider filter
+        if criteria.providers:
+            filtered_models = [
+                model for model in filtered_models
+                if model.get("provider") in criteria.providers
+            ]
+        
+        # Apply status filter
+        if criteria.statuses:
+            filtered_models = [
+                model for model in filtered_models
+                if self._get_model_status(model) in criteria.statuses
+            ]
+        
+        # Apply capabilities filter
+        if criteria.capabilities:
+            filtered_models = [
+                model for model in filtered_models
+                if self._model_has_capabilities(model, criteria.capabilities)
+            ]
+        
+        # Apply safety level filter
+        if criteria.safety_levels:
+            filtered_models = [
+                model for model in filtered_models
+                if SafetyLevel(model.get("safety_level", "moderate")) in criteria.safety_levels
+            ]
+        
+        # Apply tags filter (if tags are implemented in model data)
+        if criteria.tags:
+            filtered_models = [
+                model for model in filtered_models
+                if self._model_has_tags(model, criteria.tags)
+            ]
+        
+        return filtered_models
+    
+    def _filter_with_index(
+        self,
+        index: ModelFacetIndex,
+        criteria: FilterCriteria
+    ) -> List[Dict[str, Any]]:
+        """Apply provider/status/capability/safety/tag filters as set intersections"""
+        candidates: Optional[Set[int]] = None
+
+        def narrow(positions: Set[int]) -> None:
+            nonlocal candidates
+            candidates = positions if candidates is None else candidates & positions
+
+        def union(facet: Dict[str, Set[int]], values) -> Set[int]:
+            positions: Set[int] = set()
+            for value in values:
+                positions |= facet.get(value, set())
+            return positions
+
+        if criteria.providers:
+            narrow(union(index.providers, criteria.providers))
+        if criteria.statuses:
+            narrow(union(index.statuses, criteria.statuses))
+        if criteria.capabilities:
+            for capability in criteria.capabilities:
+                # Unknown capabilities don't restrict results
+                if capability in CAPABILITY_FACETS:
+                    narrow(index.capabilities.get(capability, set()))
+        if criteria.safety_levels:
+            narrow(union(index.safety_levels, criteria.safety_levels))
+        if criteria.tags:
+            for tag in criteria.tags:
+                narrow(index.tags.get(tag, set()))
+
+        if candidates is None:
+            return list(index.models)
+        return [index.models[position] for position in sorted(candidates)]
+    
+    def _build_facet_index(
+        self,
+        models: List[Dict[str, Any]],
+        catalog_version: Any
+    ) -> ModelFacetIndex:
+        """Build facet sets for every model in one pass"""
+        index = ModelFacetIndex(version=catalog_version, models=list(models))
+        
+        for position, model in enumerate(index.models):
+            index.providers.setdefault(model.get("provider"), set()).add(position)
+            index.statuses.setdefault(self._get_model_status(model), set()).add(position)
+            
+            model_capabilities = model.get("capabilities", {})
+            for capability, has_capability in CAPABILITY_FACETS.items():
+                if has_capability(model_capabilities):
+                    index.capabilities.setdefault(capability, set()).add(position)
+            
+            index.safety_levels.setdefault(model.get("safety_level", "moderate"), set()).add(position)
+            
+            for tag in model.get("tags", []) or []:
+                index.tags.setdefault(tag, set()).add(position)
+        
+        index.filter_options = self._compute_filter_options(index.models)
+        
+        logger.info(f"Built facet index for catalog version {catalog_version} ({len(index.models)} models)")
+        return index
+    
+    def _get_ordering(
+        self,
+        index: ModelFacetIndex,
+        criteria: SortCriteria,
+        performance_data: Optional[Dict[str, Dict[str, Any]]],
+        ratings_data: Optional[Dict[str, Dict[str, Any]]]
+    ) -> List[int]:
+        """
+        Get (and memoize) model positions ordered by the sort criteria.
+
+        A memoized ordering is reused only for the same performance/ratings
+        objects (empty data counts as none), which must not be mutated in
+        place. Different data recomputes and replaces the ordering.
+        """
+        performance_data = performance_data or None
+        ratings_data = ratings_data or None
+        key = (criteria.option, criteria.secondary_sort, criteria.direction)
+        cached = index.orderings.get(key)
+        if cached is not None and cached[0] is performance_data and cached[1] is ratings_data:
+            ordering = cached[2]
+        else:
+            sort_key_func = self._create_sort_key_function(
+                criteria, performance_data, ratings_data
+            )
+            sort_keys = [sort_key_func(model) for model in index.models]
+            ordering = sorted(
+                range(len(index.models)),
+                key=sort_keys.__getitem__,
+                reverse=(criteria.direction == SortDirection.DESC)
+            )
+            # Holding the data objects keeps their identity from being reused
+            index.orderings[key] = (performance_data, ratings_data, ordering)
+        return ordering
+    
     def _get_model_status(self, model: Dict[str, Any]) -> str:
         """Get standardized model status"""
         if model.get("configured"):
@@ -13,10 +13,13 @@ Enhanced with ratings, performance tracking, and MCP compatibility.
 """
 
 import asyncio
+import itertools
+import os
 import yaml
 import json
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from app.core.errors import NotFoundError, ValidationError, ConflictError
@@ -32,6 +35,39 @@ from app.models.enhanced_models import (
 
 logger = get_service_logger("model")
 
+# Snapshot versions are unique across ModelService instances, so caches
+# keyed by version (e.g. the model filter facet index) never mix catalogs
+_snapshot_versions = itertools.count(1)
+
+# (mtime_ns, size) of a file, or None if it does not exist
+FileSignature = Optional[Tuple[int, int]]
+
+
+def _file_signature(path: Path) -> FileSignature:
+    """Cheap change detector for a config/data file."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+@dataclass(frozen=True)
+class ModelCatalogSnapshot:
+    """
+    Immutable view of models plus their metrics, ratings and compatibility data.
+
+    A new snapshot (with a higher version) is built only when one of the
+    backing files changes. Readers must treat the contained dicts as read-only.
+    """
+    version: int
+    signature: Tuple[FileSignature, ...]
+    models: Tuple[Dict[str, Any], ...]
+    models_by_id: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    performance: Dict[str, Any] = field(default_factory=dict)
+    ratings: Dict[str, Any] = field(default_factory=dict)
+    compatibility: Dict[str, Any] = field(default_factory=dict)
+
 
 class ModelService:
     """
@@ -73,6 +109,14 @@ class ModelService:
         
         # Initialize metadata tracker service
         self.metadata_tracker = MetadataTrackerService()
+
+        # Versioned catalog snapshot served lock-free to readers
+        self._snapshot: Optional[ModelCatalogSnapshot] = None
+        self._snapshot_lock = asyncio.Lock()
+        self._dirty_sources = set()  # Indexes into the catalog signature written by this service
+        self._models_loaded = False
+        self._models_signature: FileSignature = None
+        self._compatibility_matrix: Optional[Tuple[int, Dict[str, MCPCompatibilityMatrix]]] = None
         
         logger.info(f"ModelService initialized with config: {models_config_path}")
 
@@ -87,6 +131,8 @@ class ModelService:
             ValidationError: If config file is invalid
         """
         async with self.lock:
+            self._models_loaded = True
+            self._models_signature = _file_signature(self.models_config_path)
             try:
                 if not self.models_config_path.exists():
                     logger.warning(f"Models config not found at {self.models_config_path}")
@@ -254,6 +300,10 @@ class ModelService:
             with open(self.models_config_path, "w") as f:
                 yaml.safe_dump(existing_config, f, default_flow_style=False, sort_keys=False)
 
+            # In-memory models already reflect this write; only rebuild the snapshot
+            self._models_signature = _file_signature(self.models_config_path)
+            self._dirty_sources.add(0)
+
             logger.info(f"Saved {len(models)} models to config")
             return True
 
@@ -268,12 +318,8 @@ class ModelService:
         Returns:
             List of model configurations
         """
-        # Lazy load models from config if not already loaded
-        if not self.models:
-            await self.load_from_config()
-
-        async with self.lock:
-            return self.models.copy()
+        snapshot = await self.get_catalog_snapshot()
+        return [model.copy() for model in snapshot.models]
 
     async def get_model(self, model_id: str) -> Dict[str, Any]:
         """
@@ -288,16 +334,34 @@ class ModelService:
         Raises:
             NotFoundError: If model not found
         """
-        # Lazy load - use list_models which handles locking
-        if not self.models:
-            await self.load_from_config()
+        snapshot = await self.get_catalog_snapshot()
+        model = snapshot.models_by_id.get(model_id)
+        if model is None:
+            raise NotFoundError("Model", model_id)
+        return model.copy()
 
-        async with self.lock:
-            for model in self.models:
-                if model["id"] == model_id:
-                    return model.copy()
+    async def get_catalog_snapshot(self) -> ModelCatalogSnapshot:
+        """
+        Get the current model catalog snapshot.
 
-            raise NotFoundError("Model", model_id)
+        The fast path is a handful of stat() calls and no locking; the
+        snapshot is rebuilt only when models.yaml or one of the metrics,
+        ratings or compatibility files has changed.
+
+        Returns:
+            Current ModelCatalogSnapshot
+        """
+        signature = self._catalog_signature()
+        snapshot = self._snapshot
+        if snapshot is not None and not self._dirty_sources and snapshot.signature == signature:
+            return snapshot
+
+        async with self._snapshot_lock:
+            signature = self._catalog_signature()
+            snapshot = self._snapshot
+            if snapshot is not None and not self._dirty_sources and snapshot.signature == signature:
+                return snapshot
+            return await self._rebuild_snapshot(signature, snapshot)
 
     async def create_model(self, model_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -314,7 +378,7 @@ class ModelService:
             ConflictError: If model ID already exists
         """
         # Lazy load models before acquiring lock
-        if not self.models:
+        if not self._models_loaded:
             await self.load_from_config()
 
         async with self.lock:
@@ -380,7 +444,7 @@ class ModelService:
             NotFoundError: If model not found
         """
         # Lazy load models before acquiring lock
-        if not self.models:
+        if not self._models_loaded:
             await self.load_from_config()
 
         async with self.lock:
@@ -436,7 +500,7 @@ class ModelService:
             ValidationError: If trying to delete last model or default model
         """
         # Lazy load models before acquiring lock
-        if not self.models:
+        if not self._models_loaded:
             await self.load_from_config()
 
         async with self.lock:
@@ -490,7 +554,7 @@ class ModelService:
             ValidationError: If model is not configured
         """
         # Lazy load models before acquiring lock
-        if not self.models:
+        if not self._models_loaded:
             await self.load_from_config()
 
         async with self.lock:
@@ -603,10 +667,13 @@ class ModelService:
         Returns:
             Dictionary mapping model_id to compatibility matrix
         """
-        compatibility_data = await self._load_mcp_compatibility_data()
-        
+        snapshot = await self.get_catalog_snapshot()
+        cached = self._compatibility_matrix
+        if cached is not None and cached[0] == snapshot.version:
+            return dict(cached[1])
+
         result = {}
-        for model_id, data in compatibility_data.items():
+        for model_id, data in snapshot.compatibility.items():
             success_rates = {}
             for category, compat_data in data.get("success_rates", {}).items():
                 success_rates[category] = MCPToolCompatibility(
@@ -620,8 +687,9 @@ class ModelService:
                 tested_categories=data["tested_categories"],
                 success_rates=success_rates
             )
-        
-        return result
+
+        self._compatibility_matrix = (snapshot.version, result)
+        return dict(result)
 
     async def update_mcp_compatibility(self, model_id: str, compatibility: MCPCompatibilityMatrix) -> MCPCompatibilityMatrix:
         """
@@ -663,12 +731,12 @@ class ModelService:
         Returns:
             List of model recommendations sorted by score
         """
-        models = await self.list_models()
-        ratings_data = await self._load_ratings_data()
+        snapshot = await self.get_catalog_snapshot()
+        ratings_data = snapshot.ratings
         
         recommendations = []
         
-        for model in models:
+        for model in snapshot.models:
             if not model.get("configured"):
                 continue
                 
@@ -730,6 +798,83 @@ class ModelService:
 
     # Private helper methods
 
+    def _catalog_signature(self) -> Tuple[FileSignature, ...]:
+        """Signatures of every file the catalog snapshot is built from."""
+        return (
+            _file_signature(self.models_config_path),
+            _file_signature(self.performance_data_path),
+            _file_signature(self.ratings_data_path),
+            _file_signature(self.mcp_compatibility_path),
+        )
+
+    async def _rebuild_snapshot(
+        self,
+        signature: Tuple[FileSignature, ...],
+        previous: Optional[ModelCatalogSnapshot]
+    ) -> ModelCatalogSnapshot:
+        """
+        Build a new snapshot, re-parsing only the files that changed.
+
+        NOTE: Caller must hold self._snapshot_lock.
+        """
+        models_signature, performance_signature, ratings_signature, compatibility_signature = signature
+        dirty = set(self._dirty_sources)
+        self._dirty_sources.clear()
+
+        # Reload models.yaml only if it changed outside this service;
+        # our own saves already updated self.models
+        if not self._models_loaded or models_signature != self._models_signature:
+            try:
+                await self.load_from_config()
+            except Exception as e:
+                if previous is None:
+                    # Nothing to fall back to; retry (and raise) on the next read
+                    self._models_loaded = False
+                    raise
+                logger.error(f"Keeping previous models after failed reload: {e}")
+
+        async with self.lock:
+            models = tuple(model.copy() for model in self.models)
+
+        def reuse_or_load(index: int, path: Path, current: Dict[str, Any], sig: FileSignature, kind: str):
+            if previous is not None and index not in dirty and previous.signature[index] == sig:
+                return current
+            return self._read_json_data(path, kind)
+
+        snapshot = ModelCatalogSnapshot(
+            version=next(_snapshot_versions),
+            signature=signature,
+            models=models,
+            models_by_id={model["id"]: model for model in models},
+            performance=reuse_or_load(
+                1, self.performance_data_path,
+                previous.performance if previous else {}, performance_signature, "performance metrics"
+            ),
+            ratings=reuse_or_load(
+                2, self.ratings_data_path,
+                previous.ratings if previous else {}, ratings_signature, "ratings data"
+            ),
+            compatibility=reuse_or_load(
+                3, self.mcp_compatibility_path,
+                previous.compatibility if previous else {}, compatibility_signature, "MCP compatibility data"
+            ),
+        )
+        self._snapshot = snapshot
+        logger.info(f"Built model catalog snapshot v{snapshot.version} ({len(models)} models)")
+        return snapshot
+
+    def _read_json_data(self, path: Path, kind: str) -> Dict[str, Any]:
+        """Parse a JSON data file, returning {} if missing or invalid."""
+        try:
+            if not path.exists():
+                return {}
+
+            with open(path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load {kind}: {e}")
+            return {}
+
     def _convert_to_enhanced_config(self, model_config: Dict[str, Any]) -> EnhancedModelConfig:
         """Convert basic model config to enhanced config with defaults."""
         # Set default capabilities based on provider and model
@@ -802,13 +947,8 @@ class ModelService:
     async def _load_performance_metrics(self, model_id: str) -> Optional[PerformanceMetrics]:
         """Load performance metrics for a model."""
         try:
-            if not self.performance_data_path.exists():
-                return None
-                
-            with open(self.performance_data_path, "r") as f:
-                data = json.load(f)
-                
-            model_data = data.get(model_id)
+            snapshot = await self.get_catalog_snapshot()
+            model_data = snapshot.performance.get(model_id)
             if not model_data:
                 return None
                 
@@ -827,43 +967,31 @@ class ModelService:
             return None
 
     async def _load_ratings_data(self) -> Dict[str, Any]:
-        """Load ratings data from storage."""
-        try:
-            if not self.ratings_data_path.exists():
-                return {}
-                
-            with open(self.ratings_data_path, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.warning(f"Failed to load ratings data: {e}")
-            return {}
+        """Load a mutable copy of ratings data from the catalog snapshot."""
+        snapshot = await self.get_catalog_snapshot()
+        return dict(snapshot.ratings)
 
     async def _save_ratings_data(self, ratings_data: Dict[str, Any]) -> None:
         """Save ratings data to storage."""
         try:
             with open(self.ratings_data_path, "w") as f:
                 json.dump(ratings_data, f, indent=2)
+            self._dirty_sources.add(2)
         except Exception as e:
             logger.error(f"Failed to save ratings data: {e}")
             raise ValidationError(f"Failed to save ratings data: {e}", field="ratings")
 
     async def _load_mcp_compatibility_data(self) -> Dict[str, Any]:
-        """Load MCP compatibility data from storage."""
-        try:
-            if not self.mcp_compatibility_path.exists():
-                return {}
-                
-            with open(self.mcp_compatibility_path, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.warning(f"Failed to load MCP compatibility data: {e}")
-            return {}
+        """Load a mutable copy of MCP compatibility data from the catalog snapshot."""
+        snapshot = await self.get_catalog_snapshot()
+        return dict(snapshot.compatibility)
 
     async def _save_mcp_compatibility_data(self, compatibility_data: Dict[str, Any]) -> None:
         """Save MCP compatibility data to storage."""
         try:
             with open(self.mcp_compatibility_path, "w") as f:
                 json.dump(compatibility_data, f, indent=2)
+            self._dirty_sources.add(3)
         except Exception as e:
             logger.error(f"Failed to save MCP compatibility data: {e}")
             raise ValidationError(f"Failed to save MCP compatibility data: {e}", field="mcp_compatibility")
@@ -8,6 +8,11 @@
 Registry Failover Manager
 
 Single responsibility: Handle registry failover, health checking, and retry logic
+
+Requests are hedged: when the registry being tried has not answered within
+its own p95 latency, the same request is also sent to the next registry in
+line and the first success wins. A slow mirror then costs roughly its p95
+instead of the full timeout.
 """
 
 import asyncio
@@ -23,6 +28,11 @@ from app.models.registry_models import RegistryConfig, PackageMetadata
 
 logger = logging.getLogger(__name__)
 
+# Registry score weights: seconds of latency a registry is "charged" for
+# a fully failing recent window and for each consecutive failure
+ERROR_RATE_PENALTY = 10.0
+CONSECUTIVE_FAILURE_PENALTY = 5.0
+
 
 class RegistryHealth(Enum):
     """Registry health status"""
@@ -42,6 +52,8 @@ class HealthMetrics:
     response_times: List[float] = field(default_factory=list)
     error_messages: List[str] = field(default_factory=list)
     consecutive_failures: int = 0
+    # Success (True) / failure (False) of the last 20 requests
+    outcomes: List[bool] = field(default_factory=list)
     
     @property
     def avg_response_time(self) -> float:
@@ -50,6 +62,43 @@ class HealthMetrics:
             return 0.0
         return sum(self.response_times[-10:]) / len(self.response_times[-10:])
     
+    def response_time_percentile(self, percentile: float) -> Optional[float]:
+        """
+        Response time percentile over the recorded window.
+        
+        Args:
+            percentile: Percentile between 0 and 100
+            
+        Returns:
+            Response time in seconds, or None without samples
+        """
+        if not self.response_times:
+            return None
+        ordered = sorted(self.response_times)
+        index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+        return ordered[index]
+    
+    @property
+    def error_rate(self) -> float:
+        """Fraction of failed requests over the last 20"""
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+    
+    @property
+    def score(self) -> float:
+        """Latency/error-weighted cost of using this registry (lower is better)"""
+        return (
+            self.avg_response_time * (1 + self.error_rate)
+            + self.error_rate * ERROR_RATE_PENALTY
+            + self.consecutive_failures * CONSECUTIVE_FAILURE_PENALTY
+        )
+    
+    def _record_outcome(self, success: bool):
+        self.outcomes.append(success)
+        if len(self.outcomes) > 20:
+            self.outcomes = self.outcomes[-20:]
+    
     @property
     def is_available(self) -> bool:
         """Whether registry is considered available"""
@@ -59,6 +108,7 @@ class HealthMetrics:
         """Record successful request"""
         self.last_success = datetime.now(UTC)
         self.consecutive_failures = 0
+        self._record_outcome(True)
         self.response_times.append(response_time)
         
         # Keep only last 20 response times
@@ -78,6 +128,7 @@ class HealthMetrics:
         self.last_failure = datetime.now(UTC)
         self.failure_count += 1
         self.consecutive_failures += 1
+        self._record_outcome(False)
         self.error_messages.append(f"{datetime.now(UTC).isoformat()}: {error_msg}")
         
         # Keep only last 10 error messages
@@ -104,6 +155,32 @@ class FailoverConfig:
     timeout: float = 30.0
     circuit_breaker_threshold: int = 5
     circuit_breaker_reset_time: int = 300
+    hedge_enabled: bool = True
+    hedge_percentile: float = 95.0  # Registry latency percentile that triggers a hedge
+    hedge_min_delay: float = 0.05
+    hedge_default_delay: float = 2.0  # Used until a registry has latency samples
+    max_hedged_requests: int = 1  # Extra registries queried while one is slow
+
+
+@dataclass
+class HedgeMetrics:
+    """Counters for hedged requests"""
+    requests: int = 0
+    hedged_requests: int = 0
+    hedges_sent: int = 0
+    hedge_wins: int = 0
+    cancelled_requests: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedged_requests": self.hedged_requests,
+            "hedges_sent": self.hedges_sent,
+            "hedge_wins": self.hedge_wins,
+            "cancelled_requests": self.cancelled_requests,
+            "hedge_rate": round(self.hedged_requests / self.requests, 4) if self.requests else 0.0,
+            "hedge_win_rate": round(self.hedge_wins / self.hedges_sent, 4) if self.hedges_sent else 0.0,
+        }
 
 
 class RegistryFailoverManager:
@@ -113,7 +190,8 @@ class RegistryFailoverManager:
     Features:
     - Automatic retry with exponential backoff
     - Health monitoring and circuit breaker
-    - Priority-based registry selection
+    - Priority-based registry selection, latency/error score within a priority
+    - Hedged requests to the next registry when one is slower than its p95
     - Comprehensive error handling and logging
     """
 
@@ -127,6 +205,7 @@ class RegistryFailoverManager:
         self.config = config or FailoverConfig()
         self.health_metrics: Dict[str, HealthMetrics] = {}
         self.circuit_breakers: Dict[str, datetime] = {}
+        self.hedge_metrics = HedgeMetrics()
         self._last_health_check = datetime.now(UTC)
         
         logger.info(
@@ -219,11 +298,12 @@ class RegistryFailoverManager:
             if health.is_available:
                 available_registries.append(registry)
         
-        # Sort by priority (lower number = higher priority), then by health
+        # Sort by priority (lower number = higher priority), then by score.
+        # Priority stays first so a trusted registry is never bypassed for a
+        # faster one; hedging covers a slow preferred registry.
         available_registries.sort(key=lambda r: (
             r.priority,
-            self.get_registry_health(r.name).consecutive_failures,
-            -self.get_registry_health(r.name).avg_response_time
+            self.get_registry_health(r.name).score
         ))
         
         logger.info(
@@ -233,24 +313,125 @@ class RegistryFailoverManager:
         
         return available_registries
     
+    def hedge_delay(self, registry_name: str) -> float:
+        """
+        Time to wait for a registry before hedging to the next one.
+        
+        Args:
+            registry_name: Registry name
+            
+        Returns:
+            Delay in seconds, from the registry's latency percentile
+        """
+        latency = self.get_registry_health(registry_name).response_time_percentile(
+            self.config.hedge_percentile
+        )
+        if latency is None:
+            latency = self.config.hedge_default_delay
+        return min(max(latency, self.config.hedge_min_delay), self.config.timeout)
+    
+    def get_hedge_metrics(self) -> Dict[str, Any]:
+        """
+        Get hedged request counters.
+        
+        Returns:
+            Hedge metrics including hedge_rate and hedge_win_rate
+        """
+        return self.hedge_metrics.to_dict()
+    
+    async def _attempt(
+        self,
+        operation: Callable,
+        registry: RegistryConfig,
+        operation_name: str,
+        **kwargs
+    ) -> Any:
+        """
+        Run operation once on a registry and record the outcome.
+        
+        A cancelled attempt (lost a hedge race) is not recorded.
+        """
+        health = self.get_registry_health(registry.name)
+        logger.info(f"Attempting {operation_name} on registry: {registry.name}")
+        start_time = time.time()
+        
+        try:
+            # Execute operation with timeout
+            result = await asyncio.wait_for(
+                operation(registry, **kwargs),
+                timeout=self.config.timeout
+            )
+        except asyncio.TimeoutError:
+            error_msg = f"Timeout after {self.config.timeout}s"
+            logger.warning(
+                f"{operation_name} timeout on registry '{registry.name}' "
+                f"({registry.url}): {error_msg}. "
+                f"Consecutive failures: {health.consecutive_failures + 1}"
+            )
+            health.record_failure(error_msg)
+            self._check_circuit_breaker(registry.name)
+            raise
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error_msg = str(e)
+            logger.warning(
+                f"{operation_name} failed on registry '{registry.name}' "
+                f"({registry.url}): {error_msg}. "
+                f"Consecutive failures: {health.consecutive_failures + 1}. "
+                f"Error type: {type(e).__name__}"
+            )
+            health.record_failure(error_msg)
+            self._check_circuit_breaker(registry.name)
+            raise
+        
+        # Record success
+        response_time = time.time() - start_time
+        health.record_success(response_time)
+        
+        logger.info(
+            f"Successfully executed {operation_name} on {registry.name} "
+            f"in {response_time:.2f}s"
+        )
+        return result
+    
+    def _check_circuit_breaker(self, registry_name: str):
+        """Open the circuit breaker if a registry failed too often in a row"""
+        health = self.get_registry_health(registry_name)
+        if health.consecutive_failures >= self.config.circuit_breaker_threshold:
+            self.open_circuit_breaker(registry_name)
+    
     async def execute_with_failover(
         self,
         operation: Callable,
         registries: Dict[str, RegistryConfig],
         operation_name: str,
+        accept: Optional[Callable[[Any], bool]] = None,
         **kwargs
     ) -> Any:
         """
         Execute operation with automatic failover across registries.
         
+        Registries are tried in order. A failure moves on to the next one
+        immediately; a registry slower than its hedge delay gets the next
+        registry queried alongside it (up to max_hedged_requests extra)
+        and the first accepted success is returned.
+        
+        A success that accept() rejects (e.g. "package not found") does not
+        win the race: other attempts keep running and the next registry is
+        tried, so a fast registry without the answer cannot beat a slower
+        one that has it.
+        
         Args:
             operation: Async function to execute
             registries: Available registries
             operation_name: Operation name for logging
+            accept: Optional predicate for usable results (default: any success)
             **kwargs: Arguments to pass to operation
             
         Returns:
-            Operation result
+            First accepted result, or the first rejected result if no
+            registry produced an accepted one
             
         Raises:
             Exception: If all registries fail
@@ -260,62 +441,77 @@ class RegistryFailoverManager:
         if not ordered_registries:
             raise Exception(f"No available registries for {operation_name}")
         
+        self.hedge_metrics.requests += 1
+        max_in_flight = 1 + (self.config.max_hedged_requests if self.config.hedge_enabled else 0)
+        
         last_error = None
+        rejected: List[Any] = []
         attempted_registries = []
+        in_flight: Dict[asyncio.Task, RegistryConfig] = {}
+        hedges: Set[asyncio.Task] = set()
+        remaining = list(ordered_registries)
         
-        for registry in ordered_registries:
-            health = self.get_registry_health(registry.name)
+        def launch(hedge: bool):
+            registry = remaining.pop(0)
             attempted_registries.append(registry.name)
-            
-            try:
-                logger.info(f"Attempting {operation_name} on registry: {registry.name}")
-                start_time = time.time()
-                
-                # Execute operation with timeout
-                result = await asyncio.wait_for(
-                    operation(registry, **kwargs),
-                    timeout=self.config.timeout
-                )
-                
-                # Record success
-                response_time = time.time() - start_time
-                health.record_success(response_time)
-                
-                logger.info(
-                    f"Successfully executed {operation_name} on {registry.name} "
-                    f"in {response_time:.2f}s"
-                )
-                
-                return result
-                
-            except asyncio.TimeoutError as e:
-                error_msg = f"Timeout after {self.config.timeout}s"
-                logger.warning(
-                    f"{operation_name} timeout on registry '{registry.name}' "
-                    f"({registry.url}): {error_msg}. "
-                    f"Consecutive failures: {health.consecutive_failures + 1}"
+            task = asyncio.create_task(
+                self._attempt(operation, registry, operation_name, **kwargs)
+            )
+            in_flight[task] = registry
+            if hedge:
+                hedges.add(task)
+                self.hedge_metrics.hedges_sent += 1
+                if len(hedges) == 1:
+                    self.hedge_metrics.hedged_requests += 1
+            return registry
+        
+        newest = launch(hedge=False)
+        try:
+            while in_flight:
+                can_hedge = remaining and len(in_flight) < max_in_flight
+                done, _ = await asyncio.wait(
+                    in_flight,
+                    timeout=self.hedge_delay(newest.name) if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
                 )
-                health.record_failure(error_msg)
-                last_error = e
                 
-                # Check if circuit breaker should open
-                if health.consecutive_failures >= self.config.circuit_breaker_threshold:
-                    self.open_circuit_breaker(registry.name)
+                if not done:
+                    logger.info(
+                        f"{operation_name} on {newest.name} exceeded hedge delay, "
+                        f"also trying {remaining[0].name}"
+                    )
+                    newest = launch(hedge=True)
+                    continue
                 
-            except Exception as e:
-                error_msg = str(e)
-                logger.warning(
-                    f"{operation_name} failed on registry '{registry.name}' "
-                    f"({registry.url}): {error_msg}. "
-                    f"Consecutive failures: {health.consecutive_failures + 1}. "
-                    f"Error type: {type(e).__name__}"
-                )
-                health.record_failure(error_msg)
-                last_error = e
+                for task in done:
+                    registry = in_flight.pop(task)
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+                    result = task.result()
+                    if accept is None or accept(result):
+                        if task in hedges:
+                            self.hedge_metrics.hedge_wins += 1
+                        return result
+                    # Answered without a usable result: keep waiting for the others
+                    logger.info(f"{operation_name} on {registry.name} returned no usable result")
+                    rejected.append(result)
                 
-                # Check if circuit breaker should open
-                if health.consecutive_failures >= self.config.circuit_breaker_threshold:
-                    self.open_circuit_breaker(registry.name)
+                # Failover: replace failed or rejected attempts right away
+                while remaining and len(in_flight) < 1:
+                    newest = launch(hedge=False)
+        finally:
+            # Stop the losers and let them unwind before the caller closes
+            # any client they share
+            losers = [task for task in in_flight if not task.done()]
+            for task in losers:
+                task.cancel()
+            self.hedge_metrics.cancelled_requests += len(losers)
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        
+        if rejected:
+            logger.info(f"No registry had a usable result for {operation_name}. Attempted: {attempted_registries}")
+            return rejected[0]
         
         # All registries failed
         error_summary = f"All registries failed for {operation_name}. Attempted: {attempted_registries}"
@@ -501,6 +697,9 @@ class RegistryFailoverManager:
                 "failure_count": health.failure_count,
                 "consecutive_failures": health.consecutive_failures,
                 "avg_response_time": round(health.avg_response_time, 2),
+                "p95_response_time": round(health.response_time_percentile(95) or 0.0, 2),
+                "error_rate": round(health.error_rate, 2),
+                "score": round(health.score, 2),
                 "recent_errors": health.error_messages[-3:]  # Last 3 errors
             }
         
@@ -8,10 +8,20 @@
 Package Index Manager
 
 Single responsibility: Manage package index (search, refresh, query)
+
+Refresh fans out to all registries concurrently (bounded) and sends
+conditional requests so unchanged catalogs cost one 304 round-trip:
+- ETag / Last-Modified validators are stored per registry in the index
+- A content hash skips re-validating identical full responses
+- Registries that return a delta ({"delta": true, "packages": [...],
+  "removed": [...]}) for ?since=<cursor> are patched in place
 """
 
+import asyncio
+import hashlib
 import json
 import logging
+import os
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime, UTC
@@ -25,9 +35,13 @@ from app.models.registry_models import (
     InstallationRecord
 )
 from .failover import RegistryFailoverManager, FailoverConfig
+from .lookup import PackageLookup
 
 logger = logging.getLogger(__name__)
 
+# Concurrent registry fetches during refresh
+DEFAULT_MAX_CONCURRENT_FETCHES = 4
+
 
 class PackageIndexManager:
     """Manages searchable package index from all registries"""
@@ -36,7 +50,8 @@ class PackageIndexManager:
         self, 
         index_file: Path, 
         base_dir: Path = Path("/app"),
-        failover_config: Optional[FailoverConfig] = None
+        failover_config: Optional[FailoverConfig] = None,
+        max_concurrent_fetches: int = DEFAULT_MAX_CONCURRENT_FETCHES
     ):
         """
         Initialize package index manager.
@@ -45,10 +60,13 @@ class PackageIndexManager:
             index_file: Path to package-index.json
             base_dir: Base directory for resolving relative paths (default: /app)
             failover_config: Optional failover configuration
+            max_concurrent_fetches: Maximum registries fetched at once during refresh
         """
         self.index_file = index_file
         self.base_dir = base_dir
+        self.max_concurrent_fetches = max(1, max_concurrent_fetches)
         self.index = self._load_index()
+        self.lookup = PackageLookup(self.index)
         self.failover_manager = RegistryFailoverManager(failover_config)
 
     def _load_index(self) -> Dict[str, Any]:
@@ -68,8 +86,10 @@ class PackageIndexManager:
             return {"last_updated": None, "registries": {}}
 
     def _save_index(self):
-        """Save package index to disk"""
-        self.index_file.write_text(json.dumps(self.index, indent=2))
+        """Save package index to disk (compact, atomic replace)"""
+        tmp_file = self.index_file.with_suffix(self.index_file.suffix + ".tmp")
+        tmp_file.write_text(json.dumps(self.index, separators=(",", ":")))
+        os.replace(tmp_file, self.index_file)
 
     async def refresh(
         self,
@@ -104,56 +124,182 @@ class PackageIndexManager:
             "registries": {},
             "failover_summary": self.failover_manager.get_health_summary()
         }
+        previous = self.index.get("registries", {})
+        semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
 
-        async with httpx.AsyncClient(timeout=self.failover_manager.config.timeout) as client:
-            for registry in registries_to_refresh:
+        async def refresh_registry(registry: RegistryConfig, client: httpx.AsyncClient):
+            async with semaphore:
                 try:
                     logger.info(f"Fetching packages from {registry.name}...")
-                    
+
                     # Use retry logic for individual registries
-                    packages = await self.failover_manager.execute_with_retry(
-                        self._fetch_from_registry_with_client,
+                    entry = await self.failover_manager.execute_with_retry(
+                        self._refresh_registry_with_client,
                         registry,
                         "fetch_packages",
-                        client=client
+                        client=client,
+                        previous=previous.get(registry.name)
                     )
-                    
-                    new_index["registries"][registry.name] = {
-                        "url": registry.url,
-                        "packages": [pkg.model_dump() for pkg in packages],
-                        "last_updated": datetime.now(UTC).isoformat()
-                    }
-                    logger.info(f"Fetched {len(packages)} packages from {registry.name}")
-                    
+                    new_index["registries"][registry.name] = entry
+                    logger.info(
+                        f"Fetched {len(entry['packages'])} packages from {registry.name} "
+                        f"({entry.get('refresh_mode', 'full')})"
+                    )
+
                 except Exception as e:
                     logger.error(f"Failed to fetch from {registry.name} after retries: {e}")
                     # Continue with other registries - partial failure is acceptable
 
+        async with httpx.AsyncClient(timeout=self.failover_manager.config.timeout) as client:
+            await asyncio.gather(*(
+                refresh_registry(registry, client) for registry in registries_to_refresh
+            ))
+
+        # Keep registry order stable (priority order) regardless of completion order
+        new_index["registries"] = {
+            registry.name: new_index["registries"][registry.name]
+            for registry in registries_to_refresh
+            if registry.name in new_index["registries"]
+        }
+
         # Only update if we got data from at least one registry
         if new_index["registries"]:
             self.index = new_index
+            self.lookup = PackageLookup(new_index)
             self._save_index()
             logger.info(f"Package index refreshed successfully from {len(new_index['registries'])} registries")
         else:
             logger.warning("No registries available - keeping existing index")
             raise Exception("All registries failed - package index not updated")
 
-    async def _fetch_from_registry_with_client(
+    async def _refresh_registry_with_client(
         self,
         registry: RegistryConfig,
-        client: httpx.AsyncClient
-    ) -> List[PackageMetadata]:
+        client: httpx.AsyncClient,
+        previous: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
-        Wrapper for _fetch_from_registry that matches failover manager signature.
-        
+        Wrapper for _refresh_registry that matches failover manager signature.
+
         Args:
             registry: Registry configuration
             client: HTTP client
-            
+            previous: Index entry from the last refresh (for conditional requests)
+
         Returns:
-            List of package metadata
+            Index entry for the registry
+        """
+        return await self._refresh_registry(client, registry, previous)
+
+    async def _refresh_registry(
+        self,
+        client: httpx.AsyncClient,
+        registry: RegistryConfig,
+        previous: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build a registry's index entry, reusing the previous one when unchanged.
+
+        Args:
+            client: HTTP client
+            registry: Registry configuration
+            previous: Index entry from the last refresh, if any
+
+        Returns:
+            Index entry with packages and cache validators
         """
-        return await self._fetch_from_registry(client, registry)
+        now = datetime.now(UTC).isoformat()
+
+        if registry.url.startswith("file://"):
+            packages = await self._scan_local_directory(registry)
+            return {
+                "url": registry.url,
+                "packages": [pkg.model_dump() for pkg in packages],
+                "last_updated": now,
+                "refresh_mode": "full"
+            }
+
+        # Validators only apply to the same URL the previous entry came from
+        if previous and previous.get("url") != registry.url:
+            previous = None
+
+        headers = {}
+        params = {}
+        if previous:
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
+            if previous.get("cursor"):
+                params["since"] = previous["cursor"]
+
+        response = await client.get(
+            f"{registry.url}/api/v2/packages", headers=headers, params=params
+        )
+
+        if response.status_code == 304 and previous:
+            return {**previous, "last_checked": now, "refresh_mode": "not_modified"}
+        response.raise_for_status()
+
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        validators = {
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "content_hash": content_hash,
+        }
+
+        if previous and previous.get("content_hash") == content_hash:
+            return {**previous, **validators, "last_checked": now, "refresh_mode": "unchanged"}
+
+        data = response.json()
+        validators["cursor"] = data.get("cursor")
+
+        if data.get("delta") and previous:
+            packages = self._apply_delta(previous.get("packages", []), data)
+            mode = "delta"
+        else:
+            packages = [PackageMetadata(**pkg).model_dump() for pkg in data.get("packages", [])]
+            mode = "full"
+
+        return {
+            "url": registry.url,
+            "packages": packages,
+            "last_updated": now,
+            "last_checked": now,
+            **validators,
+            "refresh_mode": mode
+        }
+
+    def _apply_delta(
+        self,
+        packages: List[Dict[str, Any]],
+        delta: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply an incremental catalog response to a registry's package list.
+
+        Args:
+            packages: Current package dicts for the registry
+            delta: Delta response with "packages" (upserts) and "removed"
+                   ([{"name", "version"}]; omitting version removes all versions)
+
+        Returns:
+            Updated package list
+        """
+        by_key = {(pkg["name"], pkg["version"]): pkg for pkg in packages}
+
+        for removed in delta.get("removed", []):
+            if removed.get("version") is None:
+                for key in [k for k in by_key if k[0] == removed["name"]]:
+                    del by_key[key]
+            else:
+                by_key.pop((removed["name"], removed["version"]), None)
+
+        for pkg in delta.get("packages", []):
+            metadata = PackageMetadata(**pkg)
+            by_key[(metadata.name, metadata.version)] = metadata.model_dump()
+
+        return list(by_key.values())
 
     async def _fetch_from_registry(
         self,
@@ -269,40 +415,30 @@ class PackageIndexManager:
         filters = filters or {}
         installed_packages = installed_packages or {}
 
-        for reg_name, reg_data in self.index.get("registries", {}).items():
-            for pkg in reg_data.get("packages", []):
-                # Apply query filter
-                if query:
-                    if query.lower() not in pkg["name"].lower() and \
-                       query.lower() not in pkg.get("description", "").lower():
-                        continue
-
-                # Apply type filter
-                if "type" in filters and pkg.get("type") != filters["type"]:
-                    continue
-
-                # Apply tags filter
-                if "tags" in filters:
-                    pkg_tags = set(pkg.get("tags", []))
-                    filter_tags = set(filters["tags"])
-                    if not filter_tags.intersection(pkg_tags):
-                        continue
-
-                # Check if installed
-                installed = pkg["name"] in installed_packages
-                installed_version = None
-                if installed:
-                    installed_version = installed_packages[pkg["name"]].version
-
-                results.append(PackageSearchResult(
-                    name=pkg["name"],
-                    version=pkg["version"],
-                    description=pkg.get("description", ""),
-                    registry=reg_name,
-                    tags=pkg.get("tags", []),
-                    installed=installed,
-                    installed_version=installed_version
-                ))
+        positions = self.lookup.search(
+            query=query,
+            package_type=filters["type"] if "type" in filters else None,
+            tags=filters["tags"] if "tags" in filters else None
+        )
+
+        for position in positions:
+            reg_name, pkg = self.lookup.entries[position]
+
+            # Check if installed
+            installed = pkg["name"] in installed_packages
+            installed_version = None
+            if installed:
+                installed_version = installed_packages[pkg["name"]].version
+
+            results.append(PackageSearchResult(
+                name=pkg["name"],
+                version=pkg["version"],
+                description=pkg.get("description", ""),
+                registry=reg_name,
+                tags=pkg.get("tags", []),
+                installed=installed,
+                installed_version=installed_version
+            ))
 
         return results
 
@@ -321,19 +457,17 @@ class PackageIndexManager:
         Returns:
             Package info or None if not found
         """
-        for reg_name, reg_data in self.index.get("registries", {}).items():
-            for pkg in reg_data.get("packages", []):
-                if pkg["name"] == name:
-                    if version is None or pkg["version"] == version:
-                        metadata = PackageMetadata(**pkg)
-                        return PackageInfo(
-                            metadata=metadata,
-                            registry_name=reg_name,
-                            registry_url=reg_data["url"],
-                            available_versions=[pkg["version"]]
-                        )
+        position = self.lookup.find(name, version)
+        if position is None:
+            return None
 
-        return None
+        reg_name, pkg = self.lookup.entries[position]
+        return PackageInfo(
+            metadata=PackageMetadata(**pkg),
+            registry_name=reg_name,
+            registry_url=self.lookup.registry_urls[reg_name],
+            available_versions=self.lookup.versions(name)
+        )
 
     def get_registry_health(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -387,7 +521,9 @@ class PackageIndexManager:
                 result = await self.failover_manager.execute_with_failover(
                     lambda reg: search_registry(reg, client),
                     registries,
-                    f"search_package_{name}"
+                    f"search_package_{name}",
+                    # Not found on one registry: let the others answer
+                    accept=lambda info: info is not None
                 )
                 return result
                 
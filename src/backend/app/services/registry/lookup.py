@@ -0,0 +1,173 @@
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Package Lookup Tables
+
+Single responsibility: Index the package index for fast queries
+
+Built once per loaded/refreshed index so search and dependency resolution
+are dict lookups instead of nested scans over every registry:
+- name -> versions, (name, version) -> package
+- tag -> packages and type -> packages inverted indexes
+- token -> packages over name + description for search
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.models.registry_models import PackageMetadata
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Query results kept per lookup; cleared whenever the index is rebuilt
+_MAX_CACHED_QUERIES = 256
+
+
+class PackageLookup:
+    """Read-only lookup tables over a package index dictionary"""
+
+    def __init__(self, package_index: Dict[str, Any]):
+        """
+        Build lookup tables.
+
+        Args:
+            package_index: Package index dictionary ({"registries": {...}})
+        """
+        # Index the tables were built from (used to detect a swapped index)
+        self.source = package_index
+
+        # Position -> (registry name, package dict), in index order
+        self.entries: List[Tuple[str, Dict[str, Any]]] = []
+        self.registry_urls: Dict[str, str] = {}
+        self.by_name: Dict[str, List[int]] = {}
+        self.by_name_version: Dict[Tuple[str, str], int] = {}
+        self.by_tag: Dict[str, Set[int]] = {}
+        self.by_type: Dict[str, Set[int]] = {}
+        self.by_token: Dict[str, Set[int]] = {}
+        # Lowercased "name\ndescription" per position for phrase queries
+        self._search_text: List[str] = []
+        self._metadata: Dict[int, PackageMetadata] = {}
+        self._query_cache: Dict[str, Set[int]] = {}
+
+        for reg_name, reg_data in package_index.get("registries", {}).items():
+            self.registry_urls[reg_name] = reg_data.get("url", "")
+            for pkg in reg_data.get("packages", []):
+                self._add(reg_name, pkg)
+
+    def _add(self, reg_name: str, pkg: Dict[str, Any]):
+        """Add one package to every table"""
+        position = len(self.entries)
+        self.entries.append((reg_name, pkg))
+
+        name, version = pkg["name"], pkg["version"]
+        self.by_name.setdefault(name, []).append(position)
+        # First registry in priority order wins, like a linear scan would
+        self.by_name_version.setdefault((name, version), position)
+
+        for tag in pkg.get("tags", []):
+            self.by_tag.setdefault(tag, set()).add(position)
+        self.by_type.setdefault(pkg.get("type"), set()).add(position)
+
+        text = f"{name.lower()}\n{pkg.get('description', '').lower()}"
+        self._search_text.append(text)
+        for token in _TOKEN_RE.findall(text):
+            self.by_token.setdefault(token, set()).add(position)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def versions(self, name: str) -> List[str]:
+        """All versions of a package across registries (index order, unique)"""
+        return list(dict.fromkeys(
+            self.entries[position][1]["version"] for position in self.by_name.get(name, [])
+        ))
+
+    def find(self, name: str, version: Optional[str] = None) -> Optional[int]:
+        """
+        Position of the first matching package.
+
+        Args:
+            name: Package name
+            version: Exact version, or None for the first listed version
+        """
+        if version is not None:
+            return self.by_name_version.get((name, version))
+        positions = self.by_name.get(name)
+        return positions[0] if positions else None
+
+    def get_metadata(self, name: str, version: str) -> Optional[PackageMetadata]:
+        """
+        Validated metadata for an exact (name, version).
+
+        Parsed once per index build; callers must treat it as read-only.
+        """
+        position = self.by_name_version.get((name, version))
+        if position is None:
+            return None
+        metadata = self._metadata.get(position)
+        if metadata is None:
+            metadata = PackageMetadata(**self.entries[position][1])
+            self._metadata[position] = metadata
+        return metadata
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        package_type: Optional[str] = None,
+        tags: Optional[List[str]] = None
+    ) -> List[int]:
+        """
+        Positions matching a query and filters, in index order.
+
+        Args:
+            query: Case-insensitive substring of name or description
+            package_type: Exact package type
+            tags: Match packages having any of these tags
+
+        Returns:
+            Matching positions
+        """
+        candidates: Optional[Set[int]] = None
+
+        if query:
+            candidates = self._match_query(query.lower())
+        if package_type is not None:
+            typed = self.by_type.get(package_type, set())
+            candidates = typed if candidates is None else candidates & typed
+        if tags is not None:
+            tagged = set()
+            for tag in tags:
+                tagged |= self.by_tag.get(tag, set())
+            candidates = tagged if candidates is None else candidates & tagged
+
+        if candidates is None:
+            return list(range(len(self.entries)))
+        return sorted(candidates)
+
+    def _match_query(self, query: str) -> Set[int]:
+        """Positions whose name or description contains the query"""
+        cached = self._query_cache.get(query)
+        if cached is not None:
+            return cached
+
+        if _TOKEN_RE.fullmatch(query):
+            # A run of word characters can only occur inside a single token,
+            # so scanning the (much smaller) vocabulary is exact
+            matches = set()
+            for token, positions in self.by_token.items():
+                if query in token:
+                    matches |= positions
+        else:
+            matches = {
+                position for position, text in enumerate(self._search_text)
+                if query in text
+            }
+
+        if len(self._query_cache) >= _MAX_CACHED_QUERIES:
+            self._query_cache.clear()
+        self._query_cache[query] = matches
+        return matches
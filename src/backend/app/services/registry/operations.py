@@ -13,7 +13,7 @@ Single responsibility: Install, update, and remove packages
 import json
 import logging
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional
 from datetime import datetime, UTC
 
 from app.models.registry_models import (
@@ -27,6 +27,7 @@ from app.models.registry_models import (
 )
 from app.mcp_manager import MCPManager
 
+from .planner import InstallPlan, InstallPlanner, InstallPlanError
 from .resolver import DependencyResolver
 from .transactions import TransactionLogger
 
@@ -101,7 +102,7 @@ class PackageOperations:
 
         self.installed_packages_file.write_text(json.dumps(data, indent=2))
 
-    def _create_backup_state(self) -> BackupState:
+    async def _create_backup_state(self) -> BackupState:
         """
         Create backup of current state for rollback.
 
@@ -110,12 +111,15 @@ class PackageOperations:
         """
         container_states = {}
         container_ids = []
+        statuses = None
 
         for name, record in self.installed_packages.items():
             if record.container_id:
                 container_ids.append(record.container_id)
-                status = self.mcp_manager.get_status(name)
-                container_states[name] = status.get("state", "unknown")
+                if statuses is None:
+                    # One batched status query for every container
+                    statuses = {s.get("name"): s for s in await self.mcp_manager.list_installed_async()}
+                container_states[name] = statuses.get(name, {}).get("state", "unknown")
 
         return BackupState(
             installed_packages=json.loads(self.installed_packages_file.read_text()) if self.installed_packages_file.exists() else {},
@@ -124,7 +128,7 @@ class PackageOperations:
             files_backed_up=[str(self.installed_packages_file)]
         )
 
-    def _restore_backup_state(self, backup: BackupState):
+    async def _restore_backup_state(self, backup: BackupState):
         """
         Restore system to backup state (rollback).
 
@@ -144,27 +148,53 @@ class PackageOperations:
         for name, state in backup.container_states.items():
             try:
                 if state == "running":
-                    self.mcp_manager.start(name)
+                    await self.mcp_manager.start_async(name)
                 elif state == "stopped":
-                    self.mcp_manager.stop(name)
+                    await self.mcp_manager.stop_async(name)
             except Exception as e:
                 logger.error(f"Failed to restore container {name}: {e}")
 
         logger.info("Rollback completed")
 
+    async def _rollback_install(self, backup: BackupState, new_packages: List[str]):
+        """
+        Undo a failed install: remove packages it added, then restore the backup.
+
+        Args:
+            backup: Backup state taken before the install
+            new_packages: Names of packages the failed install deployed
+        """
+        previously_installed = backup.installed_packages.get("packages", {})
+        for name in new_packages:
+            if name in previously_installed:
+                continue
+            try:
+                await self.mcp_manager.uninstall_async(name)
+            except Exception as e:
+                logger.error(f"Failed to remove {name} during rollback: {e}")
+            self.installed_packages.pop(name, None)
+
+        await self._restore_backup_state(backup)
+
     async def install(
         self,
         package: PackageMetadata,
         registry_name: str,
-        options: Optional[InstallOptions] = None
+        options: Optional[InstallOptions] = None,
+        progress_callback: Optional[Callable] = None
     ) -> TransactionRecord:
         """
         Install a package with dependencies.
 
+        Independent dependencies are installed concurrently (up to
+        options.max_parallel); a package only starts once the dependencies
+        it declares are installed.
+
         Args:
             package: Package metadata
             registry_name: Registry name (for tracking)
             options: Installation options
+            progress_callback: Optional callback receiving per-package progress events
 
         Returns:
             Transaction record
@@ -176,13 +206,16 @@ class PackageOperations:
             package.version
         )
 
+        # Packages this transaction deployed (removed again on rollback)
+        deployed: List[str] = []
+
         try:
             transaction.status = TransactionStatus.IN_PROGRESS
             self.transaction_logger.log(transaction)
 
             # Create backup
             if not options.no_rollback:
-                transaction.backup_state = self._create_backup_state()
+                transaction.backup_state = await self._create_backup_state()
 
             # Check if already installed
             if package.name in self.installed_packages:
@@ -199,43 +232,43 @@ class PackageOperations:
                 deps = self.resolver.resolve(package, self.installed_packages)
                 transaction.dependencies_installed = [f"{d.name}@{d.version}" for d in deps]
 
-            # Install dependencies first
-            for dep in deps:
-                logger.info(f"Installing dependency: {dep.name}@{dep.version}")
-                dep_result = self.mcp_manager.install(dep.model_dump())
-                if dep_result.get("status") not in ["installed", "already_installed"]:
-                    raise Exception(f"Failed to install dependency {dep.name}: {dep_result.get('error')}")
+            # Install dependencies first, independent ones in parallel
+            async def install_node(node: PackageMetadata):
+                is_dependency = node is not package
+                if is_dependency:
+                    logger.info(f"Installing dependency: {node.name}@{node.version}")
+                else:
+                    logger.info(f"Installing package: {node.name}@{node.version}")
+
+                result = await self.mcp_manager.install_async(node.model_dump())
+                if result.get("status") not in ["installed", "already_installed"]:
+                    if is_dependency:
+                        raise Exception(f"Failed to install dependency {node.name}: {result.get('error')}")
+                    raise Exception(f"Installation failed: {result.get('error')}")
+
+                if result.get("status") == "installed":
+                    deployed.append(node.name)
 
                 # Record installation
-                self.installed_packages[dep.name] = InstallationRecord(
-                    name=dep.name,
-                    version=dep.version,
+                self.installed_packages[node.name] = InstallationRecord(
+                    name=node.name,
+                    version=node.version,
                     installed_at=datetime.now(UTC),
                     installed_from=registry_name,
-                    container_id=dep_result.get("container_id"),
-                    container_name=dep_result.get("container_name"),
+                    container_id=result.get("container_id"),
+                    container_name=result.get("container_name"),
                     transaction_id=transaction.id,
-                    metadata=dep
+                    metadata=node
                 )
+                return result
 
-            # Install main package
-            logger.info(f"Installing package: {package.name}@{package.version}")
-            install_result = self.mcp_manager.install(package.model_dump())
-
-            if install_result.get("status") not in ["installed", "already_installed"]:
-                raise Exception(f"Installation failed: {install_result.get('error')}")
-
-            # Record installation
-            self.installed_packages[package.name] = InstallationRecord(
-                name=package.name,
-                version=package.version,
-                installed_at=datetime.now(UTC),
-                installed_from=registry_name,
-                container_id=install_result.get("container_id"),
-                container_name=install_result.get("container_name"),
-                transaction_id=transaction.id,
-                metadata=package
-            )
+            plan = InstallPlan(package, deps)
+            try:
+                await InstallPlanner(options.max_parallel).execute(
+                    plan, install_node, progress_callback
+                )
+            except InstallPlanError as e:
+                raise e.error
 
             # Save state
             self._save_installed_packages()
@@ -257,7 +290,7 @@ class PackageOperations:
 
             # Rollback if enabled
             if not options.no_rollback and transaction.backup_state:
-                self._restore_backup_state(transaction.backup_state)
+                await self._rollback_install(transaction.backup_state, deployed)
                 transaction.status = TransactionStatus.ROLLED_BACK
                 self.transaction_logger.log(transaction)
 
@@ -301,10 +334,10 @@ class PackageOperations:
                 return transaction
 
             # Create backup
-            transaction.backup_state = self._create_backup_state()
+            transaction.backup_state = await self._create_backup_state()
 
             # Update via MCP manager
-            update_result = self.mcp_manager.update(name, new_package.model_dump())
+            update_result = await self.mcp_manager.update_async(name, new_package.model_dump())
 
             if update_result.get("status") != "updated":
                 raise Exception(f"Update failed: {update_result.get('error')}")
@@ -331,7 +364,7 @@ class PackageOperations:
 
             # Rollback
             if transaction.backup_state:
-                self._restore_backup_state(transaction.backup_state)
+                await self._restore_backup_state(transaction.backup_state)
                 transaction.status = TransactionStatus.ROLLED_BACK
                 self.transaction_logger.log(transaction)
 
@@ -378,10 +411,10 @@ class PackageOperations:
                     raise ValueError(f"Cannot remove {name}: required by {', '.join(dependents)}")
 
             # Create backup
-            transaction.backup_state = self._create_backup_state()
+            transaction.backup_state = await self._create_backup_state()
 
             # Remove via MCP manager
-            remove_result = self.mcp_manager.uninstall(name)
+            remove_result = await self.mcp_manager.uninstall_async(name)
 
             if remove_result.get("status") != "uninstalled":
                 raise Exception(f"Removal failed: {remove_result.get('error')}")
@@ -406,7 +439,7 @@ class PackageOperations:
 
             # Rollback
             if transaction.backup_state:
-                self._restore_backup_state(transaction.backup_state)
+                await self._restore_backup_state(transaction.backup_state)
                 transaction.status = TransactionStatus.ROLLED_BACK
                 self.transaction_logger.log(transaction)
 
@@ -432,7 +465,7 @@ class PackageOperations:
 
         # Restore backup
         backup = BackupState(**txn_data["backup_state"])
-        self._restore_backup_state(backup)
+        await self._restore_backup_state(backup)
 
         # Log rollback transaction
         rollback_txn = self.transaction_logger.create_transaction(
@@ -479,7 +512,7 @@ class PackageOperations:
             
             # Create backup
             if not options.no_rollback:
-                transaction.backup_state = self._create_backup_state()
+                transaction.backup_state = await self._create_backup_state()
             
             # Check if already installed
             if package.name in self.installed_packages:
@@ -526,11 +559,11 @@ class PackageOperations:
                         logger.error(f"Failed to validate local dependency {dep.name}: {e}")
                         # Fallback to regular installation
                         logger.warning(f"Local dependency validation failed for {dep.name}, trying regular installation")
-                        dep_result = self.mcp_manager.install(dep.model_dump())
+                        dep_result = await self.mcp_manager.install_async(dep.model_dump())
                 else:
                     # Fallback to regular installation (may fail in air-gapped)
                     logger.warning(f"Local dependency not found for {dep.name}, trying regular installation")
-                    dep_result = self.mcp_manager.install(dep.model_dump())
+                    dep_result = await self.mcp_manager.install_async(dep.model_dump())
                 
                 if dep_result.get("status") not in ["installed", "already_installed"]:
                     raise Exception(f"Failed to install dependency {dep.name}: {dep_result.get('error')}")
@@ -586,7 +619,7 @@ class PackageOperations:
             
             # Rollback if enabled
             if not options.no_rollback and transaction.backup_state:
-                self._restore_backup_state(transaction.backup_state)
+                await self._restore_backup_state(transaction.backup_state)
                 transaction.status = TransactionStatus.ROLLED_BACK
                 self.transaction_logger.log(transaction)
             
@@ -0,0 +1,201 @@
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Install Planner
+
+Single responsibility: Order package installs as a DAG and run them concurrently
+
+The resolver returns a flat dependency list. The planner links each package
+to the dependencies it declares that are part of the same install, then
+installs every package whose prerequisites are done, up to max_parallel
+at a time. The first failure stops new installs from starting; packages
+already in flight are allowed to finish so rollback sees a settled state.
+"""
+
+import asyncio
+import inspect
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.models.registry_models import PackageMetadata
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PARALLEL = 4
+
+
+@dataclass
+class InstallNode:
+    """A package in an install plan"""
+    package: PackageMetadata
+    requires: Set[str] = field(default_factory=set)
+
+    @property
+    def key(self) -> str:
+        return f"{self.package.name}@{self.package.version}"
+
+
+class InstallPlanError(Exception):
+    """Raised when a node in an install plan fails"""
+
+    def __init__(self, failed: str, error: Exception, completed: List[str], skipped: List[str]):
+        super().__init__(str(error))
+        self.failed = failed
+        self.error = error
+        self.completed = completed
+        self.skipped = skipped
+
+
+class InstallPlan:
+    """Dependency DAG for one install operation"""
+
+    def __init__(self, package: PackageMetadata, dependencies: List[PackageMetadata]):
+        """
+        Build the plan.
+
+        Args:
+            package: Package being installed (installed last)
+            dependencies: Resolved dependencies not yet installed
+        """
+        self.nodes: Dict[str, InstallNode] = {}
+        for pkg in list(dependencies) + [package]:
+            node = InstallNode(pkg)
+            self.nodes.setdefault(node.key, node)
+
+        for node in self.nodes.values():
+            for dep in node.package.dependencies.mcps:
+                dep_key = f"{dep.name}@{dep.version}"
+                if dep_key in self.nodes and dep_key != node.key:
+                    node.requires.add(dep_key)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def levels(self) -> List[List[str]]:
+        """
+        Group node keys into waves that can install together.
+
+        Returns:
+            Lists of keys; every key depends only on keys in earlier waves
+
+        Raises:
+            ValueError: If the plan contains a cycle
+        """
+        remaining = {key: set(node.requires) for key, node in self.nodes.items()}
+        levels = []
+        while remaining:
+            ready = [key for key, requires in remaining.items() if not requires]
+            if not ready:
+                raise ValueError(f"Circular dependency in install plan: {', '.join(remaining)}")
+            levels.append(ready)
+            for key in ready:
+                del remaining[key]
+            for requires in remaining.values():
+                requires.difference_update(ready)
+        return levels
+
+
+class InstallPlanner:
+    """Runs an InstallPlan with bounded concurrency"""
+
+    def __init__(self, max_parallel: int = DEFAULT_MAX_PARALLEL):
+        """
+        Initialize install planner.
+
+        Args:
+            max_parallel: Maximum packages installed at the same time
+        """
+        self.max_parallel = max(1, max_parallel)
+
+    async def execute(
+        self,
+        plan: InstallPlan,
+        install_node: Callable[[PackageMetadata], Awaitable[Any]],
+        progress_callback: Optional[Callable] = None
+    ) -> Dict[str, Any]:
+        """
+        Install every node in the plan, dependencies first.
+
+        Args:
+            plan: Install plan
+            install_node: Async function installing one package
+            progress_callback: Optional (sync or async) callback receiving
+                node_started / node_completed / node_failed / node_skipped events
+
+        Returns:
+            Result of install_node keyed by node key
+
+        Raises:
+            InstallPlanError: If any node fails
+        """
+        plan.levels()  # Validate the plan is acyclic before starting anything
+
+        pending = {key: set(node.requires) for key, node in plan.nodes.items()}
+        running: Dict[asyncio.Task, str] = {}
+        results: Dict[str, Any] = {}
+        completed: List[str] = []
+        failure: Optional[tuple] = None
+        total = len(plan)
+
+        async def emit(event: str, key: str, **extra):
+            if not progress_callback:
+                return
+            node = plan.nodes[key]
+            payload = {
+                "event": event,
+                "package": node.package.name,
+                "version": node.package.version,
+                "completed": len(completed),
+                "total": total,
+                **extra
+            }
+            try:
+                result = progress_callback(payload)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"Install progress callback failed: {e}")
+
+        while pending or running:
+            if failure is None:
+                # Start ready nodes in plan order until the pool is full
+                for key in [k for k, requires in pending.items() if not requires]:
+                    if len(running) >= self.max_parallel:
+                        break
+                    del pending[key]
+                    await emit("node_started", key)
+                    task = asyncio.create_task(install_node(plan.nodes[key].package))
+                    running[task] = key
+
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                key = running.pop(task)
+                error = task.exception()
+                if error is not None:
+                    logger.error(f"Install of {key} failed: {error}")
+                    if failure is None:
+                        failure = (key, error)
+                    await emit("node_failed", key, error=str(error))
+                    continue
+
+                results[key] = task.result()
+                completed.append(key)
+                await emit("node_completed", key)
+                for requires in pending.values():
+                    requires.discard(key)
+
+        if failure is not None:
+            skipped = list(pending)
+            for key in skipped:
+                await emit("node_skipped", key)
+            raise InstallPlanError(failure[0], failure[1], completed, skipped)
+
+        return results
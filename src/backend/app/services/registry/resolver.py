@@ -8,6 +8,10 @@
 Dependency Resolver
 
 Single responsibility: Resolve package dependencies with cycle detection
+
+Resolution is a single depth-first walk: each package is expanded once,
+so shared dependencies (diamonds) cost nothing extra and deep
+team -> agent -> MCP graphs resolve in time linear in the graph size.
 """
 
 import logging
@@ -15,20 +19,28 @@ from typing import List, Optional, Set, Dict, Any
 
 from app.models.registry_models import PackageMetadata, InstallationRecord
 
+from .lookup import PackageLookup
+
 logger = logging.getLogger(__name__)
 
 
 class DependencyResolver:
     """Resolves package dependencies (exact version matching only)"""
 
-    def __init__(self, package_index: Dict[str, Any]):
+    def __init__(
+        self,
+        package_index: Dict[str, Any],
+        lookup: Optional[PackageLookup] = None
+    ):
         """
         Initialize dependency resolver.
 
         Args:
             package_index: Package index dictionary
+            lookup: Optional prebuilt lookup tables for package_index
         """
         self.package_index = package_index
+        self.lookup = lookup
 
     def resolve(
         self,
@@ -59,13 +71,41 @@ class DependencyResolver:
         if visited is None:
             visited = set()
 
+        resolved: List[PackageMetadata] = []
+        self._expand(package, installed_packages, visited, set(), set(), resolved)
+        return resolved
+
+    def _expand(
+        self,
+        package: PackageMetadata,
+        installed_packages: Dict[str, InstallationRecord],
+        in_chain: Set[str],
+        expanded: Set[str],
+        seen: Set[str],
+        resolved: List[PackageMetadata]
+    ):
+        """
+        Append a package's dependencies, then their dependencies, to resolved.
+
+        Produces the same order as concatenating each level's direct
+        dependencies with the recursive results and keeping the first
+        occurrence, without rebuilding intermediate lists.
+
+        Args:
+            package: Package being expanded
+            installed_packages: Currently installed packages
+            in_chain: Packages on the current dependency chain (cycle detection)
+            expanded: Packages whose dependencies were already expanded
+            seen: Keys already appended to resolved
+            resolved: Output list
+        """
         # Check for circular dependency
         pkg_key = f"{package.name}@{package.version}"
-        if pkg_key in visited:
+        if pkg_key in in_chain:
             raise ValueError(f"Circular dependency detected: {pkg_key} already in dependency chain")
 
-        # Mark this package as visited
-        visited.add(pkg_key)
+        # Mark this package as part of the chain
+        in_chain.add(pkg_key)
 
         deps_to_install = []
 
@@ -80,17 +120,22 @@ class DependencyResolver:
                 elif dep.required:
                     raise ValueError(f"Required dependency not found: {dep.name}@{dep.version}")
 
-        # Recursively resolve dependencies of dependencies
-        all_deps = list(deps_to_install)
         for dep in deps_to_install:
-            # Pass visited set to detect cycles
-            sub_deps = self.resolve(dep, installed_packages, visited)
-            all_deps.extend(sub_deps)
+            dep_key = f"{dep.name}@{dep.version}"
+            if dep_key not in seen:
+                seen.add(dep_key)
+                resolved.append(dep)
 
-        # Remove duplicates (keep first occurrence)
-        unique_deps = self._deduplicate(all_deps)
+        # Recursively resolve dependencies of dependencies; a package that
+        # was already expanded can only contribute packages already seen
+        for dep in deps_to_install:
+            dep_key = f"{dep.name}@{dep.version}"
+            if dep_key in expanded and dep_key not in in_chain:
+                continue
+            self._expand(dep, installed_packages, in_chain, expanded, seen, resolved)
 
-        return unique_deps
+        in_chain.discard(pkg_key)
+        expanded.add(pkg_key)
 
     def _find_package(self, name: str, version: str) -> Optional[PackageMetadata]:
         """
@@ -103,27 +148,6 @@ class DependencyResolver:
         Returns:
             PackageMetadata or None if not found
         """
-        for reg_data in self.package_index.get("registries", {}).values():
-            for pkg in reg_data.get("packages", []):
-                if pkg["name"] == name and pkg["version"] == version:
-                    return PackageMetadata(**pkg)
-        return None
-
-    def _deduplicate(self, packages: List[PackageMetadata]) -> List[PackageMetadata]:
-        """
-        Remove duplicate packages from list (keep first occurrence).
-
-        Args:
-            packages: List of packages
-
-        Returns:
-            Deduplicated list
-        """
-        seen = set()
-        unique = []
-        for pkg in packages:
-            key = f"{pkg.name}@{pkg.version}"
-            if key not in seen:
-                seen.add(key)
-                unique.append(pkg)
-        return unique
+        if self.lookup is None or self.lookup.source is not self.package_index:
+            self.lookup = PackageLookup(self.package_index)
+        return self.lookup.get_metadata(name, version)
@@ -15,7 +15,7 @@ import logging
 import re
 import subprocess
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, List, Optional
 
 from app.models.registry_models import (
     RegistryConfig,
@@ -108,7 +108,7 @@ class RegistryService:
         self.registries = self.config_loader.load()
 
         # Initialize resolver with current index
-        self.resolver = DependencyResolver(self.index_manager.index)
+        self.resolver = DependencyResolver(self.index_manager.index, self.index_manager.lookup)
 
         # Initialize operations
         self.operations = PackageOperations(
@@ -393,6 +393,7 @@ class RegistryService:
 
         # Update resolver with new index
         self.resolver.package_index = self.index_manager.index
+        self.resolver.lookup = self.index_manager.lookup
 
     async def search_packages(
         self,
@@ -446,7 +447,8 @@ class RegistryService:
         name: str,
         version: Optional[str] = None,
         options: Optional[InstallOptions] = None,
-        local_path: Optional[str] = None
+        local_path: Optional[str] = None,
+        progress_callback: Optional[Callable] = None
     ) -> TransactionRecord:
         """
         Install a package with dependencies.
@@ -456,6 +458,7 @@ class RegistryService:
             version: Optional specific version (defaults to latest)
             options: Installation options
             local_path: Optional local directory path for air-gapped installation
+            progress_callback: Optional callback receiving per-package progress events
 
         Returns:
             Transaction record
@@ -472,7 +475,8 @@ class RegistryService:
         return await self.operations.install(
             pkg_info.metadata,
             pkg_info.registry_name,
-            options
+            options,
+            progress_callback
         )
 
     async def update_package(
@@ -527,6 +531,27 @@ class RegistryService:
         """
         return self.transaction_logger.list_transactions(limit)
 
+    def get_transaction(self, transaction_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest state of a transaction.
+
+        Args:
+            transaction_id: Transaction ID
+
+        Returns:
+            Transaction record or None if not found
+        """
+        return self.transaction_logger.get_transaction(transaction_id)
+
+    def compact_transactions(self) -> Optional[Path]:
+        """
+        Compact the transaction log, archiving its full history.
+
+        Returns:
+            Path of the archived segment, or None if nothing was compacted
+        """
+        return self.transaction_logger.compact()
+
     async def rollback_transaction(self, transaction_id: str) -> bool:
         """
         Rollback a specific transaction.
@@ -625,6 +650,15 @@ class RegistryService:
         """
         return self.index_manager.get_registry_health()
 
+    def get_hedge_metrics(self) -> Dict[str, Any]:
+        """
+        Get hedged request metrics for registry failover.
+        
+        Returns:
+            Hedge counters and rates
+        """
+        return self.index_manager.failover_manager.get_hedge_metrics()
+
     async def run_health_checks(self):
         """
         Run health checks on all enabled registries.
@@ -8,13 +8,22 @@
 Transaction Logger
 
 Single responsibility: Log and retrieve transactions (append-only JSONL)
+
+Every status change appends the full record again, so the log holds several
+lines per transaction. Lookups go through an in-memory id -> byte offset
+index of each transaction's latest line, listing reads the file backwards
+from the end, and compaction rewrites the log with only the latest line per
+transaction after moving the full history into an archive segment.
 """
 
 import json
 import logging
+import os
+import shutil
+import threading
 import uuid
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional
 from datetime import datetime, UTC
 
 from app.models.registry_models import (
@@ -26,17 +35,42 @@ from app.models.registry_models import (
 logger = logging.getLogger(__name__)
 
 
+# Block size for reading the log backwards
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+# Auto-compact once the log is this large and mostly superseded lines
+DEFAULT_COMPACT_THRESHOLD_BYTES = 8 * 1024 * 1024
+
+
 class TransactionLogger:
     """Manages transaction logging to append-only JSONL file"""
 
-    def __init__(self, log_file: Path):
+    def __init__(
+        self,
+        log_file: Path,
+        archive_dir: Optional[Path] = None,
+        compact_threshold_bytes: Optional[int] = DEFAULT_COMPACT_THRESHOLD_BYTES
+    ):
         """
         Initialize transaction logger.
 
         Args:
             log_file: Path to transactions.jsonl
+            archive_dir: Directory for archived history segments
+                (defaults to transactions-archive/ next to the log)
+            compact_threshold_bytes: Log size that triggers automatic
+                compaction (None disables it)
         """
         self.log_file = log_file
+        self.archive_dir = archive_dir or log_file.parent / f"{log_file.stem}-archive"
+        self.compact_threshold_bytes = compact_threshold_bytes
+
+        # Transaction id -> byte offset of its latest line
+        self._offsets: Dict[str, int] = {}
+        self._indexed_size = 0
+        self._indexed_inode: Optional[int] = None
+        self._line_count = 0
+        self._lock = threading.Lock()
 
         # Ensure log file exists
         if not self.log_file.exists():
@@ -75,9 +109,21 @@ class TransactionLogger:
         Args:
             transaction: Transaction record to log
         """
-        log_line = json.dumps(transaction.to_dict())
-        with open(self.log_file, "a") as f:
-            f.write(log_line + "\n")
+        log_line = (json.dumps(transaction.to_dict()) + "\n").encode()
+        with self._lock:
+            self._sync_index()
+            with open(self.log_file, "ab") as f:
+                offset = f.tell()
+                f.write(log_line)
+            self._offsets[transaction.id] = offset
+            self._indexed_size = offset + len(log_line)
+            self._line_count += 1
+
+            if self._should_compact():
+                try:
+                    self._compact()
+                except OSError as e:
+                    logger.error(f"Transaction log compaction failed: {e}")
 
     def list_transactions(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
@@ -93,16 +139,19 @@ class TransactionLogger:
             return []
 
         transactions = []
-        with open(self.log_file, "r") as f:
-            for line in f:
-                try:
-                    txn = json.loads(line.strip())
-                    transactions.append(txn)
-                except Exception as e:
-                    logger.error(f"Failed to parse transaction log line: {e}")
+        if limit <= 0:
+            return transactions
+
+        for line in self._read_lines_reversed():
+            try:
+                transactions.append(json.loads(line))
+            except Exception as e:
+                logger.error(f"Failed to parse transaction log line: {e}")
+                continue
+            if len(transactions) >= limit:
+                break
 
-        # Return most recent first
-        return list(reversed(transactions[-limit:]))
+        return transactions
 
     def get_transaction(self, transaction_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -112,18 +161,143 @@ class TransactionLogger:
             transaction_id: Transaction ID
 
         Returns:
-            Transaction record or None if not found
+            Latest recorded state of the transaction, or None if not found
         """
         if not self.log_file.exists():
             return None
 
-        with open(self.log_file, "r") as f:
+        with self._lock:
+            self._sync_index()
+            offset = self._offsets.get(transaction_id)
+            if offset is None:
+                return None
+            with open(self.log_file, "rb") as f:
+                f.seek(offset)
+                line = f.readline()
+
+        try:
+            return json.loads(line)
+        except Exception as e:
+            logger.error(f"Failed to parse transaction {transaction_id}: {e}")
+            return None
+
+    def compact(self) -> Optional[Path]:
+        """
+        Rewrite the log with only the latest state of each transaction.
+
+        The full log is first moved to a timestamped segment in archive_dir.
+
+        Returns:
+            Path of the archived segment, or None if there was nothing to compact
+        """
+        with self._lock:
+            self._sync_index()
+            return self._compact()
+
+    # Private helper methods
+
+    def _sync_index(self):
+        """Index lines appended since the last sync (rebuild if the log was replaced)"""
+        try:
+            stat = self.log_file.stat()
+        except FileNotFoundError:
+            self.log_file.touch()
+            stat = self.log_file.stat()
+        size = stat.st_size
+
+        if stat.st_ino != self._indexed_inode or size < self._indexed_size:
+            self._offsets.clear()
+            self._indexed_size = 0
+            self._indexed_inode = stat.st_ino
+            self._line_count = 0
+        if size == self._indexed_size:
+            return
+
+        with open(self.log_file, "rb") as f:
+            f.seek(self._indexed_size)
+            offset = self._indexed_size
             for line in f:
-                try:
-                    txn = json.loads(line.strip())
-                    if txn.get("id") == transaction_id:
-                        return txn
-                except Exception:
-                    pass
+                if not line.endswith(b"\n"):
+                    break  # Partial write in progress; index it next time
+                transaction_id = self._extract_id(line)
+                if transaction_id is not None:
+                    self._offsets[transaction_id] = offset
+                    self._line_count += 1
+                offset += len(line)
+        self._indexed_size = offset
+
+    @staticmethod
+    def _extract_id(line: bytes) -> Optional[str]:
+        try:
+            return json.loads(line).get("id")
+        except Exception:
+            return None
 
-        return None
+    def _read_lines_reversed(self) -> Iterator[bytes]:
+        """Yield non-empty log lines from last to first, reading blocks from the end"""
+        with open(self.log_file, "rb") as f:
+            position = f.seek(0, os.SEEK_END)
+            remainder = b""
+            while position > 0:
+                read_size = min(_TAIL_BLOCK_SIZE, position)
+                position -= read_size
+                f.seek(position)
+                lines = (f.read(read_size) + remainder).split(b"\n")
+                # First piece may be the tail of a line that starts earlier
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    if line.strip():
+                        yield line
+            if remainder.strip():
+                yield remainder
+
+    def _should_compact(self) -> bool:
+        if self.compact_threshold_bytes is None:
+            return False
+        return (
+            self._indexed_size >= self.compact_threshold_bytes
+            and self._line_count > 2 * len(self._offsets)
+        )
+
+    def _compact(self) -> Optional[Path]:
+        """Compact the log (caller holds the lock and has synced the index)"""
+        if self._line_count <= len(self._offsets):
+            return None
+
+        # Latest line of each transaction, in log order
+        latest = sorted(self._offsets.values())
+        temp_file = self.log_file.with_suffix(self.log_file.suffix + ".tmp")
+        offsets: Dict[str, int] = {}
+        with open(self.log_file, "rb") as src, open(temp_file, "wb") as dst:
+            for offset in latest:
+                src.seek(offset)
+                line = src.readline()
+                transaction_id = self._extract_id(line)
+                if transaction_id is None:
+                    continue
+                offsets[transaction_id] = dst.tell()
+                dst.write(line)
+            dst.flush()
+            os.fsync(dst.fileno())
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%fZ")
+        archive_file = self.archive_dir / f"{self.log_file.stem}-{stamp}{self.log_file.suffix}"
+        # Archive the full history, then swap the compacted log in atomically
+        try:
+            os.link(self.log_file, archive_file)
+        except OSError:
+            shutil.copyfile(self.log_file, archive_file)
+        os.replace(temp_file, self.log_file)
+
+        removed = self._line_count - len(offsets)
+        self._offsets = offsets
+        stat = self.log_file.stat()
+        self._indexed_size = stat.st_size
+        self._indexed_inode = stat.st_ino
+        self._line_count = len(offsets)
+        logger.info(
+            f"Compacted transaction log: kept {len(offsets)} transactions, "
+            f"archived {removed} superseded lines to {archive_file}"
+        )
+        return archive_file
@@ -0,0 +1,658 @@
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Scheduler Service - Runs schedule triggers inside the orchestrator.
+
+Replaces one container + croniter loop per schedule trigger with a single
+timer heap for every cron schedule:
+- Each firing is delayed by a random jitter (up to jitter_seconds) so
+  schedules sharing a cron expression do not all fire at the same instant
+- Firings for the same workflow/team share a concurrency cap (the largest
+  max_concurrent of the schedules targeting it); a schedule that already
+  has a firing waiting for the cap is coalesced
+- Orchestrator calls are bounded by SCHEDULER_FIRE_TIMEOUT so a hung
+  request cannot hold a slot of the cap forever
+- Next fire times are persisted, and firings missed while the orchestrator
+  was down are handled by the schedule's misfire policy on start:
+  "skip", "fire_once" (one catch-up run) or "fire_all" (up to max_catchup)
+"""
+
+import asyncio
+import heapq
+import json
+import os
+import random
+import re
+import time
+from dataclasses import dataclass, asdict, field, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+import httpx
+from croniter import croniter
+
+from app.core.logging import get_service_logger
+
+logger = get_service_logger("scheduler")
+
+MISFIRE_POLICIES = ("skip", "fire_once", "fire_all")
+DEFAULT_CRON_EXPRESSION = "0 0 * * *"
+DEFAULT_JITTER_SECONDS = 30.0
+DEFAULT_MAX_CATCHUP = 10
+DEFAULT_FIRE_TIMEOUT = 600.0
+# A firing this late is still treated as on time rather than missed
+MISFIRE_GRACE_SECONDS = 60.0
+
+_ENV_DEFAULT_RE = re.compile(r"^\$\{(\w+)(?::-(.*))?\}$")
+
+
+def scheduler_enabled() -> bool:
+    """Whether schedule triggers run in the orchestrator (SCHEDULER_ENABLED, default true)"""
+    return os.getenv("SCHEDULER_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+
+
+def scheduler_fire_timeout() -> float:
+    """Seconds a firing's orchestrator call may take (SCHEDULER_FIRE_TIMEOUT, default 600)"""
+    value = os.getenv("SCHEDULER_FIRE_TIMEOUT")
+    if not value:
+        return DEFAULT_FIRE_TIMEOUT
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid SCHEDULER_FIRE_TIMEOUT={value!r}, using {DEFAULT_FIRE_TIMEOUT}")
+        return DEFAULT_FIRE_TIMEOUT
+
+
+def is_schedule_trigger(trigger_package: Dict[str, Any]) -> bool:
+    """Whether a trigger package is a cron schedule trigger"""
+    return trigger_package.get("trigger", {}).get("type") == "schedule"
+
+
+def _resolve_env_default(value: Any) -> Any:
+    """Resolve a "${VAR:-default}" package value from the environment"""
+    if not isinstance(value, str):
+        return value
+    match = _ENV_DEFAULT_RE.match(value.strip())
+    if not match:
+        return value
+    return os.getenv(match.group(1), match.group(2) or "")
+
+
+@dataclass
+class Schedule:
+    """A cron schedule targeting a workflow or team"""
+    name: str
+    cron_expression: str
+    version: str = "unknown"
+    timezone: str = "UTC"
+    workflow_id: Optional[str] = None
+    team_id: Optional[str] = None
+    task_description: str = "Execute scheduled task"
+    jitter_seconds: float = DEFAULT_JITTER_SECONDS
+    misfire_policy: str = "fire_once"
+    max_concurrent: int = 1  # Schedules sharing a target use the largest value
+    enabled: bool = True
+    next_fire: Optional[float] = None  # Unjittered cron time (epoch seconds)
+    last_fire: Optional[float] = None
+    last_result: Optional[Dict[str, Any]] = None
+    fire_count: int = 0
+    installed_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    package: Optional[Dict[str, Any]] = None
+    user_config: Optional[Dict[str, Any]] = None
+
+    @property
+    def target_key(self) -> str:
+        """Concurrency cap key shared by schedules with the same target"""
+        if self.workflow_id:
+            return f"workflow:{self.workflow_id}"
+        return f"team:{self.team_id}"
+
+    def next_after(self, after: float) -> float:
+        """Next cron time strictly after an epoch timestamp"""
+        start = datetime.fromtimestamp(after, ZoneInfo(self.timezone))
+        return croniter(self.cron_expression, start).get_next(float)
+
+    def validate(self):
+        """
+        Validate the schedule definition.
+
+        Raises:
+            ValueError: If the target, cron expression, timezone or policy is invalid
+        """
+        if not self.workflow_id and not self.team_id:
+            raise ValueError("Must specify workflow_id or team_id")
+        if not croniter.is_valid(self.cron_expression):
+            raise ValueError(f"Invalid cron expression: {self.cron_expression}")
+        try:
+            ZoneInfo(self.timezone)
+        except Exception:
+            raise ValueError(f"Unknown timezone: {self.timezone}")
+        if self.misfire_policy not in MISFIRE_POLICIES:
+            raise ValueError(
+                f"Invalid misfire_policy '{self.misfire_policy}' "
+                f"(expected one of {', '.join(MISFIRE_POLICIES)})"
+            )
+        if self.max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Schedule":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    @classmethod
+    def from_trigger_package(
+        cls,
+        trigger_package: Dict[str, Any],
+        user_config: Dict[str, Any]
+    ) -> "Schedule":
+        """
+        Build a schedule from a schedule trigger package.
+
+        The cron expression and timezone come from user_config, then the
+        package's deployment environment, then trigger.schedule.
+
+        Args:
+            trigger_package: Trigger package from registry
+            user_config: User configuration (workflow_id or team_id, optional overrides)
+
+        Returns:
+            Schedule (not yet validated)
+        """
+        environment = trigger_package.get("deployment", {}).get("environment", {})
+        schedule = trigger_package.get("trigger", {}).get("schedule", {})
+
+        def setting(key: str, env_key: str, default: Any) -> Any:
+            if user_config.get(key) not in (None, ""):
+                return user_config[key]
+            resolved = _resolve_env_default(environment.get(env_key))
+            if resolved not in (None, ""):
+                return resolved
+            return schedule.get(key, default)
+
+        return cls(
+            name=trigger_package["name"],
+            version=trigger_package.get("version", "unknown"),
+            cron_expression=setting("cron_expression", "CRON_EXPRESSION", DEFAULT_CRON_EXPRESSION),
+            timezone=setting("timezone", "TIMEZONE", "UTC"),
+            workflow_id=user_config.get("workflow_id"),
+            team_id=user_config.get("team_id"),
+            task_description=setting(
+                "task_description", "TASK_DESCRIPTION", "Execute scheduled task"
+            ),
+            jitter_seconds=float(setting("jitter_seconds", "JITTER_SECONDS", DEFAULT_JITTER_SECONDS)),
+            misfire_policy=setting("misfire_policy", "MISFIRE_POLICY", "fire_once"),
+            max_concurrent=int(setting("max_concurrent", "MAX_CONCURRENT", 1)),
+            package=trigger_package,
+            user_config=user_config,
+        )
+
+
+FireCallback = Callable[[Schedule, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class SchedulerService:
+    """
+    Heap-based cron scheduler for schedule triggers.
+
+    Responsibilities:
+    - Keep every schedule's next fire time in one timer heap
+    - Fire workflows/teams with jitter and a per-target concurrency cap
+    - Persist schedules and next fire times; apply misfire policies on start
+    """
+
+    def __init__(
+        self,
+        state_file: Path,
+        fire: Optional[FireCallback] = None,
+        orchestrator_url: Optional[str] = None,
+        max_catchup: int = DEFAULT_MAX_CATCHUP,
+        fire_timeout: Optional[float] = None
+    ):
+        """
+        Initialize SchedulerService.
+
+        Args:
+            state_file: Path to schedules.json
+            fire: Async callback executing a firing (defaults to POSTing to
+                the orchestrator's /workflows/execute or /teams/run)
+            orchestrator_url: Base URL used by the default fire callback
+            max_catchup: Maximum missed firings replayed by "fire_all"
+            fire_timeout: Timeout in seconds for the default fire callback's
+                orchestrator call (defaults to SCHEDULER_FIRE_TIMEOUT)
+        """
+        self.state_file = state_file
+        self.orchestrator_url = orchestrator_url or os.getenv(
+            "ORCHESTRATOR_URL", "http://localhost:8000"
+        )
+        self.max_catchup = max_catchup
+        self.fire_timeout = fire_timeout if fire_timeout is not None else scheduler_fire_timeout()
+        self._fire = fire or self._fire_http
+
+        self.schedules: Dict[str, Schedule] = {}
+        # (fire_at, seq, name, generation); entries with an old generation are stale
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._generation: Dict[str, int] = {}
+        self._seq = 0
+        # target_key -> firings holding a slot of the target's cap
+        self._target_running: Dict[str, int] = {}
+        self._slots: Optional[asyncio.Condition] = None
+        self._waiting: Set[str] = set()
+        self._running: Dict[str, int] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._wake: Optional[asyncio.Event] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+        self._load()
+
+    # Lifecycle
+
+    async def start(self):
+        """Apply misfire policies and start the timer loop"""
+        if self._loop_task is not None and not self._loop_task.done():
+            return
+        self._wake = asyncio.Event()
+
+        now = time.time()
+        for schedule in self.schedules.values():
+            if schedule.enabled:
+                self._recover(schedule, now)
+        self._save()
+
+        self._loop_task = asyncio.create_task(self._run_loop())
+        logger.info(f"Scheduler started with {len(self.schedules)} schedules")
+
+    async def stop(self):
+        """Stop the timer loop and wait for in-flight firings"""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+            self._loop_task = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._save()
+
+    # Schedule management (results mirror DockerManager's trigger responses)
+
+    def install(self, trigger_package: Dict[str, Any], user_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Install a schedule trigger.
+
+        Args:
+            trigger_package: Schedule trigger package from registry
+            user_config: User configuration (workflow_id or team_id)
+
+        Returns:
+            Installation result
+        """
+        name = trigger_package["name"]
+        version = trigger_package.get("version", "unknown")
+
+        existing = self.schedules.get(name)
+        if existing is not None and existing.version == version:
+            return {"status": "already_installed", "name": name, "version": version}
+
+        try:
+            schedule = Schedule.from_trigger_package(trigger_package, user_config or {})
+            schedule.validate()
+        except Exception as e:
+            return {"status": "error", "name": name, "version": version, "error": str(e)}
+
+        self.add(schedule)
+        return {
+            "status": "installed",
+            "name": name,
+            "version": version,
+            "scheduler": "orchestrator",
+            "next_fire": self._isoformat(schedule.next_fire),
+        }
+
+    def add(self, schedule: Schedule):
+        """
+        Add or replace a schedule and arm its next firing.
+
+        Args:
+            schedule: Validated schedule
+        """
+        schedule.next_fire = schedule.next_after(time.time())
+        self.schedules[schedule.name] = schedule
+        self._arm(schedule)
+        self._save()
+        logger.info(
+            f"Scheduled {schedule.name} ({schedule.cron_expression} {schedule.timezone}) "
+            f"-> {schedule.target_key}, next at {self._isoformat(schedule.next_fire)}"
+        )
+
+    def uninstall(self, name: str) -> Dict[str, Any]:
+        """Remove a schedule"""
+        schedule = self.schedules.pop(name, None)
+        if schedule is None:
+            return {"status": "not_installed", "name": name}
+        self._disarm(name)
+        self._save()
+        return {"status": "uninstalled", "name": name, "version": schedule.version}
+
+    def start_schedule(self, name: str) -> Dict[str, Any]:
+        """Resume a paused schedule"""
+        schedule = self.schedules.get(name)
+        if schedule is None:
+            return {"status": "not_installed", "name": name}
+        schedule.enabled = True
+        schedule.next_fire = schedule.next_after(time.time())
+        self._arm(schedule)
+        self._save()
+        return {"status": "started", "name": name}
+
+    def stop_schedule(self, name: str) -> Dict[str, Any]:
+        """Pause a schedule (in-flight firings finish)"""
+        schedule = self.schedules.get(name)
+        if schedule is None:
+            return {"status": "not_installed", "name": name}
+        schedule.enabled = False
+        self._disarm(name)
+        self._save()
+        return {"status": "stopped", "name": name}
+
+    def restart_schedule(self, name: str) -> Dict[str, Any]:
+        """Re-arm a schedule from now"""
+        result = self.start_schedule(name)
+        if result["status"] == "started":
+            result["status"] = "restarted"
+        return result
+
+    def update(self, name: str, trigger_package: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace a schedule with a new package version, keeping its user config"""
+        schedule = self.schedules.get(name)
+        if schedule is None:
+            return {"status": "not_installed", "name": name}
+
+        old_version = schedule.version
+        new_version = trigger_package.get("version", "unknown")
+        if old_version == new_version:
+            return {"status": "already_latest", "name": name, "version": new_version}
+
+        result = self.install(trigger_package, schedule.user_config)
+        if result["status"] == "installed":
+            result["status"] = "updated"
+            result["old_version"] = old_version
+            result["new_version"] = new_version
+        return result
+
+    def get_status(self, name: str) -> Dict[str, Any]:
+        """Status of a schedule in the shape of a trigger container status"""
+        schedule = self.schedules.get(name)
+        if schedule is None:
+            return {"status": "not_installed", "name": name}
+        return {
+            "name": name,
+            "version": schedule.version,
+            "container_name": None,
+            "state": "running" if schedule.enabled else "exited",
+            "running": schedule.enabled,
+            "installed_at": schedule.installed_at,
+            "trigger_type": "schedule",
+            "scheduler": "orchestrator",
+            "package": schedule.package,
+            "user_config": schedule.user_config,
+            "cron_expression": schedule.cron_expression,
+            "timezone": schedule.timezone,
+            "misfire_policy": schedule.misfire_policy,
+            "next_fire": self._isoformat(schedule.next_fire) if schedule.enabled else None,
+            "last_fire": self._isoformat(schedule.last_fire),
+            "last_result": schedule.last_result,
+            "fire_count": schedule.fire_count,
+            "in_flight": self._running.get(name, 0),
+        }
+
+    def list_installed(self) -> List[Dict[str, Any]]:
+        """Status of every schedule"""
+        return [self.get_status(name) for name in self.schedules]
+
+    # Timer loop
+
+    async def _run_loop(self):
+        """Sleep until the earliest firing, fire it, re-arm the schedule"""
+        while True:
+            if not self._heap:
+                await self._wait(None)
+                continue
+
+            fire_at, _, name, generation = self._heap[0]
+            delay = fire_at - time.time()
+            if delay > 0:
+                await self._wait(delay)
+                continue
+
+            heapq.heappop(self._heap)
+            schedule = self.schedules.get(name)
+            if schedule is None or self._generation.get(name) != generation:
+                continue  # Removed or re-armed since this entry was pushed
+
+            scheduled_for = schedule.next_fire
+            self._dispatch(schedule, scheduled_for)
+            schedule.next_fire = schedule.next_after(max(scheduled_for, time.time()))
+            self._arm(schedule)
+            self._save()
+
+    async def _wait(self, timeout: Optional[float]):
+        """Sleep until timeout or until the heap changes"""
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _arm(self, schedule: Schedule):
+        """Push the schedule's next firing (with jitter) onto the heap"""
+        generation = self._generation.get(schedule.name, 0) + 1
+        self._generation[schedule.name] = generation
+        if not schedule.enabled or schedule.next_fire is None:
+            return
+
+        jitter = random.uniform(0, schedule.jitter_seconds) if schedule.jitter_seconds > 0 else 0.0
+        self._seq += 1
+        heapq.heappush(
+            self._heap, (schedule.next_fire + jitter, self._seq, schedule.name, generation)
+        )
+        if self._wake is not None:
+            self._wake.set()
+
+    def _disarm(self, name: str):
+        """Invalidate any heap entries of a schedule"""
+        self._generation[name] = self._generation.get(name, 0) + 1
+        if self._wake is not None:
+            self._wake.set()
+
+    def _recover(self, schedule: Schedule, now: float):
+        """Apply the misfire policy to firings missed while stopped, then arm"""
+        if schedule.next_fire is None or schedule.next_fire >= now - MISFIRE_GRACE_SECONDS:
+            if schedule.next_fire is None:
+                schedule.next_fire = schedule.next_after(now)
+            self._arm(schedule)
+            return
+
+        missed = []
+        fire_time = schedule.next_fire
+        while fire_time <= now and len(missed) <= self.max_catchup:
+            missed.append(fire_time)
+            fire_time = schedule.next_after(fire_time)
+
+        if schedule.misfire_policy == "fire_once":
+            replay = missed[-1:]
+        elif schedule.misfire_policy == "fire_all":
+            replay = missed[-self.max_catchup:]
+        else:
+            replay = []
+
+        logger.warning(
+            f"Schedule {schedule.name} missed {len(missed)}"
+            f"{'+' if len(missed) > self.max_catchup else ''} firings; "
+            f"policy {schedule.misfire_policy} replays {len(replay)}"
+        )
+        for scheduled_for in replay:
+            self._dispatch(schedule, scheduled_for, misfire=True, coalesce=False)
+
+        schedule.next_fire = schedule.next_after(now)
+        self._arm(schedule)
+
+    # Firing
+
+    def _dispatch(self, schedule: Schedule, scheduled_for: float, misfire: bool = False, coalesce: bool = True):
+        """Start a firing, coalescing with one already waiting for the cap"""
+        if coalesce and schedule.name in self._waiting:
+            logger.warning(
+                f"Schedule {schedule.name} still waiting on {schedule.target_key} "
+                f"concurrency cap; skipping firing for {self._isoformat(scheduled_for)}"
+            )
+            return
+        task = asyncio.create_task(self._execute(schedule, scheduled_for, misfire))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _target_limit(self, schedule: Schedule) -> int:
+        """Concurrency cap of a schedule's target: the largest max_concurrent targeting it"""
+        return max(
+            [schedule.max_concurrent] + [
+                other.max_concurrent for other in self.schedules.values()
+                if other.target_key == schedule.target_key
+            ]
+        )
+
+    async def _execute(self, schedule: Schedule, scheduled_for: float, misfire: bool):
+        """Run one firing under the target's concurrency cap"""
+        if self._slots is None:
+            self._slots = asyncio.Condition()
+        target_key = schedule.target_key
+
+        self._waiting.add(schedule.name)
+        try:
+            async with self._slots:
+                await self._slots.wait_for(
+                    lambda: self._target_running.get(target_key, 0) < self._target_limit(schedule)
+                )
+                self._target_running[target_key] = self._target_running.get(target_key, 0) + 1
+        finally:
+            self._waiting.discard(schedule.name)
+
+        self._running[schedule.name] = self._running.get(schedule.name, 0) + 1
+        params = {
+            "triggered_at": datetime.now().isoformat(),
+            "trigger_type": "schedule",
+            "cron_expression": schedule.cron_expression,
+            "scheduled_for": self._isoformat(scheduled_for),
+            "misfire": misfire,
+        }
+        try:
+            result = await self._fire(schedule, params)
+            schedule.last_result = {"status": "success", "execution_id": (result or {}).get("id")}
+            logger.info(f"Schedule {schedule.name} triggered {schedule.target_key}")
+        except Exception as e:
+            schedule.last_result = {"status": "error", "error": str(e)}
+            logger.error(f"Schedule {schedule.name} failed to trigger {schedule.target_key}: {e}")
+        finally:
+            async with self._slots:
+                self._target_running[target_key] -= 1
+                self._slots.notify_all()
+            self._running[schedule.name] -= 1
+            schedule.last_fire = time.time()
+            schedule.fire_count += 1
+            self._save()
+
+    async def _fire_http(self, schedule: Schedule, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Default firing: call the orchestrator API over one pooled client"""
+        if self._client is None:
+            # Bounded: a hung call would otherwise hold its target's slot forever
+            self._client = httpx.AsyncClient(
+                base_url=self.orchestrator_url,
+                timeout=httpx.Timeout(self.fire_timeout, connect=min(10.0, self.fire_timeout))
+            )
+
+        if schedule.workflow_id:
+            response = await self._client.post(
+                "/workflows/execute",
+                json={"workflow_id": schedule.workflow_id, "params": params}
+            )
+        else:
+            response = await self._client.post(
+                "/teams/run",
+                json={
+                    "team_id": schedule.team_id,
+                    "task": schedule.task_description,
+                    "context": params
+                }
+            )
+        response.raise_for_status()
+        return response.json()
+
+    # Persistence
+
+    def _load(self):
+        """Load schedules and next fire times from the state file"""
+        if not self.state_file.exists():
+            return
+        try:
+            data = json.loads(self.state_file.read_text())
+            for name, entry in data.get("schedules", {}).items():
+                self.schedules[name] = Schedule.from_dict(entry)
+        except Exception as e:
+            logger.error(f"Failed to load schedules from {self.state_file}: {e}")
+
+    def _save(self):
+        """Write schedules atomically"""
+        data = {"schedules": {name: s.to_dict() for name, s in self.schedules.items()}}
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.state_file.with_suffix(self.state_file.suffix + ".tmp")
+            temp_file.write_text(json.dumps(data, indent=2))
+            os.replace(temp_file, self.state_file)
+        except Exception as e:
+            logger.error(f"Failed to save schedules to {self.state_file}: {e}")
+
+    @staticmethod
+    def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+        if timestamp is None:
+            return None
+        return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+# Global singleton instance
+_scheduler_service_instance: Optional[SchedulerService] = None
+
+
+def init_scheduler_service(state_file: Path, **kwargs) -> SchedulerService:
+    """
+    Initialize the global SchedulerService.
+
+    Args:
+        state_file: Path to schedules.json
+        **kwargs: Passed to SchedulerService
+
+    Returns:
+        SchedulerService instance
+    """
+    global _scheduler_service_instance
+    _scheduler_service_instance = SchedulerService(state_file, **kwargs)
+    return _scheduler_service_instance
+
+
+def get_scheduler_service() -> Optional[SchedulerService]:
+    """
+    Get the global SchedulerService.
+
+    Returns:
+        SchedulerService, or None when schedule triggers run as containers
+    """
+    return _scheduler_service_instance
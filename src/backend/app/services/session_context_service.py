@@ -13,9 +13,13 @@ Follows ADCL principle: Disk-first, no hidden state.
 
 import json
 import asyncio
+import copy
+import os
 import aiofiles
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import re
 
@@ -54,6 +58,9 @@ class SessionContextService:
     - Clear session context
 
     Follows Unix philosophy: Simple text files, one directory per session.
+    Updates to a session are serialized by a per-session lock and written
+    atomically (temp file + os.replace); recently used contexts are kept in
+    a small LRU so hot sessions are not re-read from disk.
     """
 
     def __init__(
@@ -61,7 +68,8 @@ class SessionContextService:
         conversations_dir: Path,
         max_context_items: int = 5,
         max_context_tokens: int = 4000,
-        default_model: str = "claude-sonnet-4"
+        default_model: str = "claude-sonnet-4",
+        cache_size: int = 128
     ) -> None:
         """
         Initialize SessionContextService.
@@ -71,11 +79,16 @@ class SessionContextService:
             max_context_items: Maximum number of execution summaries to keep
             max_context_tokens: Maximum total tokens allowed in context
             default_model: Model to use for token counting (default: claude-sonnet-4)
+            cache_size: Number of session contexts kept in memory (0 disables)
         """
         self.conversations_dir = conversations_dir
         self.max_context_items = max_context_items
         self.max_context_tokens = max_context_tokens
         self.default_model = default_model
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Session id -> (lock, tasks holding or waiting for it)
+        self._locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
         logger.info(f"SessionContextService initialized with directory: {conversations_dir}")
 
     async def get_context(self, session_id: str) -> Dict[str, Any]:
@@ -99,6 +112,10 @@ class SessionContextService:
         # Validate session_id to prevent path traversal
         _validate_session_id(session_id)
 
+        cached = self._cache_get(session_id)
+        if cached is not None:
+            return cached
+
         context_file = self.conversations_dir / "active" / session_id / "context.json"
 
         # Check if context file exists
@@ -114,7 +131,8 @@ class SessionContextService:
                 context = json.loads(content)
 
             logger.debug(f"Loaded context for session {session_id}: {context.get('total_items', 0)} items")
-            return context
+            self._cache_put(session_id, context)
+            return copy.deepcopy(context)
 
         except json.JSONDecodeError as e:
             # Backup corrupted file and return empty context
@@ -157,12 +175,19 @@ class SessionContextService:
         session_dir = self.conversations_dir / "active" / session_id
         await asyncio.to_thread(session_dir.mkdir, parents=True, exist_ok=True)
 
-        # Load existing context
-        context = await self.get_context(session_id)
-
         # Create execution summary (not full result - too large)
         summary = self._summarize_execution(execution_result, user_message)
 
+        # Serialize read-modify-write per session so concurrent executions
+        # cannot overwrite each other's summaries
+        async with self._session_lock(session_id):
+            await self._append_summary(session_id, session_dir, summary)
+
+    async def _append_summary(self, session_id: str, session_dir: Path, summary: Dict[str, Any]) -> None:
+        """Append a summary to the stored context (caller holds the session lock)"""
+        # Load existing context
+        context = await self.get_context(session_id)
+
         # Append new summary
         executions = context.get("executions", [])
         executions.append(summary)
@@ -182,11 +207,19 @@ class SessionContextService:
             "last_updated": datetime.now().isoformat()
         }
 
-        # Save to disk
+        # Save to disk atomically - a crash mid-write leaves the old file intact
         context_file = session_dir / "context.json"
-        async with aiofiles.open(context_file, "w") as f:
-            await f.write(json.dumps(updated_context, indent=2))
-
+        tmp_file = context_file.with_name(f".context.json.{os.getpid()}.tmp")
+        try:
+            async with aiofiles.open(tmp_file, "w") as f:
+                await f.write(json.dumps(updated_context, indent=2))
+            await asyncio.to_thread(os.replace, tmp_file, context_file)
+        except Exception:
+            self._cache.pop(session_id, None)
+            await asyncio.to_thread(tmp_file.unlink, missing_ok=True)
+            raise
+
+        self._cache_put(session_id, updated_context)
         logger.info(f"Updated context for session {session_id}: {len(executions)} items")
 
     async def clear_context(self, session_id: str) -> None:
@@ -204,12 +237,51 @@ class SessionContextService:
 
         context_file = self.conversations_dir / "active" / session_id / "context.json"
 
-        exists = await asyncio.to_thread(context_file.exists)
-        if exists:
-            await asyncio.to_thread(context_file.unlink)
-            logger.info(f"Cleared context for session {session_id}")
-        else:
-            logger.debug(f"No context to clear for session {session_id}")
+        async with self._session_lock(session_id):
+            self._cache.pop(session_id, None)
+            exists = await asyncio.to_thread(context_file.exists)
+            if exists:
+                await asyncio.to_thread(context_file.unlink)
+                logger.info(f"Cleared context for session {session_id}")
+            else:
+                logger.debug(f"No context to clear for session {session_id}")
+
+    @asynccontextmanager
+    async def _session_lock(self, session_id: str) -> AsyncIterator[None]:
+        """
+        Hold the lock serializing context updates for one session.
+
+        The lock is dropped once no task holds or waits for it, so only
+        sessions being updated right now keep one.
+        """
+        lock, users = self._locks.get(session_id) or (asyncio.Lock(), 0)
+        self._locks[session_id] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[session_id]
+            if users > 1:
+                self._locks[session_id] = (lock, users - 1)
+            else:
+                del self._locks[session_id]
+
+    def _cache_get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Copy of a cached context (marking it recently used), or None"""
+        context = self._cache.get(session_id)
+        if context is None:
+            return None
+        self._cache.move_to_end(session_id)
+        return copy.deepcopy(context)
+
+    def _cache_put(self, session_id: str, context: Dict[str, Any]) -> None:
+        """Cache a context, evicting the least recently used beyond cache_size"""
+        if self.cache_size <= 0:
+            return
+        self._cache[session_id] = copy.deepcopy(context)
+        self._cache.move_to_end(session_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
 
     def _summarize_execution(self, result: Dict[str, Any], user_message: str) -> Dict[str, Any]:
         """
@@ -255,13 +327,34 @@ class SessionContextService:
         if "hosts" in str(answer)[:500] or "vulnerabilities" in str(answer)[:500]:
             summary["contains_technical_findings"] = True
 
+        # Counted once here so pruning never re-serializes the whole context
+        self._summary_tokens(summary, get_token_counter())
+
         return summary
 
+    def _summary_tokens(self, summary: Dict[str, Any], token_counter) -> int:
+        """
+        Token count of a single execution summary, counted once and stored on it.
+
+        Summaries loaded from older context files have no stored count and
+        are counted on first use.
+        """
+        count = summary.get("token_count")
+        if not isinstance(count, int):
+            count = token_counter.count_tokens(json.dumps(summary), self.default_model)
+            summary["token_count"] = count
+        return count
+
     def _prune_by_tokens(self, executions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Prune executions list to stay within token budget.
         Removes oldest executions first.
 
+        Per-summary token counts give the cut point from running totals in
+        one pass; the serialized list is then counted exactly at that point
+        (and its neighbours), so the result matches removing the oldest
+        item and re-counting until the list fits.
+
         Args:
             executions: List of execution summaries
 
@@ -270,22 +363,31 @@ class SessionContextService:
         """
         token_counter = get_token_counter()
 
-        # Calculate total tokens
-        total_text = json.dumps(executions)
-        total_tokens = token_counter.count_tokens(total_text, self.default_model)
+        def exact_tokens(start: int) -> int:
+            return token_counter.count_tokens(json.dumps(executions[start:]), self.default_model)
 
         # If within budget, return as-is
-        if total_tokens <= self.max_context_tokens:
+        total_tokens = exact_tokens(0)
+        if total_tokens <= self.max_context_tokens or not executions:
             return executions
 
-        # Remove oldest until we're under budget
-        while executions and total_tokens > self.max_context_tokens:
-            executions = executions[1:]  # Remove oldest
-            total_text = json.dumps(executions)
-            total_tokens = token_counter.count_tokens(total_text, self.default_model)
-            logger.debug(f"Pruned context: {total_tokens} tokens remaining")
+        # Drop oldest summaries while the running total is over budget
+        item_tokens = [self._summary_tokens(summary, token_counter) for summary in executions]
+        remaining = sum(item_tokens)
+        start = 1
+        remaining -= item_tokens[0]
+        while start < len(executions) and remaining > self.max_context_tokens:
+            remaining -= item_tokens[start]
+            start += 1
+
+        # Settle on the longest suffix whose serialized form fits
+        while start < len(executions) and exact_tokens(start) > self.max_context_tokens:
+            start += 1
+        while start > 1 and exact_tokens(start - 1) <= self.max_context_tokens:
+            start -= 1
 
-        return executions
+        logger.debug(f"Pruned context: dropped {start} oldest items, {len(executions) - start} remaining")
+        return executions[start:]
 
     def format_context_for_agent(self, context: Dict[str, Any]) -> str:
         """
@@ -317,3 +419,43 @@ class SessionContextService:
             lines.append("")
 
         return "\n".join(lines)
+
+
+# Global singleton instance
+# Initialized in main.py at startup so every chat session shares its locks and cache
+_session_context_service_instance: Optional[SessionContextService] = None
+
+
+def get_session_context_service() -> SessionContextService:
+    """
+    Get the global SessionContextService instance.
+
+    Returns:
+        SessionContextService singleton instance
+
+    Raises:
+        RuntimeError: If SessionContextService not initialized
+    """
+    if _session_context_service_instance is None:
+        raise RuntimeError(
+            "SessionContextService not initialized. "
+            "Call init_session_context_service() in main.py startup"
+        )
+    return _session_context_service_instance
+
+
+def init_session_context_service(conversations_dir: Path, **kwargs: Any) -> SessionContextService:
+    """
+    Initialize the global SessionContextService instance.
+
+    Args:
+        conversations_dir: Directory for conversation persistence (volumes/conversations)
+        **kwargs: Passed through to SessionContextService
+
+    Returns:
+        Initialized SessionContextService instance
+    """
+    global _session_context_service_instance
+
+    _session_context_service_instance = SessionContextService(conversations_dir, **kwargs)
+    return _session_context_service_instance
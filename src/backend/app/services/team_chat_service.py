@@ -0,0 +1,175 @@
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Team Chat Service - Concurrent multi-agent fan-out for /chat
+
+Each team member's think call is an independent LLM round trip, so they
+run concurrently behind a semaphore with a per-agent timeout. Responses
+keep the team's agent order, and a slow or failing member produces an
+error entry instead of holding back the rest.
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.core.logging import get_service_logger
+
+logger = get_service_logger("team_chat")
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_AGENT_TIMEOUT = 120.0
+
+
+def _env_number(name: str, default, cast):
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={value!r}, using {default}")
+        return default
+
+
+def team_chat_max_concurrency() -> int:
+    """Max agents queried at once (TEAM_CHAT_MAX_CONCURRENCY)"""
+    return max(1, _env_number("TEAM_CHAT_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY, int))
+
+
+def team_chat_agent_timeout() -> float:
+    """Per-agent timeout in seconds (TEAM_CHAT_AGENT_TIMEOUT)"""
+    return _env_number("TEAM_CHAT_AGENT_TIMEOUT", DEFAULT_AGENT_TIMEOUT, float)
+
+
+def _agent_entry(agent: Dict[str, Any], response: str, elapsed: Optional[float] = None) -> Dict[str, Any]:
+    entry = {"agent": agent["name"], "role": agent["role"], "response": response}
+    if elapsed is not None:
+        entry["elapsed_seconds"] = round(elapsed, 3)
+    return entry
+
+
+def build_agent_prompt(
+    agent: Dict[str, Any], team: Dict[str, Any], message: str, conversation_history: str
+) -> str:
+    """
+    Build the think prompt for one team member.
+
+    Args:
+        agent: Agent entry from the team definition
+        team: Team definition
+        message: User message
+        conversation_history: Pre-rendered history block (may be empty)
+
+    Returns:
+        Prompt text for the agent MCP think tool
+    """
+    agent_context = f"You are {agent['name']}, the {agent['role']} on the '{team['name']}' team.\n"
+    agent_context += f"Team description: {team['description']}\n"
+    agent_context += f"Your MCP server capabilities: {agent['mcp_server']}\n\n"
+
+    # Only agent MCP has think tool, others should describe their capabilities
+    if agent["mcp_server"] == "agent":
+        return f"{conversation_history}{agent_context}User message: {message}\n\nProvide your analysis and recommendations."
+    return f"{conversation_history}{agent_context}User message: {message}\n\nAs {agent['name']}, explain what you would do with your {agent['mcp_server']} capabilities to help with this request. Be specific about the tools/actions you would use."
+
+
+async def _call_think(client: httpx.AsyncClient, endpoint: str, prompt: str) -> str:
+    response = await client.post(
+        f"{endpoint}/mcp/call_tool",
+        json={"tool": "think", "arguments": {"prompt": prompt}},
+    )
+    response.raise_for_status()
+    data = response.json()
+
+    if data.get("isError"):
+        return f"⚠️ Error: {data['content'][0]['text']}"
+
+    result = data["content"][0]["text"]
+    try:
+        return json.loads(result).get("reasoning", result)
+    except (json.JSONDecodeError, TypeError, KeyError, AttributeError):
+        # Use raw response if JSON parsing fails
+        return result
+
+
+async def gather_team_responses(
+    client: httpx.AsyncClient,
+    registry: Any,
+    team: Dict[str, Any],
+    message: str,
+    conversation_history: str = "",
+    max_concurrency: Optional[int] = None,
+    agent_timeout: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Ask every team member concurrently and collect their responses.
+
+    Args:
+        client: Shared HTTP client used for MCP calls
+        registry: MCP registry (``get(name)`` returns a server with ``endpoint``)
+        team: Team definition with an ``agents`` list
+        message: User message
+        conversation_history: Pre-rendered history block (may be empty)
+        max_concurrency: Max agents queried at once (default: TEAM_CHAT_MAX_CONCURRENCY)
+        agent_timeout: Seconds allowed per agent, including time waiting for
+            a slot (default: TEAM_CHAT_AGENT_TIMEOUT)
+
+    Returns:
+        One entry per agent, in team order. Agents whose MCP server is not
+        an agent server are skipped when no agent server is registered.
+    """
+    if max_concurrency is None:
+        max_concurrency = team_chat_max_concurrency()
+    if agent_timeout is None:
+        agent_timeout = team_chat_agent_timeout()
+    slots = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def ask(agent: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        server = registry.get(agent["mcp_server"])
+        if not server:
+            return _agent_entry(agent, f"⚠️ MCP server '{agent['mcp_server']}' not available")
+
+        if agent["mcp_server"] != "agent":
+            # For non-agent MCP servers, use agent to explain what this team member would do
+            server = registry.get("agent")
+            if not server:
+                return None
+
+        prompt = build_agent_prompt(agent, team, message, conversation_history)
+
+        async def call() -> str:
+            async with slots:
+                return await _call_think(client, server.endpoint, prompt)
+
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(call(), timeout=agent_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Team '{team['name']}' agent '{agent['name']}' timed out after {agent_timeout}s")
+            return _agent_entry(
+                agent, f"⚠️ Error: no response within {agent_timeout:g}s", time.perf_counter() - started
+            )
+        except Exception as e:
+            return _agent_entry(agent, f"⚠️ Error: {str(e)}", time.perf_counter() - started)
+        return _agent_entry(agent, response, time.perf_counter() - started)
+
+    results = await asyncio.gather(*(ask(agent) for agent in team.get("agents", [])))
+    return [entry for entry in results if entry is not None]
+
+
+def combine_team_responses(team: Dict[str, Any], team_responses: List[Dict[str, Any]]) -> str:
+    """Render team responses as a single Markdown chat message"""
+    combined_response = f"**{team['name']} Team Response:**\n\n"
+    for resp in team_responses:
+        combined_response += (
+            f"**{resp['agent']}** ({resp['role']}):\n{resp['response']}\n\n---\n\n"
+        )
+    return combined_response
@@ -13,10 +13,11 @@ Follows ADCL principle: Do one thing well.
 
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from app.core.errors import NotFoundError, ValidationError
 from app.core.logging import get_service_logger
+from app.services.definition_registry import DefinitionRegistry, get_definition_registry
 
 logger = get_service_logger("team")
 
@@ -34,15 +35,17 @@ class TeamService:
     - Validate team configurations
     """
 
-    def __init__(self, teams_dir: Path):
+    def __init__(self, teams_dir: Path, definitions: Optional[DefinitionRegistry] = None):
         """
         Initialize TeamService.
 
         Args:
             teams_dir: Directory containing team JSON files
+            definitions: Team definition index (defaults to the shared index for teams_dir)
         """
         self.teams_dir = teams_dir
         self.teams_dir.mkdir(parents=True, exist_ok=True)
+        self.definitions = definitions or get_definition_registry(teams_dir, "team")
         logger.info(f"TeamService initialized with directory: {teams_dir}")
 
     async def list_teams(self) -> List[Dict[str, Any]]:
@@ -58,16 +61,9 @@ class TeamService:
             >>> len(teams)
             3
         """
-        teams = []
+        teams = self.definitions.list()
 
-        for file_path in self.teams_dir.glob("*.json"):
-            try:
-                team = self._load_team_from_file(file_path)
-                teams.append(team)
-            except Exception as e:
-                logger.error(f"Failed to load team from {file_path}: {e}")
-
-        logger.info(f"Loaded {len(teams)} teams from disk")
+        logger.info(f"Listed {len(teams)} teams")
         return teams
 
     async def get_team(self, team_id: str) -> Dict[str, Any]:
@@ -84,12 +80,11 @@ class TeamService:
             NotFoundError: If team not found
         """
         self._validate_team_id(team_id)
-        file_path = self.teams_dir / f"{team_id}.json"
 
-        if not file_path.exists():
+        team = self.definitions.get(team_id)
+        if team is None:
             raise NotFoundError("Team", team_id)
 
-        team = self._load_team_from_file(file_path)
         logger.info(f"Retrieved team: {team_id}")
         return team
 
@@ -199,6 +194,7 @@ class TeamService:
             raise NotFoundError("Team", team_id)
 
         file_path.unlink()
+        self.definitions.invalidate(team_id)
 
         logger.info(f"Deleted team: {team_id}")
         return {"status": "deleted", "id": team_id}
@@ -260,30 +256,6 @@ class TeamService:
                 field="team_id"
             )
 
-    def _load_team_from_file(self, file_path: Path) -> Dict[str, Any]:
-        """
-        Load a team from a JSON file.
-
-        Args:
-            file_path: Path to team JSON file
-
-        Returns:
-            Team definition
-
-        Raises:
-            JSONDecodeError: If file is not valid JSON
-        """
-        team_data = json.loads(file_path.read_text())
-
-        # Use filename (without .json) as ID if not present
-        if "id" not in team_data:
-            team_data["id"] = file_path.stem
-
-        # Add file metadata
-        team_data["file"] = file_path.name
-
-        return team_data
-
     def _save_team_to_file(
         self, team_id: str, team_data: Dict[str, Any]
     ) -> Path:
@@ -305,6 +277,7 @@ class TeamService:
         }
 
         file_path.write_text(json.dumps(save_data, indent=2))
+        self.definitions.invalidate(team_id)
         return file_path
 
     def _slugify_team_id(self, name: str) -> str:
@@ -252,32 +252,13 @@ class VulhubManager:
         Args:
             ip_address: IP address to clean from all attack sessions
         """
-        sessions_dir = Path("volumes/data/attack_sessions")
-        if not sessions_dir.exists():
-            return
-
-        cleaned_count = 0
-        for session_file in sessions_dir.glob("*.json"):
-            try:
-                with open(session_file, 'r') as f:
-                    session_data = json.load(f)
-
-                # Remove host with matching IP
-                original_count = len(session_data.get("hosts", []))
-                session_data["hosts"] = [
-                    host for host in session_data.get("hosts", [])
-                    if host.get("ip") != ip_address
-                ]
-
-                if len(session_data["hosts"]) < original_count:
-                    # Save updated session
-                    with open(session_file, 'w') as f:
-                        json.dump(session_data, f, indent=2)
-                    cleaned_count += 1
-                    logger.info(f"Cleaned IP {ip_address} from attack session {session_file.name}")
+        try:
+            from app.services.attack_session_service import AttackSessionService
 
-            except Exception as e:
-                logger.error(f"Failed to clean attack session {session_file}: {e}")
+            cleaned_count = AttackSessionService.remove_host_from_all_sessions(ip_address)
+        except Exception as e:
+            logger.error(f"Failed to clean attack sessions for {ip_address}: {e}")
+            return
 
         if cleaned_count > 0:
             logger.info(f"Cleaned IP {ip_address} from {cleaned_count} attack session(s)")
@@ -0,0 +1,256 @@
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Workflow Post-Processing Service - Background work after a workflow run
+
+Scan creation and attack session updates run after the execution result
+has been returned. Jobs for the same session run in submission order,
+each step is retried with exponential back-off, and the number of
+unfinished jobs is bounded so a burst of runs applies back-pressure
+instead of growing memory.
+"""
+import asyncio
+import os
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.core.logging import get_service_logger
+
+logger = get_service_logger("workflow-postprocessing")
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 100
+DEFAULT_MAX_ATTEMPTS = 3
+
+PostProcessingStep = Tuple[str, Callable[[], Awaitable[Any]]]
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={value!r}, using {default}")
+        return default
+
+
+@dataclass
+class PostProcessingJob:
+    """Post-processing for one workflow execution"""
+    execution_id: str
+    workflow_id: str
+    ordering_key: str  # Jobs sharing a key (the session) run one at a time, in order
+    steps: List[PostProcessingStep]
+    status: str = "queued"  # queued, running, completed, failed
+    step_status: Dict[str, str] = field(default_factory=dict)
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    attempts: int = 0
+    submitted_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    finished_at: Optional[str] = None
+    _done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def __post_init__(self):
+        self.step_status = {name: "pending" for name, _ in self.steps}
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    async def wait(self, timeout: Optional[float] = None) -> "PostProcessingJob":
+        """Wait until the job has finished (raises asyncio.TimeoutError)"""
+        await asyncio.wait_for(self._done.wait(), timeout)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "execution_id": self.execution_id,
+            "workflow_id": self.workflow_id,
+            "status": self.status,
+            "steps": dict(self.step_status),
+            "results": dict(self.results),
+            "errors": dict(self.errors),
+            "attempts": self.attempts,
+            "submitted_at": self.submitted_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class PostProcessingQueue:
+    """
+    Bounded background queue for workflow post-processing jobs.
+
+    Workers are started on first submit, inside the running event loop.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_pending: int = 100,
+        max_attempts: int = 3,
+        retry_base_delay: float = 1.0,
+        history_size: int = 500
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            workers: Jobs processed concurrently (for different sessions)
+            max_pending: Unfinished jobs allowed before submit() waits
+            max_attempts: Attempts per step before it is marked failed
+            retry_base_delay: First retry delay in seconds (doubles per attempt)
+            history_size: Finished jobs kept for status lookups
+        """
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_delay = retry_base_delay
+        self.history_size = history_size
+
+        self._jobs: "OrderedDict[str, PostProcessingJob]" = OrderedDict()
+        # ordering key -> jobs waiting for the key's running job to finish
+        self._waiting: Dict[str, Deque[PostProcessingJob]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._capacity: Optional[asyncio.Semaphore] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _ensure_started(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._capacity = asyncio.Semaphore(self.max_pending)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"workflow-postprocessing-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def submit(self, job: PostProcessingJob) -> PostProcessingJob:
+        """
+        Queue a job, waiting for capacity if max_pending jobs are unfinished.
+
+        Returns:
+            The job, whose status can be polled or awaited
+        """
+        self._ensure_started()
+        await self._capacity.acquire()
+
+        self._jobs[job.execution_id] = job
+        self._trim_history()
+
+        if job.ordering_key in self._waiting:
+            # A job for this session is queued or running; run after it
+            self._waiting[job.ordering_key].append(job)
+        else:
+            self._waiting[job.ordering_key] = deque()
+            self._queue.put_nowait(job)
+        return job
+
+    def get(self, execution_id: str) -> Optional[PostProcessingJob]:
+        """Job for an execution, if still tracked"""
+        return self._jobs.get(execution_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Job counts by status"""
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {"workers": self.workers, "max_pending": self.max_pending, "jobs": counts}
+
+    async def drain(self, timeout: Optional[float] = None):
+        """Wait for every submitted job to finish"""
+        pending = [job.wait() for job in list(self._jobs.values()) if not job.finished]
+        if pending:
+            await asyncio.wait_for(asyncio.gather(*pending), timeout)
+
+    async def stop(self, drain_timeout: Optional[float] = None):
+        """Optionally wait for pending jobs, then stop the workers"""
+        if drain_timeout:
+            try:
+                await self.drain(drain_timeout)
+            except asyncio.TimeoutError:
+                unfinished = sum(1 for job in self._jobs.values() if not job.finished)
+                logger.warning(f"Stopping with {unfinished} unfinished post-processing jobs")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # Private helper methods
+
+    def _trim_history(self):
+        excess = len(self._jobs) - self.history_size
+        if excess <= 0:
+            return
+        for execution_id in [eid for eid, job in self._jobs.items() if job.finished][:excess]:
+            del self._jobs[execution_id]
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+                self._capacity.release()
+                waiting = self._waiting.get(job.ordering_key)
+                if waiting:
+                    self._queue.put_nowait(waiting.popleft())
+                else:
+                    self._waiting.pop(job.ordering_key, None)
+
+    async def _run(self, job: PostProcessingJob):
+        job.status = "running"
+        for name, step in job.steps:
+            for attempt in range(1, self.max_attempts + 1):
+                job.attempts += 1
+                try:
+                    job.results[name] = await step()
+                    job.step_status[name] = "completed"
+                    job.errors.pop(name, None)
+                    break
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    job.errors[name] = str(e)
+                    if attempt == self.max_attempts:
+                        job.step_status[name] = "failed"
+                        logger.error(
+                            f"Post-processing step '{name}' failed for execution {job.execution_id} "
+                            f"after {attempt} attempts: {e}"
+                        )
+                        break
+                    delay = self.retry_base_delay * (2 ** (attempt - 1))
+                    logger.warning(
+                        f"Post-processing step '{name}' failed for execution {job.execution_id} "
+                        f"(attempt {attempt}/{self.max_attempts}), retrying in {delay:.1f}s: {e}"
+                    )
+                    await asyncio.sleep(delay)
+
+        job.status = "failed" if "failed" in job.step_status.values() else "completed"
+        job.finished_at = datetime.now().isoformat()
+        job._done.set()
+        logger.info(f"Post-processing {job.status} for execution {job.execution_id}")
+
+
+# Module-level singleton
+_queue_instance: Optional[PostProcessingQueue] = None
+
+
+def get_post_processing_queue() -> PostProcessingQueue:
+    """Get the shared post-processing queue, configured from the environment"""
+    global _queue_instance
+    if _queue_instance is None:
+        _queue_instance = PostProcessingQueue(
+            workers=_env_int("WORKFLOW_POSTPROCESS_WORKERS", DEFAULT_WORKERS),
+            max_pending=_env_int("WORKFLOW_POSTPROCESS_MAX_PENDING", DEFAULT_MAX_PENDING),
+            max_attempts=_env_int("WORKFLOW_POSTPROCESS_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)
+        )
+    return _queue_instance
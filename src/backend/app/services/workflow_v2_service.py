@@ -10,17 +10,90 @@ Workflow V2 Service
 Manages V2 workflow definitions and execution.
 """
 
+import asyncio
+import copy
 import json
+import os
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
 from app.core.errors import NotFoundError, ValidationError
 from app.core.logging import get_service_logger
+from app.services.definition_registry import DefinitionRegistry
+from app.services.workflow_postprocessing_service import (
+    PostProcessingJob,
+    PostProcessingQueue,
+    get_post_processing_queue,
+)
 from app.workflow_v2.models import WorkflowV2Definition, ExecutionV2Result
 from app.workflow_v2.executor import WorkflowExecutor
 
 logger = get_service_logger("workflow-v2")
 
+StatKey = Tuple[int, int]
+
+
+@dataclass
+class CompiledWorkflow:
+    """
+    Validated workflow definition with its precomputed graph.
+
+    Shared between runs: callers must treat it as read-only (run_workflow
+    hands the executor a deep copy of the definition). The adjacency map
+    and topological order are not used by WorkflowExecutor yet; they are
+    kept here so scheduling and cycle checks can reuse them without
+    rebuilding the graph.
+    """
+    workflow_id: str
+    definition: WorkflowV2Definition
+    adjacency: Dict[str, List[str]]
+    topological_order: Optional[List[str]]  # None if the edges form a cycle
+
+
+class WorkflowRunResult(ExecutionV2Result):
+    """Execution result plus the status of its background post-processing"""
+    post_processing: Optional[Dict[str, Any]] = None
+
+
+def _compile_graph(workflow_data: Dict[str, Any]) -> Tuple[Dict[str, List[str]], Optional[List[str]]]:
+    """
+    Build the node adjacency map and a topological order (Kahn's algorithm).
+
+    Nodes without edges keep their definition order among equally ready nodes.
+    """
+    node_ids = [node.get("node_id") for node in workflow_data.get("nodes", [])]
+    adjacency: Dict[str, List[str]] = {node_id: [] for node_id in node_ids}
+    in_degree: Dict[str, int] = {node_id: 0 for node_id in node_ids}
+
+    for edge in workflow_data.get("edges", []):
+        source, target = edge.get("from"), edge.get("to")
+        if source not in adjacency or target not in in_degree:
+            continue
+        adjacency[source].append(target)
+        in_degree[target] += 1
+
+    ready = deque(node_id for node_id in node_ids if in_degree[node_id] == 0)
+    order = []
+    while ready:
+        node_id = ready.popleft()
+        order.append(node_id)
+        for target in adjacency[node_id]:
+            in_degree[target] -= 1
+            if in_degree[target] == 0:
+                ready.append(target)
+
+    return adjacency, order if len(order) == len(node_ids) else None
+
+
+def _stat_key(file_path: Path) -> Optional[StatKey]:
+    try:
+        st = file_path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
 
 class WorkflowV2Service:
     """
@@ -29,13 +102,33 @@ class WorkflowV2Service:
     Responsibilities:
     - CRUD operations for workflow definitions
     - Workflow execution via WorkflowExecutor
+    - Queueing scan creation and attack session updates after each run
+
+    Parsed, migrated and validated definitions are cached per file and
+    reused while the file's (mtime, size) is unchanged.
     """
 
-    def __init__(self, workflows_dir: Path, executor: WorkflowExecutor, result_processor=None):
+    def __init__(
+        self,
+        workflows_dir: Path,
+        executor: WorkflowExecutor,
+        result_processor=None,
+        agent_definitions: Optional[DefinitionRegistry] = None,
+        post_processing: Optional[PostProcessingQueue] = None
+    ):
         self.workflows_dir = workflows_dir
         self.workflows_dir.mkdir(parents=True, exist_ok=True)
         self.executor = executor
         self.result_processor = result_processor  # Optional - allows workflows without recon integration
+        self.agent_definitions = agent_definitions  # Optional - enables agent reference checks
+        self.post_processing = post_processing or get_post_processing_queue()
+
+        # workflow_id -> (stat key, migrated workflow data)
+        self._workflows: Dict[str, Tuple[StatKey, Dict[str, Any]]] = {}
+        # workflow_id -> (stat key, compiled workflow)
+        self._compiled: Dict[str, Tuple[StatKey, CompiledWorkflow]] = {}
+        # filename -> (stat key, list_workflows entry)
+        self._summaries: Dict[str, Tuple[StatKey, Dict[str, Any]]] = {}
         logger.info(f"WorkflowV2Service initialized with directory: {workflows_dir}")
 
     def _migrate_workflow_to_v2(self, workflow_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -100,33 +193,128 @@ class WorkflowV2Service:
 
         return workflow_data
 
+    def _check_agent_references(self, workflow_data: Dict[str, Any]) -> List[str]:
+        """
+        Find node agent_ids that have no agent definition.
+
+        Returns the unknown ids (empty if no agent index is configured).
+        Unknown agents are logged rather than rejected so workflows can be
+        saved before the agents they use are installed.
+        """
+        if self.agent_definitions is None:
+            return []
+
+        missing = [
+            node["agent_id"]
+            for node in workflow_data.get("nodes", [])
+            if node.get("agent_id") and node["agent_id"] not in self.agent_definitions
+        ]
+        if missing:
+            logger.warning(
+                f"Workflow '{workflow_data.get('workflow_id')}' references unknown agents: {', '.join(missing)}"
+            )
+        return missing
+
+    def invalidate(self, workflow_id: Optional[str] = None) -> None:
+        """
+        Drop cached state for a workflow (or all workflows).
+
+        Args:
+            workflow_id: Workflow whose file changed; None clears everything
+        """
+        if workflow_id is None:
+            self._workflows.clear()
+            self._compiled.clear()
+            self._summaries.clear()
+            return
+        self._workflows.pop(workflow_id, None)
+        self._compiled.pop(workflow_id, None)
+        self._summaries.pop(f"{workflow_id}.json", None)
+
     async def list_workflows(self) -> List[Dict[str, Any]]:
         """List all V2 workflow definitions"""
         workflows = []
-
-        for file in self.workflows_dir.glob("*.json"):
-            try:
-                workflow_data = json.loads(file.read_text())
-                workflows.append({
-                    "workflow_id": workflow_data.get("workflow_id"),
-                    "name": workflow_data.get("name"),
-                    "description": workflow_data.get("description"),
-                    "node_count": len(workflow_data.get("nodes", [])),
-                    "filename": file.name
-                })
-            except Exception as e:
-                logger.warning(f"Skipping invalid workflow file {file.name}: {e}")
-
+        summaries: Dict[str, Tuple[StatKey, Dict[str, Any]]] = {}
+
+        with os.scandir(self.workflows_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".json") or not entry.is_file():
+                    continue
+                st = entry.stat()
+                stat_key = (st.st_mtime_ns, st.st_size)
+
+                cached = self._summaries.get(entry.name)
+                if cached and cached[0] == stat_key:
+                    summaries[entry.name] = cached
+                    workflows.append(dict(cached[1]))
+                    continue
+
+                try:
+                    workflow_data = json.loads(Path(entry.path).read_text())
+                    summary = {
+                        "workflow_id": workflow_data.get("workflow_id"),
+                        "name": workflow_data.get("name"),
+                        "description": workflow_data.get("description"),
+                        "node_count": len(workflow_data.get("nodes", [])),
+                        "filename": entry.name
+                    }
+                except Exception as e:
+                    logger.warning(f"Skipping invalid workflow file {entry.name}: {e}")
+                    continue
+                summaries[entry.name] = (stat_key, summary)
+                workflows.append(dict(summary))
+
+        # Replaced wholesale so deleted files drop out of the cache
+        self._summaries = summaries
         logger.info(f"Listed {len(workflows)} V2 workflows")
         return workflows
 
     async def get_workflow(self, workflow_id: str) -> Dict[str, Any]:
         """Get a specific workflow definition with automatic V1 → V2 migration"""
+        return copy.deepcopy(self._load_workflow(workflow_id)[1])
+
+    async def get_compiled_workflow(self, workflow_id: str) -> CompiledWorkflow:
+        """
+        Get the validated definition, adjacency map and topological order.
+
+        Compiled once per file version; later calls only stat the file.
+
+        Raises:
+            NotFoundError: If the workflow does not exist
+            pydantic.ValidationError: If the definition is invalid
+        """
+        stat_key, workflow_data = self._load_workflow(workflow_id)
+        cached = self._compiled.get(workflow_id)
+        if cached and cached[0] == stat_key:
+            return cached[1]
+
+        definition = WorkflowV2Definition(**workflow_data)
+        adjacency, order = _compile_graph(workflow_data)
+        if order is None:
+            logger.warning(f"Workflow '{workflow_id}' edges contain a cycle; no topological order")
+
+        compiled = CompiledWorkflow(
+            workflow_id=workflow_id,
+            definition=definition,
+            adjacency=adjacency,
+            topological_order=order
+        )
+        self._compiled[workflow_id] = (stat_key, compiled)
+        return compiled
+
+    def _load_workflow(self, workflow_id: str) -> Tuple[StatKey, Dict[str, Any]]:
+        """Cached (stat key, migrated data) for a workflow file, re-read when it changes"""
         file_path = self.workflows_dir / f"{workflow_id}.json"
 
-        if not file_path.exists():
+        stat_key = _stat_key(file_path)
+        if stat_key is None:
+            self.invalidate(workflow_id)
             raise NotFoundError("Workflow", workflow_id)
 
+        cached = self._workflows.get(workflow_id)
+        if cached and cached[0] == stat_key:
+            return cached
+
         workflow_data = json.loads(file_path.read_text())
 
         # Auto-migrate V1 workflows to V2
@@ -134,10 +322,12 @@ class WorkflowV2Service:
             workflow_data = self._migrate_workflow_to_v2(workflow_data)
             # Save migrated version back to disk
             file_path.write_text(json.dumps(workflow_data, indent=2))
+            stat_key = _stat_key(file_path) or stat_key
             logger.info(f"Auto-migrated workflow '{workflow_id}' to V2.0")
 
-        logger.info(f"Retrieved workflow: {workflow_id}")
-        return workflow_data
+        logger.info(f"Loaded workflow: {workflow_id}")
+        self._workflows[workflow_id] = (stat_key, workflow_data)
+        return stat_key, workflow_data
 
     async def create_workflow(self, workflow_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new workflow definition"""
@@ -152,9 +342,11 @@ class WorkflowV2Service:
 
         # Validate workflow structure
         WorkflowV2Definition(**workflow_data)
+        self._check_agent_references(workflow_data)
 
         # Save to disk
         file_path.write_text(json.dumps(workflow_data, indent=2))
+        self.invalidate(workflow_id)
 
         logger.info(f"Created workflow: {workflow_id}")
         return workflow_data
@@ -171,9 +363,11 @@ class WorkflowV2Service:
 
         # Validate workflow structure
         WorkflowV2Definition(**workflow_data)
+        self._check_agent_references(workflow_data)
 
         # Save to disk
         file_path.write_text(json.dumps(workflow_data, indent=2))
+        self.invalidate(workflow_id)
 
         logger.info(f"Updated workflow: {workflow_id}")
         return workflow_data
@@ -186,6 +380,7 @@ class WorkflowV2Service:
             raise NotFoundError("Workflow", workflow_id)
 
         file_path.unlink()
+        self.invalidate(workflow_id)
 
         logger.info(f"Deleted workflow: {workflow_id}")
         return {"message": f"Workflow '{workflow_id}' deleted"}
@@ -198,11 +393,19 @@ class WorkflowV2Service:
         progress_callback: Any = None,
         session_id: str = None,
         security_context: Any = None
-    ) -> ExecutionV2Result:
-        """Execute a workflow"""
-        # Load workflow definition
-        workflow_data = await self.get_workflow(workflow_id)
-        workflow_def = WorkflowV2Definition(**workflow_data)
+    ) -> WorkflowRunResult:
+        """
+        Execute a workflow.
+
+        Returns as soon as the executor finishes. Scan creation and attack
+        session updates are queued; the result's post_processing field
+        carries the job status.
+        """
+        # Load workflow definition (validated once per file version). The
+        # executor gets its own copy so a run cannot alter the cached one.
+        workflow_def = (await self.get_compiled_workflow(workflow_id)).definition.model_copy(deep=True)
+        # Agents may be removed after the definition was cached: check every run
+        self._check_agent_references(self._load_workflow(workflow_id)[1])
 
         # Execute workflow with progress callback
         logger.info(f"Executing workflow: {workflow_id}")
@@ -214,60 +417,25 @@ class WorkflowV2Service:
             security_context=security_context
         )
 
-        # Process results if workflow completed successfully
-        scan_id = None
-        if context.completed_at and self.result_processor:
-            try:
-                scan_id = await self.result_processor.process_workflow_result(
-                    workflow_id=workflow_id,
-                    execution_id=context.execution_id,
-                    initial_message=initial_message or "",
-                    final_result=context.node_results
-                )
-                if scan_id:
-                    logger.info(f"Created scan {scan_id} from workflow {context.execution_id}")
-            except Exception as e:
-                logger.error(f"Failed to process workflow results: {e}", exc_info=True)
-                # Don't fail the workflow if scan creation fails
-
-        # Update attack playground session if session_id provided
-        logger.info(f"Session update check: session_id={session_id}, completed_at={context.completed_at}")
-        if session_id and context.completed_at:
-            try:
-                from app.services.attack_session_service import attack_session_service
-
-                # Build execution result for session processor
-                execution_result = {
-                    "execution_id": context.execution_id,
-                    "workflow_id": workflow_id,
-                    "result": context.node_results
-                }
+        # Scan creation and session updates run in the background
+        post_processing = None
+        if context.completed_at and (self.result_processor or session_id):
+            job = await self.post_processing.submit(
+                self._build_post_processing_job(workflow_id, context, initial_message or "", session_id)
+            )
+            post_processing = job.to_dict()
 
-                logger.info(f"Calling on_workflow_complete for session {session_id}, workflow {workflow_id}")
-                attack_session_service.on_workflow_complete(
-                    session_id=session_id,
-                    workflow_id=workflow_id,
-                    target=initial_message or "",
-                    execution_result=execution_result
-                )
-                logger.info(f"Updated attack session {session_id} from workflow {context.execution_id}")
-            except Exception as e:
-                logger.error(f"Failed to update attack session: {e}", exc_info=True)
-                # Don't fail the workflow if session update fails
-
-        # Load updated session state to include in response
-        updated_session_state = None
+        # Current session state; the post-processed state follows via get_post_processing
+        session_state = None
         if session_id:
             try:
                 from app.services.attack_session_service import attack_session_service
-                updated_session = attack_session_service.get_or_create_session(session_id)
-                updated_session_state = updated_session
-                logger.info(f"Loaded updated session state for {session_id}: {len(updated_session.get('hosts', []))} hosts")
+                session_state = attack_session_service.load_session(session_id)
             except Exception as e:
                 logger.error(f"Failed to load session state: {e}", exc_info=True)
 
         # Build result
-        result = ExecutionV2Result(
+        result = WorkflowRunResult(
             execution_id=context.execution_id,
             workflow_id=context.workflow_id,
             status="completed",
@@ -275,10 +443,75 @@ class WorkflowV2Service:
             started_at=context.started_at,
             completed_at=context.completed_at or "",
             final_result=context.node_results,
-            scan_id=scan_id,  # Include scan_id for UI
+            scan_id=None,  # Set by post-processing, see post_processing["results"]["scan"]
             cumulative_tokens=context.cumulative_tokens,  # Include token usage and cost
-            session_state=updated_session_state  # Include updated session with exploit results
+            session_state=session_state,
+            post_processing=post_processing
         )
 
         logger.info(f"Workflow execution completed: {context.execution_id}")
         return result
+
+    async def get_post_processing(self, execution_id: str) -> Dict[str, Any]:
+        """Post-processing status for an execution, with the session state once finished"""
+        job = self.post_processing.get(execution_id)
+        if job is None:
+            raise NotFoundError("Post-processing job", execution_id)
+
+        status = job.to_dict()
+        if job.finished and job.ordering_key.startswith("session:"):
+            from app.services.attack_session_service import attack_session_service
+            status["session_state"] = attack_session_service.load_session(job.ordering_key[len("session:"):])
+        return status
+
+    def _build_post_processing_job(
+        self,
+        workflow_id: str,
+        context: Any,
+        initial_message: str,
+        session_id: Optional[str]
+    ) -> PostProcessingJob:
+        """Queueable scan creation and attack session update for a finished execution"""
+        steps = []
+
+        if self.result_processor:
+            async def create_scan():
+                scan_id = await self.result_processor.process_workflow_result(
+                    workflow_id=workflow_id,
+                    execution_id=context.execution_id,
+                    initial_message=initial_message,
+                    final_result=context.node_results
+                )
+                if scan_id:
+                    logger.info(f"Created scan {scan_id} from workflow {context.execution_id}")
+                return scan_id
+
+            steps.append(("scan", create_scan))
+
+        if session_id:
+            from app.services.attack_session_service import attack_session_service
+
+            async def update_session():
+                # Regex parsing and session writes are blocking; keep them off the event loop
+                await asyncio.to_thread(
+                    attack_session_service.on_workflow_complete,
+                    session_id=session_id,
+                    workflow_id=workflow_id,
+                    target=initial_message,
+                    execution_result={
+                        "execution_id": context.execution_id,
+                        "workflow_id": workflow_id,
+                        "result": context.node_results
+                    }
+                )
+                logger.info(f"Updated attack session {session_id} from workflow {context.execution_id}")
+
+            steps.append(("attack_session", update_session))
+
+        return PostProcessingJob(
+            execution_id=context.execution_id,
+            workflow_id=workflow_id,
+            # Updates to one session are applied in run order
+            ordering_key=f"session:{session_id}" if session_id else f"execution:{context.execution_id}",
+            steps=steps
+        )
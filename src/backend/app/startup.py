@@ -9,12 +9,63 @@
 import asyncio
 import os
 import json
+import time
 import httpx
-import docker
-from pathlib import Path as _PathForEnv
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from app.models import MCPServerInfo
 from app.services.model_config_service import load_models_from_config
+from app.startup_profile import get_startup_profiler
+
+# Seconds to wait for a freshly installed MCP to answer /health
+STARTUP_READY_TIMEOUT = 60.0
+# Seconds between readiness / registry probes
+STARTUP_PROBE_INTERVAL = 1.0
+
+
+class StartupProgress:
+    """Startup state reported on /health while the orchestrator comes up"""
+
+    def __init__(self):
+        self.phase = "starting"
+        self.started_at = time.time()
+        self.completed_at: Optional[float] = None
+        self.packages: Dict[str, Dict[str, Any]] = {}
+
+    def set_phase(self, phase: str):
+        self.phase = phase
+
+    def set_package(self, name: str, state: str, **details):
+        entry = self.packages.setdefault(name, {"required": False})
+        entry["state"] = state
+        entry.update({key: value for key, value in details.items() if value is not None})
+
+    def finish(self):
+        self.completed_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        pending = [
+            name for name, entry in self.packages.items()
+            if entry["state"] in ("pending", "installing", "starting")
+        ]
+        end = self.completed_at or time.time()
+        return {
+            "phase": self.phase,
+            "ready": self.phase == "ready",
+            "complete": self.completed_at is not None,
+            "elapsed_seconds": round(end - self.started_at, 2),
+            "pending": pending,
+            "packages": {name: dict(entry) for name, entry in self.packages.items()},
+        }
+
+
+_startup_progress = StartupProgress()
+
+
+def get_startup_progress() -> StartupProgress:
+    """Get the startup progress tracker"""
+    return _startup_progress
 
 
 async def run_startup(app, config, engine, agent_runtime, team_runtime, registry,
@@ -26,6 +77,10 @@ async def run_startup(app, config, engine, agent_runtime, team_runtime, registry
     2. Discover and register dynamically installed MCPs
     3. Auto-install default MCPs from registry if configured
 
+    Required auto-install packages are installed in parallel before this
+    returns; optional ones continue in a background task so the API starts
+    serving immediately. Progress is tracked in get_startup_progress().
+
     Args:
         app: FastAPI application instance
         config: Configuration object
@@ -38,8 +93,11 @@ async def run_startup(app, config, engine, agent_runtime, team_runtime, registry
         parse_registries_conf: Function to parse registries config
     """
     print("🚀 Starting orchestrator...")
+    progress = get_startup_progress()
+    profiler = get_startup_profiler()
 
     # 0. Check and perform automatic migration if needed (US-011)
+    progress.set_phase("migrating")
     print("🔄 Checking for installation migration...")
     try:
         from app.services.startup_migration_service import StartupMigrationService
@@ -82,18 +140,17 @@ async def run_startup(app, config, engine, agent_runtime, team_runtime, registry
     app.state.mcp_registry = registry  # Global MCP registry with registered servers
     app.state.mcp_manager = None  # Will be set after MCP manager initializes
     print("✅ Runtime objects stored in app.state")
-
-    # Wait for registry to be ready
-    print("⏳ Waiting for registry server...")
-    await asyncio.sleep(config.get_polling_interval())
+    profiler.mark("startup: migration check")
 
     # 1. Discover already installed MCPs and get MCP network name
+    # (one batched container status query for every MCP)
+    progress.set_phase("discovering")
     print("🔍 Discovering installed MCPs...")
+    mcp_mgr = None
     try:
         mcp_mgr = get_mcp_manager()
         app.state.mcp_manager = mcp_mgr  # Store in app.state for dependency injection
-        installed_mcps = mcp_mgr.list_installed()
-        installed_names = {mcp["name"] for mcp in installed_mcps}
+        installed_mcps = await mcp_mgr.list_installed_async()
 
         # Get the actual MCP network name (auto-detected with compose prefix)
         mcp_network_name = getattr(mcp_mgr, 'network_name', 'mcp-network')
@@ -101,11 +158,14 @@ async def run_startup(app, config, engine, agent_runtime, team_runtime, registry
     except Exception as e:
         print(f"⚠️  Could not discover installed MCPs: {e}")
         installed_mcps = []
-        installed_names = set()
         mcp_network_name = 'mcp-network'
 
+    profiler.mark("startup: discover installed MCPs")
+
     # 1.5. Initialize Registry Service for YUM-style package management
+    # The index refresh runs alongside the MCP pipeline below
     print("📦 Initializing Registry Service...")
+    refresh_task = None
     try:
         from app.services.registry import RegistryService
 
@@ -116,8 +176,7 @@ async def run_startup(app, config, engine, agent_runtime, team_runtime, registry
         print(f"✅ Registry Service initialized with {len(registry_service.registries)} registries")
 
         # Refresh package index from registries
-        await registry_service.refresh_index()
-        print(f"✅ Package index refreshed")
+        refresh_task = asyncio.create_task(registry_service.refresh_index())
     except Exception as e:
         print(f"⚠️  Warning: Failed to initialize Registry Service: {e}")
         print("   Registry features will be disabled.")
@@ -132,268 +191,70 @@ async def run_startup(app, config, engine, agent_runtime, team_runtime, registry
         print(f"⚠️  Warning: Failed to initialize Vulhub services: {e}")
         print("   Vulhub features will be disabled.")
 
-    # 3. Start any stopped MCP containers
-    if installed_mcps:
+    profiler.mark("startup: registry service and vulhub")
+
+    # 3. Start any stopped MCP containers (in parallel)
+    stopped = [mcp for mcp in installed_mcps if mcp.get("name") and not mcp.get("running")]
+    if stopped and mcp_mgr is not None:
         print("🔄 Ensuring MCP containers are running...")
-        for mcp in installed_mcps:
-            mcp_name = mcp.get("name")
-            if not mcp.get("running"):
-                try:
-                    print(f"  Starting {mcp_name}...")
-                    result = mcp_mgr.start(mcp_name)
-                    if result.get("status") == "started":
-                        print(f"  ✅ Started {mcp_name}")
-                    else:
-                        print(f"  ⚠️  Failed to start {mcp_name}: {result.get('error', 'Unknown')}")
-                except Exception as e:
-                    print(f"  ⚠️  Error starting {mcp_name}: {e}")
-
-    # 4. Auto-install default MCPs from registry if not already installed
-    def get_auto_install_packages():
-        """
-        Get list of packages to auto-install.
-        Reads from configs/auto-install.json (preferred) or AUTO_INSTALL_MCPS env var (fallback).
-        """
-        # Prefer JSON configuration file (use ADCL_SYSTEM_CONFIG_DIR for system configs)
-        config_dir = _PathForEnv(os.getenv('ADCL_SYSTEM_CONFIG_DIR', '/configs'))
-        auto_install_file = config_dir / "auto-install.json"
-        if auto_install_file.exists():
-            try:
-                with open(auto_install_file) as f:
-                    config_data = json.load(f)
-
-                if not config_data.get("auto_install", {}).get("enabled", True):
-                    print("ℹ️  Auto-install is disabled in configs/auto-install.json")
-                    return []
-
-                packages = config_data.get("auto_install", {}).get("packages", {})
-                # Filter enabled packages and sort by priority
-                enabled_packages = [
-                    (name, pkg.get("priority", 99), pkg.get("required", False))
-                    for name, pkg in packages.items()
-                    if pkg.get("enabled", False)
-                ]
-                enabled_packages.sort(key=lambda x: x[1])  # Sort by priority
-
-                package_names = [name for name, _, _ in enabled_packages]
-                required_count = sum(1 for _, _, req in enabled_packages if req)
-                optional_count = len(enabled_packages) - required_count
-
-                print(f"📦 Auto-install from configs/auto-install.json:")
-                print(f"   • {required_count} required package(s)")
-                print(f"   • {optional_count} optional package(s)")
-                print(f"   • Order: {', '.join(package_names)}")
-
-                return package_names
-            except Exception as e:
-                print(f"⚠️  Failed to read configs/auto-install.json: {e}")
-                print("   Falling back to AUTO_INSTALL_MCPS environment variable")
+        await asyncio.gather(*(_start_mcp(mcp_mgr, mcp["name"]) for mcp in stopped))
 
-        # Fallback to environment variable (backward compatibility)
-        auto_install = os.getenv("AUTO_INSTALL_MCPS", "")
-        if auto_install:
-            mcps = [name.strip() for name in auto_install.split(",") if name.strip()]
-            print(f"📦 Auto-install from environment variable: {', '.join(mcps)}")
-            return mcps
+    profiler.mark("startup: start stopped containers")
 
-        return []
+    # 4. Auto-install default MCPs from registry if not already installed.
+    # Required packages are installed before the API reports ready; optional
+    # packages keep installing in the background while requests are served.
+    optional_task = None
+    packages_to_install = _get_auto_install_packages()
+    if packages_to_install and mcp_mgr is not None:
+        progress.set_phase("installing")
+        print(f"📦 Installing {len(packages_to_install)} package(s)...")
+        for pkg in packages_to_install:
+            progress.set_package(pkg["name"], "pending", required=pkg["required"])
 
-    mcps_to_install = get_auto_install_packages()
-    if mcps_to_install:
-        print(f"📦 Installing {len(mcps_to_install)} package(s)...")
+        catalog = await _fetch_startup_catalog(
+            [pkg["name"] for pkg in packages_to_install], parse_registries_conf, config
+        )
+        installed_by_name = {mcp["name"]: mcp for mcp in installed_mcps if "name" in mcp}
 
-        for mcp_name in mcps_to_install:
-            # Check if already installed with same version
-            installed_mcp = next((m for m in installed_mcps if m["name"] == mcp_name), None)
+        def install(pkg_name: str):
+            return _auto_install_mcp(
+                pkg_name, catalog.get(pkg_name, []), installed_by_name.get(pkg_name),
+                mcp_mgr, registry, config, progress
+            )
 
-            try:
-                # Fetch from registry
-                registries = parse_registries_conf()
-                enabled_registries = [r for r in registries if r.get("enabled", True)]
-
-                for reg in enabled_registries:
-                    try:
-                        # Handle file:// registries
-                        if reg['url'].startswith('file://'):
-                            from pathlib import Path
-
-                            local_path = reg['url'].replace('file://', '')
-                            if local_path.startswith('./') or local_path.startswith('../'):
-                                base_dir = os.getenv('APP_BASE_DIR', '/app')
-                                directory = (Path(base_dir) / local_path).resolve()
-                            else:
-                                directory = Path(local_path)
-
-                            # Scan all subdirectories to find mcp.json with matching name
-                            # (directory name might not match package name)
-                            mcp_package = None
-                            if directory.exists() and directory.is_dir():
-                                for item in directory.iterdir():
-                                    if not item.is_dir():
-                                        continue
-                                    mcp_json_path = item / "mcp.json"
-                                    if mcp_json_path.exists():
-                                        try:
-                                            with open(mcp_json_path) as f:
-                                                pkg = json.load(f)
-                                            # Match by package name from mcp.json, not directory name
-                                            if pkg.get("name") == mcp_name:
-                                                mcp_package = pkg
-                                                break
-                                        except Exception as e:
-                                            print(f"  ⚠️  Failed to read {mcp_json_path}: {e}")
-                                            continue
-
-                            if not mcp_package:
-                                continue
-
-                            # Check if version matches installed version AND container actually exists
-                            if installed_mcp:
-                                installed_version = installed_mcp.get("version")
-                                package_version = mcp_package.get("version")
-                                # Verify container exists before considering it "installed"
-                                container_name = f"mcp-{mcp_name.replace('_', '-')}"
-                                container_exists = False
-                                try:
-                                    docker_client = docker.from_env()
-                                    docker_client.containers.get(container_name)
-                                    container_exists = True
-                                except docker.errors.NotFound:
-                                    pass  # Container doesn't exist
-
-                                if installed_version == package_version and container_exists:
-                                    print(f"  ⏭️  Skipping {mcp_name} - already installed and running (v{installed_version})")
-                                    break
-
-                            # Install or upgrade from file:// registry
-                            if installed_mcp:
-                                print(f"  🔄 Upgrading {mcp_name} from v{installed_mcp.get('version')} to v{mcp_package.get('version')}...")
-                            else:
-                                print(f"  📥 Installing {mcp_name} from {reg['name']}...")
-
-                            result = get_mcp_manager().install(mcp_package)
-
-                            if result["status"] in ["installed", "already_installed"]:
-                                print(f"  ✅ Installed {mcp_name} successfully from file:// registry")
-                                installed_mcps.append(result)
-                                break
-                            else:
-                                print(f"  ❌ Failed to install {mcp_name}: {result.get('error', 'Unknown error')}")
-
-                            continue
-
-                        async with httpx.AsyncClient(
-                            timeout=config.get_http_timeout_default()
-                        ) as client:
-                            # Try to find MCP by name
-                            response = await client.get(f"{reg['url']}/catalog")
-                            response.raise_for_status()
-                            catalog = response.json()
-
-                            # Find MCP in catalog
-                            mcp_id = None
-                            for mcp in catalog.get("mcps", []):
-                                if mcp.get("name") == mcp_name:
-                                    mcp_id = mcp.get("id")
-                                    break
-
-                            if mcp_id:
-                                # Fetch full package
-                                response = await client.get(
-                                    f"{reg['url']}/mcps/{mcp_id}"
-                                )
-                                response.raise_for_status()
-                                mcp_package = response.json()
-
-                                # Check if version matches installed version AND container actually exists
-                                if installed_mcp:
-                                    installed_version = installed_mcp.get("version")
-                                    package_version = mcp_package.get("version")
-                                    # Verify container exists before considering it "installed"
-                                    container_name = f"mcp-{mcp_name.replace('_', '-')}"
-                                    container_exists = False
-                                    try:
-                                        docker_client = docker.from_env()
-                                        docker_client.containers.get(container_name)
-                                        container_exists = True
-                                    except docker.errors.NotFound:
-                                        pass  # Container doesn't exist
-
-                                    if installed_version == package_version and container_exists:
-                                        print(f"  ⏭️  Skipping {mcp_name} - already installed and running (v{installed_version})")
-                                        break
-
-                                # Install or upgrade
-                                if installed_mcp:
-                                    print(
-                                        f"  🔄 Upgrading {mcp_name} from v{installed_mcp.get('version')} to v{mcp_package.get('version')}..."
-                                    )
-                                else:
-                                    print(
-                                        f"  📥 Installing {mcp_name} from {reg['name']}..."
-                                    )
-                                result = get_mcp_manager().install(mcp_package)
-
-                                if result["status"] in [
-                                    "installed",
-                                    "already_installed",
-                                ]:
-                                    print(f"  ✅ Installed {mcp_name} successfully")
-                                    installed_mcps.append(result)
-                                    break
-                                else:
-                                    print(
-                                        f"  ❌ Failed to install {mcp_name}: {result.get('error', 'Unknown error')}"
-                                    )
-                    except Exception as e:
-                        print(
-                            f"  ⚠️  Error fetching {mcp_name} from {reg.get('name', 'registry')}: {e}"
-                        )
-                        continue
-
-                # If not found in any registry, try installing from local mcp_servers/ as final fallback
-                base_dir = os.getenv('APP_BASE_DIR', '/app')
-                local_mcp_path = _PathForEnv(base_dir) / "mcp_servers" / mcp_name / "mcp.json"
-                if local_mcp_path.exists():
-                    print(f"  📦 Loading {mcp_name} from local mcp_servers/...")
-                    try:
-                        with open(local_mcp_path, 'r') as f:
-                            mcp_package = json.load(f)
-
-                        # Check if version matches installed version
-                        if installed_mcp:
-                            installed_version = installed_mcp.get("version")
-                            package_version = mcp_package.get("version")
-                            if installed_version == package_version:
-                                print(f"  ⏭️  Skipping {mcp_name} - already installed (v{installed_version})")
-                                continue
-
-                        # Install or upgrade from local
-                        if installed_mcp:
-                            print(
-                                f"  🔄 Upgrading {mcp_name} from v{installed_mcp.get('version')} to v{mcp_package.get('version')}..."
-                            )
-                        else:
-                            print(f"  📥 Installing {mcp_name} from local mcp_servers/...")
-
-                        result = get_mcp_manager().install(mcp_package)
-
-                        if result["status"] in ["installed", "already_installed"]:
-                            print(f"  ✅ Installed {mcp_name} successfully")
-                            installed_mcps.append(result)
-                        else:
-                            print(
-                                f"  ❌ Failed to install {mcp_name}: {result.get('error', 'Unknown error')}"
-                            )
-                    except Exception as e:
-                        print(f"  ⚠️  Failed to install {mcp_name} from local: {e}")
+        required = [pkg["name"] for pkg in packages_to_install if pkg["required"]]
+        optional = [pkg["name"] for pkg in packages_to_install if not pkg["required"]]
 
-            except Exception as e:
-                print(f"  ⚠️  Failed to auto-install {mcp_name}: {e}")
+        # Optional packages start right away but are not waited for
+        if optional:
+            print(f"⏳ Installing {len(optional)} optional package(s) in the background...")
+
+            async def install_optional():
+                await asyncio.gather(*(install(name) for name in optional))
+                progress.finish()
+                print(f"✅ Optional MCPs processed. {len(registry.servers)} MCP servers registered.")
+
+            optional_task = asyncio.create_task(install_optional())
+
+        await asyncio.gather(*(install(name) for name in required))
+
+    # Keep a reference so the background install isn't garbage collected
+    app.state.startup_task = optional_task
+
+    if refresh_task is not None:
+        try:
+            await refresh_task
+            print(f"✅ Package index refreshed")
+        except Exception as e:
+            print(f"⚠️  Warning: Failed to refresh package index: {e}")
+
+    profiler.mark("startup: required auto-install and index refresh")
 
     # 5. Register all installed MCPs with orchestrator
+    progress.set_phase("registering")
     print("🔧 Registering installed MCPs...")
-    installed_mcps = get_mcp_manager().list_installed()
+    installed_mcps = await get_mcp_manager().list_installed_async()
 
     for mcp in installed_mcps:
         # Only register if running
@@ -407,45 +268,7 @@ async def run_startup(app, config, engine, agent_runtime, team_runtime, registry
                 )
                 mcp_info = installed_registry.get(mcp["name"])
                 if mcp_info and "package" in mcp_info:
-                    mcp_package = mcp_info["package"]
-                    deployment = mcp_package.get("deployment", {})
-
-                    # Determine endpoint based on network mode
-                    if deployment.get("network_mode") == "host":
-                        # Host mode: use host.docker.internal
-                        port_env_var = f"{mcp['name'].upper()}_PORT"
-                        port = os.getenv(port_env_var, str(config.get_nmap_port()))
-                        endpoint = config.get_docker_host_url_pattern().format(
-                            port=port
-                        )
-                    else:
-                        # Bridge mode: use container name
-                        container_name = deployment.get(
-                            "container_name", f"mcp-{mcp['name']}"
-                        )
-                        port_config = deployment.get("ports", [{}])[0]
-                        port = port_config.get(
-                            "container", str(config.get_agent_port())
-                        )
-                        # Resolve environment variables in port
-                        port = (
-                            port.replace("${", "").split(":-")[1].replace("}", "")
-                            if "${" in str(port)
-                            else port
-                        )
-                        endpoint = config.get_docker_container_url_pattern().format(
-                            container_name=container_name, port=port
-                        )
-
-                    # Register with orchestrator
-                    registry.register(
-                        MCPServerInfo(
-                            name=mcp["name"],
-                            endpoint=endpoint,
-                            description=mcp_package.get("description", ""),
-                            version=mcp_package.get("version", "1.0.0"),
-                        )
-                    )
+                    endpoint = _register_mcp(registry, config, mcp["name"], mcp_info["package"])
                     print(
                         f"  ✅ Registered {mcp['name']} v{mcp['version']} at {endpoint}"
                     )
@@ -453,6 +276,7 @@ async def run_startup(app, config, engine, agent_runtime, team_runtime, registry
                 print(f"  ⚠️  Failed to register {mcp['name']}: {e}")
 
     print(f"✅ Orchestrator ready! {len(registry.servers)} MCP servers registered.")
+    profiler.mark("startup: register MCPs")
 
     # 6. Load model configurations from configs/models.yaml
     print("🤖 Loading model configurations from configs/models.yaml...")
@@ -462,3 +286,361 @@ async def run_startup(app, config, engine, agent_runtime, team_runtime, registry
         db.clear()
         db.extend(load_models_from_config())
     print(f"✅ Loaded {len(db)} models")
+    profiler.mark("startup: load models")
+
+    progress.set_phase("ready")
+    if optional_task is None:
+        progress.finish()
+
+
+def _get_auto_install_packages() -> List[Dict[str, Any]]:
+    """
+    Get list of packages to auto-install.
+    Reads from configs/auto-install.json (preferred) or AUTO_INSTALL_MCPS env var (fallback).
+
+    Returns:
+        [{"name": ..., "required": bool}] in priority order. Packages from
+        AUTO_INSTALL_MCPS are treated as required.
+    """
+    # Prefer JSON configuration file (use ADCL_SYSTEM_CONFIG_DIR for system configs)
+    config_dir = Path(os.getenv('ADCL_SYSTEM_CONFIG_DIR', '/configs'))
+    auto_install_file = config_dir / "auto-install.json"
+    if auto_install_file.exists():
+        try:
+            with open(auto_install_file) as f:
+                config_data = json.load(f)
+
+            if not config_data.get("auto_install", {}).get("enabled", True):
+                print("ℹ️  Auto-install is disabled in configs/auto-install.json")
+                return []
+
+            packages = config_data.get("auto_install", {}).get("packages", {})
+            # Filter enabled packages and sort by priority
+            enabled_packages = [
+                (name, pkg.get("priority", 99), pkg.get("required", False))
+                for name, pkg in packages.items()
+                if pkg.get("enabled", False)
+            ]
+            enabled_packages.sort(key=lambda x: x[1])  # Sort by priority
+
+            package_names = [name for name, _, _ in enabled_packages]
+            required_count = sum(1 for _, _, req in enabled_packages if req)
+            optional_count = len(enabled_packages) - required_count
+
+            print(f"📦 Auto-install from configs/auto-install.json:")
+            print(f"   • {required_count} required package(s)")
+            print(f"   • {optional_count} optional package(s)")
+            print(f"   • Order: {', '.join(package_names)}")
+
+            return [
+                {"name": name, "required": required}
+                for name, _, required in enabled_packages
+            ]
+        except Exception as e:
+            print(f"⚠️  Failed to read configs/auto-install.json: {e}")
+            print("   Falling back to AUTO_INSTALL_MCPS environment variable")
+
+    # Fallback to environment variable (backward compatibility)
+    auto_install = os.getenv("AUTO_INSTALL_MCPS", "")
+    if auto_install:
+        mcps = [name.strip() for name in auto_install.split(",") if name.strip()]
+        print(f"📦 Auto-install from environment variable: {', '.join(mcps)}")
+        return [{"name": name, "required": True} for name in mcps]
+
+    return []
+
+
+async def _fetch_startup_catalog(
+    names: List[str],
+    parse_registries_conf,
+    config
+) -> Dict[str, List[Tuple[Dict[str, Any], str]]]:
+    """
+    Look up auto-install packages in every enabled registry at once.
+
+    Each registry's catalog is fetched a single time (concurrently across
+    registries). Every registry that has a package becomes an install
+    candidate, in registries.conf order, followed by local mcp_servers/
+    as the final fallback.
+
+    Returns:
+        {name: [(mcp_package, source), ...]} in the order to try them
+    """
+    wanted = set(names)
+    registries = [r for r in parse_registries_conf() if r.get("enabled", True)]
+
+    async with httpx.AsyncClient(timeout=config.get_http_timeout_default()) as client:
+        results = await asyncio.gather(
+            *(_fetch_registry_packages(client, reg, wanted, config) for reg in registries),
+            return_exceptions=True
+        )
+
+    catalog = {name: [] for name in names}
+    for reg, packages in zip(registries, results):
+        if isinstance(packages, Exception):
+            print(f"  ⚠️  Error fetching catalog from {reg.get('name', 'registry')}: {packages}")
+            continue
+        for name, mcp_package in packages.items():
+            catalog[name].append((mcp_package, reg.get("name", "registry")))
+
+    # Local mcp_servers/ is tried last, after every registry
+    base_dir = os.getenv('APP_BASE_DIR', '/app')
+    for name in wanted:
+        local_mcp_path = Path(base_dir) / "mcp_servers" / name / "mcp.json"
+        if local_mcp_path.exists():
+            try:
+                with open(local_mcp_path, 'r') as f:
+                    catalog[name].append((json.load(f), "local mcp_servers/"))
+            except Exception as e:
+                print(f"  ⚠️  Failed to read {local_mcp_path}: {e}")
+
+    return catalog
+
+
+async def _fetch_registry_packages(
+    client: httpx.AsyncClient,
+    reg: Dict[str, Any],
+    wanted: Set[str],
+    config
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch the wanted packages from one registry.
+
+    HTTP registries are retried until the polling interval elapses, so a
+    registry container that is still starting is waited for instead of
+    sleeping unconditionally before every startup.
+
+    Returns:
+        {name: mcp_package} for the wanted packages this registry has
+    """
+    # Handle file:// registries
+    if reg['url'].startswith('file://'):
+        local_path = reg['url'].replace('file://', '')
+        if local_path.startswith('./') or local_path.startswith('../'):
+            base_dir = os.getenv('APP_BASE_DIR', '/app')
+            directory = (Path(base_dir) / local_path).resolve()
+        else:
+            directory = Path(local_path)
+        return await asyncio.to_thread(_scan_local_registry, directory, wanted)
+
+    deadline = time.monotonic() + config.get_polling_interval()
+    while True:
+        try:
+            response = await client.get(f"{reg['url']}/catalog")
+            response.raise_for_status()
+            catalog = response.json()
+            break
+        except httpx.TransportError:
+            if time.monotonic() >= deadline:
+                raise
+            await asyncio.sleep(STARTUP_PROBE_INTERVAL)
+
+    # Find wanted MCPs in catalog
+    mcp_ids = {}
+    for mcp in catalog.get("mcps", []):
+        if mcp.get("name") in wanted and mcp.get("name") not in mcp_ids:
+            mcp_ids[mcp["name"]] = mcp.get("id")
+
+    async def fetch_package(mcp_id: str) -> Dict[str, Any]:
+        response = await client.get(f"{reg['url']}/mcps/{mcp_id}")
+        response.raise_for_status()
+        return response.json()
+
+    names = list(mcp_ids)
+    fetched = await asyncio.gather(
+        *(fetch_package(mcp_ids[name]) for name in names), return_exceptions=True
+    )
+
+    packages = {}
+    for name, mcp_package in zip(names, fetched):
+        if isinstance(mcp_package, Exception):
+            print(f"  ⚠️  Error fetching {name} from {reg.get('name', 'registry')}: {mcp_package}")
+            continue
+        packages[name] = mcp_package
+    return packages
+
+
+def _scan_local_registry(directory: Path, wanted: Set[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Scan a file:// registry once for the wanted packages.
+
+    Matches by package name from mcp.json, not directory name
+    (directory name might not match package name).
+    """
+    packages = {}
+    if not directory.exists() or not directory.is_dir():
+        return packages
+
+    for item in directory.iterdir():
+        if not item.is_dir():
+            continue
+        mcp_json_path = item / "mcp.json"
+        if not mcp_json_path.exists():
+            continue
+        try:
+            with open(mcp_json_path) as f:
+                pkg = json.load(f)
+        except Exception as e:
+            print(f"  ⚠️  Failed to read {mcp_json_path}: {e}")
+            continue
+        if pkg.get("name") in wanted:
+            packages.setdefault(pkg["name"], pkg)
+    return packages
+
+
+async def _start_mcp(mcp_mgr, mcp_name: str):
+    """Start a stopped MCP container"""
+    try:
+        print(f"  Starting {mcp_name}...")
+        result = await mcp_mgr.start_async(mcp_name)
+        if result.get("status") == "started":
+            print(f"  ✅ Started {mcp_name}")
+        else:
+            print(f"  ⚠️  Failed to start {mcp_name}: {result.get('error', 'Unknown')}")
+    except Exception as e:
+        print(f"  ⚠️  Error starting {mcp_name}: {e}")
+
+
+async def _auto_install_mcp(
+    mcp_name: str,
+    candidates: List[Tuple[Dict[str, Any], str]],
+    installed_mcp: Optional[Dict[str, Any]],
+    mcp_mgr,
+    registry,
+    config,
+    progress: "StartupProgress"
+):
+    """
+    Install one auto-install MCP, wait for it to answer /health, and register it.
+
+    Candidates are tried in order; a failed install moves on to the next
+    source, so a broken build in one registry does not block the package.
+
+    Args:
+        mcp_name: Package name
+        candidates: (mcp_package, source) pairs from the startup catalog
+        installed_mcp: Current status entry if already installed
+        mcp_mgr: MCP manager
+        registry: MCP registry to register the server with
+        config: Configuration object
+        progress: Startup progress tracker
+    """
+    if not candidates:
+        print(f"  ⚠️  {mcp_name} not found in any registry")
+        progress.set_package(mcp_name, "not_found")
+        return
+
+    error = None
+    for mcp_package, source in candidates:
+        package_version = mcp_package.get("version")
+
+        # Check if version matches installed version AND container actually exists
+        if installed_mcp:
+            installed_version = installed_mcp.get("version")
+            container_exists = installed_mcp.get("state") in ("running", "exited")
+            if installed_version == package_version and container_exists:
+                print(f"  ⏭️  Skipping {mcp_name} - already installed (v{installed_version})")
+                progress.set_package(mcp_name, "skipped", version=installed_version)
+                return
+
+        # Install or upgrade
+        if installed_mcp:
+            print(f"  🔄 Upgrading {mcp_name} from v{installed_mcp.get('version')} to v{package_version}...")
+        else:
+            print(f"  📥 Installing {mcp_name} from {source}...")
+        progress.set_package(mcp_name, "installing", version=package_version, source=source)
+
+        try:
+            result = await mcp_mgr.install_async(mcp_package)
+        except Exception as e:
+            print(f"  ⚠️  Failed to auto-install {mcp_name} from {source}: {e}")
+            error = str(e)
+            continue
+
+        if result["status"] not in ["installed", "already_installed"]:
+            error = result.get('error', 'Unknown error')
+            print(f"  ❌ Failed to install {mcp_name} from {source}: {error}")
+            continue
+
+        break
+    else:
+        progress.set_package(mcp_name, "failed", error=error)
+        return
+
+    print(f"  ✅ Installed {mcp_name} successfully from {source}")
+
+    # Readiness probe before registering the server
+    progress.set_package(mcp_name, "starting")
+    endpoint = _mcp_endpoint(config, mcp_name, mcp_package)
+    if await _wait_until_ready(endpoint, config):
+        progress.set_package(mcp_name, "ready")
+    else:
+        print(f"  ⚠️  {mcp_name} did not become ready within {STARTUP_READY_TIMEOUT}s")
+        progress.set_package(mcp_name, "unready")
+
+    try:
+        _register_mcp(registry, config, mcp_name, mcp_package)
+    except Exception as e:
+        print(f"  ⚠️  Failed to register {mcp_name}: {e}")
+
+
+async def _wait_until_ready(endpoint: str, config) -> bool:
+    """Poll an MCP server's /health endpoint until it answers or the timeout passes"""
+    deadline = time.monotonic() + STARTUP_READY_TIMEOUT
+    async with httpx.AsyncClient(timeout=config.get_http_timeout_health_check()) as client:
+        while True:
+            try:
+                response = await client.get(f"{endpoint}/health")
+                if response.status_code == 200:
+                    return True
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(STARTUP_PROBE_INTERVAL)
+
+
+def _mcp_endpoint(config, mcp_name: str, mcp_package: Dict[str, Any]) -> str:
+    """Determine the endpoint an installed MCP serves on"""
+    deployment = mcp_package.get("deployment", {})
+
+    # Determine endpoint based on network mode
+    if deployment.get("network_mode") == "host":
+        # Host mode: use host.docker.internal
+        port_env_var = f"{mcp_name.upper()}_PORT"
+        port = os.getenv(port_env_var, str(config.get_nmap_port()))
+        return config.get_docker_host_url_pattern().format(
+            port=port
+        )
+
+    # Bridge mode: use container name
+    container_name = deployment.get(
+        "container_name", f"mcp-{mcp_name}"
+    )
+    port_config = deployment.get("ports", [{}])[0]
+    port = port_config.get(
+        "container", str(config.get_agent_port())
+    )
+    # Resolve environment variables in port
+    port = (
+        port.replace("${", "").split(":-")[1].replace("}", "")
+        if "${" in str(port)
+        else port
+    )
+    return config.get_docker_container_url_pattern().format(
+        container_name=container_name, port=port
+    )
+
+
+def _register_mcp(registry, config, mcp_name: str, mcp_package: Dict[str, Any]) -> str:
+    """Register an MCP server with the orchestrator and return its endpoint"""
+    endpoint = _mcp_endpoint(config, mcp_name, mcp_package)
+    registry.register(
+        MCPServerInfo(
+            name=mcp_name,
+            endpoint=endpoint,
+            description=mcp_package.get("description", ""),
+            version=mcp_package.get("version", "1.0.0"),
+        )
+    )
+    return endpoint
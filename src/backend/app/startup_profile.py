@@ -0,0 +1,163 @@
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Startup Profiler and Lazy Startup Mode
+
+ADCL_STARTUP_PROFILE enables a per-phase timing report of orchestrator
+import and startup:
+- "1" / "true": print the report when startup completes
+- any other value: also write the report as JSON to that path
+
+ADCL_LAZY_STARTUP defers provider health checks and heavy service
+construction until first use, so container restarts reach a serving
+state faster.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Captured when main.py first imports this module - the start of profiling
+_PROCESS_START = time.perf_counter()
+
+_TRUTHY = ("1", "true", "yes", "on")
+
+
+def lazy_startup_enabled() -> bool:
+    """Whether ADCL_LAZY_STARTUP is set"""
+    return os.getenv("ADCL_LAZY_STARTUP", "false").strip().lower() in _TRUTHY
+
+
+class StartupProfiler:
+    """Records the duration of consecutive startup phases"""
+
+    def __init__(self, output: Optional[str] = None):
+        """
+        Initialize profiler.
+
+        Args:
+            output: ADCL_STARTUP_PROFILE value (None disables profiling)
+        """
+        self.output = output
+        self.enabled = bool(output)
+        self.phases: List[Tuple[str, float]] = []
+        self._last = _PROCESS_START
+        self._reported = False
+
+    def mark(self, phase: str):
+        """Close the current phase under the given name"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def report(self) -> Dict[str, Any]:
+        """Timing report for all recorded phases"""
+        total = sum(seconds for _, seconds in self.phases)
+        return {
+            "total_seconds": round(total, 4),
+            "lazy_startup": lazy_startup_enabled(),
+            "phases": [
+                {
+                    "phase": phase,
+                    "seconds": round(seconds, 4),
+                    "percent": round(100 * seconds / total, 1) if total else 0.0,
+                }
+                for phase, seconds in self.phases
+            ],
+        }
+
+    def write_report(self):
+        """Print the report and write it to the configured path (once)"""
+        if not self.enabled or self._reported:
+            return
+        self._reported = True
+
+        report = self.report()
+        print(f"⏱️  Startup profile ({report['total_seconds']:.3f}s total):")
+        for entry in report["phases"]:
+            print(f"   {entry['seconds']:8.3f}s {entry['percent']:5.1f}%  {entry['phase']}")
+
+        if self.output.strip().lower() not in _TRUTHY:
+            try:
+                path = Path(self.output)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(json.dumps(report, indent=2))
+                print(f"   Report written to {path}")
+            except Exception as e:
+                print(f"⚠️  Failed to write startup profile to {self.output}: {e}")
+
+
+_profiler: Optional[StartupProfiler] = None
+
+
+def get_startup_profiler() -> StartupProfiler:
+    """Get the process-wide startup profiler (configured from ADCL_STARTUP_PROFILE)"""
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler(os.getenv("ADCL_STARTUP_PROFILE") or None)
+    return _profiler
+
+
+class LazyProxy:
+    """
+    Stands in for an object that is constructed on first attribute access.
+
+    Used in lazy startup mode for services and clients whose construction
+    is expensive but which many requests never touch.
+    """
+
+    def __init__(self, factory: Callable[[], Any], name: str):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _resolve(self) -> Any:
+        instance = object.__getattribute__(self, "_instance")
+        if instance is None:
+            with object.__getattribute__(self, "_lock"):
+                instance = object.__getattribute__(self, "_instance")
+                if instance is None:
+                    started = time.perf_counter()
+                    instance = object.__getattribute__(self, "_factory")()
+                    object.__setattr__(self, "_instance", instance)
+                    name = object.__getattribute__(self, "_name")
+                    print(f"✅ {name} initialized on first use ({time.perf_counter() - started:.3f}s)")
+        return instance
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._resolve(), attr)
+
+    def __setattr__(self, attr: str, value: Any):
+        setattr(self._resolve(), attr, value)
+
+    def __repr__(self) -> str:
+        instance = object.__getattribute__(self, "_instance")
+        if instance is None:
+            return f"<LazyProxy {object.__getattribute__(self, '_name')} (not initialized)>"
+        return repr(instance)
+
+
+def lazy(factory: Callable[[], Any], name: str) -> Any:
+    """
+    Construct now, or on first use when lazy startup is enabled.
+
+    Args:
+        factory: Zero-argument constructor
+        name: Name used in the first-use log line
+
+    Returns:
+        The constructed object, or a LazyProxy for it
+    """
+    if lazy_startup_enabled():
+        return LazyProxy(factory, name)
+    return factory()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for the attack session host store
+Checks merge semantics against the original JSON list implementation and
+benchmarks inserting and updating 10k hosts
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import attack_session_service as module
+from app.services.attack_session_service import AttackSessionService, init_attack_session_store
+
+BENCHMARK_HOSTS = 10_000
+LEGACY_BENCHMARK_HOSTS = 1_000
+
+
+def legacy_update_host(session_file: Path, host_ip: str, update_data, now="T"):
+    """The original implementation: load JSON, scan hosts, rewrite the file"""
+    if session_file.exists():
+        session = json.loads(session_file.read_text())
+    else:
+        session = {"session_id": session_file.stem, "created_at": now, "hosts": []}
+    for idx, host in enumerate(session["hosts"]):
+        if host["ip"] == host_ip:
+            session["hosts"][idx] = {**host, **update_data, "updated_at": now}
+            break
+    else:
+        session["hosts"].append({"ip": host_ip, **update_data, "added_at": now})
+    session_file.write_text(json.dumps(session, indent=2))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = init_attack_session_store(tmp_path / "attack_sessions.db", legacy_dir=tmp_path)
+    yield store
+    store.close()
+    module._store_instance = None
+
+
+def strip_times(hosts):
+    return [{k: v for k, v in h.items() if k not in ("added_at", "updated_at")} for h in hosts]
+
+
+def test_merge_semantics_match_legacy(store, tmp_path):
+    """Same hosts, order and merged fields as the JSON list implementation"""
+    updates = [
+        ("10.0.0.1", {"services": [{"port": 22}], "ports": [22]}),
+        ("10.0.0.2", {"services": [{"port": 80}], "ports": [80]}),
+        ("10.0.0.1", {"vulnerabilities": [{"cve": "CVE-2017-5638"}]}),
+        ("10.0.0.3", {"ports": []}),
+        ("10.0.0.1", {"ports": [22, 443]}),
+        ("10.0.0.2", {"exploitation_results": {"access_level": "root"}}),
+    ]
+    legacy_file = tmp_path / "legacy" / "s1.json"
+    legacy_file.parent.mkdir()
+    for ip, data in updates:
+        legacy_update_host(legacy_file, ip, data)
+        AttackSessionService.update_host_in_session("s1", ip, data)
+
+    legacy_hosts = json.loads(legacy_file.read_text())["hosts"]
+    session = AttackSessionService.get_or_create_session("s1")
+
+    assert strip_times(session["hosts"]) == strip_times(legacy_hosts)
+    assert "updated_at" in session["hosts"][0] and "added_at" in session["hosts"][0]
+    assert AttackSessionService.get_host_from_session("s1", "10.0.0.1")["ports"] == [22, 443]
+    assert AttackSessionService.get_host_from_session("s1", "10.9.9.9") is None
+    assert AttackSessionService.get_host_from_session("missing", "10.0.0.1") is None
+
+
+def test_legacy_json_sessions_are_imported(tmp_path):
+    """Existing <session_id>.json files are imported once and set aside"""
+    legacy = {
+        "session_id": "old",
+        "created_at": "2025-01-01T00:00:00",
+        "target_network": "10.0.0.0/24",
+        "hosts": [{"ip": "10.0.0.5", "ports": [80]}, {"ip": "10.0.0.4", "ports": [22]}],
+    }
+    (tmp_path / "old.json").write_text(json.dumps(legacy, indent=2))
+
+    store = init_attack_session_store(tmp_path / "attack_sessions.db", legacy_dir=tmp_path)
+    try:
+        assert AttackSessionService.load_session("old") == legacy
+        assert not (tmp_path / "old.json").exists()
+        assert (tmp_path / "old.json.migrated").exists()
+    finally:
+        store.close()
+        module._store_instance = None
+
+
+def test_remove_host_from_all_sessions(store):
+    for session_id in ("a", "b"):
+        AttackSessionService.update_host_in_session(session_id, "10.0.0.1", {"ports": [22]})
+        AttackSessionService.update_host_in_session(session_id, "10.0.0.2", {"ports": [80]})
+
+    assert AttackSessionService.remove_host_from_all_sessions("10.0.0.1") == 2
+    assert [h["ip"] for h in AttackSessionService.load_session("a")["hosts"]] == ["10.0.0.2"]
+    assert AttackSessionService.load_session("never") is None
+
+
+def test_failed_transaction_leaves_session_intact(store):
+    """A write that fails mid-transaction is rolled back"""
+    AttackSessionService.update_host_in_session("s1", "10.0.0.1", {"ports": [22]})
+    before = AttackSessionService.load_session("s1")
+
+    with pytest.raises(TypeError):
+        # Not JSON serializable: fails after the session row is touched
+        AttackSessionService.update_host_in_session("s1", "10.0.0.1", {"ports": {1, 2}})
+
+    assert AttackSessionService.load_session("s1") == before
+
+
+def test_benchmark_10k_hosts(store, tmp_path):
+    """Insert then update 10k hosts; per-update cost stays flat"""
+    ips = [f"10.{i // 65536}.{(i // 256) % 256}.{i % 256}" for i in range(BENCHMARK_HOSTS)]
+
+    started = time.perf_counter()
+    for ip in ips:
+        AttackSessionService.update_host_in_session("bench", ip, {"ports": [22, 80]})
+    insert_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for ip in ips:
+        AttackSessionService.update_host_in_session("bench", ip, {"services": [{"port": 22, "name": "ssh"}]})
+    update_seconds = time.perf_counter() - started
+
+    legacy_file = tmp_path / "legacy-bench.json"
+    started = time.perf_counter()
+    for ip in ips[:LEGACY_BENCHMARK_HOSTS]:
+        legacy_update_host(legacy_file, ip, {"ports": [22, 80]})
+    legacy_seconds = time.perf_counter() - started
+
+    session = AttackSessionService.load_session("bench")
+    print(
+        f"\n{BENCHMARK_HOSTS} hosts: insert {insert_seconds:.2f}s "
+        f"({insert_seconds / BENCHMARK_HOSTS * 1e6:.0f}us/host), "
+        f"update {update_seconds:.2f}s ({update_seconds / BENCHMARK_HOSTS * 1e6:.0f}us/host); "
+        f"legacy JSON insert of {LEGACY_BENCHMARK_HOSTS} hosts {legacy_seconds:.2f}s "
+        f"({legacy_seconds / LEGACY_BENCHMARK_HOSTS * 1e6:.0f}us/host)"
+    )
+    assert len(session["hosts"]) == BENCHMARK_HOSTS
+    assert session["hosts"][-1]["ip"] == ips[-1]
+    assert session["hosts"][0]["services"][0]["name"] == "ssh"
+    assert insert_seconds + update_seconds < legacy_seconds * (BENCHMARK_HOSTS / LEGACY_BENCHMARK_HOSTS)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for the registry catalog cache
+Uses a fake monotonic clock and an httpx MockTransport registry to check
+TTL / stale-while-revalidate / max-stale behaviour, ETags and the circuit
+breaker
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import catalog_cache_service as module
+from app.services.catalog_cache_service import RegistryCatalogCache
+from app.services.registry.failover import FailoverConfig, RegistryFailoverManager
+
+TTL = 30.0
+MAX_STALE = 600.0
+REGISTRY = {"id": "primary", "name": "Primary", "url": "http://primary.test", "enabled": True}
+
+
+class FakeClock:
+    """Stands in for the time module inside catalog_cache_service"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class FakeRegistry:
+    """Serves /catalog; `status` switches it into failing mode"""
+
+    def __init__(self):
+        self.mcps = [{"id": "agent", "name": "agent", "version": "1.0.0"}]
+        self.status = 200
+        self.fetches = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.fetches += 1
+        await asyncio.sleep(0.01)
+        if self.status != 200:
+            return httpx.Response(self.status, json={"detail": "unavailable"})
+        return httpx.Response(200, json={"mcps": self.mcps, "teams": [], "triggers": []})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def registry():
+    return FakeRegistry()
+
+
+@pytest.fixture
+def cache(tmp_path, registry):
+    registries = [dict(REGISTRY)]
+    cache = RegistryCatalogCache(
+        load_registries=lambda: registries,
+        timeout=5.0,
+        ttl=TTL,
+        max_stale=MAX_STALE,
+        teams_dir=tmp_path / "agent-teams",
+        triggers_dir=tmp_path / "triggers",
+        failover_manager=RegistryFailoverManager(
+            FailoverConfig(max_retries=0, timeout=5.0, circuit_breaker_threshold=3)
+        ),
+    )
+    cache._client = httpx.AsyncClient(transport=httpx.MockTransport(registry.handle))
+    return cache
+
+
+def mcp_versions(snapshot):
+    return [mcp["version"] for mcp in json.loads(snapshot.body)["mcps"]]
+
+
+def test_fresh_catalog_served_without_fetch(cache, clock, registry):
+    async def scenario():
+        first = await cache.get()
+        clock.now += TTL - 1
+        second = await cache.get()
+        await cache.aclose()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert registry.fetches == 1
+    assert second is first
+    assert mcp_versions(second) == ["1.0.0"]
+
+
+def test_stale_catalog_served_while_one_refresh_runs(cache, clock, registry):
+    async def scenario():
+        first = await cache.get()
+        registry.mcps = [{"id": "agent", "name": "agent", "version": "2.0.0"}]
+        clock.now += TTL + 1
+
+        # Past the TTL: every caller gets the cached catalog at once...
+        stale = await asyncio.gather(*(cache.get() for _ in range(5)))
+        fetches_while_stale = registry.fetches
+        # ...while a single background refresh brings in the new one
+        await cache._refresh_task
+        fresh = await cache.get()
+        await cache.aclose()
+        return first, stale, fetches_while_stale, fresh
+
+    first, stale, fetches_while_stale, fresh = asyncio.run(scenario())
+
+    assert all(snapshot is first for snapshot in stale)
+    assert fetches_while_stale == 1
+    assert registry.fetches == 2
+    assert mcp_versions(fresh) == ["2.0.0"]
+    assert fresh.etag != first.etag
+
+
+def test_catalog_past_max_stale_waits_for_fetch(cache, clock, registry):
+    async def scenario():
+        await cache.get()
+        registry.mcps = [{"id": "agent", "name": "agent", "version": "2.0.0"}]
+        clock.now += MAX_STALE + 1
+        snapshot = await cache.get()
+        await cache.aclose()
+        return snapshot
+
+    snapshot = asyncio.run(scenario())
+
+    assert registry.fetches == 2
+    assert mcp_versions(snapshot) == ["2.0.0"]
+
+
+def test_etag_stable_until_content_changes(cache, clock, registry):
+    """The /registries/catalog route answers 304 while the ETag is unchanged"""
+
+    async def scenario():
+        first = await cache.get()
+        same = await cache.refresh()
+        registry.mcps.append({"id": "files", "name": "files", "version": "1.0.0"})
+        changed = await cache.refresh()
+        await cache.aclose()
+        return first, same, changed
+
+    first, same, changed = asyncio.run(scenario())
+
+    assert same.etag == first.etag and same.body == first.body
+    assert changed.etag != first.etag
+
+
+def test_registries_conf_change_refreshes_immediately(cache, clock, registry):
+    async def scenario():
+        await cache.get()
+        cache.load_registries().append({"id": "second", "name": "Second", "url": "http://second.test"})
+        snapshot = await cache.get()
+        await cache.aclose()
+        return snapshot
+
+    snapshot = asyncio.run(scenario())
+
+    assert [entry["id"] for entry in json.loads(snapshot.body)["registries"]] == ["primary", "second"]
+    assert registry.fetches == 3
+
+
+def test_breaker_opens_after_repeated_failures(cache, clock, registry):
+    async def scenario():
+        await cache.get()
+        registry.status = 503
+        snapshots = []
+        for _ in range(4):
+            snapshots.append(await cache.refresh())
+        await cache.aclose()
+        return snapshots
+
+    snapshots = asyncio.run(scenario())
+
+    # Three failed fetches trip the breaker; the fourth refresh sends nothing
+    assert registry.fetches == 4
+    assert cache.failover_manager.is_circuit_breaker_open("primary")
+    entry = json.loads(snapshots[-1].body)["registries"][0]
+    assert entry["available"] is False
+    assert entry["error"] == "circuit breaker open"
+    # The last good packages keep being served, marked stale
+    assert entry["stale"] is True
+    assert mcp_versions(snapshots[-1]) == ["1.0.0"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for dependency resolution
+Table-driven graphs checked against the original recursive resolver: the
+resolution order, missing-dependency errors and cycle detection must match
+"""
+import sys
+from pathlib import Path
+from typing import Dict, List, Set
+
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.registry_models import PackageMetadata
+from app.services.registry.lookup import PackageLookup
+from app.services.registry.resolver import DependencyResolver
+
+
+def make_package(name: str, deps: List[str], version: str = "1.0.0") -> Dict:
+    """deps entries are "name" (required) or "?name" (optional)"""
+    return PackageMetadata(
+        name=name, version=version, description=f"{name} package", type="mcp",
+        dependencies={"mcps": [
+            {"name": dep.lstrip("?"), "version": "1.0.0", "required": not dep.startswith("?")}
+            for dep in deps
+        ]},
+        deployment={"image": f"{name}:{version}", "container_name": f"mcp-{name}"}
+    ).model_dump()
+
+
+def make_index(graph: Dict[str, List[str]]) -> Dict:
+    return {"registries": {"primary": {"url": "http://primary", "packages": [
+        make_package(name, deps) for name, deps in graph.items()
+    ]}}}
+
+
+def reference_resolve(index: Dict, package: PackageMetadata, installed: Set[str], chain: Set[str] = frozenset()):
+    """
+    The original resolver: direct dependencies, then each one's resolution,
+    first occurrence kept. Its visited set was shared across siblings, which
+    reported diamonds as cycles; here it tracks the current chain only.
+    """
+    pkg_key = f"{package.name}@{package.version}"
+    if pkg_key in chain:
+        raise ValueError(f"Circular dependency detected: {pkg_key} already in dependency chain")
+    chain = chain | {pkg_key}
+
+    direct = []
+    for dep in package.dependencies.mcps:
+        if dep.name in installed:
+            continue
+        found = next((PackageMetadata(**p) for reg in index["registries"].values() for p in reg["packages"]
+                      if p["name"] == dep.name and p["version"] == dep.version), None)
+        if found:
+            direct.append(found)
+        elif dep.required:
+            raise ValueError(f"Required dependency not found: {dep.name}@{dep.version}")
+
+    resolved = list(direct)
+    for dep in direct:
+        resolved.extend(reference_resolve(index, dep, installed, chain))
+    unique = {}
+    for pkg in resolved:
+        unique.setdefault(f"{pkg.name}@{pkg.version}", pkg)
+    return list(unique.values())
+
+
+CASES = {
+    "chain": ({"app": ["api"], "api": ["db"], "db": []}, set(), ["api", "db"]),
+    "diamond": ({"app": ["api", "worker"], "api": ["base"], "worker": ["base"], "base": []},
+                set(), ["api", "worker", "base"]),
+    "nested diamond": ({"app": ["a", "b"], "a": ["c", "d"], "b": ["d", "c"], "c": ["e"], "d": ["e"], "e": []},
+                       set(), ["a", "b", "c", "d", "e"]),
+    "shared at different depths": ({"app": ["a", "shared"], "a": ["b"], "b": ["shared"], "shared": ["leaf"],
+                                    "leaf": []}, set(), ["a", "shared", "b", "leaf"]),
+    "installed skipped": ({"app": ["api", "worker"], "api": ["base"], "worker": ["base"], "base": []},
+                          {"base"}, ["api", "worker"]),
+    "missing required": ({"app": ["api"], "api": ["ghost"]}, set(),
+                         "Required dependency not found: ghost@1.0.0"),
+    "missing optional": ({"app": ["api", "?ghost"], "api": []}, set(), ["api"]),
+    "missing behind diamond": ({"app": ["a", "b"], "a": ["c"], "b": ["c"], "c": ["ghost"]}, set(),
+                               "Required dependency not found: ghost@1.0.0"),
+    "cycle": ({"app": ["a"], "a": ["b"], "b": ["a"]}, set(),
+              "Circular dependency detected: a@1.0.0 already in dependency chain"),
+    "cycle back to root": ({"app": ["a"], "a": ["app"]}, set(),
+                           "Circular dependency detected: app@1.0.0 already in dependency chain"),
+    "cycle behind diamond": ({"app": ["a", "b"], "a": ["c"], "b": ["c"], "c": ["d"], "d": ["b"]}, set(),
+                             "Circular dependency detected: c@1.0.0 already in dependency chain"),
+}
+
+
+@pytest.mark.parametrize("case", list(CASES))
+def test_resolution_matches_reference(case):
+    graph, installed, expected = CASES[case]
+    index = make_index(graph)
+    root = PackageMetadata(**index["registries"]["primary"]["packages"][0])
+    installed_records = {name: None for name in installed}
+
+    for resolver in (DependencyResolver(index), DependencyResolver(index, PackageLookup(index))):
+        if isinstance(expected, str):
+            with pytest.raises(ValueError) as error:
+                resolver.resolve(root, installed_records)
+            with pytest.raises(ValueError) as reference_error:
+                reference_resolve(index, root, installed)
+            assert str(error.value) == str(reference_error.value) == expected
+        else:
+            names = [p.name for p in resolver.resolve(root, installed_records)]
+            assert names == [p.name for p in reference_resolve(index, root, installed)] == expected
+
+
+def test_first_registry_wins_for_duplicate_versions():
+    index = {"registries": {
+        "primary": {"packages": [make_package("app", ["api"]), {**make_package("api", []), "description": "primary"}]},
+        "mirror": {"packages": [{**make_package("api", []), "description": "mirror"}]},
+    }}
+    root = PackageMetadata(**index["registries"]["primary"]["packages"][0])
+
+    assert [p.description for p in DependencyResolver(index).resolve(root, {})] == ["primary"]
+
+
+def test_swapped_index_rebuilds_lookup():
+    resolver = DependencyResolver(make_index({"app": ["api"], "api": []}))
+    root = PackageMetadata(**make_package("app", ["api"]))
+    assert [p.name for p in resolver.resolve(root, {})] == ["api"]
+
+    resolver.package_index = make_index({"app": ["api"]})
+    with pytest.raises(ValueError, match="Required dependency not found: api@1.0.0"):
+        resolver.resolve(root, {})
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
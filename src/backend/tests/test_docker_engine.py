@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for the Docker Engine API client and DockerManager's async methods
+Serves canned Engine API responses from a temporary Unix socket and checks
+that status, start, stop and restart go through it without the docker CLI
+"""
+import asyncio
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.docker_engine import DockerEngineClient, DockerEngineError
+from app.docker_manager import DockerManager
+from app.services.registry.operations import PackageOperations
+from app.services.registry.resolver import DependencyResolver
+from app.services.registry.transactions import TransactionLogger
+
+REASONS = {200: "OK", 204: "No Content", 304: "Not Modified", 404: "Not Found", 500: "Internal Server Error"}
+
+CONTAINERS = [
+    {"Id": "a1", "Names": ["/mcp-agent"], "State": "running", "Status": "Up 3 minutes"},
+    {"Id": "b2", "Names": ["/mcp-files"], "State": "exited", "Status": "Exited (0) 2 hours ago"},
+]
+
+INSTALLED = {
+    "agent": {"container_name": "mcp-agent", "version": "1.0.0", "installed_at": "2025-01-01T00:00:00"},
+    "files": {"container_name": "mcp-files", "version": "2.1.0", "installed_at": "2025-01-01T00:00:00"},
+    "history": {"container_name": "mcp-history", "version": "0.3.0", "installed_at": "2025-01-01T00:00:00"},
+}
+
+
+class FakeEngine:
+    """Minimal HTTP/1.1 Engine API over a Unix socket with canned responses"""
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self.requests = []
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def route(self, method: str, path: str, query: dict):
+        known = {name.lstrip("/") for c in CONTAINERS for name in c["Names"]}
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        if method == "GET" and path == "/_ping":
+            return 200, "OK"
+        if method == "GET" and path == "/containers/json":
+            return 200, CONTAINERS if query.get("all") == ["1"] else CONTAINERS[:1]
+        if method == "GET" and parts[0] == "images":
+            return (200, {"Id": "sha256:1"}) if parts[1] == "present:latest" else (404, {"message": "No such image"})
+        if method == "POST" and parts[0] == "containers" and len(parts) == 3:
+            name, action = parts[1], parts[2]
+            if name not in known:
+                return 404, {"message": f"No such container: {name}"}
+            running = next(c for c in CONTAINERS if c["Names"][0] == f"/{name}")["State"] == "running"
+            if (action == "start" and running) or (action == "stop" and not running):
+                return 304, None
+            return 204, None
+        if method == "DELETE" and parts[0] == "containers":
+            return (204, None) if parts[1] in known else (404, {"message": "No such container"})
+        return 500, {"message": f"unexpected {method} {path}"}
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode().partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                await reader.readexactly(int(headers.get("content-length") or 0))
+
+                url = urlsplit(target)
+                self.requests.append((method, url.path, url.query))
+                status, payload = self.route(method, url.path, parse_qs(url.query))
+                body = b"" if payload is None else (
+                    payload.encode() if isinstance(payload, str) else json.dumps(payload).encode()
+                )
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+def socket_dir():
+    # Short path: Unix socket paths are limited to ~100 characters
+    path = tempfile.mkdtemp(prefix="docker-", dir="/tmp")
+    yield Path(path)
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def manager(tmp_path, socket_dir, monkeypatch):
+    """DockerManager on a fake socket, with docker CLI calls recorded instead of run"""
+    monkeypatch.setenv("DOCKER_SOCKET_PATH", f"unix://{socket_dir / 'docker.sock'}")
+    monkeypatch.setenv("MCP_NETWORK", "mcp-network")
+    monkeypatch.setenv("HOSTNAME", "")
+
+    cli_calls = []
+
+    def fake_cli(self, args, check=True):
+        cli_calls.append(args)
+        if args[:2] == ["network", "ls"]:
+            return subprocess.CompletedProcess(args, 0, stdout="mcp-network\n", stderr="")
+        if args[:2] == ["ps", "-a"]:
+            lines = [f"{c['Names'][0].lstrip('/')}\t{c['Status']}" for c in CONTAINERS]
+            return subprocess.CompletedProcess(args, 0, stdout="\n".join(lines) + "\n", stderr="")
+        return subprocess.CompletedProcess(args, 0, stdout="", stderr="")
+
+    monkeypatch.setattr(DockerManager, "_run_docker", fake_cli)
+
+    state_dir = tmp_path / "volumes" / "state"
+    state_dir.mkdir(parents=True)
+    (state_dir / "installed-mcps.json").write_text(json.dumps(INSTALLED))
+
+    manager = DockerManager(base_dir=str(tmp_path))
+    cli_calls.clear()
+    manager.cli_calls = cli_calls
+    yield manager
+    manager._workers.shutdown(wait=False)
+
+
+def test_engine_client_against_fake_socket(socket_dir):
+    socket_path = str(socket_dir / "docker.sock")
+
+    async def scenario():
+        client = DockerEngineClient(f"unix://{socket_path}")
+        async with FakeEngine(socket_path) as engine:
+            assert await client.ping()
+            statuses = await client.container_statuses()
+            present = await client.image_exists("present:latest")
+            missing = await client.image_exists("missing:latest")
+            await client.start_container("mcp-agent")  # 304: already running
+            await client.stop_container("mcp-files")  # 304: already stopped
+            await client.remove_container("mcp-gone")  # 404 tolerated
+            with pytest.raises(DockerEngineError) as error:
+                await client.restart_container("mcp-gone")
+            await client.close()
+            return engine.requests, statuses, present, missing, error.value
+
+    requests, statuses, present, missing, error = asyncio.run(scenario())
+
+    assert statuses == {
+        "mcp-agent": {"state": "running", "status": "Up 3 minutes"},
+        "mcp-files": {"state": "exited", "status": "Exited (0) 2 hours ago"},
+    }
+    assert (present, missing) == (True, False)
+    assert error.status_code == 404 and "No such container" in str(error)
+    assert ("POST", "/containers/mcp-files/stop", "t=10") in requests
+    assert ("GET", "/containers/json", "all=1") in requests
+
+
+def test_list_installed_async_matches_cli_without_running_it(manager, socket_dir):
+    """One /containers/json call gives the same statuses as the docker ps path"""
+
+    async def scenario():
+        async with FakeEngine(str(socket_dir / "docker.sock")) as engine:
+            statuses = await manager.list_installed_async()
+            single = await manager.get_status_async("history")
+            await manager.engine.close()
+            return engine.requests, statuses, single
+
+    requests, statuses, single = asyncio.run(scenario())
+
+    assert manager.cli_calls == []
+    assert [r for r in requests if r[1] == "/containers/json"] == [("GET", "/containers/json", "all=1")] * 2
+    assert {s["name"]: s["state"] for s in statuses} == {
+        "agent": "running", "files": "exited", "history": "container_missing"
+    }
+    assert single["state"] == "container_missing"
+    assert statuses == manager.list_installed()
+
+
+def test_start_stop_restart_async_use_engine_api(manager, socket_dir):
+    async def scenario():
+        async with FakeEngine(str(socket_dir / "docker.sock")) as engine:
+            results = [
+                await manager.start_async("files"),
+                await manager.stop_async("agent"),
+                await manager.restart_async("agent"),
+                await manager.stop_async("history"),  # container missing: API error
+                await manager.start_async("unknown"),
+            ]
+            await manager.engine.close()
+            return engine.requests, results
+
+    requests, results = asyncio.run(scenario())
+
+    assert [r["status"] for r in results] == ["started", "stopped", "restarted", "error", "not_installed"]
+    assert [(m, p) for m, p, _ in requests] == [
+        ("POST", "/containers/mcp-files/start"),
+        ("POST", "/containers/mcp-agent/stop"),
+        ("POST", "/containers/mcp-agent/restart"),
+        ("POST", "/containers/mcp-history/stop"),
+    ]
+    assert manager.cli_calls == []
+
+
+def test_package_backup_state_uses_engine_api(manager, socket_dir, tmp_path):
+    """Rollback backups read and restore container state without blocking on the CLI"""
+    installed_file = tmp_path / "installed-packages.json"
+    installed_file.write_text(json.dumps({"version": "2.0", "packages": {
+        name: {"name": name, "version": "1.0.0", "installed_at": "2025-01-01T00:00:00",
+               "installed_from": "primary", "transaction_id": "tx-1", "container_id": f"id-{name}"}
+        for name in ("agent", "files")
+    }}))
+    operations = PackageOperations(
+        installed_file, manager, DependencyResolver({"registries": {}}),
+        TransactionLogger(tmp_path / "transactions.log")
+    )
+
+    async def scenario():
+        async with FakeEngine(str(socket_dir / "docker.sock")) as engine:
+            backup = await operations._create_backup_state()
+            await operations._restore_backup_state(backup)
+            await manager.engine.close()
+            return engine.requests, backup
+
+    requests, backup = asyncio.run(scenario())
+
+    assert backup.container_states == {"agent": "running", "files": "exited"}
+    assert backup.container_ids == ["id-agent", "id-files"]
+    assert [(m, p) for m, p, _ in requests] == [
+        ("GET", "/containers/json"),
+        ("POST", "/containers/mcp-agent/start"),
+    ]
+    assert manager.cli_calls == []
+
+
+def test_falls_back_to_cli_without_socket(manager):
+    """No daemon socket: status comes from docker ps in the worker pool"""
+    statuses = asyncio.run(manager.list_installed_async())
+
+    assert manager.cli_calls == [["ps", "-a", "--format", "{{.Names}}\t{{.Status}}"]]
+    assert {s["name"]: s["state"] for s in statuses} == {
+        "agent": "running", "files": "exited", "history": "container_missing"
+    }
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for concurrent dependency installs
+Drives InstallPlanner and PackageOperations.install with a fake deploy
+function to check DAG ordering, the max_parallel bound and rollback of a
+failed install
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.registry_models import InstallOptions, PackageMetadata, TransactionStatus
+from app.services.registry.operations import PackageOperations
+from app.services.registry.planner import InstallPlan, InstallPlanError, InstallPlanner
+from app.services.registry.resolver import DependencyResolver
+from app.services.registry.transactions import TransactionLogger
+
+
+def make_package(name: str, *deps: str, version: str = "1.0.0") -> PackageMetadata:
+    return PackageMetadata(
+        name=name, version=version, description=f"{name} package", type="mcp",
+        dependencies={"mcps": [{"name": dep, "version": "1.0.0"} for dep in deps]},
+        deployment={"image": f"{name}:{version}", "container_name": f"mcp-{name}"}
+    )
+
+
+class FakeDeploy:
+    """Deploy function recording start/finish order and peak concurrency"""
+
+    def __init__(self, delays=None, fail=()):
+        self.delays = delays or {}
+        self.fail = set(fail)
+        self.events = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, package: PackageMetadata):
+        self.events.append(("start", package.name))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(package.name, 0.01))
+            if package.name in self.fail:
+                raise RuntimeError(f"deploy of {package.name} failed")
+        finally:
+            self.in_flight -= 1
+        self.events.append(("end", package.name))
+        return package.name
+
+    def index(self, kind: str, name: str) -> int:
+        return self.events.index((kind, name))
+
+
+def test_dependencies_deploy_before_dependents():
+    """Diamond app -> (api, worker) -> base, plus a chain cli -> api"""
+    app = make_package("app", "api", "worker", "cli")
+    deps = [make_package("api", "base"), make_package("worker", "base"),
+            make_package("cli", "api"), make_package("base")]
+    deploy = FakeDeploy(delays={"base": 0.03, "worker": 0.05})
+
+    results = asyncio.run(InstallPlanner(max_parallel=4).execute(InstallPlan(app, deps), deploy))
+
+    assert set(results) == {"app@1.0.0", "api@1.0.0", "worker@1.0.0", "cli@1.0.0", "base@1.0.0"}
+    edges = [("base", "api"), ("base", "worker"), ("api", "cli"),
+             ("api", "app"), ("worker", "app"), ("cli", "app")]
+    for dependency, dependent in edges:
+        assert deploy.index("end", dependency) < deploy.index("start", dependent), (dependency, dependent)
+    # Independent packages overlap: worker (slow) is still deploying when cli starts
+    assert deploy.index("start", "cli") < deploy.index("end", "worker")
+
+
+def test_max_parallel_bounds_installs_in_flight():
+    app = make_package("app", *[f"dep{i}" for i in range(6)])
+    deps = [make_package(f"dep{i}") for i in range(6)]
+
+    peaks = {}
+    for max_parallel in (1, 2, 4):
+        deploy = FakeDeploy()
+        asyncio.run(InstallPlanner(max_parallel).execute(InstallPlan(app, deps), deploy))
+        peaks[max_parallel] = deploy.peak
+
+    assert peaks == {1: 1, 2: 2, 4: 4}
+
+
+def test_failure_stops_new_installs_and_reports_progress():
+    app = make_package("app", "slow", "broken")
+    deps = [make_package("slow"), make_package("broken"), make_package("later", "broken")]
+    deploy = FakeDeploy(delays={"slow": 0.05}, fail={"broken"})
+    events = []
+
+    with pytest.raises(InstallPlanError) as error:
+        asyncio.run(InstallPlanner(4).execute(InstallPlan(app, deps), deploy, events.append))
+
+    assert error.value.failed == "broken@1.0.0"
+    # The in-flight install settles before the plan gives up
+    assert error.value.completed == ["slow@1.0.0"]
+    assert sorted(error.value.skipped) == ["app@1.0.0", "later@1.0.0"]
+    assert {(e["event"], e["package"]) for e in events if e["event"] == "node_skipped"} == {
+        ("node_skipped", "app"), ("node_skipped", "later")
+    }
+
+
+class FakeMCPManager:
+    """MCP manager whose installs go through a FakeDeploy"""
+
+    def __init__(self, deploy: FakeDeploy, already_installed=()):
+        self.deploy = deploy
+        self.already_installed = set(already_installed)
+        self.uninstalled = []
+        self.started = []
+        self.stopped = []
+
+    async def install_async(self, package: dict):
+        metadata = PackageMetadata(**package)
+        await self.deploy(metadata)
+        status = "already_installed" if metadata.name in self.already_installed else "installed"
+        return {"status": status, "container_id": f"id-{metadata.name}", "container_name": f"mcp-{metadata.name}"}
+
+    async def uninstall_async(self, name: str):
+        self.uninstalled.append(name)
+        return {"status": "uninstalled"}
+
+    async def list_installed_async(self):
+        return [{"name": "base", "state": "running"}]
+
+    async def start_async(self, name: str):
+        self.started.append(name)
+        return {"status": "started"}
+
+    async def stop_async(self, name: str):
+        self.stopped.append(name)
+        return {"status": "stopped"}
+
+
+def test_failed_install_rolls_back_only_its_own_deployments(tmp_path):
+    """Only packages this transaction deployed are removed; the backup is restored"""
+    installed_file = tmp_path / "installed-packages.json"
+    installed_file.write_text(json.dumps({"version": "2.0", "packages": {"base": {
+        "name": "base", "version": "1.0.0", "installed_at": "2025-01-01T00:00:00",
+        "installed_from": "primary", "transaction_id": "tx-0", "container_id": "id-base",
+        "dependencies_installed": [], "metadata": None
+    }}}, indent=2))
+    before = installed_file.read_text()
+
+    index = {"registries": {"primary": {"packages": [
+        make_package(name, *deps).model_dump()
+        for name, deps in (("fresh", ()), ("shared", ()), ("broken", ("fresh",)), ("base", ()))
+    ]}}}
+    deploy = FakeDeploy(delays={"broken": 0.05}, fail={"broken"})
+    manager = FakeMCPManager(deploy, already_installed={"shared"})
+    operations = PackageOperations(
+        installed_file, manager, DependencyResolver(index),
+        TransactionLogger(tmp_path / "transactions.log")
+    )
+    app = make_package("app", "base", "fresh", "shared", "broken")
+
+    with pytest.raises(Exception, match="broken"):
+        asyncio.run(operations.install(app, "primary", InstallOptions(max_parallel=2)))
+
+    # fresh was deployed by this install; shared was already there; base was never touched
+    assert [name for kind, name in deploy.events if kind == "end"] == ["fresh", "shared"]
+    assert manager.uninstalled == ["fresh"]
+    assert installed_file.read_text() == json.dumps(json.loads(before), indent=2)
+    assert set(operations.installed_packages) == {"base"}
+    assert manager.started == ["base"] and manager.stopped == []
+
+    latest = operations.transaction_logger.list_transactions(1)[0]
+    assert latest["status"] == TransactionStatus.ROLLED_BACK.value
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
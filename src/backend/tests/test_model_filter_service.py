@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for the model filter facet index
+Checks that cached filtering and sorting match the linear scan, including
+when filter options built the index before sorting passed ratings data
+"""
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import model_filter_service as module
+from app.services.model_filter_service import (
+    FilterCriteria, ModelFilterService, SortCriteria, SortDirection, SortOption
+)
+from app.services.model_service import ModelService
+
+MODELS = [
+    {"id": "a", "name": "Alpha", "provider": "anthropic", "configured": True,
+     "capabilities": {"function_calling": "full", "vision": True}, "tags": ["fast"]},
+    {"id": "b", "name": "Beta", "provider": "openai", "configured": False,
+     "capabilities": {"function_calling": "none"}, "tags": ["cheap"]},
+    {"id": "c", "name": "Gamma", "provider": "openai", "configured": True,
+     "capabilities": {"function_calling": "basic", "code_generation": True}, "tags": ["fast"]},
+]
+RATINGS = {"a": {"quality": 2.0}, "b": {"quality": 5.0}, "c": {"quality": 4.0}}
+PERFORMANCE = {"a": {"total_requests": 10}, "b": {"total_requests": 5}, "c": {"total_requests": 50}}
+
+
+@pytest.fixture
+def service():
+    module._facet_index = None
+    yield ModelFilterService()
+    module._facet_index = None
+
+
+def ids(models):
+    return [model["id"] for model in models]
+
+
+def test_sort_with_data_after_filter_options_on_same_version(service):
+    """An index first built without data must not serve sorts that pass data"""
+    service.get_filter_options(MODELS, catalog_version=7)
+
+    for option, data in ((SortOption.RATING, {"ratings_data": RATINGS}),
+                         (SortOption.USAGE, {"performance_data": PERFORMANCE})):
+        criteria = SortCriteria(option=option, direction=SortDirection.DESC)
+        expected = service.sort_models(MODELS, criteria, **data)
+        cached = service.sort_models(MODELS, criteria, catalog_version=7, **data)
+        assert ids(cached) == ids(expected), option
+        # Sorting again without data does not reuse the data-driven ordering
+        assert ids(service.sort_models(MODELS, criteria, catalog_version=7)) == ids(service.sort_models(MODELS, criteria))
+
+    assert ids(service.sort_models(
+        MODELS, SortCriteria(option=SortOption.RATING, direction=SortDirection.DESC),
+        ratings_data=RATINGS, catalog_version=7
+    )) == ["b", "c", "a"]
+
+
+def test_cached_filter_matches_linear_scan(service):
+    criteria_list = [
+        FilterCriteria(providers=["openai"]),
+        FilterCriteria(statuses=["configured"], tags=["fast"]),
+        FilterCriteria(capabilities=["function_calling", "code_generation"]),
+        FilterCriteria(providers=["openai"], search_query="gam"),
+    ]
+    for criteria in criteria_list:
+        assert ids(service.filter_models(MODELS, criteria, catalog_version=1)) == ids(
+            service.filter_models(MODELS, criteria)
+        )
+    assert service.get_filter_options(MODELS, catalog_version=1) == service.get_filter_options(MODELS)
+
+
+def test_snapshot_versions_unique_across_model_services(tmp_path):
+    """Two ModelService instances never hand out the same catalog version"""
+    versions = []
+    for name in ("one", "two"):
+        config_dir = tmp_path / name
+        config_dir.mkdir()
+        (config_dir / "models.yaml").write_text("models: []\n")
+        model_service = ModelService(config_dir / "models.yaml", SimpleNamespace())
+        versions.append(asyncio.run(model_service.get_catalog_snapshot()).version)
+
+    assert versions[0] != versions[1]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
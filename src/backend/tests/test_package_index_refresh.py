@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for package index refresh
+Serves registries from an httpx stand-in transport to check conditional
+requests, delta merging and the bounded concurrent fan-out
+"""
+import asyncio
+import json
+import sys
+import time
+from email.utils import formatdate
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.registry_models import RegistryConfig
+from app.services.registry.failover import FailoverConfig
+from app.services.registry.index import PackageIndexManager
+
+LATENCY = 0.1
+
+
+def package(name: str, version: str) -> dict:
+    return {
+        "name": name, "version": version, "description": f"{name} package", "type": "mcp",
+        "deployment": {"image": f"{name}:{version}", "container_name": name}
+    }
+
+
+class StandInRegistry:
+    """Package registries behind an httpx transport, honouring validators and ?since= cursors"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.catalogs = {}
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+
+    def publish(self, host: str, packages=(), removed=()):
+        """Publish a new catalog revision; the change since the last one is served as a delta"""
+        catalog = self.catalogs.setdefault(host, {"revision": 0, "packages": {}, "changes": {}})
+        current = catalog["packages"]
+        for name in removed:
+            for key in [k for k in current if k[0] == name]:
+                del current[key]
+        for pkg in packages:
+            current[(pkg["name"], pkg["version"])] = pkg
+        catalog["changes"][catalog["revision"]] = {
+            "packages": list(packages), "removed": [{"name": name} for name in removed]
+        }
+        catalog["revision"] += 1
+        catalog["last_modified"] = formatdate(1_700_000_000 + catalog["revision"] * 60, usegmt=True)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+        if request.url.path == "/health":
+            return httpx.Response(200, json={"status": "ok"})
+
+        catalog = self.catalogs[request.url.host]
+        revision = catalog["revision"]
+        etag = f'"rev-{revision}"'
+        headers = {"ETag": etag, "Last-Modified": catalog["last_modified"]}
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers=headers)
+
+        cursor = f"rev-{revision}"
+        since = request.url.params.get("since")
+        if since is not None and since.startswith("rev-") and int(since[4:]) == revision - 1:
+            body = {"delta": True, "cursor": cursor, **catalog["changes"][revision - 1]}
+        else:
+            body = {"cursor": cursor, "packages": list(catalog["packages"].values())}
+        return httpx.Response(200, headers=headers, content=json.dumps(body).encode())
+
+
+@pytest.fixture
+def stand_in(monkeypatch):
+    """Route every httpx.AsyncClient the registry code opens through the stand-in"""
+    registry = StandInRegistry()
+    client_class = httpx.AsyncClient
+
+    def client(*args, **kwargs):
+        return client_class(*args, transport=httpx.MockTransport(registry.handle), **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", client)
+    return registry
+
+
+def make_registry(name: str, priority: int = 10) -> RegistryConfig:
+    return RegistryConfig(name=name, display_name=name.title(), url=f"http://{name}.test", priority=priority)
+
+
+def make_manager(tmp_path, max_concurrent_fetches: int = 4) -> PackageIndexManager:
+    return PackageIndexManager(
+        tmp_path / "package-index.json", base_dir=tmp_path,
+        failover_config=FailoverConfig(max_retries=0, timeout=5.0),
+        max_concurrent_fetches=max_concurrent_fetches
+    )
+
+
+def catalog_of(manager: PackageIndexManager, registry: str):
+    return sorted((pkg["name"], pkg["version"]) for pkg in manager.index["registries"][registry]["packages"])
+
+
+def test_conditional_refresh_and_delta_merge(tmp_path, stand_in):
+    registries = {"primary": make_registry("primary")}
+    stand_in.publish("primary.test", packages=[package("demo", "1.0.0"), package("tools", "1.0.0"),
+                                               package("legacy", "0.9.0"), package("legacy", "1.0.0")])
+    manager = make_manager(tmp_path)
+
+    # First refresh: full catalog, no validators to send yet
+    asyncio.run(manager.refresh(registries))
+    first = stand_in.requests[-1]
+    entry = manager.index["registries"]["primary"]
+    assert "if-none-match" not in first.headers and "since" not in first.url.params
+    assert entry["refresh_mode"] == "full"
+    assert (entry["etag"], entry["cursor"]) == ('"rev-1"', "rev-1")
+    assert entry["last_modified"] == stand_in.catalogs["primary.test"]["last_modified"]
+
+    # Unchanged catalog: validators and cursor go out, a 304 keeps the entry
+    asyncio.run(manager.refresh(registries))
+    second = stand_in.requests[-1]
+    assert second.headers["if-none-match"] == '"rev-1"'
+    assert second.headers["if-modified-since"] == entry["last_modified"]
+    assert second.url.params["since"] == "rev-1"
+    assert manager.index["registries"]["primary"]["refresh_mode"] == "not_modified"
+    assert catalog_of(manager, "primary") == [
+        ("demo", "1.0.0"), ("legacy", "0.9.0"), ("legacy", "1.0.0"), ("tools", "1.0.0")
+    ]
+
+    # New revision: only the change since rev-1 is sent and merged in place
+    stand_in.publish("primary.test", packages=[package("demo", "1.1.0"), package("agent", "2.0.0")],
+                     removed=["legacy"])
+    asyncio.run(manager.refresh(registries))
+    third = stand_in.requests[-1]
+    assert third.url.params["since"] == "rev-1"
+    entry = manager.index["registries"]["primary"]
+    assert entry["refresh_mode"] == "delta"
+    assert (entry["etag"], entry["cursor"]) == ('"rev-2"', "rev-2")
+
+    expected = [("agent", "2.0.0"), ("demo", "1.0.0"), ("demo", "1.1.0"), ("tools", "1.0.0")]
+    assert catalog_of(manager, "primary") == expected
+    assert manager.lookup.versions("demo") == ["1.0.0", "1.1.0"]
+    assert manager.lookup.versions("legacy") == []
+
+    # The merged index matches a full download of the same revision
+    (tmp_path / "fresh").mkdir()
+    fresh = make_manager(tmp_path / "fresh")
+    asyncio.run(fresh.refresh(registries))
+    assert fresh.index["registries"]["primary"]["refresh_mode"] == "full"
+    assert catalog_of(fresh, "primary") == expected
+
+    # ...and survives a reload from disk
+    assert catalog_of(make_manager(tmp_path), "primary") == expected
+
+
+def run_timed_refresh(tmp_path, stand_in, registries, max_concurrent_fetches: int):
+    manager = make_manager(tmp_path, max_concurrent_fetches)
+    stand_in.peak = 0
+    started = time.perf_counter()
+    asyncio.run(manager.refresh(registries))
+    return manager, time.perf_counter() - started, stand_in.peak
+
+
+def test_refresh_fans_out_concurrently_within_limit(tmp_path, stand_in):
+    """Registries are fetched in parallel, never more than max_concurrent_fetches at once"""
+    stand_in.latency = LATENCY
+    registries = {}
+    for i in range(6):
+        registries[f"reg{i}"] = make_registry(f"reg{i}", priority=i)
+        stand_in.publish(f"reg{i}.test", packages=[package(f"pkg{i}", "1.0.0")])
+
+    (tmp_path / "sequential").mkdir()
+    (tmp_path / "concurrent").mkdir()
+    sequential, sequential_seconds, sequential_peak = run_timed_refresh(
+        tmp_path / "sequential", stand_in, registries, max_concurrent_fetches=1
+    )
+    concurrent, concurrent_seconds, concurrent_peak = run_timed_refresh(
+        tmp_path / "concurrent", stand_in, registries, max_concurrent_fetches=3
+    )
+
+    print(
+        f"\n6 registries at {LATENCY * 1000:.0f}ms: sequential {sequential_seconds * 1000:.0f}ms, "
+        f"concurrent (limit 3) {concurrent_seconds * 1000:.0f}ms"
+    )
+
+    assert sequential_peak == 1
+    assert concurrent_peak == 3
+    assert sequential_seconds >= 6 * LATENCY
+    assert concurrent_seconds < sequential_seconds / 2
+    # Completion order does not leak into the index: still priority order
+    assert list(concurrent.index["registries"]) == [f"reg{i}" for i in range(6)]
+    assert concurrent.index["registries"] == {
+        name: {**entry, "last_updated": concurrent.index["registries"][name]["last_updated"],
+               "last_checked": concurrent.index["registries"][name]["last_checked"]}
+        for name, entry in sequential.index["registries"].items()
+    }
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
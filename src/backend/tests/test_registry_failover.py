@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for hedged registry failover
+Checks that a fast registry without the package cannot win the hedge race
+against a slower registry that has it
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.registry_models import DeploymentConfig, PackageMetadata, PackageType, RegistryConfig
+from app.services.registry.failover import FailoverConfig, RegistryFailoverManager
+from app.services.registry.index import PackageIndexManager
+
+HEDGE_CONFIG = FailoverConfig(hedge_default_delay=0.02, hedge_min_delay=0.01, timeout=5.0)
+
+
+def make_registries():
+    return {
+        "primary": RegistryConfig(name="primary", display_name="Primary", url="http://primary", priority=10),
+        "secondary": RegistryConfig(name="secondary", display_name="Secondary", url="http://secondary", priority=20),
+    }
+
+
+def make_package(name: str) -> PackageMetadata:
+    return PackageMetadata(
+        name=name, version="1.0.0", description="test package", type=PackageType.MCP,
+        deployment=DeploymentConfig(image=f"{name}:1.0.0", container_name=name)
+    )
+
+
+def test_not_found_on_fast_registry_does_not_win_hedge():
+    """A slow primary that has the answer beats a fast secondary that doesn't"""
+    manager = RegistryFailoverManager(HEDGE_CONFIG)
+    calls = []
+
+    async def lookup(registry):
+        calls.append(registry.name)
+        if registry.name == "primary":
+            await asyncio.sleep(0.2)
+            return "found-on-primary"
+        return None
+
+    result = asyncio.run(manager.execute_with_failover(
+        lookup, make_registries(), "search_package_demo", accept=lambda found: found is not None
+    ))
+
+    assert result == "found-on-primary"
+    assert calls == ["primary", "secondary"]  # the hedge was sent...
+    assert manager.hedge_metrics.hedge_wins == 0  # ...but did not win
+    assert manager.hedge_metrics.cancelled_requests == 0
+
+
+def test_not_found_everywhere_returns_rejected_result():
+    manager = RegistryFailoverManager(HEDGE_CONFIG)
+
+    async def lookup(registry):
+        return None
+
+    result = asyncio.run(manager.execute_with_failover(
+        lookup, make_registries(), "search_package_missing", accept=lambda found: found is not None
+    ))
+
+    assert result is None
+
+
+def test_not_found_fails_over_to_next_registry():
+    """Without hedging, a not-found answer moves on to the next registry"""
+    manager = RegistryFailoverManager(FailoverConfig(hedge_enabled=False))
+
+    async def lookup(registry):
+        return "found-on-secondary" if registry.name == "secondary" else None
+
+    result = asyncio.run(manager.execute_with_failover(
+        lookup, make_registries(), "search_package_demo", accept=lambda found: found is not None
+    ))
+
+    assert result == "found-on-secondary"
+
+
+def test_get_package_with_failover_waits_for_registry_with_package(tmp_path):
+    manager = PackageIndexManager(tmp_path / "package-index.json", base_dir=tmp_path, failover_config=HEDGE_CONFIG)
+
+    async def fetch(client, registry):
+        if registry.name == "primary":
+            await asyncio.sleep(0.2)
+            return [make_package("demo")]
+        return [make_package("other")]
+
+    manager._fetch_from_registry = fetch
+    info = asyncio.run(manager.get_package_with_failover("demo", registries=make_registries()))
+
+    assert info is not None
+    assert info.registry_name == "primary"
+    assert info.metadata.name == "demo"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
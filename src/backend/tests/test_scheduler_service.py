@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for the orchestrator scheduler
+Uses a fake clock for misfire policies and next fire times, and a blocking
+fire callback for the per-target concurrency cap and coalescing
+"""
+import asyncio
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import scheduler_service as module
+from app.services.scheduler_service import Schedule, SchedulerService
+
+# 2025-01-01 12:00:30 UTC, mid-minute so every-minute crons are unambiguous
+NOW = datetime(2025, 1, 1, 12, 0, 30, tzinfo=timezone.utc).timestamp()
+MINUTE = 60.0
+
+
+class FakeClock:
+    """Stands in for the time module inside scheduler_service"""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock(NOW)
+    monkeypatch.setattr(module, "time", clock)
+    return clock
+
+
+class Recorder:
+    """Fire callback recording firings; optionally blocks until released"""
+
+    def __init__(self, block: bool = False):
+        self.fired = []
+        self.active = 0
+        self.peak = 0
+        self.release = asyncio.Event() if block else None
+
+    async def __call__(self, schedule, params):
+        self.fired.append((schedule.name, params["scheduled_for"], params["misfire"]))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            if self.release is not None:
+                await self.release.wait()
+            return {"id": f"exec-{len(self.fired)}"}
+        finally:
+            self.active -= 1
+
+
+def make_schedule(name="nightly", workflow_id="wf", **overrides) -> Schedule:
+    values = dict(
+        name=name, cron_expression="* * * * *", workflow_id=workflow_id,
+        jitter_seconds=0.0, misfire_policy="fire_once"
+    )
+    values.update(overrides)
+    return Schedule(**values)
+
+
+def write_state(state_file: Path, *schedules: Schedule):
+    state_file.write_text(json.dumps({"schedules": {s.name: s.to_dict() for s in schedules}}))
+
+
+def iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+async def start_and_settle(service: SchedulerService):
+    await service.start()
+    while service._tasks:
+        await asyncio.gather(*service._tasks)
+    await service.stop()
+
+
+def run_recovery(tmp_path, policy: str, missed: int, max_catchup: int = 10):
+    """Start a scheduler whose schedule last fired `missed` minutes ago"""
+    state_file = tmp_path / f"{policy}.json"
+    # Cron times at 11:(60-missed)..11:59 and 12:00 have passed
+    first_missed = NOW - 30 - (missed - 1) * MINUTE
+    write_state(state_file, make_schedule(misfire_policy=policy, next_fire=first_missed))
+
+    recorder = Recorder()
+    service = SchedulerService(state_file, fire=recorder, max_catchup=max_catchup)
+    asyncio.run(start_and_settle(service))
+    return service, recorder, first_missed
+
+
+def test_misfire_skip(tmp_path, clock):
+    service, recorder, _ = run_recovery(tmp_path, "skip", missed=5)
+
+    assert recorder.fired == []
+    assert service.schedules["nightly"].next_fire == NOW + 30  # 12:01:00
+
+
+def test_misfire_fire_once_replays_latest(tmp_path, clock):
+    service, recorder, _ = run_recovery(tmp_path, "fire_once", missed=5)
+
+    assert recorder.fired == [("nightly", iso(NOW - 30), True)]
+    assert service.schedules["nightly"].next_fire == NOW + 30
+
+
+def test_misfire_fire_all_replays_in_order(tmp_path, clock):
+    service, recorder, first_missed = run_recovery(tmp_path, "fire_all", missed=5)
+
+    assert [fired[1] for fired in recorder.fired] == [iso(first_missed + i * MINUTE) for i in range(5)]
+    assert all(fired[2] for fired in recorder.fired)
+
+
+def test_misfire_fire_all_capped_by_max_catchup(tmp_path, clock):
+    _, recorder, _ = run_recovery(tmp_path, "fire_all", missed=30, max_catchup=4)
+
+    assert len(recorder.fired) == 4
+
+
+def test_late_within_grace_is_not_a_misfire(tmp_path, clock):
+    state_file = tmp_path / "state.json"
+    write_state(state_file, make_schedule(next_fire=NOW - 20))
+    recorder = Recorder()
+    service = SchedulerService(state_file, fire=recorder)
+
+    async def scenario():
+        await service.start()
+        await asyncio.sleep(0.05)  # the loop fires the overdue entry on its first pass
+        while service._tasks:
+            await asyncio.gather(*service._tasks)
+        await service.stop()
+
+    asyncio.run(scenario())
+
+    assert recorder.fired == [("nightly", iso(NOW - 20), False)]
+    assert service.schedules["nightly"].next_fire == NOW + 30
+
+
+def test_next_fire_and_state_persisted(tmp_path, clock):
+    state_file = tmp_path / "state.json"
+    service = SchedulerService(state_file, fire=Recorder())
+    service.add(make_schedule(cron_expression="0 9 * * *", timezone="America/New_York"))
+
+    # 09:00 New York on 2025-01-01 is 14:00 UTC
+    expected = datetime(2025, 1, 1, 14, 0, tzinfo=timezone.utc).timestamp()
+    assert service.schedules["nightly"].next_fire == expected
+
+    reloaded = SchedulerService(state_file, fire=Recorder())
+    assert reloaded.schedules["nightly"].next_fire == expected
+    assert reloaded.get_status("nightly")["next_fire"] == iso(expected)
+
+
+def test_target_cap_is_largest_max_concurrent(tmp_path):
+    """Schedules sharing a target get the largest cap, whichever fires first"""
+    service = SchedulerService(tmp_path / "state.json", fire=None)
+    single = make_schedule("single", max_concurrent=1)
+    triple = make_schedule("triple", max_concurrent=3)
+    service.schedules = {"single": single, "triple": triple}
+
+    async def scenario():
+        recorder = Recorder(block=True)
+        service._fire = recorder
+        # The cap-1 schedule fires first; it must not fix the cap at 1
+        for i in range(3):
+            service._dispatch(single, NOW + i, coalesce=False)
+        for i in range(2):
+            service._dispatch(triple, NOW + i, coalesce=False)
+        await asyncio.sleep(0.05)
+        running_while_blocked = recorder.active
+        recorder.release.set()
+        await asyncio.gather(*service._tasks)
+        return recorder, running_while_blocked
+
+    recorder, running_while_blocked = asyncio.run(scenario())
+
+    assert running_while_blocked == 3
+    assert recorder.peak == 3
+    assert len(recorder.fired) == 5
+    assert service._target_running == {"workflow:wf": 0}
+
+
+def test_waiting_firing_is_coalesced(tmp_path):
+    service = SchedulerService(tmp_path / "state.json", fire=None)
+    schedule = make_schedule(max_concurrent=1)
+    service.schedules = {schedule.name: schedule}
+
+    async def scenario():
+        recorder = Recorder(block=True)
+        service._fire = recorder
+        service._dispatch(schedule, NOW)  # runs
+        await asyncio.sleep(0.01)
+        service._dispatch(schedule, NOW + MINUTE)  # waits for the cap
+        await asyncio.sleep(0.01)
+        service._dispatch(schedule, NOW + 2 * MINUTE)  # coalesced with the waiting one
+        recorder.release.set()
+        await asyncio.gather(*service._tasks)
+        return recorder
+
+    recorder = asyncio.run(scenario())
+
+    assert [fired[1] for fired in recorder.fired] == [iso(NOW), iso(NOW + MINUTE)]
+
+
+def test_hung_orchestrator_call_times_out_and_frees_cap(tmp_path):
+    """The default HTTP firing is bounded by fire_timeout"""
+
+    async def scenario():
+        connections = []
+
+        async def hang(reader, writer):
+            connections.append(writer)
+            await reader.read()  # never answer
+
+        server = await asyncio.start_server(hang, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        service = SchedulerService(
+            tmp_path / "state.json", orchestrator_url=f"http://127.0.0.1:{port}", fire_timeout=0.2
+        )
+        schedule = make_schedule(max_concurrent=1)
+        service.schedules = {schedule.name: schedule}
+
+        service._dispatch(schedule, NOW)
+        await asyncio.wait_for(asyncio.gather(*service._tasks), 5)
+        await service.stop()
+        for writer in connections:
+            writer.close()
+        server.close()
+        await server.wait_closed()
+        return service, schedule
+
+    service, schedule = asyncio.run(scenario())
+
+    assert schedule.last_result["status"] == "error"
+    assert service._target_running == {"workflow:wf": 0}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
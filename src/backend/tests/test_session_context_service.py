@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for SessionContextService pruning, concurrent updates and context cache
+Compares the running-total pruning against the original re-count-per-removal loop
+"""
+import asyncio
+import copy
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.session_context_service import SessionContextService
+from app.utils.token_counter import get_token_counter
+
+BENCHMARK_ITEMS = 500
+
+
+def legacy_prune_by_tokens(service, executions):
+    """The original pruning loop: re-serialize and re-count after each removal"""
+    token_counter = get_token_counter()
+    total_tokens = token_counter.count_tokens(json.dumps(executions), service.default_model)
+    if total_tokens <= service.max_context_tokens:
+        return executions
+    while executions and total_tokens > service.max_context_tokens:
+        executions = executions[1:]
+        total_tokens = token_counter.count_tokens(json.dumps(executions), service.default_model)
+    return executions
+
+
+def make_service(tmp_path, max_context_tokens):
+    return SessionContextService(
+        tmp_path, max_context_items=BENCHMARK_ITEMS, max_context_tokens=max_context_tokens
+    )
+
+
+def make_executions(service, count):
+    """Synthetic summaries of varying size, counted as update_context would"""
+    executions = []
+    for i in range(count):
+        result = {
+            "status": "completed",
+            "answer": f"Finding {i}: " + "open port detected on host " * (5 + i % 40),
+            "agent_results": [
+                {"agent_id": f"agent-{j}", "role": "scanner", "status": "done", "tools_used": ["nmap"] * j}
+                for j in range(i % 4)
+            ],
+        }
+        executions.append(service._summarize_execution(result, f"scan request {i}"))
+    return executions
+
+
+def test_pruning_matches_legacy_across_budgets(tmp_path):
+    """Same surviving list as the original algorithm for every budget"""
+    for budget in (0, 1, 50, 400, 2500, 10_000, 10**9):
+        service = make_service(tmp_path, budget)
+        executions = make_executions(service, 60)
+        expected = legacy_prune_by_tokens(service, copy.deepcopy(executions))
+        assert service._prune_by_tokens(executions) == expected, f"budget={budget}"
+
+
+def test_pruning_empty_context_over_budget(tmp_path, monkeypatch):
+    """Even "[]" exceeds a zero budget; an empty list comes back unchanged"""
+    class OneTokenMinimum:
+        def count_tokens(self, text, model):
+            return max(1, len(text) // 4)
+
+    monkeypatch.setattr("app.services.session_context_service.get_token_counter", OneTokenMinimum)
+    service = make_service(tmp_path, 0)
+    assert service._prune_by_tokens([]) == []
+
+
+def test_pruning_counts_legacy_summaries_without_token_count(tmp_path):
+    """Summaries loaded from older context files are counted on demand"""
+    service = make_service(tmp_path, 1500)
+    executions = make_executions(service, 40)
+    for summary in executions:
+        del summary["token_count"]
+
+    expected = legacy_prune_by_tokens(service, copy.deepcopy(executions))
+    pruned = service._prune_by_tokens(executions)
+
+    assert [s["user_message"] for s in pruned] == [s["user_message"] for s in expected]
+    assert all(isinstance(s["token_count"], int) for s in pruned)
+
+
+def test_benchmark_500_item_context(tmp_path):
+    """Running-total pruning beats the quadratic loop on a 500-item context"""
+    service = make_service(tmp_path, 4000)
+    executions = make_executions(service, BENCHMARK_ITEMS)
+    legacy_input = copy.deepcopy(executions)
+
+    started = time.perf_counter()
+    expected = legacy_prune_by_tokens(service, legacy_input)
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    pruned = service._prune_by_tokens(executions)
+    new_seconds = time.perf_counter() - started
+
+    print(
+        f"\n_prune_by_tokens over {BENCHMARK_ITEMS} items -> {len(pruned)} kept: "
+        f"legacy {legacy_seconds * 1000:.1f}ms, running totals {new_seconds * 1000:.1f}ms "
+        f"({legacy_seconds / max(new_seconds, 1e-9):.0f}x)"
+    )
+    assert pruned == expected
+    assert new_seconds * 5 < legacy_seconds
+
+
+def test_concurrent_updates_lose_nothing(tmp_path):
+    """50 concurrent updates to one session all land in the saved context"""
+    updates = 50
+    service = SessionContextService(tmp_path, max_context_items=updates, max_context_tokens=10**9)
+
+    async def scenario():
+        await asyncio.gather(*(
+            service.update_context("session-1", {"status": "completed", "answer": f"answer {i}"}, f"message {i}")
+            for i in range(updates)
+        ))
+        return await service.get_context("session-1")
+
+    context = asyncio.run(scenario())
+    on_disk = json.loads((tmp_path / "active" / "session-1" / "context.json").read_text())
+
+    expected = {f"message {i}" for i in range(updates)}
+    assert {e["user_message"] for e in context["executions"]} == expected
+    assert {e["user_message"] for e in on_disk["executions"]} == expected
+    assert on_disk["total_items"] == updates
+    assert list((tmp_path / "active" / "session-1").glob("*.tmp")) == []
+
+
+def test_session_locks_dropped_when_idle(tmp_path):
+    """Locks only exist while a session is being updated"""
+    service = SessionContextService(tmp_path, cache_size=4)
+
+    async def scenario():
+        # Two rounds per session, so later updates queue behind earlier ones
+        await asyncio.gather(*(
+            service.update_context(f"session-{i % 100}", {"answer": f"answer {i}"}, f"message {i}")
+            for i in range(200)
+        ))
+        await service.clear_context("session-1")
+        return [await service.get_context(f"session-{i}") for i in (0, 99)]
+
+    contexts = asyncio.run(scenario())
+
+    assert service._locks == {}
+    assert [c["total_items"] for c in contexts] == [2, 2]
+
+
+def test_failed_write_keeps_previous_context(tmp_path, monkeypatch):
+    """A write that fails before the rename leaves the old file intact"""
+    service = SessionContextService(tmp_path, cache_size=0)
+    asyncio.run(service.update_context("session-1", {"answer": "first"}, "first"))
+    context_file = tmp_path / "active" / "session-1" / "context.json"
+    before = context_file.read_text()
+
+    def crash(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("app.services.session_context_service.os.replace", crash)
+    try:
+        asyncio.run(service.update_context("session-1", {"answer": "second"}, "second"))
+    except OSError:
+        pass
+
+    assert context_file.read_text() == before
+    assert list(context_file.parent.glob("*.tmp")) == []
+    context = asyncio.run(service.get_context("session-1"))
+    assert [e["user_message"] for e in context["executions"]] == ["first"]
+
+
+def test_hot_sessions_served_from_cache(tmp_path):
+    """get_context skips disk for cached sessions and returns independent copies"""
+    service = SessionContextService(tmp_path, cache_size=2)
+
+    async def scenario():
+        for session_id in ("a", "b", "c"):
+            await service.update_context(session_id, {"answer": session_id}, session_id)
+        # Remove files behind the service's back: cached sessions still answer
+        for session_id in ("a", "b", "c"):
+            (tmp_path / "active" / session_id / "context.json").unlink()
+        return [await service.get_context(session_id) for session_id in ("a", "b", "c")]
+
+    evicted, cached_b, cached_c = asyncio.run(scenario())
+
+    assert evicted["total_items"] == 0  # least recently used, evicted
+    assert cached_b["executions"][0]["user_message"] == "b"
+    assert cached_c["executions"][0]["user_message"] == "c"
+
+    cached_c["executions"].clear()
+    again = asyncio.run(service.get_context("c"))
+    assert again["total_items"] == 1
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for startup auto-install
+Checks that every registry listing a package is kept as an install source,
+and that a failed install falls through to the next registry and then to
+local mcp_servers/
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import startup
+from app.startup import StartupProgress, _auto_install_mcp, _fetch_startup_catalog
+
+
+def make_package(name: str, version: str, image: str) -> dict:
+    return {
+        "name": name, "version": version, "description": f"{name} server",
+        "deployment": {"image": image, "container_name": f"mcp-{name}", "ports": [{"container": "7000"}]}
+    }
+
+
+def write_package(directory: Path, package: dict):
+    directory.mkdir(parents=True)
+    (directory / "mcp.json").write_text(json.dumps(package))
+
+
+class FakeManager:
+    """install_async that fails for the images listed in `broken`"""
+
+    def __init__(self, broken=(), raises=()):
+        self.broken = set(broken)
+        self.raises = set(raises)
+        self.attempts = []
+
+    async def install_async(self, package):
+        image = package["deployment"]["image"]
+        self.attempts.append(image)
+        if image in self.raises:
+            raise RuntimeError(f"pull failed for {image}")
+        if image in self.broken:
+            return {"status": "error", "error": f"build failed for {image}"}
+        return {"status": "installed", "name": package["name"]}
+
+
+class FakeRegistry:
+    def __init__(self):
+        self.servers = {}
+
+    def register(self, info):
+        self.servers[info.name] = info
+
+
+CONFIG = SimpleNamespace(
+    get_http_timeout_default=lambda: 5.0,
+    get_polling_interval=lambda: 0.0,
+    get_agent_port=lambda: 7000,
+    get_docker_container_url_pattern=lambda: "http://{container_name}:{port}",
+)
+
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    """Two file:// registries and local mcp_servers/, each with its own build of `agent`"""
+    write_package(tmp_path / "primary" / "agent-dir", make_package("agent", "2.0.0", "primary/agent"))
+    write_package(tmp_path / "secondary" / "agent", make_package("agent", "2.0.0", "secondary/agent"))
+    write_package(tmp_path / "mcp_servers" / "agent", make_package("agent", "1.9.0", "local/agent"))
+    monkeypatch.setenv("APP_BASE_DIR", str(tmp_path))
+
+    registries = [
+        {"name": "primary", "url": f"file://{tmp_path / 'primary'}", "enabled": True},
+        {"name": "disabled", "url": f"file://{tmp_path / 'primary'}", "enabled": False},
+        {"name": "secondary", "url": f"file://{tmp_path / 'secondary'}", "enabled": True},
+    ]
+    return lambda: registries
+
+
+@pytest.fixture(autouse=True)
+def ready_at_once(monkeypatch):
+    async def ready(endpoint, config):
+        return True
+
+    monkeypatch.setattr(startup, "_wait_until_ready", ready)
+
+
+def run_install(sources, manager):
+    async def scenario():
+        catalog = await _fetch_startup_catalog(["agent", "missing"], sources, CONFIG)
+        progress = StartupProgress()
+        registry = FakeRegistry()
+        for name in ("agent", "missing"):
+            await _auto_install_mcp(name, catalog[name], None, manager, registry, CONFIG, progress)
+        return catalog, progress, registry
+
+    return asyncio.run(scenario())
+
+
+def test_catalog_keeps_every_source_in_order(sources):
+    catalog = asyncio.run(_fetch_startup_catalog(["agent", "missing"], sources, CONFIG))
+
+    assert [source for _, source in catalog["agent"]] == ["primary", "secondary", "local mcp_servers/"]
+    assert catalog["missing"] == []
+
+
+def test_failed_install_falls_back_to_next_registry(sources):
+    manager = FakeManager(broken={"primary/agent"})
+    _, progress, registry = run_install(sources, manager)
+
+    assert manager.attempts == ["primary/agent", "secondary/agent"]
+    assert progress.packages["agent"]["state"] == "ready"
+    assert progress.packages["agent"]["source"] == "secondary"
+    assert registry.servers["agent"].endpoint == "http://mcp-agent:7000"
+    assert progress.packages["missing"]["state"] == "not_found"
+
+
+def test_falls_back_to_local_when_every_registry_fails(sources):
+    manager = FakeManager(broken={"primary/agent"}, raises={"secondary/agent"})
+    _, progress, registry = run_install(sources, manager)
+
+    assert manager.attempts == ["primary/agent", "secondary/agent", "local/agent"]
+    assert progress.packages["agent"]["source"] == "local mcp_servers/"
+    assert registry.servers["agent"].version == "1.9.0"
+
+
+def test_failed_everywhere_reports_last_error(sources):
+    manager = FakeManager(broken={"primary/agent", "secondary/agent", "local/agent"})
+    _, progress, registry = run_install(sources, manager)
+
+    assert len(manager.attempts) == 3
+    assert progress.packages["agent"]["state"] == "failed"
+    assert progress.packages["agent"]["error"] == "build failed for local/agent"
+    assert "agent" not in registry.servers
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for concurrent team chat fan-out
+Uses a stub agent MCP endpoint that answers every think call after a fixed delay
+"""
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.team_chat_service import combine_team_responses, gather_team_responses
+
+CALL_SECONDS = 0.3
+ENDPOINT = "http://agent:7000"
+
+
+def make_stub_mcp(delay: float, slow_agents=(), failing_agents=()):
+    """Agent MCP stub; prompts naming a slow agent sleep 4x longer"""
+    app = FastAPI()
+    app.state.in_flight = 0
+    app.state.max_in_flight = 0
+
+    @app.post("/mcp/call_tool")
+    async def call_tool(body: dict):
+        prompt = body["arguments"]["prompt"]
+        name = prompt.split("You are ", 1)[1].split(",", 1)[0]
+        app.state.in_flight += 1
+        app.state.max_in_flight = max(app.state.max_in_flight, app.state.in_flight)
+        try:
+            await asyncio.sleep(delay * 4 if name in slow_agents else delay)
+        finally:
+            app.state.in_flight -= 1
+        if name in failing_agents:
+            return {"isError": True, "content": [{"type": "text", "text": "model overloaded"}]}
+        text = json.dumps({"reasoning": f"{name} reporting"})
+        return {"content": [{"type": "text", "text": text}]}
+
+    return app
+
+
+def make_team(count: int) -> dict:
+    return {
+        "name": "Stub",
+        "description": "Stub team",
+        "agents": [
+            {"name": f"agent-{i}", "role": f"role-{i}", "mcp_server": "agent"}
+            for i in range(count)
+        ],
+    }
+
+
+class StubRegistry:
+    def __init__(self, servers):
+        self.servers = servers
+
+    def get(self, name):
+        return self.servers.get(name)
+
+
+async def fan_out(app, team, **kwargs):
+    registry = StubRegistry({"agent": SimpleNamespace(endpoint=ENDPOINT)})
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport) as client:
+        started = time.perf_counter()
+        responses = await gather_team_responses(client, registry, team, "hello", **kwargs)
+        return responses, time.perf_counter() - started
+
+
+def test_agents_are_queried_concurrently_in_team_order():
+    """A five-agent team takes about one round trip, not five"""
+    app = make_stub_mcp(CALL_SECONDS)
+    team = make_team(5)
+
+    responses, elapsed = asyncio.run(fan_out(app, team, max_concurrency=5, agent_timeout=5))
+
+    assert [r["agent"] for r in responses] == [a["name"] for a in team["agents"]]
+    assert [r["response"] for r in responses] == [f"agent-{i} reporting" for i in range(5)]
+    assert app.state.max_in_flight == 5
+    assert elapsed < CALL_SECONDS * 2, f"5 agents took {elapsed:.2f}s"
+
+
+def test_concurrency_is_bounded():
+    """Agents beyond the limit wait for a free slot"""
+    app = make_stub_mcp(CALL_SECONDS)
+
+    responses, elapsed = asyncio.run(fan_out(app, make_team(4), max_concurrency=2, agent_timeout=5))
+
+    assert len(responses) == 4
+    assert app.state.max_in_flight == 2
+    assert CALL_SECONDS * 2 <= elapsed < CALL_SECONDS * 3
+
+
+def test_slow_and_failed_agents_do_not_hold_back_the_rest():
+    """Timeouts and tool errors become per-agent error entries"""
+    app = make_stub_mcp(CALL_SECONDS, slow_agents={"agent-1"}, failing_agents={"agent-2"})
+    team = make_team(4)
+
+    responses, elapsed = asyncio.run(fan_out(app, team, max_concurrency=4, agent_timeout=CALL_SECONDS * 2))
+
+    assert [r["agent"] for r in responses] == [a["name"] for a in team["agents"]]
+    assert responses[0]["response"] == "agent-0 reporting"
+    assert responses[1]["response"].startswith("⚠️ Error: no response within")
+    assert responses[2]["response"] == "⚠️ Error: model overloaded"
+    assert responses[3]["response"] == "agent-3 reporting"
+    assert elapsed < CALL_SECONDS * 3, f"slow agent held the team for {elapsed:.2f}s"
+
+
+def test_missing_mcp_server_reported_in_place():
+    """Agents whose MCP server is not registered keep their slot with an error"""
+    app = make_stub_mcp(CALL_SECONDS)
+    team = make_team(3)
+    team["agents"][1]["mcp_server"] = "unknown"
+    registry = StubRegistry({"agent": SimpleNamespace(endpoint=ENDPOINT)})
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as client:
+            return await gather_team_responses(
+                client, registry, team, "hello", max_concurrency=3, agent_timeout=5
+            )
+
+    responses = asyncio.run(scenario())
+
+    assert [r["agent"] for r in responses] == ["agent-0", "agent-1", "agent-2"]
+    assert responses[1]["response"] == "⚠️ MCP server 'unknown' not available"
+    combined = combine_team_responses(team, responses)
+    assert combined.index("agent-0") < combined.index("agent-1") < combined.index("agent-2")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for the registry transaction log
+Checks the id -> offset index, the reverse block reader against a plain
+forward parse, appends from another logger instance, and compaction
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.registry_models import BackupState, TransactionOperation, TransactionStatus
+from app.services.registry.operations import PackageOperations
+from app.services.registry.resolver import DependencyResolver
+from app.services.registry import transactions as module
+from app.services.registry.transactions import TransactionLogger
+
+LIFECYCLE = [TransactionStatus.PENDING, TransactionStatus.IN_PROGRESS, TransactionStatus.COMPLETED]
+
+
+def forward_list(log_file: Path, limit: int):
+    """The original list_transactions: parse every line, newest first"""
+    transactions = []
+    with open(log_file) as f:
+        for line in f:
+            try:
+                transactions.append(json.loads(line.strip()))
+            except Exception:
+                pass
+    return list(reversed(transactions[-limit:]))
+
+
+def run_transaction(logger: TransactionLogger, name: str, statuses=LIFECYCLE, error: str = None):
+    """Log one transaction through its status changes, like PackageOperations does"""
+    transaction = logger.create_transaction(TransactionOperation.INSTALL, name, "1.0.0")
+    for status in statuses:
+        transaction.status = status
+        transaction.error = error
+        logger.log(transaction)
+    return transaction
+
+
+def test_get_transaction_returns_latest_status(tmp_path):
+    logger = TransactionLogger(tmp_path / "transactions.jsonl")
+    rolled_back = run_transaction(logger, "broken", [
+        TransactionStatus.IN_PROGRESS, TransactionStatus.FAILED, TransactionStatus.ROLLED_BACK
+    ])
+    completed = run_transaction(logger, "fine")
+
+    assert logger.get_transaction(rolled_back.id)["status"] == "rolled_back"
+    assert logger.get_transaction(completed.id)["status"] == "completed"
+    assert logger.get_transaction("txn-missing") is None
+    # A fresh instance builds the same index from disk
+    assert TransactionLogger(logger.log_file).get_transaction(rolled_back.id)["status"] == "rolled_back"
+
+
+def test_list_matches_forward_parse_across_block_boundaries(tmp_path, monkeypatch):
+    logger = TransactionLogger(tmp_path / "transactions.jsonl", compact_threshold_bytes=None)
+    # Varying line lengths so lines straddle the 64KB block edges
+    for i in range(400):
+        run_transaction(logger, f"pkg{i}", error="x" * (i * 37 % 900))
+    size = logger.log_file.stat().st_size
+    assert size > 3 * module._TAIL_BLOCK_SIZE
+
+    for limit in (1, 7, 100, 1199, 1200, 5000):
+        assert logger.list_transactions(limit) == forward_list(logger.log_file, limit), limit
+    assert logger.list_transactions(0) == []
+
+    # Same with tiny blocks, so nearly every line crosses a boundary
+    monkeypatch.setattr(module, "_TAIL_BLOCK_SIZE", 97)
+    assert logger.list_transactions(50) == forward_list(logger.log_file, 50)
+
+
+def test_appends_from_another_instance_are_picked_up(tmp_path):
+    log_file = tmp_path / "transactions.jsonl"
+    reader = TransactionLogger(log_file)
+    writer = TransactionLogger(log_file)
+
+    transaction = run_transaction(writer, "demo", [TransactionStatus.IN_PROGRESS])
+    assert reader.get_transaction(transaction.id)["status"] == "in_progress"
+
+    transaction.status = TransactionStatus.COMPLETED
+    writer.log(transaction)
+    assert reader.get_transaction(transaction.id)["status"] == "completed"
+
+    # A half-written line is skipped until it is complete
+    complete = (json.dumps({**transaction.to_dict(), "status": "rolled_back"}) + "\n").encode()
+    with open(log_file, "ab") as f:
+        f.write(complete[:40])
+    assert reader.get_transaction(transaction.id)["status"] == "completed"
+    with open(log_file, "ab") as f:
+        f.write(complete[40:])
+    assert reader.get_transaction(transaction.id)["status"] == "rolled_back"
+
+    # The writer compacting (a new, smaller file) makes the reader re-index
+    other = run_transaction(writer, "other")
+    writer.compact()
+    assert reader.get_transaction(transaction.id)["status"] == "rolled_back"
+    assert reader.get_transaction(other.id)["status"] == "completed"
+    after = run_transaction(reader, "after")
+    assert writer.get_transaction(after.id)["status"] == "completed"
+
+
+class RestoringManager:
+    """Records the container restores a rollback performs"""
+
+    def __init__(self):
+        self.started = []
+
+    async def start_async(self, name: str):
+        self.started.append(name)
+        return {"status": "started"}
+
+
+def test_rollback_uses_backup_from_latest_record(tmp_path):
+    """The backup is attached after the first (pending) line; rollback must still find it"""
+    logger = TransactionLogger(tmp_path / "transactions.jsonl")
+    transaction = logger.create_transaction(TransactionOperation.UPDATE, "demo", "2.0.0")
+    logger.log(transaction)
+    transaction.status = TransactionStatus.IN_PROGRESS
+    transaction.backup_state = BackupState(installed_packages={}, container_states={"demo": "running"})
+    logger.log(transaction)
+
+    manager = RestoringManager()
+    operations = PackageOperations(
+        tmp_path / "installed-packages.json", manager, DependencyResolver({"registries": {}}), logger
+    )
+
+    assert asyncio.run(operations.rollback(transaction.id)) is True
+    assert manager.started == ["demo"]
+    assert logger.list_transactions(1)[0]["operation"] == "rollback"
+
+
+def test_compact_keeps_latest_line_and_archives_history(tmp_path):
+    logger = TransactionLogger(tmp_path / "transactions.jsonl", compact_threshold_bytes=None)
+    transactions = [run_transaction(logger, f"pkg{i}") for i in range(5)]
+    history = logger.log_file.read_text()
+
+    archive = logger.compact()
+
+    lines = [json.loads(line) for line in logger.log_file.read_text().splitlines()]
+    assert [line["id"] for line in lines] == [t.id for t in transactions]
+    assert all(line["status"] == "completed" for line in lines)
+    assert archive.parent == tmp_path / "transactions-archive"
+    assert archive.read_text() == history
+    assert len(history.splitlines()) == 15
+    assert logger.get_transaction(transactions[2].id)["package_name"] == "pkg2"
+    # Nothing superseded left to drop
+    assert logger.compact() is None
+
+
+def test_log_compacts_automatically_past_threshold(tmp_path):
+    logger = TransactionLogger(tmp_path / "transactions.jsonl", compact_threshold_bytes=4096)
+    transactions = [run_transaction(logger, f"pkg{i}") for i in range(20)]
+
+    assert list((tmp_path / "transactions-archive").iterdir())
+    ids = [json.loads(line)["id"] for line in logger.log_file.read_text().splitlines()]
+    assert len(ids) < 3 * len(transactions)
+    assert {t.id for t in transactions} == set(ids)
+    assert all(logger.get_transaction(t.id)["status"] == "completed" for t in transactions)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
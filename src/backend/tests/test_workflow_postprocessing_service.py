@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for background workflow post-processing
+Checks per-session ordering, retries and back-pressure, and that run latency
+no longer grows with the size of the result payload
+"""
+import asyncio
+import json
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import attack_session_service as session_module
+from app.services.attack_session_service import attack_session_service, init_attack_session_store
+from app.services.workflow_postprocessing_service import PostProcessingJob, PostProcessingQueue
+from app.services.workflow_v2_service import WorkflowV2Service
+
+TARGET = "10.0.0.5"
+PAYLOAD_SIZES = [1_000, 100_000, 2_000_000, 8_000_000]
+
+
+def make_node_results(size: int) -> dict:
+    """fast-recon output of roughly `size` characters, services summary at the end"""
+    line = f"PORT 22/tcp open ssh OpenSSH 8.2 on {TARGET}\n"
+    summary = '```json\n{"services": [{"port": 22, "name": "ssh", "version": "OpenSSH 8.2"}]}\n```\n'
+    filler = "Nmap scan report: host is up, latency 0.01s, no further findings\n"
+    body = line + filler * max(0, (size - len(line) - len(summary)) // len(filler)) + summary
+    return {"recon": {"status": "completed", "answer": body, "iterations": 1}}
+
+
+class FakeExecutor:
+    """Returns a finished context whose node_results hold a prebuilt payload"""
+
+    def __init__(self):
+        self.node_results = make_node_results(1_000)
+        self.runs = 0
+
+    async def execute(self, workflow_def, **kwargs):
+        self.runs += 1
+        now = datetime.now().isoformat()
+        return SimpleNamespace(
+            execution_id=f"exec-{self.runs}",
+            workflow_id=workflow_def.workflow_id,
+            history_session_id="",
+            started_at=now,
+            completed_at=now,
+            node_results=self.node_results,
+            cumulative_tokens={"total_tokens": 0},
+        )
+
+
+class ScanningResultProcessor:
+    """Result processor whose cost grows with the payload, like real scan extraction"""
+
+    def __init__(self):
+        self.processed = []
+
+    async def process_workflow_result(self, workflow_id, execution_id, initial_message, final_result):
+        text = json.dumps(final_result)
+        hosts = set(re.findall(r"\d+\.\d+\.\d+\.\d+", text))
+        ports = re.findall(r"(\d+)/tcp\s+open", text)
+        self.processed.append(execution_id)
+        return f"scan-{execution_id}-{len(hosts)}-{len(ports)}"
+
+
+def legacy_post_process(service, workflow_id, context, initial_message, session_id):
+    """The original inline post-processing, run before the result is returned"""
+
+    async def run():
+        await service.result_processor.process_workflow_result(
+            workflow_id=workflow_id,
+            execution_id=context.execution_id,
+            initial_message=initial_message,
+            final_result=context.node_results
+        )
+        attack_session_service.on_workflow_complete(
+            session_id=session_id,
+            workflow_id=workflow_id,
+            target=initial_message,
+            execution_result={"execution_id": context.execution_id, "workflow_id": workflow_id,
+                              "result": context.node_results}
+        )
+        attack_session_service.get_or_create_session(session_id)
+
+    return run()
+
+
+@pytest.fixture
+def session_store(tmp_path):
+    store = init_attack_session_store(tmp_path / "attack_sessions.db", legacy_dir=tmp_path)
+    yield store
+    store.close()
+    session_module._store_instance = None
+
+
+@pytest.fixture
+def service(tmp_path, session_store):
+    workflows_dir = tmp_path / "workflows"
+    workflows_dir.mkdir()
+    (workflows_dir / "fast-recon.json").write_text(json.dumps({
+        "workflow_id": "fast-recon",
+        "name": "Fast Recon",
+        "version": "2.0",
+        "nodes": [{"node_id": "recon", "node_type": "agent", "config": {"agent_id": "fast-recon-agent"},
+                   "position": {"x": 100, "y": 100}}],
+        "edges": [],
+    }))
+    return WorkflowV2Service(
+        workflows_dir,
+        executor=FakeExecutor(),
+        result_processor=ScanningResultProcessor(),
+        post_processing=PostProcessingQueue(workers=2, retry_base_delay=0.01)
+    )
+
+
+def make_job(execution_id, key, steps):
+    return PostProcessingJob(execution_id=execution_id, workflow_id="wf", ordering_key=key, steps=steps)
+
+
+def test_run_returns_before_post_processing(service):
+    async def scenario():
+        result = await service.run_workflow("fast-recon", initial_message=TARGET, session_id="s1")
+        job = service.post_processing.get(result.execution_id)
+        assert result.post_processing["status"] == "queued"
+        assert result.post_processing["steps"] == {"scan": "pending", "attack_session": "pending"}
+        assert result.scan_id is None
+        await job.wait(5)
+        status = await service.get_post_processing(result.execution_id)
+        await service.post_processing.stop()
+        return status
+
+    status = asyncio.run(scenario())
+
+    assert status["status"] == "completed"
+    assert status["results"]["scan"] == "scan-exec-1-1-1"
+    assert [h["ip"] for h in status["session_state"]["hosts"]] == [TARGET]
+
+
+def test_same_session_jobs_run_in_order():
+    """Jobs for one session never overlap and finish in submission order"""
+    queue = PostProcessingQueue(workers=4)
+    events = []
+
+    def step(label, delay):
+        async def run():
+            events.append(("start", label))
+            await asyncio.sleep(delay)
+            events.append(("end", label))
+        return run
+
+    async def scenario():
+        jobs = []
+        # Earlier jobs are slower: unordered workers would finish them last
+        for i, delay in enumerate([0.05, 0.03, 0.01, 0.0]):
+            jobs.append(await queue.submit(make_job(f"a{i}", "session:a", [("update", step(f"a{i}", delay))])))
+        jobs.append(await queue.submit(make_job("b0", "session:b", [("update", step("b0", 0.0))])))
+        await queue.drain(5)
+        await queue.stop()
+        return jobs
+
+    jobs = asyncio.run(scenario())
+
+    session_a = [e for e in events if e[1].startswith("a")]
+    assert session_a == [(kind, f"a{i}") for i in range(4) for kind in ("start", "end")]
+    # The other session was not held up behind session a
+    assert events.index(("end", "b0")) < events.index(("end", "a0"))
+    assert all(job.status == "completed" for job in jobs)
+
+
+def test_failed_step_is_retried_without_repeating_earlier_steps():
+    queue = PostProcessingQueue(max_attempts=3, retry_base_delay=0.01)
+    calls = {"scan": 0, "session": 0, "broken": 0}
+
+    async def scan():
+        calls["scan"] += 1
+        return "scan-1"
+
+    async def flaky_session():
+        calls["session"] += 1
+        if calls["session"] < 3:
+            raise OSError("database is locked")
+
+    async def broken():
+        calls["broken"] += 1
+        raise ValueError("unparseable result")
+
+    async def scenario():
+        ok = await queue.submit(make_job("e1", "session:s", [("scan", scan), ("attack_session", flaky_session)]))
+        bad = await queue.submit(make_job("e2", "execution:e2", [("broken", broken)]))
+        await queue.drain(5)
+        await queue.stop()
+        return ok, bad
+
+    ok, bad = asyncio.run(scenario())
+
+    assert calls == {"scan": 1, "session": 3, "broken": 3}
+    assert ok.status == "completed" and ok.results["scan"] == "scan-1" and ok.errors == {}
+    assert bad.status == "failed" and bad.step_status == {"broken": "failed"}
+    assert bad.errors["broken"] == "unparseable result"
+
+
+def test_submit_waits_when_queue_is_full():
+    queue = PostProcessingQueue(workers=1, max_pending=2)
+
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def blocked():
+            await gate.wait()
+
+        await queue.submit(make_job("j1", "k1", [("step", blocked)]))
+        await queue.submit(make_job("j2", "k2", [("step", blocked)]))
+        third = asyncio.create_task(queue.submit(make_job("j3", "k3", [("step", blocked)])))
+        await asyncio.sleep(0.05)
+        was_blocked = not third.done()
+        gate.set()
+        await third
+        await queue.drain(5)
+        await queue.stop()
+        return was_blocked
+
+    assert asyncio.run(scenario())
+
+
+def test_run_latency_independent_of_payload_size(service):
+    """Run latency stays flat as the result payload grows; inline processing does not"""
+
+    async def scenario():
+        rows = []
+        for size in PAYLOAD_SIZES:
+            service.executor.node_results = make_node_results(size)
+            session_id = f"bench-{size}"
+
+            started = time.perf_counter()
+            result = await service.run_workflow("fast-recon", initial_message=TARGET, session_id=session_id)
+            run_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            await service.post_processing.get(result.execution_id).wait(60)
+            background_seconds = time.perf_counter() - started
+
+            context = await service.executor.execute(SimpleNamespace(workflow_id="fast-recon"))
+            started = time.perf_counter()
+            await legacy_post_process(service, "fast-recon", context, TARGET, f"legacy-{size}")
+            legacy_seconds = time.perf_counter() - started
+
+            rows.append((size, run_seconds, background_seconds, legacy_seconds))
+        await service.post_processing.stop()
+        return rows
+
+    rows = asyncio.run(scenario())
+
+    print()
+    for size, run_seconds, background_seconds, legacy_seconds in rows:
+        print(
+            f"payload {size / 1e6:5.2f}MB: run {run_seconds * 1000:6.1f}ms, "
+            f"background post-processing {background_seconds * 1000:7.1f}ms, "
+            f"legacy inline {legacy_seconds * 1000:7.1f}ms"
+        )
+
+    smallest, largest = rows[0], rows[-1]
+    # Inline post-processing grows with the payload...
+    assert largest[3] > 10 * smallest[3]
+    # ...run latency does not, and stays well under the inline cost
+    assert largest[1] < max(5 * smallest[1], 0.02)
+    assert largest[1] * 10 < largest[3]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
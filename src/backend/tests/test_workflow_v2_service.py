@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for WorkflowV2Service definition caching
+Benchmarks list and run setup over 1,000 workflow files against the
+original parse-on-every-call implementation
+"""
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.errors import NotFoundError
+from app.services.workflow_v2_service import WorkflowV2Service, _compile_graph
+from app.workflow_v2.models import WorkflowV2Definition
+
+BENCHMARK_WORKFLOWS = 1000
+
+
+def make_workflow(workflow_id: str, nodes: int = 6, edges=None, legacy: bool = False) -> dict:
+    node_ids = [f"n{i}" for i in range(nodes)]
+    if edges is None:
+        edges = list(zip(node_ids, node_ids[1:]))
+    workflow = {
+        "workflow_id": workflow_id,
+        "name": f"Workflow {workflow_id}",
+        "description": "Generated workflow",
+        "nodes": [
+            {"node_id": node_id, "node_type": "agent", "config": {"agent_id": "fast-recon-agent", "timeout": 600}}
+            for node_id in node_ids
+        ],
+        "edges": [{"from": source, "to": target} for source, target in edges],
+    }
+    if not legacy:
+        workflow["version"] = "2.0"
+        workflow["ui_metadata"] = {"zoom": 1.0, "viewport": {"x": 0, "y": 0}}
+        for i, node in enumerate(workflow["nodes"]):
+            node["position"] = {"x": 100 + 300 * i, "y": 100}
+            node["ui"] = {"width": 200, "height": 150}
+        for edge in workflow["edges"]:
+            edge["ui"] = {"animated": True}
+    return workflow
+
+
+def write_workflow(directory: Path, workflow: dict):
+    (directory / f"{workflow['workflow_id']}.json").write_text(json.dumps(workflow, indent=2))
+
+
+@pytest.fixture
+def service(tmp_path):
+    return WorkflowV2Service(tmp_path, executor=None)
+
+
+def legacy_list_workflows(workflows_dir: Path):
+    """The original list_workflows: parse every file on every call"""
+    workflows = []
+    for file in workflows_dir.glob("*.json"):
+        try:
+            workflow_data = json.loads(file.read_text())
+            workflows.append({
+                "workflow_id": workflow_data.get("workflow_id"),
+                "name": workflow_data.get("name"),
+                "description": workflow_data.get("description"),
+                "node_count": len(workflow_data.get("nodes", [])),
+                "filename": file.name
+            })
+        except Exception:
+            pass
+    return workflows
+
+
+def legacy_run_setup(workflows_dir: Path, workflow_id: str):
+    """The original run_workflow setup: read, parse and validate every run"""
+    workflow_data = json.loads((workflows_dir / f"{workflow_id}.json").read_text())
+    return WorkflowV2Definition(**workflow_data)
+
+
+def test_compile_graph_orders_and_detects_cycles():
+    diamond = make_workflow("d", nodes=4, edges=[("n0", "n1"), ("n0", "n2"), ("n1", "n3"), ("n2", "n3")])
+    adjacency, order = _compile_graph(diamond)
+
+    assert adjacency == {"n0": ["n1", "n2"], "n1": ["n3"], "n2": ["n3"], "n3": []}
+    assert order == ["n0", "n1", "n2", "n3"]
+
+    cyclic = make_workflow("c", nodes=3, edges=[("n0", "n1"), ("n1", "n2"), ("n2", "n1")])
+    assert _compile_graph(cyclic)[1] is None
+
+
+def test_compiled_workflow_is_reused_until_file_changes(service, tmp_path):
+    write_workflow(tmp_path, make_workflow("recon"))
+
+    first = asyncio.run(service.get_compiled_workflow("recon"))
+    second = asyncio.run(service.get_compiled_workflow("recon"))
+    assert first is second
+    assert first.topological_order == [f"n{i}" for i in range(6)]
+
+    # Edited outside the service (e.g. by hand or a registry install)
+    write_workflow(tmp_path, make_workflow("recon", nodes=3))
+    third = asyncio.run(service.get_compiled_workflow("recon"))
+    assert third is not first
+    assert third.topological_order == ["n0", "n1", "n2"]
+
+
+def test_get_workflow_returns_independent_copies(service, tmp_path):
+    write_workflow(tmp_path, make_workflow("recon"))
+
+    data = asyncio.run(service.get_workflow("recon"))
+    data["nodes"].clear()
+
+    assert len(asyncio.run(service.get_workflow("recon"))["nodes"]) == 6
+
+
+def test_legacy_workflow_migrated_once(service, tmp_path, monkeypatch):
+    write_workflow(tmp_path, make_workflow("old", legacy=True))
+    calls = []
+    migrate = service._migrate_workflow_to_v2
+    monkeypatch.setattr(service, "_migrate_workflow_to_v2", lambda data: calls.append(1) or migrate(data))
+
+    for _ in range(5):
+        data = asyncio.run(service.get_workflow("old"))
+        asyncio.run(service.get_compiled_workflow("old"))
+
+    assert len(calls) == 1
+    assert data["version"] == "2.0" and "position" in data["nodes"][0]
+    assert json.loads((tmp_path / "old.json").read_text())["version"] == "2.0"
+
+
+def test_create_update_delete_invalidate(service, tmp_path):
+    asyncio.run(service.create_workflow(make_workflow("wf", nodes=2)))
+    assert asyncio.run(service.get_compiled_workflow("wf")).topological_order == ["n0", "n1"]
+
+    asyncio.run(service.update_workflow("wf", make_workflow("wf", nodes=3, edges=[("n2", "n0")])))
+    compiled = asyncio.run(service.get_compiled_workflow("wf"))
+    assert compiled.topological_order == ["n1", "n2", "n0"]
+    assert [w["node_count"] for w in asyncio.run(service.list_workflows())] == [3]
+
+    asyncio.run(service.delete_workflow("wf"))
+    with pytest.raises(NotFoundError):
+        asyncio.run(service.get_compiled_workflow("wf"))
+    assert asyncio.run(service.list_workflows()) == []
+
+
+def test_list_matches_legacy_and_skips_invalid(service, tmp_path):
+    for i in range(5):
+        write_workflow(tmp_path, make_workflow(f"wf{i}", nodes=i + 1))
+    (tmp_path / "broken.json").write_text("{not json")
+
+    def key(w):
+        return w["filename"]
+
+    assert sorted(asyncio.run(service.list_workflows()), key=key) == sorted(legacy_list_workflows(tmp_path), key=key)
+    (tmp_path / "wf0.json").unlink()
+    assert len(asyncio.run(service.list_workflows())) == 4
+
+
+class MutatingExecutor:
+    """Executor that edits the definition it is given, recording what it saw"""
+
+    def __init__(self):
+        self.timeouts = []
+
+    async def execute(self, workflow_def, **kwargs):
+        config = workflow_def.nodes[0].config
+        self.timeouts.append(config["timeout"])
+        config["timeout"] = 1
+        workflow_def.nodes.pop()
+        return SimpleNamespace(
+            execution_id=f"exec-{len(self.timeouts)}", workflow_id=workflow_def.workflow_id,
+            history_session_id="", started_at="", completed_at=None,
+            node_results={}, cumulative_tokens=None
+        )
+
+
+def test_runs_do_not_share_mutable_definition(tmp_path):
+    """A run that edits its definition leaves the cached one untouched"""
+    executor = MutatingExecutor()
+    service = WorkflowV2Service(tmp_path, executor=executor)
+    write_workflow(tmp_path, make_workflow("recon"))
+
+    async def run_twice():
+        await service.run_workflow("recon")
+        await service.run_workflow("recon")
+        return await service.get_compiled_workflow("recon")
+
+    compiled = asyncio.run(run_twice())
+
+    assert executor.timeouts == [600, 600]
+    assert len(compiled.definition.nodes) == 6
+    assert compiled.definition.nodes[0].config["timeout"] == 600
+
+
+def test_agent_references_checked_every_run(tmp_path, monkeypatch):
+    """Agents removed after the definition was cached are still reported"""
+    agents = {"fast-recon-agent"}
+    service = WorkflowV2Service(tmp_path, executor=MutatingExecutor(), agent_definitions=agents)
+    workflow = make_workflow("recon", nodes=1)
+    workflow["nodes"][0]["agent_id"] = "fast-recon-agent"
+    write_workflow(tmp_path, workflow)
+
+    reported = []
+    check = service._check_agent_references
+    monkeypatch.setattr(service, "_check_agent_references", lambda data: reported.append(check(data)))
+
+    asyncio.run(service.run_workflow("recon"))
+    agents.clear()
+    asyncio.run(service.run_workflow("recon"))
+
+    assert reported == [[], ["fast-recon-agent"]]
+
+
+def test_benchmark_1000_workflows(service, tmp_path):
+    """Warm list and run setup skip parsing, migration and validation"""
+    ids = [f"workflow-{i:04d}" for i in range(BENCHMARK_WORKFLOWS)]
+    for workflow_id in ids:
+        write_workflow(tmp_path, make_workflow(workflow_id, nodes=8))
+
+    def timed(fn):
+        started = time.perf_counter()
+        result = fn()
+        return result, time.perf_counter() - started
+
+    legacy_list, legacy_list_seconds = timed(lambda: legacy_list_workflows(tmp_path))
+    _, cold_list_seconds = timed(lambda: asyncio.run(service.list_workflows()))
+    warm_list, warm_list_seconds = timed(lambda: asyncio.run(service.list_workflows()))
+
+    _, legacy_setup_seconds = timed(lambda: [legacy_run_setup(tmp_path, w) for w in ids])
+
+    async def setup_all():
+        return [await service.get_compiled_workflow(w) for w in ids]
+
+    _, cold_setup_seconds = timed(lambda: asyncio.run(setup_all()))
+    compiled, warm_setup_seconds = timed(lambda: asyncio.run(setup_all()))
+
+    print(
+        f"\n{BENCHMARK_WORKFLOWS} workflows: list legacy {legacy_list_seconds * 1000:.0f}ms, "
+        f"cold {cold_list_seconds * 1000:.0f}ms, warm {warm_list_seconds * 1000:.0f}ms; "
+        f"run setup legacy {legacy_setup_seconds * 1000:.0f}ms, "
+        f"cold {cold_setup_seconds * 1000:.0f}ms, warm {warm_setup_seconds * 1000:.0f}ms"
+    )
+    assert len(warm_list) == len(legacy_list) == BENCHMARK_WORKFLOWS
+    assert all(c.topological_order == [f"n{i}" for i in range(8)] for c in compiled)
+    assert warm_list_seconds < legacy_list_seconds
+    assert warm_setup_seconds < legacy_setup_seconds
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q", "-s"]))
@@ -8,15 +8,19 @@
 Agent MCP Server
 Exposes AI agent capabilities as MCP tools (think, code, review)
 """
+import asyncio
 import os
 import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 import yaml
 
 from base_server import BaseMCPServer
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
+
+# Concurrent LLM calls allowed when config.yaml does not set llm.max_concurrent_requests
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
 
 
 class AgentMCPServer(BaseMCPServer):
@@ -25,7 +29,7 @@ class AgentMCPServer(BaseMCPServer):
     Tools: think, code, review
     """
 
-    def __init__(self, port: int = 7000):
+    def __init__(self, port: int = 7000, max_concurrent_requests: Optional[int] = None):
         super().__init__(
             name="agent",
             port=port,
@@ -61,9 +65,20 @@ class AgentMCPServer(BaseMCPServer):
         if self.temperature is None:
             raise ValueError("Missing 'llm.temperature' in config.yaml")
 
-        # Initialize Anthropic client
+        # Cap on in-flight LLM calls (argument > env > config.yaml)
+        if max_concurrent_requests is None:
+            max_concurrent_requests = (
+                os.getenv("AGENT_MAX_CONCURRENT_REQUESTS")
+                or llm_config.get("max_concurrent_requests", DEFAULT_MAX_CONCURRENT_REQUESTS)
+            )
+        self.max_concurrent_requests = int(max_concurrent_requests)
+        if self.max_concurrent_requests < 1:
+            raise ValueError("'llm.max_concurrent_requests' must be at least 1")
+        self._llm_slots = asyncio.Semaphore(self.max_concurrent_requests)
+
+        # Initialize Anthropic client (async, so calls never block the event loop)
         api_key = os.getenv("ANTHROPIC_API_KEY")
-        self.anthropic = Anthropic(api_key=api_key) if api_key else None
+        self.anthropic = AsyncAnthropic(api_key=api_key) if api_key else None
 
         # Register agent tools
         self._register_agent_tools()
@@ -123,6 +138,17 @@ class AgentMCPServer(BaseMCPServer):
             }
         )
 
+    async def _complete(self, content: str) -> str:
+        """Send a single-turn prompt to the model, waiting for a free slot first"""
+        async with self._llm_slots:
+            message = await self.anthropic.messages.create(
+                model=self.model_name,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                messages=[{"role": "user", "content": content}]
+            )
+        return message.content[0].text
+
     async def think(self, prompt: str) -> Dict[str, Any]:
         """Think about a problem using AI"""
         if not self.anthropic:
@@ -132,19 +158,11 @@ class AgentMCPServer(BaseMCPServer):
             }
 
         try:
-            message = self.anthropic.messages.create(
-                model=self.model_name,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": f"Think deeply about this:\n\n{prompt}\n\nProvide structured reasoning and conclusions."
-                    }
-                ]
+            reasoning = await self._complete(
+                f"Think deeply about this:\n\n{prompt}\n\nProvide structured reasoning and conclusions."
             )
             return {
-                "reasoning": message.content[0].text,
+                "reasoning": reasoning,
                 "model": self.model_name
             }
         except Exception as e:
@@ -161,20 +179,12 @@ class AgentMCPServer(BaseMCPServer):
             }
 
         try:
-            message = self.anthropic.messages.create(
-                model=self.model_name,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": f"Generate {language} code for:\n\n{spec}\n\nIMPORTANT: Return ONLY the executable code with inline comments. Do NOT include:\n- Markdown code fences (```)\n- Explanatory text before or after the code\n- Multiple alternative versions\n- Usage examples outside the code\n\nJust return clean, executable {language} code that can be directly saved to a file and run."
-                    }
-                ]
+            code_text = await self._complete(
+                f"Generate {language} code for:\n\n{spec}\n\nIMPORTANT: Return ONLY the executable code with inline comments. Do NOT include:\n- Markdown code fences (```)\n- Explanatory text before or after the code\n- Multiple alternative versions\n- Usage examples outside the code\n\nJust return clean, executable {language} code that can be directly saved to a file and run."
             )
 
             # Extract code from markdown blocks if present
-            code_text = message.content[0].text.strip()
+            code_text = code_text.strip()
 
             # Remove markdown code fences if they exist
             if code_text.startswith("```"):
@@ -206,19 +216,11 @@ class AgentMCPServer(BaseMCPServer):
             }
 
         try:
-            message = self.anthropic.messages.create(
-                model=self.model_name,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": f"Review this code:\n\n```\n{code}\n```\n\nProvide:\n1. Issues found\n2. Suggestions for improvement\n3. Overall assessment"
-                    }
-                ]
+            feedback = await self._complete(
+                f"Review this code:\n\n```\n{code}\n```\n\nProvide:\n1. Issues found\n2. Suggestions for improvement\n3. Overall assessment"
             )
             return {
-                "feedback": message.content[0].text,
+                "feedback": feedback,
                 "model": self.model_name
             }
         except Exception as e:
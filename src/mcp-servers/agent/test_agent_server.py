@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for Agent MCP Server LLM concurrency
+Uses a fake Anthropic client whose calls sleep instead of hitting the API
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from agent_server import AgentMCPServer
+
+CALL_SECONDS = 0.3
+
+
+class FakeMessages:
+    """Stands in for AsyncAnthropic().messages"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        prompt = kwargs["messages"][0]["content"]
+        return SimpleNamespace(content=[SimpleNamespace(text=f"answer to {prompt[:40]}")])
+
+
+def make_server(max_concurrent_requests: int) -> AgentMCPServer:
+    server = AgentMCPServer(max_concurrent_requests=max_concurrent_requests)
+    server.anthropic = SimpleNamespace(messages=FakeMessages(CALL_SECONDS))
+    return server
+
+
+async def run_concurrently(coroutines):
+    started = time.perf_counter()
+    results = await asyncio.gather(*coroutines)
+    return results, time.perf_counter() - started
+
+
+def test_concurrent_think_calls_overlap(monkeypatch):
+    """Several think calls take about as long as one"""
+    monkeypatch.delenv("AGENT_MAX_CONCURRENT_REQUESTS", raising=False)
+    server = make_server(max_concurrent_requests=5)
+
+    results, elapsed = asyncio.run(run_concurrently(
+        server.think(f"problem {i}") for i in range(5)
+    ))
+
+    assert all("reasoning" in r for r in results)
+    assert server.anthropic.messages.calls == 5
+    assert server.anthropic.messages.max_in_flight == 5
+    assert elapsed < CALL_SECONDS * 2, f"5 concurrent calls took {elapsed:.2f}s"
+
+
+def test_concurrency_cap_limits_in_flight_calls(monkeypatch):
+    """Calls beyond the cap wait for a free slot"""
+    monkeypatch.delenv("AGENT_MAX_CONCURRENT_REQUESTS", raising=False)
+    server = make_server(max_concurrent_requests=2)
+
+    results, elapsed = asyncio.run(run_concurrently(
+        [server.think("a"), server.code("b"), server.review("c"), server.think("d")]
+    ))
+
+    assert "reasoning" in results[0]
+    assert "code" in results[1]
+    assert "feedback" in results[2]
+    assert server.anthropic.messages.max_in_flight == 2
+    assert CALL_SECONDS * 2 <= elapsed < CALL_SECONDS * 3
+
+
+def test_event_loop_stays_responsive_during_calls(monkeypatch):
+    """Other coroutines (e.g. health checks) run while a call is in flight"""
+    monkeypatch.delenv("AGENT_MAX_CONCURRENT_REQUESTS", raising=False)
+    server = make_server(max_concurrent_requests=1)
+
+    async def scenario():
+        call = asyncio.create_task(server.think("slow"))
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        ticked_after = time.perf_counter() - started
+        await call
+        return ticked_after
+
+    assert asyncio.run(scenario()) < CALL_SECONDS / 2
+
+
+def test_cap_argument_overrides_env(monkeypatch):
+    """An explicit cap wins over AGENT_MAX_CONCURRENT_REQUESTS, which wins over config.yaml"""
+    monkeypatch.setenv("AGENT_MAX_CONCURRENT_REQUESTS", "7")
+
+    assert make_server(max_concurrent_requests=3).max_concurrent_requests == 3
+    assert AgentMCPServer().max_concurrent_requests == 7
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
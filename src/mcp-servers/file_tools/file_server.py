@@ -8,18 +8,46 @@
 File Tools MCP Server
 Provides file system operations as MCP tools
 """
+import asyncio
+import base64
 import os
 import sys
-from typing import Dict, Any
-from pathlib import Path
+import uuid
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from pathlib import Path, PurePosixPath
 
 from base_server import BaseMCPServer
 
+# Upper bound on bytes returned by a single read_file call; larger files
+# are paged with offset/next_offset
+MAX_READ_BYTES = int(os.getenv("FILE_TOOLS_MAX_READ_BYTES", str(1024 * 1024)))
+
+READ_ENCODINGS = ("utf-8", "base64")
+
+# Entries returned per recursive list_files call unless a limit is given,
+# and the most a single call may return
+DEFAULT_LIST_LIMIT = int(os.getenv("FILE_TOOLS_LIST_LIMIT", "1000"))
+MAX_LIST_LIMIT = int(os.getenv("FILE_TOOLS_MAX_LIST_LIMIT", "10000"))
+
+
+def _complete_utf8_prefix(data: bytes) -> int:
+    """Length of data without a trailing, incomplete UTF-8 sequence"""
+    # A sequence is at most 4 bytes, so only the last 3 can be a partial one
+    for back in range(1, min(4, len(data)) + 1):
+        byte = data[-back]
+        if byte & 0xC0 == 0x80:
+            continue  # continuation byte, keep looking for the lead byte
+        if byte & 0x80 == 0:
+            return len(data)  # ASCII, nothing pending
+        needed = 2 if byte & 0xE0 == 0xC0 else 3 if byte & 0xF0 == 0xE0 else 4
+        return len(data) if back >= needed else len(data) - back
+    return len(data)
+
 
 class FileToolsMCPServer(BaseMCPServer):
     """
     File Tools MCP Server
-    Tools: read_file, write_file, list_files
+    Tools: read_file, write_file, write_files, list_files
     """
 
     def __init__(self, port: int = 7002, workspace_dir: str = "/workspace"):
@@ -41,13 +69,33 @@ class FileToolsMCPServer(BaseMCPServer):
         self.register_tool(
             name="read_file",
             handler=self.read_file,
-            description="Read contents of a file",
+            description=(
+                "Read contents of a file. Large files are returned in chunks: "
+                "pass next_offset back as offset to read the next chunk"
+            ),
             input_schema={
                 "type": "object",
                 "properties": {
                     "path": {
                         "type": "string",
                         "description": "Path to file (relative to workspace)"
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Byte offset to start reading at (default: 0)"
+                    },
+                    "length": {
+                        "type": "integer",
+                        "description": "Maximum number of bytes to read (default: up to max_bytes)"
+                    },
+                    "max_bytes": {
+                        "type": "integer",
+                        "description": f"Cap on bytes returned by this call (server limit: {MAX_READ_BYTES})"
+                    },
+                    "encoding": {
+                        "type": "string",
+                        "enum": list(READ_ENCODINGS),
+                        "description": "utf-8 for text (default) or base64 for binary files"
                     }
                 },
                 "required": ["path"]
@@ -57,7 +105,7 @@ class FileToolsMCPServer(BaseMCPServer):
         self.register_tool(
             name="write_file",
             handler=self.write_file,
-            description="Write content to a file",
+            description="Write content to a file (atomically replaces existing content unless appending)",
             input_schema={
                 "type": "object",
                 "properties": {
@@ -68,22 +116,86 @@ class FileToolsMCPServer(BaseMCPServer):
                     "content": {
                         "type": "string",
                         "description": "Content to write"
+                    },
+                    "append": {
+                        "type": "boolean",
+                        "description": "Append to the file instead of replacing it (default: false)"
+                    },
+                    "fsync": {
+                        "type": "boolean",
+                        "description": "Flush the write to disk before returning (default: false)"
                     }
                 },
                 "required": ["path", "content"]
             }
         )
 
+        self.register_tool(
+            name="write_files",
+            handler=self.write_files,
+            description="Write several files in one call; returns a result per file",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "files": {
+                        "type": "array",
+                        "description": "Files to write, in order",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "path": {"type": "string"},
+                                "content": {"type": "string"},
+                                "append": {"type": "boolean"}
+                            },
+                            "required": ["path", "content"]
+                        }
+                    },
+                    "fsync": {
+                        "type": "boolean",
+                        "description": "Flush all writes to disk before returning (default: false)"
+                    }
+                },
+                "required": ["files"]
+            }
+        )
+
         self.register_tool(
             name="list_files",
             handler=self.list_files,
-            description="List files in a directory",
+            description=(
+                "List files in a directory, optionally recursively. Recursive "
+                "listings are paged: pass next_cursor back as cursor to continue"
+            ),
             input_schema={
                 "type": "object",
                 "properties": {
                     "path": {
                         "type": "string",
                         "description": "Directory path (relative to workspace, default: .)"
+                    },
+                    "recursive": {
+                        "type": "boolean",
+                        "description": "Walk subdirectories; names become paths relative to path (default: false)"
+                    },
+                    "max_depth": {
+                        "type": "integer",
+                        "description": "Maximum directory depth when recursive (1 = only this directory)"
+                    },
+                    "pattern": {
+                        "type": "string",
+                        "description": "Glob filter, e.g. '*.xml' (name) or 'reports/*.md' (end of the relative path)"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": f"Maximum entries to return (recursive default: {DEFAULT_LIST_LIMIT}, max: {MAX_LIST_LIMIT})"
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "next_cursor from a previous call"
+                    },
+                    "include_mtime": {
+                        "type": "boolean",
+                        "description": "Include modification time (epoch seconds) for files"
                     }
                 }
             }
@@ -99,8 +211,25 @@ class FileToolsMCPServer(BaseMCPServer):
 
         return full_path
 
-    async def read_file(self, path: str) -> Dict[str, Any]:
-        """Read a file from the workspace"""
+    async def read_file(
+        self,
+        path: str,
+        offset: int = 0,
+        length: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        encoding: str = "utf-8"
+    ) -> Dict[str, Any]:
+        """
+        Read a file (or a byte range of it) from the workspace.
+
+        At most min(length, max_bytes, MAX_READ_BYTES) bytes are read, so
+        memory stays bounded regardless of file size. In utf-8 mode a chunk
+        never ends inside a multi-byte character; next_offset accounts for it.
+
+        Returns:
+            content, offset, length (bytes read), total_size, next_offset
+            (None at end of file) and eof
+        """
         try:
             file_path = self._get_safe_path(path)
 
@@ -110,24 +239,70 @@ class FileToolsMCPServer(BaseMCPServer):
             if not file_path.is_file():
                 return {"error": f"Not a file: {path}"}
 
-            content = file_path.read_text()
+            if encoding not in READ_ENCODINGS:
+                return {"error": f"Unsupported encoding: {encoding} (use one of {', '.join(READ_ENCODINGS)})"}
+            if offset < 0 or (length is not None and length < 0):
+                return {"error": "offset and length must be non-negative"}
+
+            limit = MAX_READ_BYTES if max_bytes is None else max(1, min(max_bytes, MAX_READ_BYTES))
+            if length is not None:
+                limit = min(limit, length)
+
+            data, total_size = await asyncio.to_thread(self._read_range, file_path, offset, limit)
+            end = offset + len(data)
+
+            if encoding == "base64":
+                content = base64.b64encode(data).decode("ascii")
+            else:
+                complete = _complete_utf8_prefix(data)
+                # Keep a split character for the next chunk (unless it is all there is)
+                if end < total_size and complete:
+                    data = data[:complete]
+                    end = offset + len(data)
+                content = data.decode("utf-8", errors="replace")
+
+            eof = end >= total_size
             return {
                 "path": path,
                 "content": content,
-                "size": len(content)
+                "encoding": encoding,
+                "size": len(content),
+                "offset": offset,
+                "length": len(data),
+                "total_size": total_size,
+                "next_offset": None if eof else end,
+                "eof": eof
             }
         except Exception as e:
             return {"error": str(e)}
 
-    async def write_file(self, path: str, content: str) -> Dict[str, Any]:
-        """Write content to a file in the workspace"""
-        try:
-            file_path = self._get_safe_path(path)
+    @staticmethod
+    def _read_range(file_path: Path, offset: int, limit: int):
+        """Read up to limit bytes at offset; returns (data, total file size)"""
+        with open(file_path, "rb") as f:
+            total_size = os.fstat(f.fileno()).st_size
+            if offset >= total_size or limit == 0:
+                return b"", total_size
+            f.seek(offset)
+            return f.read(limit), total_size
 
-            # Create parent directories if needed
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+    async def write_file(
+        self,
+        path: str,
+        content: str,
+        append: bool = False,
+        fsync: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Write content to a file in the workspace.
 
-            file_path.write_text(content)
+        Replacing writes go to a temp file that is renamed over the target,
+        so readers see either the old or the new content, never a partial
+        file, even if the server dies mid-write.
+        """
+        try:
+            file_path = self._get_safe_path(path)
+            await asyncio.to_thread(self._write_one, file_path, content, append, fsync)
 
             return {
                 "path": path,
@@ -137,8 +312,98 @@ class FileToolsMCPServer(BaseMCPServer):
         except Exception as e:
             return {"error": str(e)}
 
-    async def list_files(self, path: str = ".") -> Dict[str, Any]:
-        """List files in a directory"""
+    async def write_files(self, files: List[Dict[str, Any]], fsync: bool = False) -> Dict[str, Any]:
+        """
+        Write several files in one call.
+
+        Each file is written like write_file; a failure only affects that
+        file's result.
+        """
+        def write_all() -> List[Dict[str, Any]]:
+            results = []
+            for item in files:
+                path = item.get("path", "") if isinstance(item, dict) else ""
+                try:
+                    content = item["content"]
+                    file_path = self._get_safe_path(path)
+                    self._write_one(file_path, content, bool(item.get("append", False)), fsync)
+                    results.append({"path": path, "size": len(content), "success": True})
+                except Exception as e:
+                    results.append({"path": path, "success": False, "error": str(e)})
+            return results
+
+        results = await asyncio.to_thread(write_all)
+        written = sum(1 for r in results if r["success"])
+        return {
+            "results": results,
+            "written": written,
+            "failed": len(results) - written
+        }
+
+    @staticmethod
+    def _write_one(file_path: Path, content: str, append: bool, fsync: bool):
+        """Append in place, or write a sibling temp file and os.replace it"""
+        # Create parent directories if needed
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if append:
+            with open(file_path, "a") as f:
+                f.write(content)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            return
+
+        tmp_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(content)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            try:
+                # Keep the permissions of the file being replaced
+                os.chmod(tmp_path, file_path.stat().st_mode & 0o7777)
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        if fsync:
+            # Persist the rename itself
+            dir_fd = os.open(file_path.parent, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    async def list_files(
+        self,
+        path: str = ".",
+        recursive: bool = False,
+        max_depth: Optional[int] = None,
+        pattern: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_mtime: bool = False
+    ) -> Dict[str, Any]:
+        """
+        List files in a directory, optionally walking subdirectories.
+
+        Entries come from os.scandir in name order (directories before their
+        contents), so file type checks need no extra syscalls and paging is
+        stable. next_cursor is the last entry returned; resuming skips whole
+        subtrees that were already listed.
+
+        Returns:
+            files ({name, size[, mtime]}), directories (names), next_cursor
+            (None when complete) and truncated
+        """
         try:
             dir_path = self._get_safe_path(path)
 
@@ -148,26 +413,102 @@ class FileToolsMCPServer(BaseMCPServer):
             if not dir_path.is_dir():
                 return {"error": f"Not a directory: {path}"}
 
-            files = []
-            directories = []
+            if not recursive:
+                max_depth = 1
+            elif max_depth is not None and max_depth < 1:
+                return {"error": "max_depth must be at least 1"}
 
-            for item in dir_path.iterdir():
-                if item.is_file():
-                    files.append({
-                        "name": item.name,
-                        "size": item.stat().st_size
-                    })
-                elif item.is_dir():
-                    directories.append(item.name)
+            if limit is None and recursive:
+                limit = DEFAULT_LIST_LIMIT
+            if limit is not None:
+                limit = max(1, min(limit, MAX_LIST_LIMIT))
 
-            return {
-                "path": path,
-                "files": files,
-                "directories": directories
-            }
+            return await asyncio.to_thread(
+                self._list_entries, dir_path, path, max_depth, pattern, limit, cursor, include_mtime
+            )
         except Exception as e:
             return {"error": str(e)}
 
+    def _list_entries(
+        self,
+        dir_path: Path,
+        path: str,
+        max_depth: Optional[int],
+        pattern: Optional[str],
+        limit: Optional[int],
+        cursor: Optional[str],
+        include_mtime: bool
+    ) -> Dict[str, Any]:
+        files: List[Dict[str, Any]] = []
+        directories: List[str] = []
+        after = tuple(cursor.split("/")) if cursor else ()
+        last: Optional[Tuple[str, ...]] = None
+        truncated = False
+
+        for parts, entry, is_dir in self._walk(str(dir_path), (), max_depth, after):
+            name = "/".join(parts)
+            if pattern is not None and not PurePosixPath(name).match(pattern):
+                continue
+            if limit is not None and len(files) + len(directories) >= limit:
+                truncated = True
+                break
+
+            if is_dir:
+                directories.append(name)
+            else:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # Removed while listing
+                item = {"name": name, "size": stat.st_size}
+                if include_mtime:
+                    item["mtime"] = stat.st_mtime
+                files.append(item)
+            last = parts
+
+        return {
+            "path": path,
+            "files": files,
+            "directories": directories,
+            "next_cursor": "/".join(last) if truncated and last else None,
+            "truncated": truncated
+        }
+
+    def _walk(
+        self,
+        directory: str,
+        prefix: Tuple[str, ...],
+        max_depth: Optional[int],
+        after: Tuple[str, ...]
+    ) -> Iterator[Tuple[Tuple[str, ...], os.DirEntry, bool]]:
+        """Yield (relative parts, entry, is_dir) in name order, after the cursor"""
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return  # Unreadable or removed while listing
+
+        for entry in entries:
+            parts = prefix + (entry.name,)
+            try:
+                is_dir = entry.is_dir()
+                if not is_dir and not entry.is_file():
+                    continue
+            except OSError:
+                continue
+
+            # Subtrees of the cursor path still need walking; everything else
+            # at or before it was already returned
+            inside_cursor = after[:len(parts)] == parts
+            if parts <= after and not inside_cursor:
+                continue
+            if parts > after:
+                yield parts, entry, is_dir
+
+            # Recurse into real directories only (symlinks could loop or leave the workspace)
+            if is_dir and (max_depth is None or len(parts) < max_depth) and not entry.is_symlink():
+                yield from self._walk(entry.path, parts, max_depth, after)
+
 
 if __name__ == "__main__":
     # Get workspace and port from env or use defaults
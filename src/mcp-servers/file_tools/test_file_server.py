@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 adcl.io
+# All Rights Reserved.
+#
+# This software is proprietary and confidential. Unauthorized copying,
+# distribution, or use of this software is strictly prohibited.
+
+"""
+Tests for File Tools MCP Server range reads, directory listing and writes
+Pages through a generated 1 GB sparse file and checks resident memory stays flat;
+benchmarks recursive listing of a 100k-file tree against per-directory calls
+and batched writes against single write_file calls
+"""
+import asyncio
+import base64
+import os
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import file_server
+from file_server import FileToolsMCPServer
+
+GB = 1024 ** 3
+MB = 1024 ** 2
+
+
+def make_server(workspace: Path) -> FileToolsMCPServer:
+    return FileToolsMCPServer(workspace_dir=str(workspace))
+
+
+def current_rss() -> int:
+    """Resident set size in bytes"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def peak_rss() -> int:
+    """Peak resident set size in bytes"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def test_paging_1gb_sparse_file_keeps_memory_flat(tmp_path):
+    """Every chunk is bounded; RSS does not grow with file size"""
+    sparse = tmp_path / "capture.pcap"
+    with open(sparse, "wb") as f:
+        f.truncate(GB)
+        f.seek(GB - 4)
+        f.write(b"END\n")
+    server = make_server(tmp_path)
+
+    async def page_through():
+        offset, chunks, largest = 0, 0, 0
+        tail = b""
+        while offset is not None:
+            result = await server.read_file("capture.pcap", offset=offset, encoding="base64")
+            assert "error" not in result, result
+            assert result["total_size"] == GB
+            largest = max(largest, result["length"])
+            chunks += 1
+            if result["eof"]:
+                tail = base64.b64decode(result["content"])
+            offset = result["next_offset"]
+        return chunks, largest, tail
+
+    rss_before, peak_before = current_rss(), peak_rss()
+    chunks, largest, tail = asyncio.run(page_through())
+    rss_growth = current_rss() - rss_before
+    peak_growth = peak_rss() - peak_before
+
+    assert chunks == GB // file_server.MAX_READ_BYTES
+    assert largest == file_server.MAX_READ_BYTES
+    assert tail.endswith(b"END\n")
+    assert rss_growth < 32 * MB, f"RSS grew by {rss_growth / MB:.0f} MB"
+    assert peak_growth < 64 * MB, f"peak RSS grew by {peak_growth / MB:.0f} MB"
+
+
+def test_default_read_is_capped_and_reports_next_offset(tmp_path):
+    """Without a range, read_file returns at most MAX_READ_BYTES"""
+    big = tmp_path / "scan.txt"
+    big.write_bytes(b"x" * (file_server.MAX_READ_BYTES + 10))
+    server = make_server(tmp_path)
+
+    first = asyncio.run(server.read_file("scan.txt"))
+    rest = asyncio.run(server.read_file("scan.txt", offset=first["next_offset"]))
+
+    assert first["length"] == file_server.MAX_READ_BYTES
+    assert first["next_offset"] == file_server.MAX_READ_BYTES and not first["eof"]
+    assert rest["content"] == "x" * 10 and rest["eof"] and rest["next_offset"] is None
+
+
+def test_small_file_read_unchanged(tmp_path):
+    (tmp_path / "report.md").write_text("# Report\n")
+    result = asyncio.run(make_server(tmp_path).read_file("report.md"))
+
+    assert result["content"] == "# Report\n"
+    assert result["size"] == 9 and result["total_size"] == 9 and result["eof"]
+
+
+def test_utf8_chunks_never_split_characters(tmp_path):
+    """Paging text with small chunks reassembles exactly"""
+    text = "héllo wörld ✓ 𝄞 " * 50
+    (tmp_path / "notes.txt").write_text(text, encoding="utf-8")
+    server = make_server(tmp_path)
+
+    async def read_all():
+        parts, offset = [], 0
+        while offset is not None:
+            result = await server.read_file("notes.txt", offset=offset, length=7)
+            parts.append(result["content"])
+            offset = result["next_offset"]
+        return "".join(parts)
+
+    assert asyncio.run(read_all()) == text
+
+
+def test_base64_mode_round_trips_binary(tmp_path):
+    payload = os.urandom(4096)
+    (tmp_path / "blob.bin").write_bytes(payload)
+    server = make_server(tmp_path)
+
+    result = asyncio.run(server.read_file("blob.bin", offset=100, length=1000, encoding="base64"))
+
+    assert base64.b64decode(result["content"]) == payload[100:1100]
+    assert result["next_offset"] == 1100
+
+
+def test_invalid_arguments(tmp_path):
+    (tmp_path / "a.txt").write_text("a")
+    server = make_server(tmp_path)
+
+    assert "error" in asyncio.run(server.read_file("a.txt", encoding="latin-1"))
+    assert "error" in asyncio.run(server.read_file("a.txt", offset=-1))
+    assert "error" in asyncio.run(server.read_file("../etc/passwd"))
+
+
+def make_tree(root: Path, spec):
+    """spec: {name: None (file) | nested spec (directory)}"""
+    for name, child in spec.items():
+        if child is None:
+            (root / name).write_text(name)
+        else:
+            (root / name).mkdir()
+            make_tree(root / name, child)
+
+
+def list_all(server, **kwargs):
+    """Follow next_cursor until the listing is complete; returns (entries, calls)"""
+    async def run():
+        entries, cursor, calls = [], None, 0
+        while True:
+            result = await server.list_files(cursor=cursor, **kwargs)
+            assert "error" not in result, result
+            calls += 1
+            entries += [f["name"] for f in result["files"]] + result["directories"]
+            cursor = result["next_cursor"]
+            if cursor is None:
+                return entries, calls
+    return asyncio.run(run())
+
+
+def test_non_recursive_listing_keeps_shape(tmp_path):
+    make_tree(tmp_path, {"b.txt": None, "a.txt": None, "sub": {"c.txt": None}})
+    result = asyncio.run(make_server(tmp_path).list_files("."))
+
+    assert result["files"] == [{"name": "a.txt", "size": 5}, {"name": "b.txt", "size": 5}]
+    assert result["directories"] == ["sub"]
+    assert result["next_cursor"] is None and not result["truncated"]
+
+
+def test_recursive_listing_depth_pattern_and_mtime(tmp_path):
+    make_tree(tmp_path, {
+        "scan.xml": None,
+        "reports": {"r1.md": None, "deep": {"r2.md": None, "x.xml": None}},
+    })
+    server = make_server(tmp_path)
+
+    everything = asyncio.run(server.list_files(".", recursive=True))
+    shallow = asyncio.run(server.list_files(".", recursive=True, max_depth=2))
+    xml = asyncio.run(server.list_files(".", recursive=True, pattern="*.xml", include_mtime=True))
+    by_path = asyncio.run(server.list_files(".", recursive=True, pattern="reports/*.md"))
+
+    assert sorted(f["name"] for f in everything["files"]) == [
+        "reports/deep/r2.md", "reports/deep/x.xml", "reports/r1.md", "scan.xml"
+    ]
+    assert everything["directories"] == ["reports", "reports/deep"]
+    assert [f["name"] for f in shallow["files"]] == ["reports/r1.md", "scan.xml"]
+    assert [f["name"] for f in xml["files"]] == ["reports/deep/x.xml", "scan.xml"]
+    assert all(isinstance(f["mtime"], float) for f in xml["files"])
+    assert [f["name"] for f in by_path["files"]] == ["reports/r1.md"]
+
+
+def test_cursor_pagination_visits_every_entry_once(tmp_path):
+    make_tree(tmp_path, {
+        f"d{i}": {f"e{j}": {f"f{k}.txt": None for k in range(3)} for j in range(3)}
+        for i in range(4)
+    })
+    server = make_server(tmp_path)
+
+    entries, calls = list_all(server, path=".", recursive=True, limit=7)
+    single = asyncio.run(server.list_files(".", recursive=True, limit=1000))
+
+    assert len(entries) == len(set(entries)) == 4 + 12 + 36
+    assert calls == -(-52 // 7)
+    assert set(entries) == {f["name"] for f in single["files"]} | set(single["directories"])
+
+
+def legacy_list_files(dir_path: Path):
+    """The original one-level listing: iterdir plus is_file/is_dir/stat per entry"""
+    files, directories = [], []
+    for item in dir_path.iterdir():
+        if item.is_file():
+            files.append({"name": item.name, "size": item.stat().st_size})
+        elif item.is_dir():
+            directories.append(item.name)
+    return {"files": files, "directories": directories}
+
+
+def test_benchmark_100k_file_tree(tmp_path):
+    """One paged recursive walk vs one call per directory"""
+    root = tmp_path / "tree"
+    root.mkdir()
+    files_per_dir = 1000
+    for i in range(10):
+        for j in range(10):
+            leaf = root / f"host{i}" / f"port{j}"
+            leaf.mkdir(parents=True)
+            for k in range(files_per_dir):
+                (leaf / f"scan{k}.txt").touch()
+    server = make_server(tmp_path)
+
+    started = time.perf_counter()
+    legacy_files, legacy_calls, pending = 0, 0, [root]
+    while pending:
+        directory = pending.pop()
+        result = legacy_list_files(directory)
+        legacy_calls += 1
+        legacy_files += len(result["files"])
+        pending += [directory / d for d in result["directories"]]
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    entries, calls = list_all(server, path="tree", recursive=True, limit=10000)
+    recursive_seconds = time.perf_counter() - started
+
+    print(
+        f"\n100k-file tree: per-directory {legacy_calls} calls {legacy_seconds:.2f}s; "
+        f"recursive scandir {calls} calls {recursive_seconds:.2f}s"
+    )
+    assert legacy_files == 100 * files_per_dir
+    assert len(entries) == 100 * files_per_dir + 110
+    assert calls < legacy_calls
+
+
+def test_write_survives_crash_before_rename(tmp_path, monkeypatch):
+    """A write interrupted after the temp file is written leaves the old file intact"""
+    (tmp_path / "report.md").write_text("old report")
+    server = make_server(tmp_path)
+
+    def crash(*args):
+        raise OSError("simulated crash")
+
+    monkeypatch.setattr(file_server.os, "replace", crash)
+    result = asyncio.run(server.write_file("report.md", "new report " * 1000))
+
+    assert "error" in result
+    assert (tmp_path / "report.md").read_text() == "old report"
+    assert [p.name for p in tmp_path.iterdir()] == ["report.md"]
+
+
+def test_write_survives_crash_mid_write(tmp_path, monkeypatch):
+    """Content flushed but not yet synced never reaches the target path"""
+    (tmp_path / "report.md").write_text("old report")
+    server = make_server(tmp_path)
+
+    def crash(fd):
+        raise OSError("simulated crash during fsync")
+
+    monkeypatch.setattr(file_server.os, "fsync", crash)
+    result = asyncio.run(server.write_file("report.md", "partial", fsync=True))
+
+    assert "error" in result
+    assert (tmp_path / "report.md").read_text() == "old report"
+    assert [p.name for p in tmp_path.iterdir()] == ["report.md"]
+
+
+def test_readers_never_see_partial_content(tmp_path):
+    """Concurrent readers see either the old or the new file, complete"""
+    size = 2 * MB
+    target = tmp_path / "scan.txt"
+    target.write_text("a" * size)
+    stop = threading.Event()
+    partial_reads = []
+
+    def reader():
+        while not stop.is_set():
+            data = target.read_text()
+            if len(data) != size or len(set(data)) != 1:
+                partial_reads.append(len(data))
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    try:
+        for i in range(30):
+            FileToolsMCPServer._write_one(target, ("b" if i % 2 else "a") * size, append=False, fsync=False)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert partial_reads == []
+
+
+def test_append_and_fsync_modes(tmp_path):
+    server = make_server(tmp_path)
+
+    asyncio.run(server.write_file("log/run.log", "line 1\n", fsync=True))
+    asyncio.run(server.write_file("log/run.log", "line 2\n", append=True, fsync=True))
+    asyncio.run(server.write_file("log/run.log", "line 3\n", append=True))
+
+    assert (tmp_path / "log" / "run.log").read_text() == "line 1\nline 2\nline 3\n"
+
+
+def test_write_files_reports_per_file_results(tmp_path):
+    server = make_server(tmp_path)
+
+    result = asyncio.run(server.write_files([
+        {"path": "a.txt", "content": "A"},
+        {"path": "../escape.txt", "content": "nope"},
+        {"path": "nested/b.txt", "content": "B"},
+        {"path": "c.txt"},
+        {"path": "a.txt", "content": "+", "append": True},
+    ]))
+
+    assert [r["success"] for r in result["results"]] == [True, False, True, False, True]
+    assert result["written"] == 3 and result["failed"] == 2
+    assert "outside workspace" in result["results"][1]["error"]
+    assert (tmp_path / "a.txt").read_text() == "A+"
+    assert (tmp_path / "nested" / "b.txt").read_text() == "B"
+    assert not (tmp_path.parent / "escape.txt").exists()
+
+
+def test_benchmark_1000_small_files(tmp_path):
+    """One write_files call vs 1,000 write_file calls over the MCP endpoint"""
+    count = 1000
+    server = make_server(tmp_path)
+
+    async def run():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://file-tools") as client:
+            started = time.perf_counter()
+            for i in range(count):
+                response = await client.post("/mcp/call_tool", json={
+                    "tool": "write_file",
+                    "arguments": {"path": f"single/finding-{i}.json", "content": f'{{"id": {i}}}'}
+                })
+                assert not response.json()["isError"]
+            single_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            response = await client.post("/mcp/call_tool", json={
+                "tool": "write_files",
+                "arguments": {"files": [
+                    {"path": f"batch/finding-{i}.json", "content": f'{{"id": {i}}}'}
+                    for i in range(count)
+                ]}
+            })
+            batch_seconds = time.perf_counter() - started
+            assert not response.json()["isError"]
+            return single_seconds, batch_seconds
+
+    single_seconds, batch_seconds = asyncio.run(run())
+
+    print(
+        f"\n{count} small files: {count} write_file calls {single_seconds:.2f}s "
+        f"({count / single_seconds:.0f} files/s); one write_files call {batch_seconds:.2f}s "
+        f"({count / batch_seconds:.0f} files/s)"
+    )
+    assert len(list((tmp_path / "batch").iterdir())) == count
+    assert len(list((tmp_path / "single").iterdir())) == count
+    assert batch_seconds < single_seconds
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))